@@ -10,5 +10,7 @@ import apps.RBM5.BCF  # This automatically sets up the path
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.pin import ComponentPin
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.crossing_overlay import CrossingOverlay
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.reroute_scheduler import RerouteScheduler
 
-__all__ = ['ComponentPin', 'ComponentWithPins', 'Wire']
+__all__ = ['ComponentPin', 'ComponentWithPins', 'Wire', 'CrossingOverlay', 'RerouteScheduler']
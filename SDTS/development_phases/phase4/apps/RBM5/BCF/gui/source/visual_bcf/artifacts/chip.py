@@ -4,13 +4,22 @@ Component with Pins Module - Phase 2.5
 Enhanced component with visible pins for connections.
 """
 
+from typing import Tuple
+
 from PySide6.QtCore import QPointF, Qt, QTimer
-from PySide6.QtGui import QPen, QBrush, QColor, QFont
+from PySide6.QtGui import QPen, QBrush, QColor, QFont, QStaticText
 from PySide6.QtWidgets import (
-    QGraphicsRectItem, QGraphicsTextItem, QMenu, QMessageBox, QGraphicsItem, QGraphicsView)
+    QGraphicsRectItem, QMenu, QMessageBox, QGraphicsItem, QGraphicsView)
 
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.pin import ComponentPin
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.level_of_detail import (
+    NAME_DETAIL, OVERVIEW_DETAIL, DetailTextItem, level_of_detail)
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import to_point, to_rect
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import Rect, inflate_rect
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.orthogonal import approach_point
+from apps.RBM5.BCF.source.models.visual_bcf.dcf_resolver import parse_pin_layout
 
 
 class ComponentWithPins(QGraphicsRectItem):
@@ -22,7 +31,8 @@ class ComponentWithPins(QGraphicsRectItem):
             component_type: str,
             width: float = 100,
             height: float = 60,
-            component_config: dict = None):
+            component_config: dict = None,
+            pin_layout: tuple = None):
         height = len(component_config.get('pins', [])) * 10 + 20 if component_config else 60
         super().__init__(0, 0, width, height)
 
@@ -30,21 +40,29 @@ class ComponentWithPins(QGraphicsRectItem):
         self.name = name
         self.component_type = component_type
         self.component_config = component_config or {}
+        # Pre-parsed pin layout shared between components of the same type
+        # (see VisualBCFDataModel.component_pin_layout); parsed here if absent
+        self.pin_layout = pin_layout
         self.is_selected = False
         self.pins = []  # List of ComponentPin objects
         self.connected_wires = []  # List of wires connected to this component
+        # Scene geometry read by routing; rebuilt on first use after a move or resize
+        self.geometry_version = 0
+        self._geometry = None
 
         # Visual properties
         self.setFlag(self.GraphicsItemFlag.ItemIsMovable, True)
         self.setFlag(self.GraphicsItemFlag.ItemIsSelectable, True)
         self.setFlag(self.GraphicsItemFlag.ItemSendsScenePositionChanges, True)
+        # Rotation and scale changes invalidate the routing geometry (see itemChange)
+        self.setFlag(self.GraphicsItemFlag.ItemSendsGeometryChanges, True)
 
         # Set appearance and create pins based on type or configuration
         self._setup_appearance()
         self._create_pins()
 
         # Add centered text label
-        self.text_item = QGraphicsTextItem(name, self)
+        self.text_item = DetailTextItem(name, self, OVERVIEW_DETAIL)
         self.text_item.setFont(QFont("Arial", 8))
         # Center the text properly
         text_rect = self.text_item.boundingRect()
@@ -52,6 +70,11 @@ class ComponentWithPins(QGraphicsRectItem):
             (width - text_rect.width()) / 2,
             (height - text_rect.height()) / 2
         )
+        # Laid out once, drawn instead of the text item when zoomed out
+        self._overview_name = QStaticText(name)
+        self._overview_name.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        margin = self.text_item.document().documentMargin()
+        self._overview_name_pos = self.text_item.pos() + QPointF(margin, margin)
 
     def _create_pins(self):
         """Create pins based on component configuration or fallback to type-based creation"""
@@ -166,21 +189,11 @@ class ComponentWithPins(QGraphicsRectItem):
         pin_radius = 4  # Pin radius for centering calculations
 
         try:
-            pins_config = self.component_config.get('pins', [])
-            print(f"Creating pins from config for {self.name}: {len(pins_config)} pins")
+            pin_layout = self.pin_layout
+            if pin_layout is None:
+                pin_layout = parse_pin_layout(self.component_config)
             
-            for pin_config in pins_config:
-                # Get pin information from configuration
-                pin_id = pin_config.get('pin_id', pin_config.get('id', ''))
-                pin_name = pin_config.get('pin_name', pin_config.get('name', pin_id))
-                pin_side = pin_config.get('side', 'right')
-                pin_position = pin_config.get('position', 0.5)  # Position as fraction (0.0 to 1.0)
-                pin_type = pin_config.get('type', 'digital')
-                
-                if not pin_id:
-                    print(f"Warning: Pin missing ID in config: {pin_config}")
-                    continue
-                
+            for pin_id, pin_name, pin_type, pin_side, pin_position in pin_layout:
                 # Create the pin
                 pin = ComponentPin(
                     pin_id,
@@ -206,7 +219,6 @@ class ComponentWithPins(QGraphicsRectItem):
                     pin.setPos(width, height * pin_position - pin_radius)
                 
                 self.pins.append(pin)
-                print(f"  Created pin: {pin_id} ({pin_name}) on {pin_side} at position {pin_position}")
                 
         except Exception as e:
             print(f"Error creating pins from configuration: {e}")
@@ -253,6 +265,74 @@ class ComponentWithPins(QGraphicsRectItem):
                 self.setBrush(QBrush(QColor(180, 180, 180)))  # Gray
                 self.setPen(QPen(QColor(120, 120, 120), 2))
 
+    # ---------------------- Routing geometry ----------------------
+
+    # Item changes that move the scene rect and pins other than a move
+    _TRANSFORM_CHANGES = (
+        QGraphicsItem.GraphicsItemChange.ItemTransformHasChanged,
+        QGraphicsItem.GraphicsItemChange.ItemRotationHasChanged,
+        QGraphicsItem.GraphicsItemChange.ItemScaleHasChanged,
+        QGraphicsItem.GraphicsItemChange.ItemTransformOriginPointHasChanged,
+    )
+
+    def setRect(self, *args):
+        super().setRect(*args)
+        self.invalidate_geometry()
+
+    def setPen(self, pen):
+        super().setPen(pen)
+        # The scene rect is taken from boundingRect(), which includes the pen width
+        self.invalidate_geometry()
+
+    def invalidate_geometry(self):
+        """Drop the cached routing geometry after a move, resize, pen or transform change"""
+        self.geometry_version += 1
+        self._geometry = None
+
+    def _routing_geometry(self) -> dict:
+        if self._geometry is None:
+            self._geometry = {'rect': to_rect(self.mapRectToScene(self.boundingRect())),
+                              'inflated': {}, 'approach': {}}
+        return self._geometry
+
+    def scene_rect(self) -> Rect:
+        """Scene rect (x0, y0, x1, y1) of the component, as the obstacle index stores it"""
+        return self._routing_geometry()['rect']
+
+    def inflated_rect(self, margin: float) -> Rect:
+        """Scene rect grown by ``margin`` on every side"""
+        inflated = self._routing_geometry()['inflated']
+        rect = inflated.get(margin)
+        if rect is None:
+            rect = inflated[margin] = inflate_rect(self.scene_rect(), margin)
+        return rect
+
+    def pin_approach(self, pin) -> Tuple[Point, Point]:
+        """Connection point of one of the pins and the point a wire leaves it from"""
+        approach = self._routing_geometry()['approach']
+        points = approach.get(pin)
+        if points is None:
+            connection = to_point(pin.get_connection_point())
+            points = approach[pin] = (connection, approach_point(connection, pin.edge))
+        return points
+
+    def paint(self, painter, option, widget=None):
+        """Draw the component, as a flat rect with its cached name when zoomed out"""
+        lod = level_of_detail(painter)
+        if lod >= OVERVIEW_DETAIL:
+            super().paint(painter, option, widget)
+            return
+        painter.fillRect(self.rect(), self.brush())
+        if self.isSelected():
+            pen = QPen(self.pen().color(), 0)  # cosmetic hairline
+            painter.setPen(pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(self.rect())
+        if lod >= NAME_DETAIL:
+            painter.setPen(self.text_item.defaultTextColor())
+            painter.setFont(self.text_item.font())
+            painter.drawStaticText(self._overview_name_pos, self._overview_name)
+
     def contextMenuEvent(self, event):
         """Show context menu on right click"""
         menu = QMenu()
@@ -342,13 +422,19 @@ class ComponentWithPins(QGraphicsRectItem):
             # This prevents performance issues during mouse movement
             pass
 
-        elif change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            # Update connected wires only after the move is complete
-            # Use QTimer.singleShot to defer the update
-            QTimer.singleShot(0, self.update_connected_wires)
+        elif change in self._TRANSFORM_CHANGES:
+            self.invalidate_geometry()
 
-            # Defer intersecting wires update in the same tick
-            QTimer.singleShot(0, lambda: self._update_intersecting_wires(final=False))
+        elif change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self.invalidate_geometry()
+            scene = self.scene()
+            if scene is not None and hasattr(scene, 'update_obstacle'):
+                # The scene records the moved region and reroutes only the
+                # affected wires at its next idle tick
+                scene.update_obstacle(self)
+            elif scene is not None:
+                # Update connected and intersecting wires after the move
+                QTimer.singleShot(0, self.update_connected_wires)
 
             # Notify controller to sync model position (deferred)
             try:
@@ -389,11 +475,16 @@ class ComponentWithPins(QGraphicsRectItem):
         except Exception:
             pass
 
-        # After dragging is complete, do a full wire update
-        # This ensures proper collision detection and routing
-        QTimer.singleShot(100, self.update_connected_wires_full)
-        # And finalize intersecting wire updates
-        QTimer.singleShot(120, lambda: self._update_intersecting_wires(final=True))
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'settle_reroutes'):
+            # Settle any reroute still pending from the drag
+            scene.settle_reroutes()
+        else:
+            # After dragging is complete, do a full wire update
+            # This ensures proper collision detection and routing
+            QTimer.singleShot(100, self.update_connected_wires_full)
+            # And finalize intersecting wire updates
+            QTimer.singleShot(120, lambda: self._update_intersecting_wires(final=True))
 
     def mousePressEvent(self, event):
         """Switch cursor to closed hand when starting a drag in move mode"""
@@ -14,7 +14,16 @@ from PySide6.QtCore import QPointF, Qt, QRectF, QLineF
 from PySide6.QtGui import QPen, QColor, QPainter, QPainterPath, QPainterPathStroker
 from PySide6.QtWidgets import QGraphicsPathItem, QMenu, QGraphicsItem
 
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.level_of_detail import (
+    OVERVIEW_DETAIL, coarse_path, level_of_detail)
+
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.pin import ComponentPin
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import (
+    line_points, to_point, to_points, to_qpoint, to_qpoints, to_qrect)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.orthogonal import OrthogonalRouter, approach_point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.route_cache import (
+    RouteRequest, fast_route_request, run_route_request)
 
 
 class WirePath:
@@ -27,8 +36,21 @@ class WirePath:
     3. Creating intelligent detours around components
     4. Maintaining orthogonal routing throughout the path
     5. Supporting real-time calculation during component movement
+
+    The routing engine is selected with ``engine`` (or the scene's
+    ``routing_engine``): "heuristic" uses the detour logic of
+    ``routing.orthogonal.OrthogonalRouter`` plus the wire jogs below, any
+    other name is looked up in the scene's ``routers`` and falls back to the
+    heuristic when that router finds no route. Geometry is converted to plain
+    tuples for the Qt-free routing package with the ``qt_geometry`` adapters.
+
+    A wire of a fan-out net draws only its ``branch`` of the net's Steiner
+    tree, from the ``junction`` where it leaves the wires before it (see
+    ``ComponentScene.update_wire_net``); ``segments`` keep the whole route.
     """
 
+    DEFAULT_ENGINE = "heuristic"
+
     def __init__(
         self,
         start_point: QPointF,
@@ -37,6 +59,7 @@ class WirePath:
         end_pin=None,
         scene=None,
         calculate_now=True,
+        engine: Optional[str] = None,
     ):
         # Ensure connections always flow from left to right
         if start_point.x() > end_point.x():
@@ -55,14 +78,10 @@ class WirePath:
 
         self.get_start_and_end_approach_points()
         self.scene = scene
+        self.engine = engine or getattr(scene, "routing_engine", None) or self.DEFAULT_ENGINE
         self.segments = []
         self.intersection_bumps = []
 
-        # Jog bookkeeping for full-wire offsets (per colinear track)
-        self._h_jogs_by_y = {}  # y_value -> vertical offset (dy)
-        self._v_jogs_by_x = {}  # x_value -> horizontal offset (dx)
-        self._lane_spacing = 10
-
         # Orthogonal routing properties
         self.clearance = 30  # Minimum clearance from components
         self.grid_size = 10  # Grid alignment for cleaner routing
@@ -82,220 +101,96 @@ class WirePath:
         """Get the perpendicular approach point for a pin based on its edge"""
         if not pin or not pin.edge:
             return pin_point
-
-        clearance = 20  # 20px clearance from pin
-
-        if pin.edge == "left":
-            # Pin on left edge, approach from left (right to left)
-            return QPointF(pin_point.x() - clearance, pin_point.y())
-        elif pin.edge == "right":
-            # Pin on right edge, approach from right (left to right)
-            return QPointF(pin_point.x() + clearance, pin_point.y())
-        elif pin.edge == "top":
-            # Pin on top edge, approach from top (bottom to top)
-            return QPointF(pin_point.x(), pin_point.y() - clearance)
-        elif pin.edge == "bottom":
-            # Pin on bottom edge, approach from bottom (top to bottom)
-            return QPointF(pin_point.x(), pin_point.y() + clearance)
-        else:
-            return pin_point
+        point = to_point(pin_point)
+        # Components cache their pins' approach points until they move
+        pin_approach = getattr(pin.parent_component, 'pin_approach', None)
+        if pin_approach is not None:
+            connection, approach = pin_approach(pin)
+            if connection == point:
+                return to_qpoint(approach)
+        return to_qpoint(approach_point(point, pin.edge))
 
     def _calculate_orthogonal_path(self):
         """Calculate orthogonal wire path with component avoidance"""
-        # Start with basic orthogonal routing
-        path_points = self._calculate_basic_orthogonal_path()
-        # Check for component intersections and create detours
-        path_points = self._avoid_component_intersections(path_points)
-        # Compute and apply jogs in one pass
-        path_points = self._compute_and_apply_jogs(path_points)
-
-        # Convert path points to segments
-        self.segments = [self.start_point]
-        self.segments += path_points
-        self.segments.append(self.end_point)
-
-    def _calculate_basic_orthogonal_path(self) -> List[QPointF]:
-        """Calculate basic orthogonal path from start to end based on pin positions"""
-        path, component, p = self.get_default_detour()
-        if path is not None:
-            return path
-        intersection_point, _, edge = self._line_intersects_rect(
-            QLineF(self.start_approach_point, p),
-            component.boundingRect())
-        points = {
-            'left': self.get_left_edge_intersection_detour,
-            'right': self.get_right_edge_intersection_detour,
-            'top': self.get_top_edge_intersection_detour,
-            'bottom': self.get_bottom_edge_intersection_detour,
-        }[edge](intersection_point, component)
-
-        # While building, update jog maps for candidate segments
-        return points
-
-    def _calculate_simple_l_path(self) -> List[QPointF]:
-        """Calculate simple L-shaped path when pin info is not available"""
-        # Simple L-shaped path: horizontal first, then vertical
-        mid_x = (self.start_approach_point.x() + self.end_approach_point.x()) / 2
-        mid_point = QPointF(mid_x, self.start_approach_point.y())
-        return [self.start_approach_point, mid_point, self.end_approach_point]
-
-    def get_default_detour(self) -> List[QPointF]:
-        component = None
-        mid_point = None
-        for p in [
-            QPointF(self.end_approach_point.x(), self.start_approach_point.y()),
-            QPointF(self.start_approach_point.x(), self.end_approach_point.y()),
-        ]:
-            mid_point = p
-            component = self.scene.get_component_at_position(p)
-            if component is None:
-                return [self.start_approach_point, p, self.end_approach_point], None, mid_point
-        return None, component, mid_point
-
-    def get_left_edge_intersection_detour(self, intersection_point: QPointF, component: QRectF) -> List[QPointF]:
-        p1 = QPointF(component.boundingRect().left() - self.clearance, intersection_point.y())
-        if self.start_approach_point.y() < self.end_approach_point.y():
-            p2 = QPointF(p1.x(), component.boundingRect().bottom() + self.clearance)
-        else:
-            p2 = QPointF(p1.x(), component.boundingRect().top() - self.clearance)
-        p3 = QPointF(component.boundingRect().center().x(), p2.y())
-        return [self.start_approach_point, p1, p2, p3, self.end_approach_point]
-
-    def get_right_edge_intersection_detour(self, intersection_point: QPointF, component: QRectF) -> List[QPointF]:
-        p1 = QPointF(component.boundingRect().right() + self.clearance, intersection_point.y())
-        if self.start_approach_point.y() < self.end_approach_point.y():
-            p2 = QPointF(p1.x(), component.boundingRect().bottom() + self.clearance)
-        else:
-            p2 = QPointF(p1.x(), component.boundingRect().top() - self.clearance)
-        p3 = QPointF(component.boundingRect().center().x(), p2.y())
-        return [self.start_approach_point, p1, p2, p3, self.end_approach_point]
-
-    def get_top_edge_intersection_detour(self, intersection_point: QPointF, component: QRectF) -> List[QPointF]:
-        p1 = QPointF(intersection_point.x(), component.boundingRect().top() - self.clearance)
-        if self.start_approach_point.x() < self.end_approach_point.x():
-            p2 = QPointF(component.boundingRect().right() + self.clearance, p1.y())
-        else:
-            p2 = QPointF(component.boundingRect().left() - self.clearance, p1.y())
-        p3 = QPointF(p2.x(), component.boundingRect().center().y())
-        return [self.start_approach_point, p1, p2, p3, self.end_approach_point]
-
-    def get_bottom_edge_intersection_detour(self, intersection_point: QPointF, component: QRectF) -> List[QPointF]:
-        p1 = QPointF(intersection_point.x(), component.boundingRect().bottom() + self.clearance)
-        if self.start_approach_point.x() < self.end_approach_point.x():
-            p2 = QPointF(component.boundingRect().right() + self.clearance, p1.y())
+        # Router output already keeps clearance, so it is used without jogs
+        path_points = self._route_with_engine()
+        if path_points is not None:
+            self._release_tracks()
         else:
-            p2 = QPointF(component.boundingRect().left() - self.clearance, p1.y())
-        p3 = QPointF(p2.x(), component.boundingRect().center().y())
-        return [self.start_approach_point, p1, p2, p3, self.end_approach_point]
-
-    def _get_component_rect(self, pin) -> QRectF:
-        """Get the bounding rectangle of the component that contains the pin"""
-        if not pin or not hasattr(pin, "parent") or not pin.parent:
-            # Fallback to a default rectangle around the pin
-            return QRectF(
-                self.start_approach_point.x() - 50, self.start_approach_point.y() - 50, 100, 100
-            )
-
-        # Get the parent component
-        component = pin.parent
-        if hasattr(component, "boundingRect"):
-            # Get component's bounding rectangle in scene coordinates
-            component_rect = component.boundingRect()
-            if hasattr(component, "mapRectToScene"):
-                return component.mapRectToScene(component_rect)
-            else:
-                # Fallback to component position
-                return QRectF(
-                    component.pos().x(),
-                    component.pos().y(),
-                    component_rect.width(),
-                    component_rect.height(),
-                )
-
-        # Final fallback
-        return QRectF(self.start_approach_point.x() - 50, self.start_approach_point.y() - 50, 100, 100)
+            # Start with basic orthogonal routing
+            path_points = self._calculate_basic_orthogonal_path()
+            # Check for component intersections and create detours
+            path_points = self._avoid_component_intersections(path_points)
+            # Move segments shared with other wires onto their lanes
+            path_points = self._compute_and_apply_jogs(path_points)
 
-    def _find_clear_horizontal_level(self) -> float:
-        """Find a clear horizontal level for routing"""
-        # Start with midpoint Y
-        mid_y = (self.start_approach_point.y() + self.end_approach_point.y()) / 2
-
-        # Try different Y levels to find one that doesn't intersect components
-        for offset in range(0, 200, self.grid_size):
-            for y in [mid_y - offset, mid_y + offset]:
-                if self._is_horizontal_level_clear(y):
-                    return y
-
-        # Fallback to midpoint
-        return mid_y
-
-    def _find_clear_vertical_level(self) -> float:
-        """Find a clear vertical level for routing"""
-        # Start with midpoint X
-        mid_x = (self.start_approach_point.x() + self.end_approach_point.x()) / 2
-
-        # Try different X levels to find one that doesn't intersect components
-        for offset in range(0, 200, self.grid_size):
-            for x in [mid_x - offset, mid_x + offset]:
-                if self._is_vertical_level_clear(x):
-                    return x
-
-        # Fallback to midpoint
-        return mid_x
-
-    def _is_horizontal_level_clear(self, y: float) -> bool:
-        """Check if a horizontal line at Y level is clear of components"""
-        if not self.scene:
-            return True
+        # Convert path points to segments
+        self.segments = [self.start_point] + list(path_points) + [self.end_point]
 
-        # Create test line for this Y level
-        test_line = QLineF(
-            min(self.start_approach_point.x(), self.end_approach_point.x()) - self.clearance,
-            y,
-            max(self.start_approach_point.x(), self.end_approach_point.x()) + self.clearance,
-            y,
-        )
+    def routing_request(self) -> Optional[RouteRequest]:
+        """Plain routing inputs for the selected engine, or None for the heuristic"""
+        if self.engine == "heuristic" or self.engine not in getattr(self.scene, "routers", {}):
+            return None
+        owners = tuple(pin.parent_component for pin in (self.start_pin, self.end_pin)
+                       if pin is not None and getattr(pin, "parent_component", None) is not None)
+        return RouteRequest(
+            self.engine,
+            to_point(self.start_approach_point),
+            to_point(self.end_approach_point),
+            getattr(self.start_pin, "edge", None),
+            getattr(self.end_pin, "edge", None),
+            owners)
+
+    def _route_with_engine(self) -> Optional[List[QPointF]]:
+        """Route between the approach points with the selected router, if any"""
+        request = self.routing_request()
+        if request is None:
+            return None
+        # Identical inputs on an unchanged neighbourhood reuse the last route
+        try:
+            points = run_route_request(self.scene.routers[self.engine],
+                                       getattr(self.scene, "route_cache", None), request)
+        except Exception as e:
+            print(f"Routing engine '{self.engine}' failed: {e}")
+            return None
+        if points is None:
+            return None
+        return to_qpoints(points)
 
-        return not self._line_intersects_any_component(test_line)
+    def calculate_fast_path(self) -> bool:
+        """Calculate the path from the route cache or a straight/L route only.
 
-    def _is_vertical_level_clear(self, x: float) -> bool:
-        """Check if a vertical line at X level is clear of components"""
-        if not self.scene:
+        Returns False, leaving the path uncalculated, if the selected router
+        would need a full search. The heuristic is always fast.
+        """
+        request = self.routing_request()
+        if request is None:
+            self._calculate_orthogonal_path()
             return True
+        points = fast_route_request(self.scene.routers[self.engine],
+                                    getattr(self.scene, "route_cache", None), request)
+        if points is None:
+            return False
+        self._release_tracks()
+        self.segments = [self.start_point] + to_qpoints(points) + [self.end_point]
+        return True
 
-        # Create test line for this X level
-        test_line = QLineF(
-            x,
-            min(self.start_approach_point.y(), self.end_approach_point.y()) - self.clearance,
-            x,
-            max(self.start_approach_point.y(), self.end_approach_point.y()) + self.clearance,
-        )
+    def _orthogonal_router(self) -> OrthogonalRouter:
+        """Heuristic routing kernel over the scene's obstacle index"""
+        index = getattr(self.scene, "obstacle_index", None)
+        return OrthogonalRouter(index if index is not None else ObstacleIndex(), self.clearance)
 
-        return not self._line_intersects_any_component(test_line)
+    def _calculate_basic_orthogonal_path(self) -> List[QPointF]:
+        """Calculate basic orthogonal path from start to end based on pin positions"""
+        points = self._orthogonal_router().basic_path(
+            to_point(self.start_approach_point), to_point(self.end_approach_point))
+        return to_qpoints(points)
 
     def _line_intersects_any_component(self, line: QLineF) -> bool:
         """Check if a line intersects any component in the scene"""
         if not self.scene:
             return False
-
-        for item in self.scene.items():
-            if not hasattr(item, "component_id"):
-                continue
-
-            # Get component bounding rectangle
-            item_rect = item.boundingRect()
-            item_rect = item.mapRectToScene(item_rect)
-
-            # Expand rectangle by clearance
-            expanded_rect = item_rect.adjusted(
-                -self.clearance, -self.clearance, self.clearance, self.clearance
-            )
-
-            # Check if line intersects with expanded rectangle
-            if self._line_intersects_rect(line, expanded_rect):
-                return True
-
-        return False
+        return self._orthogonal_router().segment_blocked(*line_points(line))
 
     def _avoid_component_intersections(
         self, path_points: List[QPointF]
@@ -303,483 +198,102 @@ class WirePath:
         """Avoid component intersections by creating detours"""
         if not self.scene:
             return path_points
+        return to_qpoints(self._orthogonal_router().avoid_obstacles(to_points(path_points)))
 
-        # Check each segment for component intersections
-        new_path_points = [path_points[0]]  # Start with first point
-
-        for i in range(len(path_points) - 1):
-            start_point = path_points[i]
-            end_point = path_points[i + 1]
-
-            # Create line segment
-            segment_line = QLineF(start_point, end_point)
-
-            # Check if this segment intersects any components
-            intersecting_components = self._find_intersecting_components(segment_line)
-
-            if intersecting_components:
-                # Create detour around intersecting components (intermediate points only)
-                detour_points = self._create_orthogonal_detour(
-                    start_point, end_point, intersecting_components
-                )
-                for p in detour_points:
-                    if new_path_points[-1] != p:
-                        new_path_points.append(p)
-                if new_path_points[-1] != end_point:
-                    new_path_points.append(end_point)
-            else:
-                # No intersections - add the end point directly
-                if new_path_points[-1] != end_point:
-                    new_path_points.append(end_point)
-
-        return new_path_points
-
-    # ---------------------- Jog calculation and application (merged) ----------------------
-
-    def _preassign_start_track_lane(self, points: List[QPointF]) -> None:
-        """Assign an initial lane offset for the first track so sibling wires
-        from the same start pin are spaced before they diverge.
-
-        We determine the first segment orientation from the first two points,
-        then compute a stable ordering among all wires that originate from the
-        same `start_pin` by sorting their `end_pin` positions along the axis
-        orthogonal to that first segment. The resulting index maps to a lane
-        offset around center.
-        """
-        try:
-            if not self.scene or not self.start_pin or not self.end_pin:
-                return
-            if not points or len(points) < 2:
-                return
-
-            start_p = points[0]
-            first_p = points[1]
-            is_horizontal = abs(first_p.y() - start_p.y()) < 1.0
-            track_key = start_p.y() if is_horizontal else start_p.x()
-
-            # If already has an offset for this track, keep it
-            if is_horizontal and track_key in self._h_jogs_by_y:
-                return
-            if not is_horizontal and track_key in self._v_jogs_by_x:
-                return
-
-            # Collect end pins of all wires starting from the same start pin
-            end_pins: List[ComponentPin] = []
-            for item in self.scene.items():
-                if hasattr(item, 'start_pin') and hasattr(item, 'end_pin'):
-                    if item.start_pin is self.start_pin and getattr(item, 'end_pin', None) is not None:
-                        end_pins.append(item.end_pin)
-
-            if not end_pins:
-                return
-            if self.end_pin not in end_pins:
-                end_pins.append(self.end_pin)
-            if len(end_pins) <= 1:
-                return
-
-            def pin_pos_x(p):
-                try:
-                    return float(p.scenePos().x())
-                except Exception:
-                    return 0.0
-
-            def pin_pos_y(p):
-                try:
-                    return float(p.scenePos().y())
-                except Exception:
-                    return 0.0
-
-            # Sort by orthogonal axis; tie-break by id for stability
-            if is_horizontal:
-                end_pins.sort(key=lambda p: (pin_pos_y(p), id(p)))
-            else:
-                end_pins.sort(key=lambda p: (pin_pos_x(p), id(p)))
+    # ---------------------- Track assignment ----------------------
 
-            try:
-                idx = end_pins.index(self.end_pin)
-            except ValueError:
-                idx = 0
+    @property
+    def source_pin(self):
+        """Pin the connection starts from, before the left-to-right swap"""
+        return self.end_pin if self._swapped else self.start_pin
 
-            center = (len(end_pins) - 1) / 2.0
-            offset = (idx - center) * self._lane_spacing
-
-            if is_horizontal:
-                self._h_jogs_by_y.setdefault(track_key, offset)
-            else:
-                self._v_jogs_by_x.setdefault(track_key, offset)
-        except Exception:
-            # Fail safe if any scene data is unavailable
-            return
+    def track_key(self) -> Optional[frozenset]:
+        """Key of this connection in the scene's track assigner"""
+        if not self.start_pin or not self.end_pin:
+            return None
+        return frozenset((self.start_pin, self.end_pin))
 
     def _compute_and_apply_jogs(self, points: List[QPointF]) -> List[QPointF]:
-        """Detect colinear overlaps with other wires and apply jogs in one function.
+        """Move segments shared with other wires onto their assigned lanes.
 
-        - Scans segments to populate jog offsets maps for shared tracks.
-        - Applies jogs with orthogonal transitions at endpoints.
+        Lanes come from the scene's track assigner, which colours each
+        channel across all wires, so the result does not depend on the order
+        in which wires are routed. Wires whose lanes moved are updated by the
+        scene.
         """
-        if not self.scene or not points or len(points) < 2:
+        assigner = getattr(self.scene, "track_assigner", None)
+        key = self.track_key()
+        if assigner is None or key is None or not points or len(points) < 2:
             return points
 
-        # Reset maps
-        self._h_jogs_by_y.clear()
-        self._v_jogs_by_x.clear()
-        # Pre-space sibling wires from same start pin before divergence
-        self._preassign_start_track_lane(points)
-
-        # Phase 1: collect jog offsets for any overlapping colinear segments
-        for i in range(len(points) - 1):
-            a = points[i]
-            b = points[i + 1]
-            is_horizontal = abs(b.y() - a.y()) < 1.0
-            is_vertical = abs(b.x() - a.x()) < 1.0
-
-            if not (is_horizontal or is_vertical):
-                continue
-
-            # Pre-assign lane on this initial track to ensure spacing even if
-            # there is no existing overlapping wire yet (e.g., detour corridor)
-            if is_horizontal:
-                if a.y() not in self._h_jogs_by_y:
-                    self._h_jogs_by_y[a.y()] = self._compute_lane_offset_for_edge(axis='y')
-            else:
-                if a.x() not in self._v_jogs_by_x:
-                    self._v_jogs_by_x[a.x()] = self._compute_lane_offset_for_edge(axis='x')
-
-            rect = self._segment_bounding_rect_points(a, b, 1.0)
-            if rect is None:
-                continue
-
-            candidates = self.scene.items(rect)
-            for item in candidates:
-                if not hasattr(item, 'wire_path') or not getattr(item, 'wire_path'):
-                    continue
-                # Skip if same connection
-                if hasattr(item, 'start_pin') and hasattr(item, 'end_pin'):
-                    if item.start_pin is self.start_pin and item.end_pin is self.end_pin:
-                        continue
-                other_segments = item.wire_path.get_segments() if hasattr(item.wire_path, 'get_segments') else []
-                for (o_s, o_e) in other_segments:
-                    if self._segments_colinear_and_overlapping_points(a, b, o_s, o_e, 1.0):
-                        if is_horizontal:
-                            y = a.y()
-                            if y not in self._h_jogs_by_y:
-                                self._h_jogs_by_y[y] = self._compute_lane_offset_for_edge(axis='y')
-                        else:
-                            x = a.x()
-                            if x not in self._v_jogs_by_x:
-                                self._v_jogs_by_x[x] = self._compute_lane_offset_for_edge(axis='x')
-                        break
-
-        # Phase 2: apply jogs with endpoint transitions
-        start_edge = getattr(self.start_pin, 'edge', 'left') or 'left'
-        end_edge = getattr(self.end_pin, 'edge', 'right') or 'right'
-
-        start_p = points[0]
-        end_p = points[-1]
-
-        dx_start = self._v_jogs_by_x.get(start_p.x(), 0.0)
-        dy_start = self._h_jogs_by_y.get(start_p.y(), 0.0)
-        dx_end = self._v_jogs_by_x.get(end_p.x(), 0.0)
-        dy_end = self._h_jogs_by_y.get(end_p.y(), 0.0)
-
-        adjusted: List[QPointF] = []
-        adjusted.append(start_p)
-
-        if dx_start != 0.0 or dy_start != 0.0:
-            if start_edge in ('left', 'right'):
-                if dx_start != 0.0:
-                    adjusted.append(QPointF(start_p.x() + dx_start, start_p.y()))
-                if dy_start != 0.0:
-                    adjusted.append(QPointF(start_p.x() + dx_start, start_p.y() + dy_start))
-            else:
-                if dy_start != 0.0:
-                    adjusted.append(QPointF(start_p.x(), start_p.y() + dy_start))
-                if dx_start != 0.0:
-                    adjusted.append(QPointF(start_p.x() + dx_start, start_p.y() + dy_start))
-
-        for i in range(1, len(points) - 1):
-            p = points[i]
-            dx = self._v_jogs_by_x.get(p.x(), 0.0)
-            dy = self._h_jogs_by_y.get(p.y(), 0.0)
-            adjusted.append(QPointF(p.x() + dx, p.y() + dy))
-
-        if dx_end != 0.0 or dy_end != 0.0:
-            if end_edge in ('left', 'right'):
-                if dy_end != 0.0:
-                    adjusted.append(QPointF(end_p.x() + dx_end, end_p.y() + dy_end))
-                if dx_end != 0.0:
-                    adjusted.append(QPointF(end_p.x() + dx_end, end_p.y()))
-            else:
-                if dx_end != 0.0:
-                    adjusted.append(QPointF(end_p.x() + dx_end, end_p.y() + dy_end))
-                if dy_end != 0.0:
-                    adjusted.append(QPointF(end_p.x(), end_p.y() + dy_end))
-
-        adjusted.append(end_p)
-        return adjusted
-    
-    def _compute_lane_offset_for_edge(self, axis: str) -> float:
-        """Compute a stable lane offset based on pin order on the respective edges.
-
-        axis='y' is for horizontal segments (shift in Y). axis='x' for vertical segments (shift in X).
-        """
-        # Determine pin ordering on start/end edges to map to a lane index
-        def lane_index(pin) -> float:
-            try:
-                component = getattr(pin, 'parent_component', None)
-                if not component or not hasattr(component, 'pins'):
-                    return 0.0
-                same = [p for p in component.pins if getattr(p, 'edge', None) == getattr(pin, 'edge', None)]
-                if not same:
-                    return 0.0
-                if pin.edge in ('left', 'right'):
-                    same.sort(key=lambda p: p.scenePos().y())
-                else:
-                    same.sort(key=lambda p: p.scenePos().x())
-                idx = same.index(pin)
-                center = (len(same) - 1) / 2.0
-                return idx - center
-            except Exception:
-                return 0.0
-
-        idx_start = lane_index(self.start_pin)
-        idx_end = lane_index(self.end_pin)
-        lane = idx_start if abs(idx_start) >= abs(idx_end) else idx_end
-        offset = lane * self._lane_spacing
-        # For axis direction, simply return signed offset
-        return offset
-
-    def _segment_bounding_rect_points(self, p1: QPointF, p2: QPointF, tol: float) -> Optional[QRectF]:
-        """Create a thin rectangle around a segment (defined by two points) for spatial querying."""
-        x1, y1 = p1.x(), p1.y()
-        x2, y2 = p2.x(), p2.y()
-        if abs(y1 - y2) < 1e-6:
-            left = min(x1, x2)
-            right = max(x1, x2)
-            top = min(y1, y2) - tol
-            bottom = max(y1, y2) + tol
-            return QRectF(left, top, max(1.0, right - left), max(1.0, bottom - top))
-        if abs(x1 - x2) < 1e-6:
-            left = min(x1, x2) - tol
-            right = max(x1, x2) + tol
-            top = min(y1, y2)
-            bottom = max(y1, y2)
-            return QRectF(left, top, max(1.0, right - left), max(1.0, bottom - top))
-        left = min(x1, x2) - tol
-        right = max(x1, x2) + tol
-        top = min(y1, y2) - tol
-        bottom = max(y1, y2) + tol
-        return QRectF(left, top, max(1.0, right - left), max(1.0, bottom - top))
-
-    def _segments_overlap_1d_vals(self, a1: float, a2: float, b1: float, b2: float, tol: float = 1.0) -> Optional[Tuple[float, float]]:
-        """Return 1D overlap interval [max(mins), min(maxs)] if any, else None."""
-        min_a, max_a = (a1, a2) if a1 <= a2 else (a2, a1)
-        min_b, max_b = (b1, b2) if b1 <= b2 else (b2, b1)
-        start = max(min_a, min_b)
-        end = min(max_a, max_b)
-        if end + tol >= start:
-            return (start, end)
-        return None
-
-    def _segments_colinear_and_overlapping_points(self, a1: QPointF, a2: QPointF, b1: QPointF, b2: QPointF, tol: float = 1.0) -> Optional[Tuple[QPointF, QPointF]]:
-        """If two axis-aligned segments are colinear and overlapping, return the overlap segment endpoints."""
-        # Horizontal?
-        if abs(a1.y() - a2.y()) < tol and abs(b1.y() - b2.y()) < tol and abs(a1.y() - b1.y()) < tol and abs(a2.y() - b2.y()) < tol:
-            ov = self._segments_overlap_1d_vals(a1.x(), a2.x(), b1.x(), b2.x(), tol)
-            if ov:
-                y = (a1.y() + a2.y()) / 2.0
-                return (QPointF(ov[0], y), QPointF(ov[1], y))
-        # Vertical?
-        if abs(a1.x() - a2.x()) < tol and abs(b1.x() - b2.x()) < tol and abs(a1.x() - b1.x()) < tol and abs(a2.x() - b2.x()) < tol:
-            ov = self._segments_overlap_1d_vals(a1.y(), a2.y(), b1.y(), b2.y(), tol)
-            if ov:
-                x = (a1.x() + a2.x()) / 2.0
-                return (QPointF(x, ov[0]), QPointF(x, ov[1]))
-        return None
+        # Wires driven by the same source pin share their lanes
+        changed = assigner.update_wire(key, to_points(points), getattr(self.start_pin, 'edge', None),
+                                       getattr(self.end_pin, 'edge', None), self.source_pin)
+        if changed:
+            self.scene.schedule_track_updates(changed)
+        return to_qpoints(assigner.jogged_points(key))
+
+    def _release_tracks(self):
+        """Drop this connection's lanes when it is routed without them"""
+        assigner = getattr(self.scene, "track_assigner", None)
+        key = self.track_key()
+        if assigner is None or key is None or key not in assigner:
+            return
+        changed = assigner.remove_wire(key)
+        if changed:
+            self.scene.schedule_track_updates(changed)
 
     def _find_intersecting_components(self, line: QLineF) -> List[QGraphicsItem]:
-        """Find components that intersect the given line"""
-        intersecting_components = []
-
+        """Find components that intersect the given line, in travel order"""
         if not self.scene:
-            return intersecting_components
-
-        for item in self.scene.items():
-            if not hasattr(item, "component_id"):
-                continue
-
-            # Get component bounding rectangle
-            item_rect = item.boundingRect()
-            item_rect = item.mapRectToScene(item_rect)
-
-            # Expand rectangle by clearance
-            expanded_rect = item_rect.adjusted(
-                -self.clearance, -self.clearance, self.clearance, self.clearance
-            )
-
-            # Check if line intersects with expanded rectangle
-            if self._line_intersects_rect(line, expanded_rect):
-                intersecting_components.append(item)
-
-        if line.p1().y() == line.p2().y():
-            intersecting_components.sort(key=lambda c: c.pos().x())
-        else:
-            intersecting_components.sort(key=lambda c: c.pos().y())
-            if line.p1().y() > line.p2().y():
-                intersecting_components.reverse()
-
-        return intersecting_components
-
-    def _create_orthogonal_detour(
-        self, start_point: QPointF, end_point: QPointF, components: List[QGraphicsItem]
-    ) -> List[QPointF]:
-        """Create orthogonal detour around components"""
-        if not components:
             return []
-
-        detour_points = []
-        for component in components:
-            rect = component.boundingRect()
-            component_rect = QRectF(
-                component.pos().x() + rect.x(),
-                component.pos().y() + rect.y(),
-                rect.width(),
-                rect.height()
-            )
-
-            intersection_point, line, edge = self._line_intersects_rect(QLineF(start_point, end_point), component_rect)
-            if intersection_point:
-                detour_points += self._get_detour_points(start_point, end_point, component_rect, intersection_point, line)
-                start_point = detour_points[-1]
-
-        # Return only intermediate detour points; caller handles start/end
-        return detour_points
-
-    def _get_detour_points(self,
-                         start_point: QPointF,
-                            end_point: QPointF, component_rect: QRectF, intersection_point: QPointF, line: QLineF) -> List[QPointF]:
-        """Get detour points around components"""
-        if end_point.x() - start_point.x() == 0:
-            return self._create_vertical_detour(start_point, end_point, component_rect, intersection_point, line)
-        else:
-            return self._create_horizontal_detour(start_point, end_point, component_rect, intersection_point, line)
-
-    def _create_vertical_detour(
-        self, start_point: QPointF, end_point: QPointF, component_rect: QRectF, intersection_point: QPointF, line: QLineF
-    ) -> List[QPointF]:
-        """Create vertical detour around components"""
-        # if line if going from top to bottom, should consider top edge of component
-        # if line if going from bottom to top, should consider bottom edge of component
-        left_distance = abs(component_rect.left() -  intersection_point.x())
-        right_distance = abs(component_rect.right() - intersection_point.x())
-        if start_point.y() < end_point.y():
-            p1 = QPointF(intersection_point.x(), component_rect.top() - self.clearance)
-            if left_distance <= right_distance:
-                p2 = QPointF(component_rect.left() - self.clearance, p1.y())
-            else:
-                p2 = QPointF(component_rect.right() + self.clearance, p1.y())
-            p3 = QPointF(p2.x(), component_rect.bottom() + self.clearance)
-            p4 = QPointF(p1.x(), p3.y())
-            return [p1, p2, p3, p4]
-        else:
-            p1 = QPointF(intersection_point.x(), component_rect.bottom() + self.clearance)
-            if left_distance < right_distance:
-                p2 = QPointF(component_rect.left() - self.clearance, p1.y())
-            else:
-                p2 = QPointF(component_rect.right() + self.clearance, p1.y())
-            p3 = QPointF(p2.x(), component_rect.top() - self.clearance)
-            p4 = QPointF(p1.x(), p3.y())
-            return [p1, p2, p3, p4]
-
-    def _create_horizontal_detour(
-        self, start_point: QPointF, end_point: QPointF, component_rect: QRectF, intersection_point: QPointF, line: QLineF
-    ) -> List[QPointF]:
-        """Create horizontal detour around components"""
-        # if line if going from left to right, should consider left edge of component
-        # if line if going from right to left, should consider right edge of component
-        top_distance = abs(component_rect.top() - intersection_point.y())
-        bottom_distance = abs(component_rect.bottom() - intersection_point.y())
-        if start_point.x() < end_point.x():
-            p1 = QPointF(component_rect.left() - self.clearance, intersection_point.y())
-            if top_distance < bottom_distance:
-                p2 = QPointF(p1.x(), component_rect.top() - self.clearance)
-            else:
-                p2 = QPointF(p1.x(), component_rect.bottom() + self.clearance)
-            p3 = QPointF(component_rect.right() + self.clearance, p2.y())
-            p4 = QPointF(p3.x(), p1.y())
-            return [p1, p2, p3, p4]
-        else:
-            p1 = QPointF(component_rect.right() + self.clearance, intersection_point.y())
-            if top_distance < bottom_distance:
-                p2 = QPointF(p1.x(), component_rect.top() - self.clearance)
-            else:
-                p2 = QPointF(p1.x(), component_rect.bottom() + self.clearance)
-            p3 = QPointF(component_rect.left() - self.clearance, p2.y())
-            p4 = QPointF(p3.x(), p1.y())
-            return [p1, p2, p3, p4]
-
-    def _find_clear_detour_y(
-        self, start_point: QPointF, end_point: QPointF, detour_x: float
-    ) -> float:
-        """Find a clear Y coordinate for vertical detour"""
-        # Start with midpoint Y
-        mid_y = (start_point.y() + end_point.y()) / 2
-
-        # Try different Y levels to find one that doesn't intersect components
-        for offset in range(0, 100, self.grid_size):
-            for y in [mid_y - offset, mid_y + offset]:
-                test_line = QLineF(detour_x, start_point.y(), detour_x, y)
-                if not self._line_intersects_any_component(test_line):
-                    return y
-
-        return mid_y
-
-    def _find_clear_detour_x(
-        self, start_point: QPointF, end_point: QPointF, detour_y: float
-    ) -> float:
-        """Find a clear X coordinate for horizontal detour"""
-        # Start with midpoint X
-        mid_x = (start_point.x() + end_point.x()) / 2
-
-        # Try different X levels to find one that doesn't intersect components
-        for offset in range(0, 100, self.grid_size):
-            for x in [mid_x - offset, mid_x + offset]:
-                test_line = QLineF(start_point.x(), detour_y, x, detour_y)
-                if not self._line_intersects_any_component(test_line):
-                    return x
-
-        return mid_x
-
-    def _line_intersects_rect(self, line: QLineF, rect: QRectF) -> Optional[Tuple[QPointF, QLineF, str]]:
-        """Check if a line intersects with a rectangle"""
-        # Check if line endpoints are inside rect
-        # if rect.contains(line.p1()) or rect.contains(line.p2()):
-        #     return line.p1() if rect.contains(line.p1()) else line.p2()
-
-        # Check if line intersects any of the rectangle's edges
-        top_line = QLineF(rect.topLeft(), rect.topRight())
-        right_line = QLineF(rect.topRight(), rect.bottomRight())
-        bottom_line = QLineF(rect.bottomRight(), rect.bottomLeft())
-        left_line = QLineF(rect.bottomLeft(), rect.topLeft())
-
-        intersections = line.intersects(top_line)
-        if intersections[0] == QLineF.BoundedIntersection:
-            return intersections[1], top_line, 'top'
-        intersections = line.intersects(right_line)
-        if intersections[0] == QLineF.BoundedIntersection:
-            return intersections[1], right_line, 'right'
-        intersections = line.intersects(bottom_line)
-        if intersections[0] == QLineF.BoundedIntersection:
-            return intersections[1], bottom_line, 'bottom'
-        intersections = line.intersects(left_line)
-        if intersections[0] == QLineF.BoundedIntersection:
-            return intersections[1], left_line, 'left'
-        return None, None, None
+        return self._orthogonal_router().obstacles_crossed(*line_points(line))
+
+    @property
+    def segments(self) -> List[QPointF]:
+        """Corner points of the wire; assign a new list to change them"""
+        return self._segments
+
+    @segments.setter
+    def segments(self, points: List[QPointF]):
+        self._segments = points
+        self._painter_path = None
+        self._segment_pairs = None
+        # A new route is drawn whole until its net's tree is rebuilt
+        self._branch = None
+        self.junction = None
+
+    def set_branch(self, branch: Optional[List[QPointF]], junction: Optional[QPointF] = None):
+        """Draw only ``branch`` of the route (None: all of it), joining its net at ``junction``"""
+        self._branch = branch
+        self.junction = junction
+        self._painter_path = None
+
+    @property
+    def branch(self) -> Optional[List[QPointF]]:
+        return self._branch
+
+    def drawn_points(self) -> List[QPointF]:
+        """Corner points of the drawn part of the wire"""
+        return self.segments if self._branch is None else self._branch
 
     def get_path(self) -> QPainterPath:
-        """Get the complete wire path as a QPainterPath"""
+        """Get the complete wire path as a QPainterPath, built once per segment list"""
+        if self._painter_path is None:
+            self._painter_path = self._build_path()
+        return QPainterPath(self._painter_path)  # implicitly shared copy
+
+    def _build_path(self) -> QPainterPath:
         path = QPainterPath()
 
+        if self._branch is not None:
+            # Part of a net tree; the direction of the branch does not matter
+            if self._branch:
+                path.moveTo(self._branch[0])
+                for point in self._branch[1:]:
+                    path.lineTo(point)
+            return path
+
         if not self.segments:
             return path
 
@@ -798,6 +312,15 @@ class WirePath:
 
         return path
 
+    def apply_route(self, points: List[QPointF]):
+        """Use externally routed corner points between the approach points"""
+        self._release_tracks()
+        self.segments = [self.start_point] + list(points) + [self.end_point]
+
+    def apply_tracks(self, points: List[QPointF]):
+        """Register unshifted corner points with the track assigner and use their lanes"""
+        self.segments = [self.start_point] + list(self._compute_and_apply_jogs(points)) + [self.end_point]
+
     def add_intersection_bump(self, intersection_point: QPointF, direction: str):
         """Add a bump at wire intersection point - DISABLED for new approach"""
         # Bump logic disabled - new approach focuses on clean detours
@@ -808,21 +331,18 @@ class WirePath:
         self.intersection_bumps.clear()
 
     def get_segments(self) -> List[Tuple[QPointF, QPointF]]:
-        """Get the wire segments as pairs of points"""
-        if not self.segments or len(self.segments) < 2:
-            return []
-
-        segments = []
-        for i in range(len(self.segments) - 1):
-            segments.append((self.segments[i], self.segments[i + 1]))
-        return segments
+        """Get the wire segments as pairs of points (cached; do not modify)"""
+        if self._segment_pairs is None:
+            points = self.segments
+            self._segment_pairs = list(zip(points, points[1:]))
+        return self._segment_pairs
 
     def update_endpoints(self, start_point: QPointF, end_point: QPointF):
         """Update start and end points and recalculate path"""
         self.start_point = start_point
         self.end_point = end_point
         self.get_start_and_end_approach_points()
-        self.segments.clear()
+        self.segments = []
         self.intersection_bumps.clear()
         self._calculate_orthogonal_path()
 
@@ -830,6 +350,8 @@ class WirePath:
 class Wire(QGraphicsPathItem):
     """Enhanced wire connection between component pins with advanced routing"""
 
+    JUNCTION_RADIUS = 3.0  # dot where a fan-out branch joins its net
+
     def __init__(
         self,
         start_pin: ComponentPin,
@@ -842,6 +364,13 @@ class Wire(QGraphicsPathItem):
         self.scene = scene
         self.is_temporary = end_pin is None
 
+        # Displayed path and its geometry, cached until the next setPath
+        self._painter_path = QPainterPath()
+        self._coarse_path = None
+        self._junction = None
+        self._bounds = QRectF()
+        self._shape = None
+
         # Wire properties
         self.wire_width = 2
         self.wire_color = QColor(0, 0, 0)  # Black
@@ -868,6 +397,9 @@ class Wire(QGraphicsPathItem):
         # Initialize wire path asynchronously to avoid main thread blocking
         self.wire_path = None
         self._calculation_in_progress = False
+        # Bumped when a path is applied directly; stale async results are dropped
+        self._route_generation = 0
+        self._async_generation = 0
 
         # Start async calculation if both pins are available
         if self.start_pin and self.end_pin:
@@ -877,19 +409,17 @@ class Wire(QGraphicsPathItem):
         """Start asynchronous wire path calculation using scene thread manager
 
         Uses "latest data wins" approach:
-        - No mutex locks for maximum responsiveness
-        - Old calculations are discarded when new ones start
-        - Component positions read at calculation time (latest data)
+        - Pin positions are captured now, on the GUI thread
+        - A new request supersedes the wire's queued or running one, whose
+          result is discarded by the thread manager
         """
         if not self.scene or not hasattr(self.scene, "wire_thread_manager"):
             # Fallback to synchronous calculation if no thread manager
             self._calculate_path_sync()
             return
 
-        if self._calculation_in_progress:
-            return  # Already calculating
-
         self._calculation_in_progress = True
+        self._async_generation = self._route_generation
 
         # Generate unique wire ID
         wire_id = f"wire_{id(self)}"
@@ -906,11 +436,13 @@ class Wire(QGraphicsPathItem):
     def _on_calculation_complete(self, wire_id: str, wire_path):
         """Handle completed wire path calculation"""
         self._calculation_in_progress = False
+        if self._async_generation != self._route_generation:
+            return  # superseded by apply_wire_path
 
         if wire_path:
             self.wire_path = wire_path
-            # Update graphics
-            self.setPath(wire_path.get_path())
+            # Update graphics and the scene's crossings
+            self._show_wire_path()
             self.setPen(QPen(self.wire_color, self.wire_width))
             print(f"✅ Wire path calculated and updated for {wire_id}")
         else:
@@ -926,13 +458,39 @@ class Wire(QGraphicsPathItem):
             self.wire_path = WirePath(
                 start_pos, end_pos, self.start_pin, self.end_pin, self.scene
             )
-            self.setPath(self.wire_path.get_path())
+            self._show_wire_path()
             self.setPen(QPen(self.wire_color, self.wire_width))
         except Exception as e:
             import traceback
             print(f"Error in sync wire calculation: {e}")
             print(traceback.format_exc())
 
+    def apply_wire_path(self, wire_path: WirePath):
+        """Adopt a precomputed path (e.g. from batch routing), superseding async results"""
+        self._route_generation += 1
+        self._calculation_in_progress = False
+        self.wire_path = wire_path
+        if self.start_pin and self.end_pin:
+            self._last_start_pos = self.start_pin.get_connection_point()
+            self._last_end_pos = self.end_pin.get_connection_point()
+        self._show_wire_path()
+        self.setPen(QPen(self.wire_color, self.wire_width))
+
+    def _show_wire_path(self):
+        """Display the current wire path, redraw its net's tree and re-index crossings"""
+        update_net = getattr(self.scene, "update_wire_net", None)
+        others = update_net(self) if update_net is not None else ()
+        self.draw_wire_path()
+        for wire in others:
+            wire.draw_wire_path()
+
+    def draw_wire_path(self):
+        """Display the current wire path as it is and re-index its crossings"""
+        self.setPath(self.wire_path.get_path())
+        update_crossings = getattr(self.scene, "update_wire_crossings", None)
+        if update_crossings is not None:
+            update_crossings(self)
+
     def update_path(self, temp_end_pos: Optional[QPointF] = None):
         """Update wire path position and routing"""
         start_pos = self.start_pin.get_connection_point()
@@ -965,9 +523,8 @@ class Wire(QGraphicsPathItem):
         self._last_start_pos = start_pos
         self._last_end_pos = end_pos
 
-        # Use async calculation for permanent wires
-        if not self._calculation_in_progress:
-            self._start_async_calculation()
+        # Use async calculation for permanent wires (supersedes one in flight)
+        self._start_async_calculation()
 
     def _calculate_optimal_path(self, start_pos: QPointF, end_pos: QPointF):
         """Calculate optimal wire path avoiding components and other wires"""
@@ -992,25 +549,8 @@ class Wire(QGraphicsPathItem):
         if not self.scene:
             return
 
-        # Get all components in the scene - look for multiple identifiers
-        components = []
-        for item in self.scene.items():
-            # Check if this is a component (not a wire, not a pin)
-            is_component = (
-                hasattr(item, "component_type")  # ComponentWithPins
-                or hasattr(item, "name")
-                and hasattr(item, "rect")  # Graphics items with name and rect
-                or (
-                    hasattr(item, "boundingRect") and not hasattr(item, "is_temporary")
-                )  # Items with bounding rect but not temporary
-            )
-
-            # Make sure it's not the current wire's parent component
-            if is_component and item != self.start_pin.parent_component:
-                components.append(item)
-
-        # Only run collision detection if there are components to avoid
-        if not components:
+        index = getattr(self.scene, "obstacle_index", None)
+        if index is None or len(index) == 0:
             return
 
         # Check each segment for collisions
@@ -1020,7 +560,13 @@ class Wire(QGraphicsPathItem):
 
         new_segments: List[Tuple[QPointF, QPointF]] = []
         for segment_start, segment_end in segments:
-            if self._segment_collides_with_components(
+            # Only components around this segment, never the wire's own start component
+            components = [
+                item for item in index.query_rect(
+                    (segment_start.x(), segment_start.y(), segment_end.x(), segment_end.y()))
+                if item is not self.start_pin.parent_component
+            ]
+            if components and self._segment_collides_with_components(
                 segment_start, segment_end, components
             ):
                 # Reroute this segment to avoid collision
@@ -1050,33 +596,17 @@ class Wire(QGraphicsPathItem):
         self, start: QPointF, end: QPointF, components: list
     ) -> bool:
         """Check if a line segment collides with any component"""
-        for component in components:
-            if hasattr(component, "boundingRect"):
-                rect = component.boundingRect()
-                component_rect = QRectF(
-                    component.pos().x() + rect.x(),
-                    component.pos().y() + rect.y(),
-                    rect.width(),
-                    rect.height(),
-                )
-
-                # Check if line segment intersects with component rectangle
-                if self._line_intersects_rect(start, end, component_rect):
-                    return True
-            elif hasattr(component, "rect"):
-                # Handle QGraphicsRectItem components
-                rect = component.rect()
-                component_rect = QRectF(
-                    component.pos().x() + rect.x(),
-                    component.pos().y() + rect.y(),
-                    rect.width(),
-                    rect.height(),
-                )
-
-                if self._line_intersects_rect(start, end, component_rect):
-                    return True
-
-        return False
+        return any(self._line_intersects_rect(start, end, self._component_rect(component))
+                   for component in components)
+
+    @staticmethod
+    def _component_rect(component, margin: float = 0.0) -> QRectF:
+        """Scene rect of a component grown by ``margin``, from its cached routing geometry"""
+        inflated_rect = getattr(component, "inflated_rect", None)
+        if inflated_rect is not None:
+            return to_qrect(inflated_rect(margin))
+        rect = component.mapRectToScene(component.boundingRect())
+        return rect.adjusted(-margin, -margin, margin, margin)
 
     def _line_intersects_rect(self, start: QPointF, end: QPointF, rect: QRectF) -> bool:
         """Check if a line segment intersects with a rectangle"""
@@ -1095,39 +625,22 @@ class Wire(QGraphicsPathItem):
     ) -> List[Tuple[QPointF, QPointF]]:
         """Reroute a segment to avoid components by adding perpendicular detours"""
         # Find the component that's blocking this segment
-        blocking_component = None
-        for component in components:
-            if hasattr(component, "boundingRect"):
-                rect = component.boundingRect()
-                component_rect = QRectF(
-                    component.pos().x() + rect.x(),
-                    component.pos().y() + rect.y(),
-                    rect.width(),
-                    rect.height(),
-                )
-
-                if self._line_intersects_rect(start, end, component_rect):
-                    blocking_component = component
-                    break
+        blocking_component = next(
+            (component for component in components
+             if self._line_intersects_rect(start, end, self._component_rect(component))), None)
 
         if not blocking_component:
             return [(start, end)]
 
-        # Calculate detour points around the component
-        rect = blocking_component.boundingRect()
-        component_rect = QRectF(
-            blocking_component.pos().x() + rect.x(),
-            blocking_component.pos().y() + rect.y(),
-            rect.width(),
-            rect.height(),
-        )
+        # Detours run 20px clear of the component
+        component_rect = self._component_rect(blocking_component, 20)
 
         # Determine if this is a horizontal or vertical segment
         is_horizontal = abs(end.y() - start.y()) < 1
 
         if is_horizontal:
             # Horizontal segment - add vertical detour
-            detour_y = component_rect.bottom() + 20  # 20px below component
+            detour_y = component_rect.bottom()  # 20px below component
 
             # Create three segments: start to detour, detour across, detour to end
             segments = [
@@ -1137,7 +650,7 @@ class Wire(QGraphicsPathItem):
             ]
         else:
             # Vertical segment - add horizontal detour
-            detour_x = component_rect.right() + 20  # 20px to the right of component
+            detour_x = component_rect.right()  # 20px to the right of component
 
             # Create three segments: start to detour, detour across, detour to end
             segments = [
@@ -1149,38 +662,24 @@ class Wire(QGraphicsPathItem):
         return segments
 
     def _handle_wire_intersections(self):
-        """Handle intersections with other wires by adding bumps"""
-        if not self.scene:
-            return
-
-        # Get all other wires in the scene
-        other_wires = []
-        for item in self.scene.items():
-            # Check if this is a wire (not a component, not a pin)
-            is_wire = (
-                isinstance(item, Wire)  # Enhanced wire
-                or hasattr(item, "is_temporary")  # Any item with is_temporary flag
-                or hasattr(item, "start_pin")
-                and hasattr(item, "end_pin")  # Items with pins
-            )
+        """Handle intersections with other wires by adding bumps.
 
-            if is_wire and item != self:
-                other_wires.append(item)
-
-        # Only process intersections if there are other wires
-        if not other_wires:
+        Crossings come from the scene's crossing index, which is updated for
+        this wire only; the wire with the smaller angle to the horizontal
+        takes the bump.
+        """
+        if not self.scene or not self.wire_path:
+            return
+        index = getattr(self.scene, "crossing_index", None)
+        if index is None:
             return
 
-        # Process intersections with other wires
-        for other_wire in other_wires:
-            # Check if the other wire has a path to analyze
-            if hasattr(other_wire, "wire_path") and other_wire.wire_path:
-                intersection_data = self._find_wire_intersections_with_angles(
-                    other_wire
-                )
-                if intersection_data:
-                    for point, direction in intersection_data:
-                        self.wire_path.add_intersection_bump(point, direction)
+        self.scene.update_wire_crossings(self)
+        this_wire_angle = abs(self._calculate_wire_angle())
+        for point, other_wire, direction in index.crossings_of(self):
+            if this_wire_angle <= abs(self._calculate_wire_angle_for_wire(other_wire)):
+                self.wire_path.add_intersection_bump(
+                    to_qpoint(point), "horizontal" if direction == "horizontal" else "vertical")
 
     def _find_wire_intersections_with_angles(
         self, other_wire
@@ -1363,7 +862,32 @@ class Wire(QGraphicsPathItem):
 
         # Update graphics immediately
         if self.wire_path:
-            self.setPath(self.wire_path.get_path())
+            self._show_wire_path()
+
+    def update_wire_position_fast(self) -> bool:
+        """Reroute during dragging only if no full search is needed.
+
+        Returns False, keeping the current path, if the wire needs a full
+        search or belongs to a fan-out net, which is routed as a unit.
+        """
+        if not self.start_pin or not self.end_pin:
+            return True
+        wire_net = getattr(self.scene, "wire_net", None)
+        if wire_net is not None and len(wire_net(self.start_pin)) > 1:
+            return False
+        wire_path = WirePath(
+            self.start_pin.get_connection_point(),
+            self.end_pin.get_connection_point(),
+            self.start_pin,
+            self.end_pin,
+            self.scene,
+            calculate_now=False,
+        )
+        if not wire_path.calculate_fast_path():
+            return False
+        self.wire_path = wire_path
+        self._show_wire_path()
+        return True
 
     def update_wire_position_lightweight(self):
         """Lightweight update that only recalculates wire positions without full routing"""
@@ -1386,9 +910,8 @@ class Wire(QGraphicsPathItem):
         self._last_start_pos = start_pos
         self._last_end_pos = end_pos
 
-        # Use async calculation for lightweight updates
-        if not self._calculation_in_progress:
-            self._start_async_calculation()
+        # Use async calculation for lightweight updates (supersedes one in flight)
+        self._start_async_calculation()
 
     def update_wire_position_final(self):
         """Update wire after dragging is complete with full orthogonal routing"""
@@ -1411,7 +934,7 @@ class Wire(QGraphicsPathItem):
 
         # Update graphics with final path
         if self.wire_path:
-            self.setPath(self.wire_path.get_path())
+            self._show_wire_path()
 
     def force_intersection_recalculation(self):
         """Force recalculation of intersections and bumps"""
@@ -1455,41 +978,62 @@ class Wire(QGraphicsPathItem):
 
         return super().itemChange(change, value)
 
+    def setPath(self, path: QPainterPath):
+        """Display a new path, dropping the cached shape and bounds"""
+        # Qt reads the old bounds here, so the scene index and repaint cover the old area
+        self.prepareGeometryChange()
+        self._painter_path = path
+        self._coarse_path = None
+        self._junction = self.wire_path.junction if self.wire_path is not None else None
+        self._bounds = path.boundingRect()
+        if self._junction is not None:
+            self._bounds = self._bounds.united(self._junction_rect())
+        self._shape = None
+        QGraphicsPathItem.setPath(self, path)
+
+    def _junction_rect(self) -> QRectF:
+        r = self.JUNCTION_RADIUS
+        return QRectF(self._junction.x() - r, self._junction.y() - r, 2 * r, 2 * r)
+
     def shape(self):
         """Override shape to make selection more precise - only select when clicking on the actual line"""
-        if not self.wire_path:
+        if self._painter_path.isEmpty():
             return super().shape()
 
-        # Create a precise shape that follows the wire path
-        path = self.wire_path.get_path()
-        if path.isEmpty():
-            return super().shape()
-
-        # Create a stroked path with a small tolerance for easier clicking
-        stroker = QPainterPathStroker()
-        stroker.setWidth(max(4, self.wire_width + 2))  # Small tolerance around the line
-        return stroker.createStroke(path)
+        if self._shape is None:
+            # Stroked path with a small tolerance for easier clicking, built once per path
+            stroker = QPainterPathStroker()
+            stroker.setWidth(max(4, self.wire_width + 2))
+            self._shape = stroker.createStroke(self._painter_path)
+            if self._junction is not None:
+                self._shape.addEllipse(self._junction_rect())
+        return self._shape
 
     def boundingRect(self):
         """Override boundingRect to return a minimal rectangle that covers only the wire path"""
-        if not self.wire_path:
+        if self._painter_path.isEmpty():
             return super().boundingRect()
 
-        # Get the wire path
-        path = self.wire_path.get_path()
-        if path.isEmpty():
-            return super().boundingRect()
-
-        # Return the bounding rectangle of the actual path
-        # This eliminates the default bounding rect display
-        return path.boundingRect()
+        # Bounding rectangle of the actual path, without the default pen margin
+        return self._bounds
 
     def paint(self, painter, option, widget):
         """Override paint to ensure no selection rectangle is drawn"""
         # Don't draw selection rectangle or bounding rect
         # Just draw the wire path itself
-        if self.wire_path:
-            path = self.wire_path.get_path()
-            if not path.isEmpty():
-                painter.setPen(self.pen())
-                painter.drawPath(path)
+        if self._painter_path.isEmpty():
+            return
+        if level_of_detail(painter) < OVERVIEW_DETAIL:
+            # Zoomed out: short jogs dropped, one pixel wide, no junction dot
+            if self._coarse_path is None:
+                self._coarse_path = coarse_path(self._painter_path)
+            painter.setPen(QPen(self.pen().color(), 0))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPath(self._coarse_path)
+            return
+        painter.setPen(self.pen())
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self._painter_path)
+        if self._junction is not None:
+            painter.setBrush(self.pen().color())
+            painter.drawEllipse(self._junction_rect())
@@ -0,0 +1,221 @@
+"""
+Crossing Overlay Module
+
+A single scene item drawing the markers of all wire crossings, so wires stay
+plain polylines and crossing markers cost nothing per wire.
+
+Crossings come from the scene's ``CrossingIndex`` as ``(point, over,
+under)``: ``over`` is the wire hopping over ``under`` at the point. They are
+bucketed into square tiles. Each tile caches its marker paths; an edit hands
+over only the crossings it removed and added, which rebuilds and repaints
+just the tiles they touch, and ``paint()`` draws only the tiles intersecting
+the exposed rect. Markers are stroked with the pens of their wires and
+masked with the scene background.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QBrush, QColor, QPainterPath, QPen
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.level_of_detail import OVERVIEW_DETAIL
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point
+
+Tile = Tuple[int, int]
+Crossing = Tuple[Point, Hashable, Hashable]  # point, over, under
+# Per tile: over wire -> (mask, marker) paths, under wire -> redrawn wire path
+TilePaths = Tuple[Dict[Hashable, Tuple[QPainterPath, QPainterPath]], Dict[Hashable, QPainterPath]]
+
+
+def _same_crossing(a: Crossing, b: Crossing) -> bool:
+    return a[0] == b[0] and ((a[1] is b[1] and a[2] is b[2]) or (a[1] is b[2] and a[2] is b[1]))
+
+
+class CrossingOverlay(QGraphicsItem):
+    """Hop or dot markers at wire crossings, drawn in one paint call.
+
+    Hops lift the ``over`` wire across the ``under`` one: the over wire is
+    masked around the crossing, the under wire redrawn through it and a half
+    circle drawn over it. Dots mark the crossing point only.
+
+    Args:
+        style: 'hop' or 'dot'
+        radius: hop radius and dot radius in scene units
+        tile_size: edge length of the cached tiles in scene units
+    """
+
+    STYLES = ('hop', 'dot')
+
+    def __init__(self, style: str = 'hop', radius: float = 5.0, tile_size: float = 512.0, parent=None):
+        super().__init__(parent)
+        if style not in self.STYLES:
+            raise ValueError(f"Unknown crossing style: {style}")
+        self.style = style
+        self.radius = float(radius)
+        self.tile_size = float(tile_size)
+        # Used for crossings of keys without a pen, and without a scene background
+        self.wire_pen = QPen(QColor(0, 0, 0), 2)  # Matches Wire's default pen
+        self.background = QColor(255, 255, 255)
+
+        self._tiles: Dict[Tile, List[Crossing]] = {}
+        self._tile_bounds: Dict[Tile, QRectF] = {}
+        self._paths: Dict[Tile, TilePaths] = {}
+        self._bounds = QRectF()
+        self.stats = {'tiles_built': 0, 'tiles_painted': 0}
+
+        self.setZValue(6)  # Above wires, below pins
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setAcceptHoverEvents(False)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+
+    def __len__(self) -> int:
+        return sum(len(crossings) for crossings in self._tiles.values())
+
+    def set_crossings(self, crossings: Iterable[Crossing]) -> None:
+        """Replace all crossings, repainting only the tiles that changed"""
+        tiles: Dict[Tile, List[Crossing]] = {}
+        for crossing in crossings:
+            tiles.setdefault(self._tile_of(crossing[0]), []).append(crossing)
+        for entries in tiles.values():
+            entries.sort(key=lambda crossing: crossing[0])
+
+        changed = {tile for tile in set(tiles) | set(self._tiles)
+                   if tiles.get(tile) != self._tiles.get(tile)}
+        self._tiles = tiles
+        self._refresh_tiles(changed)
+
+    def update_crossings(self, removed: Iterable[Crossing], added: Iterable[Crossing]) -> None:
+        """Apply one edit's removed and added crossings, repainting only their tiles"""
+        changed: Set[Tile] = set()
+        for crossing in removed:
+            tile = self._tile_of(crossing[0])
+            entries = self._tiles.get(tile, [])
+            for i, entry in enumerate(entries):
+                if _same_crossing(entry, crossing):
+                    del entries[i]
+                    changed.add(tile)
+                    break
+        for crossing in added:
+            tile = self._tile_of(crossing[0])
+            self._tiles.setdefault(tile, []).append(crossing)
+            changed.add(tile)
+        self._refresh_tiles(changed)
+
+    def set_style(self, style: str) -> None:
+        if style not in self.STYLES:
+            raise ValueError(f"Unknown crossing style: {style}")
+        self.style = style
+        self._paths.clear()
+        self.update()
+
+    # QGraphicsItem
+
+    def boundingRect(self) -> QRectF:
+        return self._bounds
+
+    def paint(self, painter, option: QStyleOptionGraphicsItem, widget=None):
+        if option.levelOfDetailFromTransform(painter.worldTransform()) < OVERVIEW_DETAIL:
+            return  # markers are sub-pixel and wires are drawn coarse
+        exposed = option.exposedRect if not option.exposedRect.isEmpty() else self._bounds
+        size = self.tile_size
+        x0, y0 = int(exposed.left() // size), int(exposed.top() // size)
+        x1, y1 = int(exposed.right() // size), int(exposed.bottom() // size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._tiles):
+            tiles = [t for t in self._tiles if x0 <= t[0] <= x1 and y0 <= t[1] <= y1]
+        else:
+            tiles = [(tx, ty) for tx in range(x0, x1 + 1) for ty in range(y0, y1 + 1)
+                     if (tx, ty) in self._tiles]
+
+        scene = self.scene()
+        background = scene.backgroundBrush() if scene is not None else QBrush()
+        if background.style() == Qt.BrushStyle.NoBrush:
+            background = QBrush(self.background)
+        for tile in tiles:
+            overs, unders = self._tile_paths(tile)
+            if self.style == 'hop':
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                for over, (mask, _) in overs.items():
+                    mask_pen = QPen(background, self._pen_of(over).widthF() + 2)
+                    mask_pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+                    painter.setPen(mask_pen)
+                    painter.drawPath(mask)
+                for under, wires in unders.items():
+                    painter.setPen(self._pen_of(under))
+                    painter.drawPath(wires)
+                for over, (_, markers) in overs.items():
+                    painter.setPen(self._pen_of(over))
+                    painter.drawPath(markers)
+            else:
+                painter.setPen(Qt.PenStyle.NoPen)
+                for over, (_, markers) in overs.items():
+                    painter.setBrush(QBrush(self._pen_of(over).color()))
+                    painter.drawPath(markers)
+            self.stats['tiles_painted'] += 1
+
+    # Helpers
+
+    def _tile_of(self, point: Point) -> Tile:
+        return int(point[0] // self.tile_size), int(point[1] // self.tile_size)
+
+    def _tile_rect(self, tile: Tile) -> QRectF:
+        r = self.radius + self.wire_pen.widthF() + 2
+        size = self.tile_size
+        return QRectF(tile[0] * size - r, tile[1] * size - r, size + 2 * r, size + 2 * r)
+
+    def _pen_of(self, wire) -> QPen:
+        pen = getattr(wire, 'pen', None)
+        return pen() if pen is not None else self.wire_pen
+
+    def _refresh_tiles(self, changed: Iterable[Tile]) -> None:
+        """Drop cached paths and bounds of changed tiles and repaint them"""
+        changed = list(changed)
+        if not changed:
+            return
+        r = self.radius + self.wire_pen.widthF() + 2
+        for tile in changed:
+            self._paths.pop(tile, None)
+            entries = self._tiles.get(tile)
+            if not entries:
+                self._tiles.pop(tile, None)
+                self._tile_bounds.pop(tile, None)
+                continue
+            xs = [crossing[0][0] for crossing in entries]
+            ys = [crossing[0][1] for crossing in entries]
+            self._tile_bounds[tile] = QRectF(QPointF(min(xs) - r, min(ys) - r),
+                                             QPointF(max(xs) + r, max(ys) + r))
+        bounds = QRectF()
+        for rect in self._tile_bounds.values():
+            bounds = bounds.united(rect)
+        if bounds != self._bounds:
+            self.prepareGeometryChange()
+            self._bounds = bounds
+        for tile in changed:
+            self.update(self._tile_rect(tile))
+
+    def _tile_paths(self, tile: Tile) -> TilePaths:
+        """Mask, marker and redrawn wire paths of one tile by wire, built once"""
+        paths = self._paths.get(tile)
+        if paths is not None:
+            return paths
+        r = self.radius
+        overs: Dict[Hashable, Tuple[QPainterPath, QPainterPath]] = {}
+        unders: Dict[Hashable, QPainterPath] = {}
+        for (x, y), over, under in self._tiles.get(tile, ()):
+            if over not in overs:
+                overs[over] = (QPainterPath(), QPainterPath())
+            mask, markers = overs[over]
+            if self.style == 'hop':
+                mask.moveTo(x - r, y)
+                mask.lineTo(x + r, y)
+                if under not in unders:
+                    unders[under] = QPainterPath()
+                unders[under].moveTo(x, y - r)
+                unders[under].lineTo(x, y + r)
+                markers.moveTo(x - r, y)
+                markers.arcTo(QRectF(x - r, y - r, 2 * r, 2 * r), 180, -180)
+            else:
+                markers.addEllipse(QPointF(x, y), r * 0.6, r * 0.6)
+        paths = self._paths[tile] = (overs, unders)
+        self.stats['tiles_built'] += 1
+        return paths
@@ -0,0 +1,62 @@
+"""
+Level of Detail Module
+
+Zoom-dependent rendering of chips, pins, labels and wires.
+
+The main view and the minimap paint the same items at very different
+scales, so detail is chosen per paint call from the painter's transform
+(``QStyleOptionGraphicsItem.levelOfDetailFromTransform``) instead of by
+hiding items; each view gets the detail that suits its own scale:
+
+- below ``LABEL_DETAIL`` pin labels are not drawn;
+- below ``PIN_DETAIL`` pins are not drawn either;
+- below ``OVERVIEW_DETAIL`` chips are flat rects with a cached name, wires
+  are coarse hairlines and crossing markers are left out;
+- below ``NAME_DETAIL`` chip names are left out as well.
+"""
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QPainter, QPainterPath
+from PySide6.QtWidgets import QGraphicsTextItem, QStyleOptionGraphicsItem
+
+LABEL_DETAIL = 1.0  # 4pt pin labels are unreadable when zoomed out
+PIN_DETAIL = 0.5  # 8 unit pins are 4 px here
+OVERVIEW_DETAIL = 0.5
+NAME_DETAIL = 0.15
+COARSE_LENGTH = 15.0  # wire corners closer than this are dropped in overview, in scene units
+
+
+def level_of_detail(painter: QPainter) -> float:
+    """Scale the painter draws at, 1.0 at 100% zoom"""
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+
+def coarse_path(path: QPainterPath, min_length: float = COARSE_LENGTH) -> QPainterPath:
+    """Polyline through the path's points, without corners closer than ``min_length`` to the last one kept"""
+    coarse = QPainterPath()
+    count = path.elementCount()
+    last = None
+    for i in range(count):
+        element = path.elementAt(i)
+        point = QPointF(element.x, element.y)
+        if element.isMoveTo():
+            coarse.moveTo(point)
+        elif (i == count - 1 or path.elementAt(i + 1).isMoveTo()
+              or abs(point.x() - last.x()) + abs(point.y() - last.y()) >= min_length):
+            coarse.lineTo(point)
+        else:
+            continue
+        last = point
+    return coarse
+
+
+class DetailTextItem(QGraphicsTextItem):
+    """Text item drawn only at a level of detail of at least ``min_detail``"""
+
+    def __init__(self, text: str, parent=None, min_detail: float = LABEL_DETAIL):
+        super().__init__(text, parent)
+        self.min_detail = min_detail
+
+    def paint(self, painter, option, widget=None):
+        if level_of_detail(painter) >= self.min_detail:
+            super().paint(painter, option, widget)
@@ -4,11 +4,14 @@ Component Pin Module - Phase 2.5
 Enhanced connection pin for components with proper names and smart positioning.
 """
 
-from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem
+from PySide6.QtWidgets import QGraphicsEllipseItem
 from PySide6.QtCore import QPointF, Qt
 from PySide6.QtGui import QPen, QBrush, QColor, QFont
 from typing import TYPE_CHECKING
 
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.level_of_detail import (
+    LABEL_DETAIL, PIN_DETAIL, DetailTextItem, level_of_detail)
+
 if TYPE_CHECKING:
     from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
     from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
@@ -63,6 +66,11 @@ class ComponentPin(QGraphicsEllipseItem):
             self.setBrush(QBrush(QColor(200, 200, 200)))
             self.setPen(QPen(QColor(100, 100, 100), 2))
 
+    def paint(self, painter, option, widget=None):
+        """Draw the pin unless the view is zoomed out too far to see it"""
+        if level_of_detail(painter) >= PIN_DETAIL:
+            super().paint(painter, option, widget)
+
     def get_connection_point(self) -> QPointF:
         """Get the center point for connections"""
         return self.scenePos() + QPointF(4, 4)  # Center of the pin
@@ -95,7 +103,7 @@ class ComponentPin(QGraphicsEllipseItem):
 
     def _create_pin_label(self):
         """Create pin name label with small font to prevent overlapping"""
-        self.pin_label = QGraphicsTextItem(self.pin_name, self)
+        self.pin_label = DetailTextItem(self.pin_name, self, LABEL_DETAIL)
         self.pin_label.setFont(QFont("Arial", 4))  # Much smaller font
         self.pin_label.setDefaultTextColor(QColor(80, 80, 80))
 
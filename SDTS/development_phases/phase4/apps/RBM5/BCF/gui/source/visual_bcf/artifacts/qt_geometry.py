@@ -0,0 +1,41 @@
+"""
+Qt Geometry Adapters
+
+Conversions between Qt geometry classes and the plain ``(x, y)`` points and
+``(x0, y0, x1, y1)`` rects used by the Qt-free routing package.
+"""
+
+from typing import Iterable, List, Tuple
+
+from PySide6.QtCore import QLineF, QPointF, QRectF
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import Rect
+
+
+def to_point(point: QPointF) -> Point:
+    return (point.x(), point.y())
+
+
+def to_qpoint(point: Point) -> QPointF:
+    return QPointF(point[0], point[1])
+
+
+def to_points(points: Iterable[QPointF]) -> List[Point]:
+    return [(p.x(), p.y()) for p in points]
+
+
+def to_qpoints(points: Iterable[Point]) -> List[QPointF]:
+    return [QPointF(x, y) for x, y in points]
+
+
+def line_points(line: QLineF) -> Tuple[Point, Point]:
+    return (line.x1(), line.y1()), (line.x2(), line.y2())
+
+
+def to_rect(rect: QRectF) -> Rect:
+    return (rect.left(), rect.top(), rect.right(), rect.bottom())
+
+
+def to_qrect(rect: Rect) -> QRectF:
+    return QRectF(QPointF(rect[0], rect[1]), QPointF(rect[2], rect[3]))
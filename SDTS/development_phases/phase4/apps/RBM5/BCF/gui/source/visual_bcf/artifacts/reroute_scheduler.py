@@ -0,0 +1,207 @@
+"""
+Reroute Scheduler for Interactive Dragging
+
+Keeps component dragging at display frame rate regardless of wire count:
+- Dirty wires wait in a priority queue, nearest to the cursor first
+- Each frame spends at most a fixed time budget rerouting from the queue,
+  and only on routes that need no search: route cache hits and straight or
+  L routes
+- Wires still queued show a straight pin-to-pin preview until their turn
+- Wires that need a full search wait until the queue settles (no new dirty
+  wires for ``settle_ms``) or the drag ends, and are then routed when the
+  event loop is idle
+"""
+
+import heapq
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QPointF, QTimer
+from PySide6.QtGui import QPainterPath
+
+logger = logging.getLogger(__name__)
+
+
+class RerouteScheduler(QObject):
+    """Frame-budgeted rerouting of dirty wires
+
+    Args:
+        budget_ms: routing time spent per frame
+        frame_ms: interval between frames while wires are queued
+        settle_ms: quiet time after which wires needing a full search are routed
+        on_preview: called with each wire that starts showing a preview, e.g.
+            to hide its crossings until it is rerouted
+    """
+
+    def __init__(self, budget_ms: float = 6.0, frame_ms: int = 16, settle_ms: int = 150, parent=None,
+                 on_preview: Optional[Callable[[object], None]] = None):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self.on_preview = on_preview
+        self.focus: Optional[QPointF] = None
+        # (distance to focus, sequence, wire); stale entries are skipped
+        self._heap: List[Tuple[float, int, object]] = []
+        self._entries: Dict[object, int] = {}
+        self._sequence = 0
+        # Wires that need a full search, held back until the queue settles
+        self._deferred: Dict[object, None] = {}
+        # Queued wires whose displayed path is not yet a preview of their new pins
+        self._needs_preview: Dict[object, None] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(frame_ms)
+        self._timer.timeout.connect(self.run_frame)
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self.finish)
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(settle_ms)
+        self._settle_timer.timeout.connect(self.finish_when_idle)
+
+        self.stats = {'frames': 0, 'rerouted': 0, 'deferred': 0, 'previewed': 0, 'finished': 0,
+                      'max_frame_ms': 0.0}
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._deferred)
+
+    def __contains__(self, wire) -> bool:
+        return wire in self._entries or wire in self._deferred
+
+    def enqueue(self, wires: Iterable, focus: Optional[QPointF] = None):
+        """Queue wires for rerouting; those left after the next frame show a preview"""
+        if focus is not None:
+            self.focus = QPointF(focus)
+        for wire in wires:
+            # Moved again, so a held-back wire may have a fast route now
+            self._deferred.pop(wire, None)
+            self._push(wire)
+            self._needs_preview[wire] = None
+
+    def discard(self, wire):
+        """Forget a queued wire, e.g. one removed from the scene"""
+        self._entries.pop(wire, None)
+        self._deferred.pop(wire, None)
+        self._needs_preview.pop(wire, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+        self._deferred.clear()
+        self._needs_preview.clear()
+        self._timer.stop()
+        self._idle_timer.stop()
+        self._settle_timer.stop()
+
+    def run_frame(self, budget_ms: Optional[float] = None) -> int:
+        """Reroute queued wires on fast routes until the frame budget is spent; returns their count.
+
+        At least one wire is tried per frame. Wires that need a full search
+        are held back until the queue settles; they and the untried wires
+        show previews.
+        """
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        started = time.perf_counter()
+        rerouted = deferred = 0
+        while self._entries and (rerouted + deferred == 0 or time.perf_counter() - started < budget):
+            wire = self._pop()
+            if wire is None:
+                break
+            if self._reroute_fast(wire):
+                self._needs_preview.pop(wire, None)
+                rerouted += 1
+            else:
+                self._deferred[wire] = None
+                deferred += 1
+        for wire in self._needs_preview:
+            self._show_preview(wire)
+        self._needs_preview.clear()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.stats['frames'] += 1
+        self.stats['rerouted'] += rerouted
+        self.stats['deferred'] += deferred
+        self.stats['max_frame_ms'] = max(self.stats['max_frame_ms'], elapsed_ms)
+        if not self._idle_timer.isActive():
+            if self._entries:
+                self._timer.start()
+            if self._deferred:
+                self._settle_timer.start()  # restarted by every frame until the queue is quiet
+        return rerouted
+
+    def finish_when_idle(self):
+        """Route the whole queue once the event loop is idle"""
+        if len(self):
+            self._idle_timer.start()
+
+    def finish(self) -> int:
+        """Reroute every queued wire now; returns their count"""
+        self._timer.stop()
+        self._idle_timer.stop()
+        self._settle_timer.stop()
+        for wire in self._deferred:
+            self._push(wire)
+        self._deferred.clear()
+        rerouted = 0
+        while self._entries:
+            wire = self._pop()
+            if wire is None:
+                break
+            self._needs_preview.pop(wire, None)
+            self._reroute(wire)
+            rerouted += 1
+        self.stats['finished'] += rerouted
+        return rerouted
+
+    # Helpers
+
+    def _push(self, wire):
+        self._sequence += 1
+        self._entries[wire] = self._sequence
+        heapq.heappush(self._heap, (self._distance(wire), self._sequence, wire))
+
+    def _pop(self):
+        while self._heap:
+            _, sequence, wire = heapq.heappop(self._heap)
+            if self._entries.get(wire) == sequence:
+                del self._entries[wire]
+                return wire
+        return None
+
+    def _distance(self, wire) -> float:
+        """Manhattan distance from the focus to the nearer end of the wire"""
+        if self.focus is None:
+            return 0.0
+        distances = []
+        for pin in (wire.start_pin, wire.end_pin):
+            if pin is not None:
+                point = pin.get_connection_point()
+                distances.append(abs(point.x() - self.focus.x()) + abs(point.y() - self.focus.y()))
+        return min(distances) if distances else 0.0
+
+    def _show_preview(self, wire):
+        if wire.start_pin is None or wire.end_pin is None:
+            return
+        path = QPainterPath(wire.start_pin.get_connection_point())
+        path.lineTo(wire.end_pin.get_connection_point())
+        wire.setPath(path)
+        if self.on_preview is not None:
+            self.on_preview(wire)
+        self.stats['previewed'] += 1
+
+    def _reroute_fast(self, wire) -> bool:
+        """Reroute without a search if possible; False if the wire needs one"""
+        try:
+            return wire.update_wire_position_fast()
+        except RuntimeError as e:
+            logger.debug("Skipping reroute of deleted wire: %s", e)
+            return True
+
+    def _reroute(self, wire):
+        try:
+            wire.update_wire_position_dragging()
+        except RuntimeError as e:
+            logger.debug("Skipping reroute of deleted wire: %s", e)
@@ -1,178 +1,227 @@
 """
 Wire Thread Manager for Scene-based Multi-threaded Wire Calculations
 
-This implementation uses a "latest data wins" approach:
-- No mutex locks to avoid blocking during rapid position changes
-- Old calculations are discarded when new ones start
-- Component positions are read at calculation time (latest data)
-- Prioritizes responsiveness over thread safety
+Routing jobs run on a fixed ``ThreadPoolExecutor``:
+- Routing inputs are captured on the GUI thread as plain geometry
+  (``RouteRequest``), so workers never touch scene items
+- Each job carries a per-wire generation; a newer request for the same wire
+  makes older jobs skip their work and their results are dropped on arrival,
+  without blocking on the worker
+- Results are delivered back to the GUI thread through a queued signal
+- Jobs route against a snapshot of the obstacle index, taken on the GUI
+  thread once per index version, so workers hold no lock and never block
+  component moves. A result whose version the scene has moved past is
+  routed again unless its route is still clear
+- Queue depth and submit-to-apply latency are exposed through ``get_statistics``
 """
 
-import uuid
-from typing import Optional, Dict, Callable
-from PySide6.QtCore import QThread, Signal, QObject, QPointF
-from PySide6.QtGui import QPainterPath
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Dict, Callable, Set, Tuple
+from PySide6.QtCore import Signal, QObject
 
 from .pin import ComponentPin
-
-
-class WireCalculationWorker(QThread):
-    """Worker thread for calculating a single wire path"""
-    
-    calculation_complete = Signal(str, object)  # wire_id, WirePathCalculator
-    calculation_failed = Signal(str, str)  # wire_id, error_message
-    
-    def __init__(self, wire_id: str, start_pin: ComponentPin, end_pin: ComponentPin, 
-                 scene, parent=None):
-        super().__init__(parent)
-        self.wire_id = wire_id
-        self.start_pin = start_pin
-        self.end_pin = end_pin
-        self.scene = scene
-        self._should_stop = False
-    
-    def run(self):
-        """Calculate wire path in separate thread"""
-        try:
-            if self._should_stop:
-                return
-            
-            # Get pin positions (latest data)
-            start_pos = self.start_pin.get_connection_point()
-            end_pos = self.end_pin.get_connection_point()
-            
-            # Import WirePath here to avoid circular imports
-            from .connection import WirePath
-            
-            # Calculate wire path
-            wire_path = WirePath(start_pos, end_pos, self.start_pin, self.end_pin, self.scene)
-            
-            if self._should_stop:
-                return
-            
-            # Emit result
-            self.calculation_complete.emit(self.wire_id, wire_path)
-            
-        except Exception as e:
-            self.calculation_failed.emit(self.wire_id, str(e))
-    
-    def stop(self):
-        """Stop the calculation"""
-        self._should_stop = True
-        if self.isRunning():
-            self.quit()
-            self.wait()
+from .qt_geometry import to_qpoints
+from ..routing.route_cache import RouteRequest, run_route_request
 
 
 class SceneWireThreadManager(QObject):
     """Thread manager for wire calculations in the scene"""
-    
+
+    # wire_id, generation, corner points or None, submit time
+    _route_finished = Signal(str, int, object, float)
+
     def __init__(self, max_threads: int = 10, parent=None):
         super().__init__(parent)
         self.max_threads = max_threads
-        self.active_workers: Dict[str, WireCalculationWorker] = {}
-        self.pending_calculations = []
-        
+        self.pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="wire-route")
+        # wire_id -> latest generation;
+        # wire_id -> (generation, WirePath, callback, RouteRequest, obstacle index version)
+        self._generations: Dict[str, int] = {}
+        self._jobs: Dict[str, Tuple[int, object, Optional[Callable], RouteRequest, int]] = {}
+        self._route_finished.connect(self._on_route_finished)
+        self._closed = False
+        # (obstacle index, its snapshot, {engine: router over the snapshot})
+        self._snapshot: Optional[Tuple[object, object, Dict[str, object]]] = None
+
         # Statistics
         self.total_calculations = 0
         self.completed_calculations = 0
         self.failed_calculations = 0
-    
-    def calculate_wire_async(self, wire_id: str, start_pin: ComponentPin, 
+        self.stale_results = 0
+        self.resubmitted_calculations = 0
+        # Queue counters are updated from pool threads
+        self._counter_lock = threading.Lock()
+        self._queued = 0
+        self._futures: Set[Future] = set()
+        self._running = 0
+        self._latency_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def calculate_wire_async(self, wire_id: str, start_pin: ComponentPin,
                            end_pin: ComponentPin, scene, callback: Optional[Callable] = None):
-        """Start wire calculation in separate thread - latest data wins approach"""
+        """Queue a wire calculation - newer requests for a wire supersede older ones"""
+        if self._closed:
+            return
         self.total_calculations += 1
-        
-        # Stop existing calculation for this wire (discard old data)
-        if wire_id in self.active_workers:
-            self.active_workers[wire_id].stop()
-            del self.active_workers[wire_id]
-        
-        # Start new calculation if we have available threads
-        if len(self.active_workers) < self.max_threads:
-            worker = WireCalculationWorker(wire_id, start_pin, end_pin, scene)
-            worker.calculation_complete.connect(
-                lambda wid, path: self._on_calculation_complete(wid, path, callback)
-            )
-            worker.calculation_failed.connect(
-                lambda wid, err: self._on_calculation_failed(wid, err, callback)
-            )
-            worker.finished.connect(lambda: self._cleanup_thread(wire_id))
-            
-            self.active_workers[wire_id] = worker
-            worker.start()
-            
-            print(f"🚀 Started wire calculation thread for {wire_id} (Active: {len(self.active_workers)}/{self.max_threads})")
-        else:
-            # Queue for later
-            self.pending_calculations.append({
-                'wire_id': wire_id,
-                'start_pin': start_pin,
-                'end_pin': end_pin,
-                'scene': scene,
-                'callback': callback
-            })
-            print(f"⏳ Queued wire calculation for {wire_id} (Queue: {len(self.pending_calculations)})")
-    
-    def _on_calculation_complete(self, wire_id: str, wire_path, callback):
-        """Handle completed calculation"""
+        generation = self._generations.get(wire_id, 0) + 1
+        self._generations[wire_id] = generation
+
+        # Import WirePath here to avoid circular imports
+        from .connection import WirePath
+
+        try:
+            wire_path = WirePath(start_pin.get_connection_point(), end_pin.get_connection_point(),
+                                 start_pin, end_pin, scene, calculate_now=False)
+            request = wire_path.routing_request()
+            if request is None:
+                # Heuristic routing reads scene items, so it stays on this thread
+                wire_path._calculate_orthogonal_path()
+                self._jobs.pop(wire_id, None)
+                self._finish(wire_id, wire_path, callback)
+                return
+        except Exception as e:
+            self._jobs.pop(wire_id, None)
+            self._fail(wire_id, str(e), callback)
+            return
+
+        router = self._snapshot_router(scene, request.engine)
+        cache = getattr(scene, "route_cache", None)
+        self._jobs[wire_id] = (generation, wire_path, callback, request, router.obstacle_index.version)
+        with self._counter_lock:
+            self._queued += 1
+        submitted = time.perf_counter()
+
+        def job():
+            with self._counter_lock:
+                self._queued -= 1
+                stale = self._generations.get(wire_id) != generation
+                if not stale:
+                    self._running += 1
+            if stale:
+                self._route_finished.emit(wire_id, generation, None, submitted)
+                return  # superseded before it started
+            try:
+                points = run_route_request(router, cache, request)
+            except Exception as e:
+                print(f"❌ Wire calculation failed for {wire_id}: {e}")
+                points = None
+            finally:
+                with self._counter_lock:
+                    self._running -= 1
+            self._route_finished.emit(wire_id, generation, points, submitted)
+
+        future = self.pool.submit(job)
+        with self._counter_lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget_future)
+
+    def _snapshot_router(self, scene, engine: str):
+        """Router for ``engine`` over a snapshot of the scene's obstacles, shared per index version"""
+        index = scene.obstacle_index
+        if self._snapshot is None or self._snapshot[0] is not index or self._snapshot[1].version != index.version:
+            self._snapshot = (index, index.snapshot(), {})
+        _, snapshot, routers = self._snapshot
+        router = routers.get(engine)
+        if router is None:
+            router = routers[engine] = scene.routers[engine].for_index(snapshot)
+        return router
+
+    def _forget_future(self, future: Future):
+        with self._counter_lock:
+            self._futures.discard(future)
+
+    def wait_for_done(self, timeout: float = 1.0) -> bool:
+        """Wait up to ``timeout`` seconds for submitted jobs; True if all finished"""
+        with self._counter_lock:
+            futures = list(self._futures)
+        _, pending = wait(futures, timeout=timeout)
+        return not pending
+
+    def _on_route_finished(self, wire_id: str, generation: int, points, submitted: float):
+        """Apply a pool result on the GUI thread, dropping superseded ones"""
+        job = self._jobs.get(wire_id)
+        if job is None or job[0] != generation:
+            self.stale_results += 1
+            return
+        del self._jobs[wire_id]
+        _, wire_path, callback, request, version = job
+
+        scene = wire_path.scene
+        if points is not None and version != scene.obstacle_index.version:
+            # Components moved while the job ran; keep the route only if still clear
+            live_router = scene.routers.get(request.engine)
+            polyline_clear = getattr(live_router, "polyline_clear", None)
+            if polyline_clear is None or not polyline_clear(points, request.owners):
+                self.resubmitted_calculations += 1
+                self.calculate_wire_async(wire_id, wire_path.start_pin, wire_path.end_pin, scene, callback)
+                return
+
+        latency = time.perf_counter() - submitted
+        self._latency_count += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
+
+        try:
+            if points is not None:
+                wire_path.apply_route(to_qpoints(points))
+            else:
+                # No route from the engine: fall back to the detour heuristic
+                wire_path.engine = "heuristic"
+                wire_path._calculate_orthogonal_path()
+        except Exception as e:
+            self._fail(wire_id, str(e), callback)
+            return
+        self._finish(wire_id, wire_path, callback)
+
+    def _finish(self, wire_id: str, wire_path, callback):
         self.completed_calculations += 1
-        
         if callback:
             callback(wire_id, wire_path)
-        
-        print(f"✅ Completed wire calculation for {wire_id}")
-        
-        # Start next pending calculation
-        self._start_next_pending()
-    
-    def _on_calculation_failed(self, wire_id: str, error: str, callback):
-        """Handle failed calculation"""
+
+    def _fail(self, wire_id: str, error: str, callback):
         self.failed_calculations += 1
-        
         print(f"❌ Wire calculation failed for {wire_id}: {error}")
-        
         if callback:
             callback(wire_id, None)
-        
-        # Start next pending calculation
-        self._start_next_pending()
-    
-    def _cleanup_thread(self, wire_id: str):
-        """Clean up completed thread"""
-        if wire_id in self.active_workers:
-            thread = self.active_workers[wire_id]
-            thread.deleteLater()
-            del self.active_workers[wire_id]
-    
-    def _start_next_pending(self):
-        """Start the next pending calculation"""
-        if self.pending_calculations and len(self.active_workers) < self.max_threads:
-            calc = self.pending_calculations.pop(0)
-            self.calculate_wire_async(
-                calc['wire_id'], calc['start_pin'], calc['end_pin'], 
-                calc['scene'], calc['callback']
-            )
-    
+
     def stop_all_calculations(self):
-        """Stop all active calculations"""
-        for worker in self.active_workers.values():
-            worker.stop()
-        self.active_workers.clear()
-        self.pending_calculations.clear()
+        """Drop queued jobs and discard results of running ones"""
+        for wire_id in self._generations:
+            self._generations[wire_id] += 1
+        self._jobs.clear()
+        with self._counter_lock:
+            futures = list(self._futures)
+        cancelled = sum(1 for future in futures if future.cancel())
+        with self._counter_lock:
+            self._queued = max(0, self._queued - cancelled)
+        self._futures: Set[Future] = set()
+        self._snapshot = None
         print("🛑 Stopped all wire calculations")
-    
-    def get_statistics(self) -> Dict[str, int]:
+
+    def get_statistics(self) -> Dict[str, float]:
         """Get calculation statistics"""
+        count = self._latency_count
         return {
             'total_calculations': self.total_calculations,
             'completed_calculations': self.completed_calculations,
             'failed_calculations': self.failed_calculations,
-            'active_threads': len(self.active_workers),
-            'pending_calculations': len(self.pending_calculations)
+            'active_threads': self._running,
+            'pending_calculations': len(self._jobs),
+            'queue_depth': max(0, self._queued),
+            'stale_results': self.stale_results,
+            'resubmitted_calculations': self.resubmitted_calculations,
+            'avg_latency_ms': self._latency_total * 1000.0 / count if count else 0.0,
+            'max_latency_ms': self._latency_max * 1000.0,
         }
-    
+
     def cleanup(self):
         """Clean up all resources"""
         self.stop_all_calculations()
+        # Running jobs only finish their current route; results are discarded
+        self.wait_for_done(1.0)
+        self._closed = True
+        self.pool.shutdown(wait=False, cancel_futures=True)
         print("🧹 Wire thread manager cleaned up")
@@ -35,6 +35,7 @@ class FloatingToolbar(QWidget):
     save_scene_requested = Signal()
     load_scene_requested = Signal()
     toggle_connections_requested = Signal(bool)
+    reroute_all_requested = Signal()
 
     def __init__(self, parent=None, device_data_provider=None):
         super().__init__(parent)
@@ -203,6 +204,12 @@ class FloatingToolbar(QWidget):
         self.toggle_conns_btn.clicked.connect(self._on_toggle_connections)
         layout.addWidget(self.toggle_conns_btn)
 
+        self.reroute_all_btn = QPushButton("⤳", self)
+        self.reroute_all_btn.setToolTip("Re-route All Connections")
+        self.reroute_all_btn.setFixedSize(30, 30)
+        self.reroute_all_btn.clicked.connect(self.reroute_all_requested.emit)
+        layout.addWidget(self.reroute_all_btn)
+
         self.clear_scene_btn = QPushButton("🗋", self)
         self.clear_scene_btn.setToolTip("Clear Scene")
         self.clear_scene_btn.setFixedSize(30, 30)
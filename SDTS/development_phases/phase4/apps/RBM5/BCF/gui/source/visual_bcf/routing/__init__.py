@@ -0,0 +1,34 @@
+"""
+Routing Package
+
+Scene-independent wire routing support for Visual BCF: spatial indexing of
+obstacles and the routing algorithms built on it.
+"""
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.batch_router import BatchRouter, Net, count_overlaps
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.bundle_router import (
+    Bundle, BundleRouter, find_bundles, offset_route)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.crossings import CrossingIndex
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import (
+    GridRouter, attach_endpoint, count_bends, simplify_points)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import (
+    ObstacleIndex, Rect, inflate_rect, normalize_rect, rects_overlap, segment_intersects_rect)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.orthogonal import (
+    OrthogonalRouter, approach_point, segment_intersection, segment_rect_crossing)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.process_router import ProcessRouter
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.route_cache import (
+    RouteCache, RouteRequest, fast_route_request, route_key, route_signature, run_route_request)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.steiner import covered_prefix, steiner_branches, tree_length
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.tracks import TrackAssigner, apply_lane_offsets
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.visibility_router import VisibilityRouter
+
+__all__ = [
+    'BatchRouter', 'Net', 'count_overlaps', 'Bundle', 'BundleRouter', 'find_bundles', 'offset_route',
+    'CrossingIndex',
+    'GridRouter', 'attach_endpoint', 'count_bends', 'simplify_points',
+    'ObstacleIndex', 'Rect', 'inflate_rect', 'normalize_rect', 'rects_overlap',
+    'segment_intersects_rect', 'OrthogonalRouter', 'approach_point', 'segment_intersection',
+    'segment_rect_crossing', 'ProcessRouter', 'RouteCache', 'RouteRequest', 'fast_route_request', 'route_key',
+    'route_signature', 'run_route_request', 'covered_prefix', 'steiner_branches', 'tree_length',
+    'TrackAssigner', 'apply_lane_offsets', 'VisibilityRouter',
+]
@@ -0,0 +1,491 @@
+"""
+Batch Router Module
+
+Whole-scene routing with negotiated congestion (PathFinder).
+
+All nets are routed on one shared grid. A grid node carries two resources,
+its horizontal and its vertical track; two nets on the same track of a node
+overlap, while a horizontal and a vertical use of one node is an ordinary
+crossing. Nets that share an endpoint belong to one electrical net and may
+share track; track their net already uses costs only ``share_factor``, so
+the wires of a fan-out net follow each other out of their source and split
+where their loads diverge, forming a Steiner tree (see ``steiner``). Every
+pass rips up and re-routes the nets that overlap, pricing each resource by
+its present occupancy and by a history cost that grows on every pass the
+resource stays overused, so nets negotiate who yields instead of the last
+routed net winning.
+
+Nets are routed in an order derived from their geometry, so the result does
+not depend on the order they were created in, and the number of passes is
+bounded by ``max_iterations``.
+
+Routes found elsewhere, such as the independent routes of ``ProcessRouter``,
+can seed the first pass: they occupy their track as if routed here, and only
+the nets on overused track are ripped up and re-routed.
+
+A net with ``lanes`` is the corridor of a bus (see ``bundle_router``). It is
+routed on its own bitmap in which other components are also inflated by
+half the bus width, so every lane keeps clearance, and it occupies the track
+of each lane alongside its route on behalf of that lane's wire, so other nets
+negotiate around the whole bus. Its own search prices every step by the tracks
+its lanes take as well, so the bus negotiates as a whole too.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import (
+    EDGE_DIRECTIONS, GridRouter, Point, attach_endpoint, simplify_points)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.tracks import offset_route
+
+# Search directions: +x, +y, -x, -y (axis = direction % 2)
+_DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+@dataclass
+class Net:
+    """One two-pin connection to route between approach points"""
+    key: Hashable
+    start: Point
+    end: Point
+    start_dir: Optional[str] = None
+    end_dir: Optional[str] = None
+    owners: tuple = ()  # obstacle keys the endpoints belong to
+    lanes: tuple = ()  # (offset, start, end) of each wire of a bus corridor
+
+    @property
+    def half_width(self) -> float:
+        """Largest lane offset from the centre line, 0 for a single wire"""
+        return max((abs(offset) for offset, _, _ in self.lanes), default=0.0)
+
+
+class BatchRouter:
+    """Negotiated-congestion router for a set of nets.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        grid_size: track pitch in scene units
+        clearance: inflation applied to obstacles
+        bend_penalty: extra cost of a bend, in cells
+        max_iterations: upper bound on rip-up and re-route passes
+        present_factor: initial weight of present occupancy
+        present_growth: multiplier applied to the present weight each pass
+        history_increment: history cost added to an overused resource each pass
+        share_factor: cost of a track used only by nets of the same electrical net
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, grid_size: float = 10.0,
+                 clearance: float = 30.0, bend_penalty: float = 4.0,
+                 margin: float = 120.0, max_iterations: int = 12,
+                 present_factor: float = 0.5, present_growth: float = 1.6,
+                 history_increment: float = 1.0, share_factor: float = 0.5,
+                 max_cells: int = 400_000):
+        self.obstacle_index = obstacle_index
+        self.grid_size = float(grid_size)
+        self.clearance = float(clearance)
+        self.bend_penalty = float(bend_penalty)
+        self.margin = float(margin)
+        self.max_iterations = int(max_iterations)
+        self.present_factor = float(present_factor)
+        self.present_growth = float(present_growth)
+        self.history_increment = float(history_increment)
+        self.share_factor = float(share_factor)
+        self.max_cells = int(max_cells)
+        self.stats = {'nets': 0, 'routed': 0, 'failed': 0, 'iterations': 0, 'overused': 0}
+
+    def route_all(self, nets: Sequence[Net],
+                  initial: Optional[Dict[Hashable, Optional[List[Point]]]] = None
+                  ) -> Dict[Hashable, Optional[List[Point]]]:
+        """Route all nets together; returns {net key: corner points or None}
+
+        ``initial`` holds routes of plain nets to start from ({net key:
+        corner points}); a seeded net keeps its route unless it is congested.
+        """
+        self.stats = {'nets': len(nets), 'routed': 0, 'failed': 0, 'iterations': 0, 'overused': 0}
+        if not nets:
+            return {}
+
+        # One grid frame covering every net, rasterized with full clearance
+        grid = GridRouter(self.obstacle_index, grid_size=self.grid_size,
+                          clearance=self.clearance, max_cells=self.max_cells)
+        xs = [p[0] for net in nets for p in (net.start, net.end)]
+        ys = [p[1] for net in nets for p in (net.start, net.end)]
+        anchor = (min(xs), min(ys))
+        # Bus corridors need room for their whole width around obstacles
+        margin = self.margin + max(net.half_width for net in nets)
+        ox, oy, cell, width, height = grid.grid_frame(anchor, (max(xs), max(ys)), margin)
+        blocked = grid.build_bitmap(ox, oy, cell, width, height).ravel().tolist()
+        escape = int(math.ceil(self.clearance / cell)) + 1
+
+        def node(p: Point) -> Tuple[int, int]:
+            return (min(width - 1, max(0, int(round((p[0] - ox) / cell)))),
+                    min(height - 1, max(0, int(round((p[1] - oy) / cell)))))
+
+        # Per-net search setup: snapped endpoints and escape corridors
+        setups = []
+        for net in nets:
+            s, e = node(net.start), node(net.end)
+            out_s = EDGE_DIRECTIONS.get(net.start_dir)
+            out_e = EDGE_DIRECTIONS.get(net.end_dir)
+            net_blocked, lead = blocked, 0
+            if net.lanes:
+                net_blocked = self._corridor_bitmap(net, ox, oy, cell, width, height)
+                lead = self._corridor_lead(net, cell, escape)
+            allowed = self._corridor(net_blocked, width, height, s, out_s, escape)
+            allowed |= self._corridor(net_blocked, width, height, e, out_e, escape)
+            setups.append((s, e,
+                           _DIRS.index(out_s) if out_s else None,
+                           _DIRS.index((-out_e[0], -out_e[1])) if out_e else None,
+                           allowed, net_blocked, lead))
+
+        # Geometry-derived order: shorter nets first, ties by coordinates
+        order = sorted(range(len(nets)), key=lambda i: (
+            abs(nets[i].start[0] - nets[i].end[0]) + abs(nets[i].start[1] - nets[i].end[1]),
+            nets[i].start, nets[i].end, str(nets[i].start_dir), str(nets[i].end_dir)))
+
+        groups, lane_groups = self._group_nets(nets)
+        # Per resource: None or {group: number of its nets using the resource}
+        users: List[Optional[Dict[int, int]]] = [None] * (width * height * 2)
+        history = [0.0] * (width * height * 2)
+        usage: Dict[int, List[Tuple[int, int]]] = {}  # net -> (resource, group) pairs
+        cells_by_net: Dict[int, List[Tuple[int, int]]] = {}
+        present = self.present_factor
+
+        def occupy(i: int, resources: List[Tuple[int, int]]) -> None:
+            for r, g in resources:
+                entry = users[r]
+                if entry is None:
+                    entry = users[r] = {}
+                entry[g] = entry.get(g, 0) + 1
+            usage[i] = resources
+
+        # Seeded routes stand in for a first pass and are kept as given unless ripped up
+        seeded: Dict[int, List[Point]] = {}
+        for i, net in enumerate(nets):
+            points = initial.get(net.key) if initial else None
+            if not points or net.lanes:
+                continue
+            path = self._raster([node(p) for p in points])
+            occupy(i, [(r, groups[i]) for r in self._resources(path, width, height)])
+            cells_by_net[i] = path
+            seeded[i] = list(points)
+
+        for iteration in range(self.max_iterations):
+            self.stats['iterations'] = iteration + 1
+            for i in order:
+                group = groups[i]
+                if i in usage:
+                    if all(len(users[r]) <= 1 for r, _ in usage[i]):
+                        continue  # not congested, keep its route
+                    for r, g in usage[i]:
+                        entry = users[r]
+                        entry[g] -= 1
+                        if not entry[g]:
+                            del entry[g]
+                        if not entry:
+                            users[r] = None
+                seeded.pop(i, None)
+                s, e, sd, gd, allowed, net_blocked, lead = setups[i]
+                spread = [(int(round(offset / cell)), g) for (offset, _, _), g in zip(nets[i].lanes, lane_groups[i])]
+                path = self._astar(net_blocked, allowed, users, group, history, present,
+                                   width, height, s, e, sd, gd, lead, spread)
+                if path is None:
+                    usage[i] = []
+                    cells_by_net.pop(i, None)
+                    continue
+                if nets[i].lanes:
+                    resources = self._lane_resources(path, nets[i], lane_groups[i], node, cell, width, height)
+                else:
+                    resources = [(r, group) for r in self._resources(path, width, height)]
+                occupy(i, resources)
+                cells_by_net[i] = path
+
+            overused = {r for resources in usage.values() for r, _ in resources if len(users[r]) > 1}
+            self.stats['overused'] = len(overused)
+            if not overused:
+                break
+            for r in overused:
+                history[r] += self.history_increment
+            present *= self.present_growth
+
+        results: Dict[Hashable, Optional[List[Point]]] = {}
+        for i, net in enumerate(nets):
+            if i in seeded:
+                results[net.key] = seeded[i]
+                self.stats['routed'] += 1
+                continue
+            path = cells_by_net.get(i)
+            if path is None:
+                results[net.key] = None
+                self.stats['failed'] += 1
+                continue
+            points = simplify_points([(ox + cx * cell, oy + cy * cell) for cx, cy in path])
+            points = attach_endpoint(points, net.end)
+            points = attach_endpoint(points[::-1], net.start)[::-1]
+            results[net.key] = points
+            self.stats['routed'] += 1
+        return results
+
+    def _corridor_bitmap(self, net: Net, ox: float, oy: float, cell: float, width: int, height: int) -> list:
+        """Bitmap of a bus corridor: components inflated by half its width as well.
+
+        The band swept by the bus leaving each of its two edges is freed, so
+        the corridor can fan out of its own components.
+        """
+        inflation = self.clearance + net.half_width
+        grid = GridRouter(self.obstacle_index, grid_size=self.grid_size, clearance=inflation,
+                          max_cells=self.max_cells)
+        blocked = grid.build_bitmap(ox, oy, cell, width, height)
+        for index, edge in ((1, net.start_dir), (2, net.end_dir)):
+            direction = EDGE_DIRECTIONS.get(edge)
+            if direction is None:
+                continue
+            points = [lane[index] for lane in net.lanes]
+            reach = [(p[0] + direction[0] * inflation, p[1] + direction[1] * inflation) for p in points]
+            x0, x1 = min(p[0] for p in points + reach), max(p[0] for p in points + reach)
+            y0, y1 = min(p[1] for p in points + reach), max(p[1] for p in points + reach)
+            cx0, cx1 = max(0, int(math.floor((x0 - ox) / cell))), min(width - 1, int(math.ceil((x1 - ox) / cell)))
+            cy0, cy1 = max(0, int(math.floor((y0 - oy) / cell))), min(height - 1, int(math.ceil((y1 - oy) / cell)))
+            blocked[cy0:cy1 + 1, cx0:cx1 + 1] = False
+        return blocked.ravel().tolist()
+
+    def _corridor_lead(self, net: Net, cell: float, escape: int) -> int:
+        """Straight run of a bus corridor out of its start and into its end, in cells.
+
+        A bus between facing edges offset by less than its lane pitch only
+        jogs, which its lanes do side by side, so it needs no more than the
+        escape distance. Any other turn fans the lanes out diagonally, so the
+        corridor first clears the band it sweeps out of its components.
+        """
+        offsets = sorted(offset for offset, _, _ in net.lanes)
+        pitch = min((b - a for a, b in zip(offsets, offsets[1:])), default=0.0)
+        across = 1 if net.start_dir in ('left', 'right') else 0
+        facing = (net.start_dir in ('left', 'right')) == (net.end_dir in ('left', 'right'))
+        if facing and abs(net.end[across] - net.start[across]) < pitch:
+            return escape
+        return max(escape, int(math.ceil((self.clearance + net.half_width) / cell)))
+
+    @staticmethod
+    def _group_nets(nets: Sequence[Net]) -> Tuple[List[int], List[List[int]]]:
+        """Group id per net and per corridor lane; wires sharing an endpoint share a group"""
+        ends = [(net.start, net.end) for net in nets]
+        lane_of = []
+        for i, net in enumerate(nets):
+            for _, start, end in net.lanes:
+                ends.append((start, end))
+                lane_of.append(i)
+        parent = list(range(len(ends)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        seen: Dict[Tuple[float, float], int] = {}
+        for i, points in enumerate(ends):
+            for p in points:
+                key = (round(p[0], 3), round(p[1], 3))
+                if key in seen:
+                    parent[find(i)] = find(seen[key])
+                else:
+                    seen[key] = i
+        lane_groups: List[List[int]] = [[] for _ in nets]
+        for n, i in enumerate(lane_of):
+            lane_groups[i].append(find(len(nets) + n))
+        return [find(i) for i in range(len(nets))], lane_groups
+
+    @staticmethod
+    def _corridor(blocked, width, height, start, direction, limit) -> set:
+        """Blocked cells a net may use to escape from its endpoint"""
+        cx, cy = start
+        allowed = {cy * width + cx}
+        if direction is None:
+            return allowed
+        dx, dy = direction
+        for _ in range(limit):
+            cx, cy = cx + dx, cy + dy
+            if not (0 <= cx < width and 0 <= cy < height) or not blocked[cy * width + cx]:
+                break
+            allowed.add(cy * width + cx)
+        return allowed
+
+    @staticmethod
+    def _raster(corners: Sequence[Tuple[float, float]]) -> List[Tuple[int, int]]:
+        """Cells along a polyline of cell corners, one axis at a time"""
+        cells = [(int(corners[0][0]), int(corners[0][1]))]
+        for x2, y2 in corners[1:]:
+            x, y = cells[-1]
+            x2, y2 = int(x2), int(y2)
+            while (x, y) != (x2, y2):
+                if x != x2:
+                    x += 1 if x2 > x else -1
+                else:
+                    y += 1 if y2 > y else -1
+                cells.append((x, y))
+        return cells
+
+    @staticmethod
+    def _resources(path: List[Tuple[int, int]], width: int, height: int) -> List[int]:
+        """Track resources (node * 2 + axis) used by a cell path inside the grid"""
+        used = set()
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            axis = 0 if y1 == y2 else 1
+            for x, y in ((x1, y1), (x2, y2)):
+                if 0 <= x < width and 0 <= y < height:
+                    used.add((y * width + x) * 2 + axis)
+        return sorted(used)
+
+    def _lane_resources(self, path: List[Tuple[int, int]], net: Net, groups: List[int], node,
+                        cell: float, width: int, height: int) -> List[Tuple[int, int]]:
+        """(resource, lane group) pairs of a bus corridor's lanes, laid out as the bus derives them"""
+        offsets = sorted(offset for offset, _, _ in net.lanes)
+        keep_below = min(b - a for a, b in zip(offsets, offsets[1:])) / cell
+        resources = []
+        claimed = set()  # lanes of one bus never compete, even where rounding makes them touch
+        for (offset, start, end), group in zip(net.lanes, groups):
+            corners = offset_route(path, round(offset / cell), keep_below)
+            if corners is None:
+                continue  # this lane will be routed on its own
+            corners = attach_endpoint(corners, node(end))
+            corners = attach_endpoint(corners[::-1], node(start))[::-1]
+            for r in self._resources(self._raster(corners), width, height):
+                if r not in claimed:
+                    claimed.add(r)
+                    resources.append((r, group))
+        return resources
+
+    def _astar(self, blocked, allowed, users, group, history, present, width, height,
+               start, goal, start_dir, goal_dir, lead=0, spread=()) -> Optional[List[Tuple[int, int]]]:
+        """A* over (cell, direction) states with congestion-aware track costs.
+
+        With a ``lead``, as for bus corridors, the route runs straight for that
+        many cells out of the start and into the goal, and enters the goal
+        only along ``goal_dir`` instead of at the cost of a bend. A ``spread``
+        of (cell offset, group) lanes adds the congestion of each lane's track
+        beside every step.
+        """
+        bend = self.bend_penalty
+        share = self.share_factor
+        gx, gy = goal
+        goal_cell = gy * width + gx
+        start_cell = start[1] * width + start[0]
+        if start_cell == goal_cell:
+            return [start]
+
+        # Cells where the route may not turn yet, and where it may only head for the goal
+        no_turn, run_in = set(), {}
+        if lead:
+            if start_dir is not None:
+                dx, dy = _DIRS[start_dir]
+                no_turn = {(start[1] + dy * k) * width + start[0] + dx * k for k in range(lead)}
+            if goal_dir is not None:
+                dx, dy = _DIRS[goal_dir]
+                run_in = {(gy - dy * k) * width + gx - dx * k: k for k in range(1, lead + 1)}
+
+        def track_cost(r: int, group: int = group) -> float:
+            entry = users[r]
+            if not entry:
+                return 1.0 + history[r]
+            others = len(entry) - (group in entry)
+            if not others:
+                return (1.0 + history[r]) * share  # already carries this net
+            return (1.0 + history[r]) * (1.0 + present * others)
+
+        def lane_cost(x: int, y: int, d: int) -> float:
+            # Lanes are offset along the lane normal of the travel direction, as in offset_route
+            dx, dy = _DIRS[d]
+            cost = 0.0
+            for k, lane_group in spread:
+                lx, ly = x - dy * k, y + dx * k
+                if 0 <= lx < width and 0 <= ly < height:
+                    r = (ly * width + lx) * 2 + d % 2
+                    if users[r] is not None or history[r]:
+                        cost += max(0.0, track_cost(r, lane_group) - 1.0)
+            return cost
+
+        best: Dict[int, float] = {}
+        parent: Dict[int, int] = {}
+        heap = []
+        counter = 0
+        for d in ((start_dir,) if start_dir is not None else range(4)):
+            state = start_cell * 4 + d
+            best[state] = 0.0
+            parent[state] = -1
+            heapq.heappush(heap, (abs(start[0] - gx) + abs(start[1] - gy), counter, 0.0, state))
+            counter += 1
+
+        max_expansions = 8 * width * height
+        expansions = 0
+        while heap:
+            _, _, g, state = heapq.heappop(heap)
+            if g > best.get(state, math.inf):
+                continue
+            cell, d = divmod(state, 4)
+            if cell == goal_cell:
+                cells = []
+                while state != -1:
+                    c = state // 4
+                    cells.append((c % width, c // width))
+                    state = parent[state]
+                return cells[::-1]
+            expansions += 1
+            if expansions > max_expansions:
+                return None
+            x, y = cell % width, cell // width
+            for nd, (dx, dy) in enumerate(_DIRS):
+                if nd == (d + 2) % 4 or (nd != d and cell in no_turn):
+                    continue
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                ncell = ny * width + nx
+                if blocked[ncell] and ncell not in allowed and ncell != goal_cell:
+                    continue
+                axis = nd % 2
+                cost = g + track_cost(ncell * 2 + axis)
+                if spread:
+                    cost += lane_cost(nx, ny, nd)
+                if nd != d:
+                    # Turning also takes the other track of the corner node
+                    cost += bend + track_cost(cell * 2 + axis) - 1.0
+                if nd != goal_dir and run_in.get(ncell, lead) < lead:
+                    continue  # joins the run-in short of its far end
+                if ncell == goal_cell and goal_dir is not None and nd != goal_dir:
+                    if lead:
+                        continue
+                    cost += bend
+                nstate = ncell * 4 + nd
+                if cost < best.get(nstate, math.inf):
+                    best[nstate] = cost
+                    parent[nstate] = state
+                    heapq.heappush(heap, (cost + abs(nx - gx) + abs(ny - gy), counter, cost, nstate))
+                    counter += 1
+        return None
+
+
+def count_overlaps(routes: Sequence[Sequence[Point]], tolerance: float = 1e-6) -> int:
+    """Number of route pairs sharing a colinear stretch of track"""
+    segments = []
+    for points in routes:
+        segments.append([(points[i], points[i + 1]) for i in range(len(points) - 1)])
+
+    def overlap(a, b) -> bool:
+        (a1, a2), (b1, b2) = a, b
+        if abs(a1[1] - a2[1]) < tolerance and abs(b1[1] - b2[1]) < tolerance and abs(a1[1] - b1[1]) < tolerance:
+            lo, hi = max(min(a1[0], a2[0]), min(b1[0], b2[0])), min(max(a1[0], a2[0]), max(b1[0], b2[0]))
+            return hi - lo > tolerance
+        if abs(a1[0] - a2[0]) < tolerance and abs(b1[0] - b2[0]) < tolerance and abs(a1[0] - b1[0]) < tolerance:
+            lo, hi = max(min(a1[1], a2[1]), min(b1[1], b2[1])), min(max(a1[1], a2[1]), max(b1[1], b2[1]))
+            return hi - lo > tolerance
+        return False
+
+    count = 0
+    for i in range(len(segments)):
+        for j in range(i + 1, len(segments)):
+            if any(overlap(a, b) for a in segments[i] for b in segments[j]):
+                count += 1
+    return count
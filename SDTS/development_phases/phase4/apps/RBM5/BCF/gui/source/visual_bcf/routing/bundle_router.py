@@ -0,0 +1,221 @@
+"""
+Bundle Router Module
+
+Routes parallel buses once instead of wire by wire.
+
+A bus is a run of nets leaving adjacent points of one component edge for
+adjacent points of one target edge, such as the ``PRX_OUTi -> PRX_INi``
+groups between RFICs. Each bus is replaced by a single corridor net along
+its centre line, as wide as the bus, which the underlying router routes
+together with the remaining nets. Member routes are then derived from the
+corridor by fixed lane offsets: every segment moves sideways by the member's
+offset from the centre line, except short jogs between segments running the
+same way, which stay aligned so the bus does not fan out into a staircase.
+
+Derived routes are checked against the obstacle index. A bus with a lane
+that cuts through a component, or whose lanes would arrive in the wrong
+order, is dissolved and its wires are routed individually in another pass.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.batch_router import Net
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import (
+    EDGE_DIRECTIONS, GridRouter, Point, attach_endpoint)
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.tracks import lane_normal, offset_route
+
+
+def _axes(edge: str) -> Tuple[int, int]:
+    """(fixed, along) coordinate indices of points on a component edge"""
+    return (0, 1) if edge in ('left', 'right') else (1, 0)
+
+
+@dataclass(eq=False)
+class Bundle:
+    """Nets of one bus and their lane offsets from its centre line"""
+    members: List[Net]
+    offsets: List[float] = field(default_factory=list)
+    corridor: Optional[Net] = None
+
+    def __post_init__(self):
+        first, last = self.members[0], self.members[-1]
+        start = ((first.start[0] + last.start[0]) / 2.0, (first.start[1] + last.start[1]) / 2.0)
+        end = ((first.end[0] + last.end[0]) / 2.0, (first.end[1] + last.end[1]) / 2.0)
+        normal = lane_normal(EDGE_DIRECTIONS[first.start_dir])
+        self.offsets = [(net.start[0] - start[0]) * normal[0] + (net.start[1] - start[1]) * normal[1]
+                        for net in self.members]
+        self.corridor = Net(self, start, end, first.start_dir, first.end_dir, first.owners,
+                            lanes=tuple((offset, net.start, net.end)
+                                        for offset, net in zip(self.offsets, self.members)))
+
+    @property
+    def min_gap(self) -> float:
+        """Smallest distance between neighbouring lanes"""
+        ordered = sorted(self.offsets)
+        return min(b - a for a, b in zip(ordered, ordered[1:]))
+
+    def derive(self, points: Sequence[Point]) -> Dict[Hashable, Optional[List[Point]]]:
+        """Member routes from the corridor's corner points; None where no lane fits.
+
+        All members are None if their lanes would reach the target edge in a
+        different order than the target pins, since they would cross there.
+        """
+        lanes = [offset_route(points, offset, self.min_gap) for offset in self.offsets]
+        _, along = _axes(self.members[0].end_dir)
+        arrivals = [(lane[-1][along] if lane else None, net.end[along])
+                    for lane, net in zip(lanes, self.members)]
+        for (a1, e1), (a2, e2) in zip(arrivals, arrivals[1:]):
+            if a1 is not None and a2 is not None and (a2 > a1) != (e2 > e1):
+                return {net.key: None for net in self.members}
+
+        routes = {}
+        for lane, net in zip(lanes, self.members):
+            if lane is not None:
+                lane = attach_endpoint(lane, net.end)
+                lane = attach_endpoint(lane[::-1], net.start)[::-1]
+            routes[net.key] = lane
+        return routes
+
+
+def find_bundles(nets: Sequence[Net], max_pitch: float = 30.0, min_size: int = 2,
+                 max_size: int = 6, tolerance: float = 1.0) -> Tuple[List[Bundle], List[Net]]:
+    """Split nets into buses and the remaining loose nets.
+
+    Nets belong to one bus when they connect the same pair of component
+    edges and neighbouring nets are at most ``max_pitch`` apart at both
+    ends, in the same order along both edges. Longer runs are split evenly
+    into buses of at most ``max_size`` nets, which stay narrow enough to
+    pass between components side by side.
+    """
+    groups: Dict[tuple, List[Net]] = {}
+    loose: List[Net] = []
+    for net in nets:
+        if net.start_dir not in EDGE_DIRECTIONS or net.end_dir not in EDGE_DIRECTIONS or net.lanes:
+            loose.append(net)
+            continue
+        start_fixed, _ = _axes(net.start_dir)
+        end_fixed, _ = _axes(net.end_dir)
+        key = (net.start_dir, round(net.start[start_fixed] / tolerance),
+               net.end_dir, round(net.end[end_fixed] / tolerance), net.owners)
+        groups.setdefault(key, []).append(net)
+
+    bundles: List[Bundle] = []
+    for group in groups.values():
+        _, start_along = _axes(group[0].start_dir)
+        _, end_along = _axes(group[0].end_dir)
+        group.sort(key=lambda net: (net.start[start_along], net.end[end_along]))
+        run: List[Net] = [group[0]]
+        sign = 0
+        for net in group[1:] + [None]:
+            if net is not None:
+                prev = run[-1]
+                step = net.start[start_along] - prev.start[start_along]
+                turn = net.end[end_along] - prev.end[end_along]
+                same_way = sign == 0 or (turn > 0) == (sign > 0)
+                if tolerance < step <= max_pitch and tolerance < abs(turn) <= max_pitch and same_way:
+                    run.append(net)
+                    sign = turn
+                    continue
+            if len(run) >= min_size:
+                parts = -(-len(run) // max_size)
+                bounds = [len(run) * k // parts for k in range(parts + 1)]
+                bundles.extend(Bundle(run[a:b]) for a, b in zip(bounds, bounds[1:]))
+            else:
+                loose.extend(run)
+            run, sign = [net], 0
+    return bundles, loose
+
+
+class BundleRouter:
+    """Routes each bus as one corridor on top of another router.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        clearance: distance derived lanes must keep from other components
+        owner_clearance: distance from the components owning their endpoints
+        max_pitch: largest pin spacing still treated as one bus
+        min_size: smallest number of nets forming a bus
+        max_size: largest number of nets routed as one bus
+        enabled: route every net individually when False
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, clearance: float = 20.0,
+                 owner_clearance: float = 10.0, max_pitch: float = 30.0, min_size: int = 2,
+                 max_size: int = 6, enabled: bool = True):
+        self.obstacle_index = obstacle_index
+        self.clearance = float(clearance)
+        self.owner_clearance = float(owner_clearance)
+        self.max_pitch = float(max_pitch)
+        self.min_size = int(min_size)
+        self.max_size = int(max_size)
+        self.enabled = enabled
+        self.stats = {'nets': 0, 'routed': 0, 'failed': 0, 'bundles': 0, 'bundled': 0, 'derived': 0,
+                      'passes': 0}
+
+    def route_all(self, nets: Sequence[Net], router,
+                  corridor_router=None) -> Dict[Hashable, Optional[List[Point]]]:
+        """Route nets with ``router`` (``route_all(nets)``), buses as one corridor each.
+
+        With a ``corridor_router`` (a ``BatchRouter``), ``router`` only gives
+        the plain nets a first route, as ProcessRouter does; the corridor
+        router then routes the corridors and negotiates congestion from those
+        routes, re-routing only the nets on overused track.
+
+        Buses with a member that cannot follow its lane are dissolved and the
+        nets are routed once more, so those wires negotiate with the rest
+        instead of being routed around routes they cannot see; should that
+        fail again, every bus is dissolved. Afterwards ``stats`` holds the
+        router's statistics of the last pass with the net counts and bus
+        counters of the whole call.
+        """
+        if self.enabled:
+            bundles, loose = find_bundles(nets, self.max_pitch, self.min_size, self.max_size)
+        else:
+            bundles, loose = [], list(nets)
+        checker = GridRouter(self.obstacle_index, clearance=self.clearance,
+                             owner_clearance=self.owner_clearance)
+        found = len(bundles)
+        bundled = sum(len(bundle.members) for bundle in bundles)
+        for attempt in range(3):
+            corridors = [bundle.corridor for bundle in bundles]
+            if corridor_router is None:
+                routes = router.route_all(corridors + loose)
+            else:
+                routes = corridor_router.route_all(corridors + loose, initial=router.route_all(loose))
+            failed, derived = self._derive(bundles, routes, checker)
+            if not failed:
+                break
+            if attempt:
+                failed = bundles
+            bundles = [bundle for bundle in bundles if bundle not in failed]
+            loose = loose + [net for bundle in failed for net in bundle.members]
+
+        routed = sum(1 for net in nets if routes.get(net.key) is not None)
+        stats = dict(router.stats)
+        if corridor_router is not None:
+            stats.update(corridor_router.stats)
+        stats.update(nets=len(nets), routed=routed, failed=len(nets) - routed, bundles=found,
+                     bundled=bundled, derived=derived, passes=attempt + 1)
+        self.stats = stats
+        return routes
+
+    def _derive(self, bundles: List[Bundle], routes: Dict, checker: GridRouter) -> Tuple[List[Bundle], int]:
+        """Replace corridor routes by member routes; returns the failed buses and the derived count"""
+        failed = []
+        derived = 0
+        for bundle in bundles:
+            points = routes.pop(bundle, None)
+            lanes = bundle.derive(points) if points else {}
+            ok = True
+            for net in bundle.members:
+                lane = lanes.get(net.key)
+                if lane is not None and checker.polyline_clear(lane, net.owners):
+                    derived += 1
+                else:
+                    lane, ok = None, False
+                routes[net.key] = lane
+            if not ok:
+                failed.append(bundle)
+        return failed, derived
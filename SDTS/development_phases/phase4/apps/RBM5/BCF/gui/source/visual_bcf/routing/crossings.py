@@ -0,0 +1,225 @@
+"""
+Crossings Module
+
+Scene-wide detection of crossings between wires, replacing the pairwise
+segment comparison of every wire against every other wire.
+
+A full pass sweeps a vertical line over the x coordinates of all segments:
+horizontal segments enter and leave an active list kept sorted by y, and
+each vertical segment reports the active horizontals within its y range by
+bisection, so a pass costs O((n + k) log n) for n segments and k crossings.
+Between passes, a wire whose path changes is updated incrementally: its
+segments are looked up in a uniform grid of all segments (``ObstacleIndex``)
+and only its own crossings are replaced.
+
+A crossing is a point strictly inside a segment of each of two different
+wires; wires touching at shared pins, corners lying on another wire and
+colinear overlaps are not crossings. Non-orthogonal segments are checked
+against their grid neighbours.
+"""
+
+import bisect
+from typing import Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex, normalize_rect
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.orthogonal import segment_intersection
+
+Segment = Tuple[Point, Point]
+SegmentKey = Tuple[Hashable, int]  # wire key, segment number
+
+_EPS = 1e-6
+
+
+def _axis(segment: Segment) -> Optional[str]:
+    (x1, y1), (x2, y2) = segment
+    if abs(y1 - y2) < _EPS and abs(x1 - x2) >= _EPS:
+        return 'horizontal'
+    if abs(x1 - x2) < _EPS and abs(y1 - y2) >= _EPS:
+        return 'vertical'
+    return None
+
+
+def _crossing(a: Segment, b: Segment) -> Optional[Point]:
+    """Point strictly inside both segments, if they cross"""
+    point = segment_intersection(a[0], a[1], b[0], b[1])
+    if point is None:
+        return None
+    # Snap to the exact coordinates of axis-aligned segments
+    x, y = point
+    for (x1, y1), (x2, y2) in (a, b):
+        if x1 == x2:
+            x = x1
+        if y1 == y2:
+            y = y1
+    point = (x, y)
+    for p in (a[0], a[1], b[0], b[1]):
+        if abs(p[0] - point[0]) < _EPS and abs(p[1] - point[1]) < _EPS:
+            return None
+    return point
+
+
+class CrossingIndex:
+    """Crossings between wires, kept current per wire.
+
+    Wires are identified by any hashable key and given as their polyline
+    points. ``crossings_of(key)`` returns ``(point, other key, direction)``
+    tuples, where direction is the axis of ``key``'s segment at the point.
+
+    Args:
+        cell_size: cell size of the segment grid used for incremental updates
+    """
+
+    def __init__(self, cell_size: float = 200.0):
+        self._segments: Dict[Hashable, List[Segment]] = {}
+        self._grid = ObstacleIndex(cell_size=cell_size)
+        # key -> other key -> [(point, direction of key's segment)]
+        self._crossings: Dict[Hashable, Dict[Hashable, List[Tuple[Point, str]]]] = {}
+        self.stats = {'rebuilds': 0, 'updates': 0, 'crossings': 0}
+
+    def __len__(self) -> int:
+        return self.stats['crossings']
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._segments
+
+    def clear(self) -> None:
+        self._segments.clear()
+        self._grid = ObstacleIndex(cell_size=self._grid.cell_size)
+        self._crossings.clear()
+        self.stats['crossings'] = 0
+
+    # Queries
+
+    def crossings_of(self, key: Hashable) -> List[Tuple[Point, Hashable, str]]:
+        """Crossings of one wire as (point, other wire, direction of this wire)"""
+        return [(point, other, direction)
+                for other, hits in self._crossings.get(key, {}).items()
+                for point, direction in hits]
+
+    def all_crossings(self) -> List[Tuple[Point, Hashable, Hashable]]:
+        """Every crossing once, as (point, wire, other wire).
+
+        The wire running horizontally at the point comes first.
+        """
+        result = []
+        seen = set()
+        for key, others in self._crossings.items():
+            for other, hits in others.items():
+                if (other, key) in seen:
+                    continue
+                seen.add((key, other))
+                result.extend((point, other, key) if direction == 'vertical' else (point, key, other)
+                              for point, direction in hits)
+        return result
+
+    # Full pass
+
+    def rebuild(self, wires: Mapping[Hashable, Sequence[Point]]) -> int:
+        """Replace all wires and compute every crossing in one sweep; returns the count"""
+        self.clear()
+        for key, points in wires.items():
+            self._store(key, points)
+        self.stats['rebuilds'] += 1
+
+        horizontals: List[Tuple[SegmentKey, Segment]] = []
+        verticals: List[Tuple[SegmentKey, Segment]] = []
+        others: List[Tuple[SegmentKey, Segment]] = []
+        for key, segments in self._segments.items():
+            for i, segment in enumerate(segments):
+                axis = _axis(segment)
+                target = horizontals if axis == 'horizontal' else verticals if axis == 'vertical' else others
+                target.append(((key, i), segment))
+
+        # Events at equal x: horizontals enter (0) before verticals query (1)
+        # before horizontals leave (2), so touching segments are seen
+        events = []
+        for n, (_, ((x1, y), (x2, _))) in enumerate(horizontals):
+            events.append((min(x1, x2), 0, n))
+            events.append((max(x1, x2), 2, n))
+        for n, (_, ((x, _), _)) in enumerate(verticals):
+            events.append((x, 1, n))
+        events.sort()
+
+        active: List[Tuple[float, int]] = []  # (y, horizontal number), sorted
+        for _, kind, n in events:
+            if kind == 0:
+                bisect.insort(active, (horizontals[n][1][0][1], n))
+            elif kind == 2:
+                del active[bisect.bisect_left(active, (horizontals[n][1][0][1], n))]
+            else:
+                vkey, vseg = verticals[n]
+                y1, y2 = sorted((vseg[0][1], vseg[1][1]))
+                lo = bisect.bisect_left(active, (y1 - _EPS, -1))
+                hi = bisect.bisect_right(active, (y2 + _EPS, len(horizontals)))
+                for _, h in active[lo:hi]:
+                    hkey, hseg = horizontals[h]
+                    if hkey[0] == vkey[0]:
+                        continue
+                    point = _crossing(hseg, vseg)
+                    if point is not None:
+                        self._record(hkey[0], vkey[0], point, 'horizontal', 'vertical')
+
+        # Non-orthogonal segments against everything near them, each pair once
+        checked = set()
+        for skey, segment in others:
+            self._check_against_grid(skey, segment, checked)
+            checked.add(skey)
+        return self.stats['crossings']
+
+    # Incremental updates
+
+    def update_wire(self, key: Hashable, points: Sequence[Point]) -> List[Tuple[Point, Hashable, str]]:
+        """Replace one wire's path and recompute only its crossings"""
+        self._drop(key)
+        self._store(key, points)
+        self.stats['updates'] += 1
+        for i, segment in enumerate(self._segments[key]):
+            self._check_against_grid((key, i), segment)
+        return self.crossings_of(key)
+
+    def remove_wire(self, key: Hashable) -> None:
+        self._drop(key)
+
+    # Helpers
+
+    def _store(self, key: Hashable, points: Sequence[Point]) -> None:
+        points = [(float(p[0]), float(p[1])) for p in points]
+        segments = [(points[i], points[i + 1]) for i in range(len(points) - 1)
+                    if points[i] != points[i + 1]]
+        self._segments[key] = segments
+        for i, (a, b) in enumerate(segments):
+            self._grid.insert((key, i), normalize_rect(a[0], a[1], b[0], b[1]))
+
+    def _drop(self, key: Hashable) -> None:
+        for i in range(len(self._segments.pop(key, ()))):
+            self._grid.remove((key, i))
+        for other, hits in self._crossings.pop(key, {}).items():
+            self.stats['crossings'] -= len(hits)
+            back = self._crossings.get(other)
+            if back is not None:
+                back.pop(key, None)
+                if not back:
+                    del self._crossings[other]
+
+    def _check_against_grid(self, skey: SegmentKey, segment: Segment,
+                            skip: Optional[set] = None) -> None:
+        """Record crossings of one segment with grid neighbours of other wires"""
+        key = skey[0]
+        axis = _axis(segment)
+        (x1, y1), (x2, y2) = segment
+        for okey, j in self._grid.query_segment(x1, y1, x2, y2):
+            if okey == key or (skip and (okey, j) in skip):
+                continue
+            other = self._segments[okey][j]
+            other_axis = _axis(other)
+            if axis is not None and axis == other_axis:
+                continue  # parallel
+            point = _crossing(segment, other)
+            if point is not None:
+                self._record(key, okey, point, axis or 'diagonal', other_axis or 'diagonal')
+
+    def _record(self, a: Hashable, b: Hashable, point: Point, a_dir: str, b_dir: str) -> None:
+        self._crossings.setdefault(a, {}).setdefault(b, []).append((point, a_dir))
+        self._crossings.setdefault(b, {}).setdefault(a, []).append((point, b_dir))
+        self.stats['crossings'] += 1
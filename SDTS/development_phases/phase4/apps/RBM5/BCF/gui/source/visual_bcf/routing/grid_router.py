@@ -0,0 +1,314 @@
+"""
+Grid Router Module
+
+A* wire routing on a NumPy occupancy bitmap (productionized from the
+``a_start_method.py`` / ``bfs_method.py`` prototypes).
+
+The bitmap covers the bounding box of the two route endpoints plus a margin
+and is rasterized from the obstacle index, so only nearby obstacles are
+touched. The search uses orthogonal moves only; its state includes the travel
+direction so every bend costs ``bend_penalty`` extra cells, which keeps routes
+to few corners. The resulting cell path is simplified to its corner points.
+
+Straight and single-bend (L) routes are checked against the obstacle index
+first and returned without building a bitmap.
+"""
+
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import (
+    ObstacleIndex, Rect, inflate_rect, segment_intersects_rect)
+
+Point = Tuple[float, float]
+
+# Outward unit vector for a pin on each component edge
+EDGE_DIRECTIONS = {
+    'left': (-1, 0),
+    'right': (1, 0),
+    'top': (0, -1),
+    'bottom': (0, 1),
+}
+
+# Search directions: +x, +y, -x, -y
+_DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def simplify_points(points: Sequence[Point]) -> List[Point]:
+    """Drop duplicate and colinear interior points of an orthogonal polyline"""
+    result: List[Point] = []
+    for p in points:
+        if result and abs(result[-1][0] - p[0]) < 1e-9 and abs(result[-1][1] - p[1]) < 1e-9:
+            continue
+        if len(result) >= 2:
+            a, b = result[-2], result[-1]
+            if (abs(a[0] - b[0]) < 1e-9 and abs(b[0] - p[0]) < 1e-9) or \
+                    (abs(a[1] - b[1]) < 1e-9 and abs(b[1] - p[1]) < 1e-9):
+                result[-1] = p
+                continue
+        result.append(p)
+    return result
+
+
+def count_bends(points: Sequence[Point]) -> int:
+    return max(0, len(simplify_points(points)) - 2)
+
+
+def attach_endpoint(points: List[Point], end: Point) -> List[Point]:
+    """Replace the last point of an orthogonal polyline with ``end``, keeping right angles"""
+    last = points[-1]
+    if abs(last[0] - end[0]) < 1e-9 and abs(last[1] - end[1]) < 1e-9:
+        points[-1] = end
+        return points
+    if len(points) >= 3:
+        prev = points[-2]
+        if abs(prev[1] - last[1]) < 1e-9:   # final leg horizontal
+            points[-2] = (prev[0], end[1])
+        else:                                # final leg vertical
+            points[-2] = (end[0], prev[1])
+        points[-1] = end
+        return simplify_points(points)
+    # Straight route ending off-node: add a small jog half way
+    start = points[0]
+    if abs(start[1] - last[1]) < 1e-9:
+        mid = (start[0] + end[0]) / 2.0
+        return simplify_points([start, (mid, start[1]), (mid, end[1]), end])
+    mid = (start[1] + end[1]) / 2.0
+    return simplify_points([start, (start[0], mid), (end[0], mid), end])
+
+
+class GridRouter:
+    """Orthogonal A* router over a locally rasterized occupancy grid.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        grid_size: grid pitch in scene units (coarsened for very long routes)
+        clearance: inflation applied to obstacles
+        owner_clearance: smaller inflation for the components owning the
+            endpoints, so approach points just outside them stay reachable
+        bend_penalty: extra cost of a bend, in cells
+        max_cells: upper bound of the bitmap size
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, grid_size: float = 10.0,
+                 clearance: float = 30.0, owner_clearance: float = 10.0,
+                 bend_penalty: float = 4.0, margin: float = 120.0,
+                 max_cells: int = 250_000):
+        self.obstacle_index = obstacle_index
+        self.grid_size = float(grid_size)
+        self.clearance = float(clearance)
+        self.owner_clearance = float(owner_clearance)
+        self.bend_penalty = float(bend_penalty)
+        self.margin = float(margin)
+        self.max_cells = int(max_cells)
+        self.stats = {'fast_path': 0, 'searched': 0, 'failed': 0}
+
+    def for_index(self, obstacle_index: ObstacleIndex) -> "GridRouter":
+        """Router with the same settings over another obstacle index, e.g. a snapshot"""
+        return GridRouter(obstacle_index, self.grid_size, self.clearance, self.owner_clearance,
+                          self.bend_penalty, self.margin, self.max_cells)
+
+    # Obstacle helpers
+
+    def _inflation(self, key: Hashable, owners) -> float:
+        return self.owner_clearance if key in owners else self.clearance
+
+    def segment_clear(self, a: Point, b: Point, owners: Iterable[Hashable] = ()) -> bool:
+        """True if segment a-b keeps clearance from every obstacle"""
+        owners = set(owners)
+        index = self.obstacle_index
+        for key in index.query_segment(a[0], a[1], b[0], b[1], inflate=self.clearance):
+            rect = index.rect(key)
+            if rect is None:
+                continue
+            if key not in owners or segment_intersects_rect(
+                    a[0], a[1], b[0], b[1], inflate_rect(rect, self.owner_clearance)):
+                return False
+        return True
+
+    def polyline_clear(self, points: Sequence[Point], owners: Iterable[Hashable] = ()) -> bool:
+        owners = set(owners)
+        return all(self.segment_clear(points[i], points[i + 1], owners) for i in range(len(points) - 1))
+
+    # Fast path
+
+    def fast_route(self, start: Point, end: Point, start_dir: Optional[str] = None,
+                   owners: Iterable[Hashable] = ()) -> Optional[List[Point]]:
+        """Straight or L route if one is clear, else None"""
+        owners = set(owners)
+        if abs(start[0] - end[0]) < 1e-9 or abs(start[1] - end[1]) < 1e-9:
+            return [start, end] if self.segment_clear(start, end, owners) else None
+        horizontal_first = (end[0], start[1])
+        vertical_first = (start[0], end[1])
+        corners = [horizontal_first, vertical_first]
+        if start_dir in ('top', 'bottom'):
+            corners.reverse()
+        for corner in corners:
+            candidate = [start, corner, end]
+            if self.polyline_clear(candidate, owners):
+                return candidate
+        return None
+
+    # Full search
+
+    def route(self, start: Point, end: Point, start_dir: Optional[str] = None,
+              end_dir: Optional[str] = None, owners: Iterable[Hashable] = ()) -> Optional[List[Point]]:
+        """Route from ``start`` to ``end`` (approach points), returning corner points.
+
+        ``start_dir``/``end_dir`` are the pin edges ('left', 'right', 'top',
+        'bottom'); the route leaves ``start`` and enters ``end`` away from
+        those edges when it can. Returns None if no route exists.
+        """
+        owners = set(owners)
+        fast = self.fast_route(start, end, start_dir, owners)
+        if fast is not None:
+            self.stats['fast_path'] += 1
+            return fast
+
+        margin = self.margin
+        for _ in range(3):
+            path = self._search(start, end, start_dir, end_dir, owners, margin)
+            if path is not None:
+                self.stats['searched'] += 1
+                return path
+            margin *= 3
+        self.stats['failed'] += 1
+        return None
+
+    def grid_frame(self, start: Point, end: Point, margin: float):
+        x0 = min(start[0], end[0]) - margin
+        y0 = min(start[1], end[1]) - margin
+        x1 = max(start[0], end[0]) + margin
+        y1 = max(start[1], end[1]) + margin
+        cell = self.grid_size
+        while math.ceil((x1 - x0) / cell + 1) * math.ceil((y1 - y0) / cell + 1) > self.max_cells:
+            cell *= 2
+        # Align the grid so the start point is exactly on a node
+        ox = start[0] - math.ceil((start[0] - x0) / cell) * cell
+        oy = start[1] - math.ceil((start[1] - y0) / cell) * cell
+        width = int(math.ceil((x1 - ox) / cell)) + 1
+        height = int(math.ceil((y1 - oy) / cell)) + 1
+        return ox, oy, cell, width, height
+
+    def build_bitmap(self, ox: float, oy: float, cell: float, width: int, height: int,
+                     owners=()) -> np.ndarray:
+        """Occupancy bitmap (height x width, True = blocked) of the grid frame"""
+        blocked = np.zeros((height, width), dtype=bool)
+        region: Rect = (ox, oy, ox + (width - 1) * cell, oy + (height - 1) * cell)
+        index = self.obstacle_index
+        for key in index.query_rect(region, inflate=self.clearance):
+            rect = index.rect(key)
+            if rect is None:
+                continue
+            r = inflate_rect(rect, self._inflation(key, owners))
+            cx0 = max(0, int(math.ceil((r[0] - ox) / cell)))
+            cy0 = max(0, int(math.ceil((r[1] - oy) / cell)))
+            cx1 = min(width - 1, int(math.floor((r[2] - ox) / cell)))
+            cy1 = min(height - 1, int(math.floor((r[3] - oy) / cell)))
+            if cx0 <= cx1 and cy0 <= cy1:
+                blocked[cy0:cy1 + 1, cx0:cx1 + 1] = True
+        return blocked
+
+    @staticmethod
+    def _carve(blocked: np.ndarray, cx: int, cy: int, direction: Optional[Tuple[int, int]], limit: int) -> None:
+        """Free the endpoint node and an escape corridor in ``direction``"""
+        height, width = blocked.shape
+        blocked[cy, cx] = False
+        if direction is None:
+            return
+        dx, dy = direction
+        for _ in range(limit):
+            cx, cy = cx + dx, cy + dy
+            if not (0 <= cx < width and 0 <= cy < height) or not blocked[cy, cx]:
+                return
+            blocked[cy, cx] = False
+
+    def _search(self, start: Point, end: Point, start_dir, end_dir, owners, margin: float) -> Optional[List[Point]]:
+        ox, oy, cell, width, height = self.grid_frame(start, end, margin)
+        blocked = self.build_bitmap(ox, oy, cell, width, height, owners)
+
+        sx, sy = int(round((start[0] - ox) / cell)), int(round((start[1] - oy) / cell))
+        ex, ey = int(round((end[0] - ox) / cell)), int(round((end[1] - oy) / cell))
+        escape = int(math.ceil(self.clearance / cell)) + 1
+        out_start = EDGE_DIRECTIONS.get(start_dir)
+        out_end = EDGE_DIRECTIONS.get(end_dir)
+        self._carve(blocked, sx, sy, out_start, escape)
+        self._carve(blocked, ex, ey, out_end, escape)
+
+        cells = self._astar(blocked.ravel().tolist(), width, height, (sx, sy), (ex, ey),
+                            _DIRS.index(out_start) if out_start else None,
+                            _DIRS.index((-out_end[0], -out_end[1])) if out_end else None)
+        if cells is None:
+            return None
+        # Offsets from the start node keep its row and column exact
+        points = [(start[0] + (cx - sx) * cell, start[1] + (cy - sy) * cell) for cx, cy in cells]
+        return attach_endpoint(simplify_points(points), end)
+
+    def _astar(self, blocked: List[bool], width: int, height: int, start: Tuple[int, int],
+               goal: Tuple[int, int], start_dir: Optional[int],
+               goal_dir: Optional[int]) -> Optional[List[Tuple[int, int]]]:
+        """A* over (cell, direction) states with a bend penalty"""
+        bend = self.bend_penalty
+        gx, gy = goal
+        goal_cell = gy * width + gx
+        start_cell = start[1] * width + start[0]
+        if start_cell == goal_cell:
+            return [start]
+
+        best: Dict[int, float] = {}
+        parent: Dict[int, int] = {}
+        heap = []
+        counter = 0
+        initial_dirs = (start_dir,) if start_dir is not None else range(4)
+        for d in initial_dirs:
+            state = start_cell * 4 + d
+            best[state] = 0.0
+            parent[state] = -1
+            heapq.heappush(heap, (abs(start[0] - gx) + abs(start[1] - gy), counter, 0.0, state))
+            counter += 1
+
+        max_expansions = 8 * width * height
+        expansions = 0
+        while heap:
+            _, _, g, state = heapq.heappop(heap)
+            if g > best.get(state, math.inf):
+                continue
+            cell, d = divmod(state, 4)
+            if cell == goal_cell:
+                return self._unwind(parent, state, width)
+            expansions += 1
+            if expansions > max_expansions:
+                return None
+            x, y = cell % width, cell // width
+            for nd, (dx, dy) in enumerate(_DIRS):
+                if nd == (d + 2) % 4:
+                    continue  # never reverse in place
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                ncell = ny * width + nx
+                if blocked[ncell] and ncell != goal_cell:
+                    continue
+                cost = g + 1.0 + (bend if nd != d else 0.0)
+                if ncell == goal_cell and goal_dir is not None and nd != goal_dir:
+                    cost += bend
+                nstate = ncell * 4 + nd
+                if cost < best.get(nstate, math.inf):
+                    best[nstate] = cost
+                    parent[nstate] = state
+                    heapq.heappush(heap, (cost + abs(nx - gx) + abs(ny - gy), counter, cost, nstate))
+                    counter += 1
+        return None
+
+    @staticmethod
+    def _unwind(parent: Dict[int, int], state: int, width: int) -> List[Tuple[int, int]]:
+        cells = []
+        while state != -1:
+            cell = state // 4
+            cells.append((cell % width, cell // width))
+            state = parent[state]
+        cells.reverse()
+        return cells
@@ -0,0 +1,213 @@
+"""
+Obstacle Index Module
+
+Uniform-grid spatial index of component rectangles used by wire routing.
+
+Rectangles are stored as plain ``(x0, y0, x1, y1)`` tuples in scene
+coordinates, un-inflated; routing clearance is applied at query time so one
+index serves every clearance. A query only visits the grid cells overlapped by
+the query region, so its cost follows the local component density rather
+than the number of items in the scene.
+
+Updates relink several cells and notify listeners, so they hold the
+index's ``lock``. Routing worker threads do not share the live index: they
+route against a ``snapshot`` taken on the GUI thread, which never changes
+and so needs no lock.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]  # x0, y0, x1, y1
+
+
+def normalize_rect(x0: float, y0: float, x1: float, y1: float) -> Rect:
+    """Return the rect with ordered corners"""
+    return (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+
+def inflate_rect(rect: Rect, margin: float) -> Rect:
+    return (rect[0] - margin, rect[1] - margin, rect[2] + margin, rect[3] + margin)
+
+
+def rects_overlap(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def segment_intersects_rect(x1: float, y1: float, x2: float, y2: float, rect: Rect) -> bool:
+    """True if the segment touches the closed rect (Liang-Barsky clipping)"""
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - rect[0]), (dx, rect[2] - x1),
+                 (-dy, y1 - rect[1]), (dy, rect[3] - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            if t > t1:
+                return False
+            t0 = max(t0, t)
+        else:
+            if t < t0:
+                return False
+            t1 = min(t1, t)
+    return t0 <= t1
+
+
+class ObstacleIndex:
+    """Uniform grid of obstacle rectangles keyed by an arbitrary hashable key.
+
+    Listeners registered with ``add_listener`` are called as
+    ``listener(key, old_rect, new_rect)`` after every change (``old_rect`` is
+    None for an insert, ``new_rect`` None for a removal). ``version`` is
+    incremented on every change. Updates and listener calls run under
+    ``lock`` (reentrant); hold it to query the index from another thread.
+    """
+
+    def __init__(self, cell_size: float = 200.0):
+        self.cell_size = float(cell_size)
+        self._rects: Dict[Hashable, Rect] = {}
+        self._cells: Dict[Tuple[int, int], tuple] = {}
+        self._listeners: List[Callable[[Hashable, Optional[Rect], Optional[Rect]], None]] = []
+        self.version = 0
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._rects
+
+    def keys(self) -> List[Hashable]:
+        return list(self._rects)
+
+    def rect(self, key: Hashable) -> Optional[Rect]:
+        return self._rects.get(key)
+
+    def add_listener(self, listener: Callable[[Hashable, Optional[Rect], Optional[Rect]], None]) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Grid helpers
+
+    def _cell_range(self, rect: Rect) -> Iterable[Tuple[int, int]]:
+        size = self.cell_size
+        cx0, cy0 = math.floor(rect[0] / size), math.floor(rect[1] / size)
+        cx1, cy1 = math.floor(rect[2] / size), math.floor(rect[3] / size)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def _link(self, key: Hashable, rect: Rect) -> None:
+        for cell in self._cell_range(rect):
+            self._cells[cell] = self._cells.get(cell, ()) + (key,)
+
+    def _unlink(self, key: Hashable, rect: Rect) -> None:
+        for cell in self._cell_range(rect):
+            remaining = tuple(k for k in self._cells.get(cell, ()) if k != key)
+            if remaining:
+                self._cells[cell] = remaining
+            else:
+                self._cells.pop(cell, None)
+
+    def _notify(self, key: Hashable, old: Optional[Rect], new: Optional[Rect]) -> None:
+        self.version += 1
+        for listener in list(self._listeners):
+            listener(key, old, new)
+
+    # Updates
+
+    def insert(self, key: Hashable, rect: Rect) -> None:
+        """Insert or move ``key`` to ``rect`` (x0, y0, x1, y1)"""
+        rect = normalize_rect(*rect)
+        with self.lock:
+            old = self._rects.get(key)
+            if old == rect:
+                return
+            if old is not None:
+                self._unlink(key, old)
+            self._rects[key] = rect
+            self._link(key, rect)
+            self._notify(key, old, rect)
+
+    update = insert
+
+    def remove(self, key: Hashable) -> bool:
+        with self.lock:
+            old = self._rects.pop(key, None)
+            if old is None:
+                return False
+            self._unlink(key, old)
+            self._notify(key, old, None)
+            return True
+
+    def clear(self) -> None:
+        for key in list(self._rects):
+            self.remove(key)
+
+    def snapshot(self) -> "ObstacleIndex":
+        """Copy of the current rects with the same ``version`` and no listeners"""
+        with self.lock:
+            copy = ObstacleIndex(self.cell_size)
+            copy._rects = dict(self._rects)
+            copy._cells = dict(self._cells)  # cell tuples are never mutated in place
+            copy.version = self.version
+        return copy
+
+    # Queries
+
+    def _candidates(self, region: Rect) -> Iterable[Hashable]:
+        seen = set()
+        cells = self._cells
+        for cell in self._cell_range(region):
+            for key in cells.get(cell, ()):
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def query_rect(self, rect: Rect, inflate: float = 0.0) -> List[Hashable]:
+        """Keys whose rect, inflated by ``inflate``, overlaps ``rect``"""
+        region = normalize_rect(*rect)
+        search = inflate_rect(region, inflate)
+        result = []
+        for key in self._candidates(search):
+            obstacle = self._rects.get(key)
+            if obstacle is not None and rects_overlap(inflate_rect(obstacle, inflate), region):
+                result.append(key)
+        return result
+
+    def query_point(self, x: float, y: float, inflate: float = 0.0) -> List[Hashable]:
+        return self.query_rect((x, y, x, y), inflate)
+
+    def query_segment(self, x1: float, y1: float, x2: float, y2: float,
+                      inflate: float = 0.0) -> List[Hashable]:
+        """Keys whose rect, inflated by ``inflate``, is touched by the segment"""
+        search = inflate_rect(normalize_rect(x1, y1, x2, y2), inflate)
+        result = []
+        for key in self._candidates(search):
+            obstacle = self._rects.get(key)
+            if obstacle is not None and segment_intersects_rect(
+                    x1, y1, x2, y2, inflate_rect(obstacle, inflate)):
+                result.append(key)
+        return result
+
+    def segment_blocked(self, x1: float, y1: float, x2: float, y2: float,
+                        inflate: float = 0.0, ignore: Iterable[Hashable] = ()) -> bool:
+        """True if any obstacle not in ``ignore`` is touched by the segment"""
+        ignore = set(ignore)
+        search = inflate_rect(normalize_rect(x1, y1, x2, y2), inflate)
+        for key in self._candidates(search):
+            if key in ignore:
+                continue
+            obstacle = self._rects.get(key)
+            if obstacle is not None and segment_intersects_rect(
+                    x1, y1, x2, y2, inflate_rect(obstacle, inflate)):
+                return True
+        return False
@@ -0,0 +1,186 @@
+"""
+Orthogonal Path Module
+
+Qt-free geometry kernel of ``WirePath``'s heuristic routing: approach points,
+segment/rect intersection, the basic L route and the detours around
+components it crosses. Points are ``(x, y)`` tuples and rects
+``(x0, y0, x1, y1)`` tuples in scene coordinates, read from an
+``ObstacleIndex``, so the heuristic runs headless, in worker threads or in
+worker processes.
+"""
+
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import EDGE_DIRECTIONS, Point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex, Rect
+
+# Distance of a wire's approach point from its pin
+APPROACH_DISTANCE = 20.0
+
+
+def approach_point(point: Point, edge: Optional[str], distance: float = APPROACH_DISTANCE) -> Point:
+    """Point ``distance`` outward from a pin on the given component edge"""
+    direction = EDGE_DIRECTIONS.get(edge)
+    if direction is None:
+        return point
+    return (point[0] + direction[0] * distance, point[1] + direction[1] * distance)
+
+
+def segment_intersection(a1: Point, a2: Point, b1: Point, b2: Point) -> Optional[Point]:
+    """Intersection point of two bounded segments; None if parallel or apart"""
+    ax, ay = a2[0] - a1[0], a2[1] - a1[1]
+    bx, by = b1[0] - b2[0], b1[1] - b2[1]
+    cx, cy = a1[0] - b1[0], a1[1] - b1[1]
+    denominator = ay * bx - ax * by
+    if denominator == 0:
+        return None
+    na = (by * cx - bx * cy) / denominator
+    nb = (ax * cy - ay * cx) / denominator
+    if 0.0 <= na <= 1.0 and 0.0 <= nb <= 1.0:
+        return (a1[0] + ax * na, a1[1] + ay * na)
+    return None
+
+
+def rect_edges(rect: Rect) -> List[Tuple[str, Point, Point]]:
+    """The four edges of a rect as (name, start, end), clockwise from the top"""
+    x0, y0, x1, y1 = rect
+    return [('top', (x0, y0), (x1, y0)),
+            ('right', (x1, y0), (x1, y1)),
+            ('bottom', (x1, y1), (x0, y1)),
+            ('left', (x0, y1), (x0, y0))]
+
+
+def segment_rect_crossing(a: Point, b: Point, rect: Rect) -> Tuple[Optional[Point], Optional[str]]:
+    """First rect edge crossed by the segment, as (point, edge name)"""
+    for edge, e1, e2 in rect_edges(rect):
+        point = segment_intersection(a, b, e1, e2)
+        if point is not None:
+            return point, edge
+    return None, None
+
+
+class OrthogonalRouter:
+    """Heuristic orthogonal routing between two approach points.
+
+    Tries both single-bend routes, then detours around each component whose
+    clearance box a segment touches.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        clearance: distance kept from components by detours
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, clearance: float = 30.0):
+        self.obstacle_index = obstacle_index
+        self.clearance = float(clearance)
+
+    def route(self, start: Point, end: Point) -> List[Point]:
+        """Corner points from ``start`` to ``end``, both included"""
+        return self.avoid_obstacles(self.basic_path(start, end))
+
+    def obstacle_at(self, point: Point) -> Optional[Hashable]:
+        hits = self.obstacle_index.query_point(point[0], point[1])
+        return hits[0] if hits else None
+
+    def obstacles_crossed(self, a: Point, b: Point) -> List[Hashable]:
+        """Obstacles whose clearance box the segment touches, in travel order"""
+        index = self.obstacle_index
+        crossed = []
+        for key in index.query_segment(a[0], a[1], b[0], b[1], inflate=self.clearance):
+            rect = index.rect(key)
+            if rect is not None:  # may have been removed meanwhile
+                crossed.append((key, rect))
+        if a[1] == b[1]:
+            crossed.sort(key=lambda item: item[1][0])
+        else:
+            crossed.sort(key=lambda item: item[1][1], reverse=a[1] > b[1])
+        return [key for key, _ in crossed]
+
+    def segment_blocked(self, a: Point, b: Point) -> bool:
+        return bool(self.obstacles_crossed(a, b))
+
+    # Basic route
+
+    def basic_path(self, start: Point, end: Point) -> List[Point]:
+        """Single-bend route, or a detour around the component at its corner"""
+        corner = None
+        for corner in ((end[0], start[1]), (start[0], end[1])):
+            if self.obstacle_at(corner) is None:
+                return [start, corner, end]
+        rect = self.obstacle_index.rect(self.obstacle_at(corner))
+        point, edge = segment_rect_crossing(start, corner, rect)
+        if edge is None:
+            return [start, corner, end]
+        return self._edge_detour(start, end, point, edge, rect)
+
+    def _edge_detour(self, start: Point, end: Point, point: Point, edge: str, rect: Rect) -> List[Point]:
+        x0, y0, x1, y1 = rect
+        c = self.clearance
+        if edge in ('left', 'right'):
+            p1 = (x0 - c if edge == 'left' else x1 + c, point[1])
+            p2 = (p1[0], y1 + c if start[1] < end[1] else y0 - c)
+            p3 = ((x0 + x1) / 2.0, p2[1])
+        else:
+            p1 = (point[0], y0 - c if edge == 'top' else y1 + c)
+            p2 = (x1 + c if start[0] < end[0] else x0 - c, p1[1])
+            p3 = (p2[0], (y0 + y1) / 2.0)
+        return [start, p1, p2, p3, end]
+
+    # Detours
+
+    def avoid_obstacles(self, points: Sequence[Point]) -> List[Point]:
+        """Insert detours around components crossed by any segment"""
+        result = [points[0]]
+        for i in range(len(points) - 1):
+            a, b = points[i], points[i + 1]
+            for p in self._detour(a, b, self.obstacles_crossed(a, b)):
+                if result[-1] != p:
+                    result.append(p)
+            if result[-1] != b:
+                result.append(b)
+        return result
+
+    def _detour(self, a: Point, b: Point, keys: Sequence[Hashable]) -> List[Point]:
+        """Intermediate points taking segment a-b around each crossed component"""
+        points: List[Point] = []
+        for key in keys:
+            rect = self.obstacle_index.rect(key)
+            if rect is None:
+                continue
+            point, _ = segment_rect_crossing(a, b, rect)
+            if point is not None:
+                if b[0] - a[0] == 0:
+                    points += self._vertical_detour(a, b, rect, point)
+                else:
+                    points += self._horizontal_detour(a, b, rect, point)
+                a = points[-1]
+        return points
+
+    def _vertical_detour(self, a: Point, b: Point, rect: Rect, point: Point) -> List[Point]:
+        x0, y0, x1, y1 = rect
+        c = self.clearance
+        left_distance = abs(x0 - point[0])
+        right_distance = abs(x1 - point[0])
+        if a[1] < b[1]:
+            p1 = (point[0], y0 - c)
+            p2 = (x0 - c if left_distance <= right_distance else x1 + c, p1[1])
+            p3 = (p2[0], y1 + c)
+        else:
+            p1 = (point[0], y1 + c)
+            p2 = (x0 - c if left_distance < right_distance else x1 + c, p1[1])
+            p3 = (p2[0], y0 - c)
+        return [p1, p2, p3, (p1[0], p3[1])]
+
+    def _horizontal_detour(self, a: Point, b: Point, rect: Rect, point: Point) -> List[Point]:
+        x0, y0, x1, y1 = rect
+        c = self.clearance
+        above = abs(y0 - point[1]) < abs(y1 - point[1])
+        if a[0] < b[0]:
+            p1 = (x0 - c, point[1])
+            p2 = (p1[0], y0 - c if above else y1 + c)
+            p3 = (x1 + c, p2[1])
+        else:
+            p1 = (x1 + c, point[1])
+            p2 = (p1[0], y0 - c if above else y1 + c)
+            p3 = (x0 - c, p2[1])
+        return [p1, p2, p3, (p3[0], p1[1])]
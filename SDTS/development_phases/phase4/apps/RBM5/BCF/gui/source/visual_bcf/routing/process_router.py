@@ -0,0 +1,150 @@
+"""
+Process Router Module
+
+Routes large batches of nets on a pool of worker processes, so re-routing
+thousands of wires uses every core instead of one GIL-bound interpreter.
+
+The obstacle set is published once per obstacle index version as a
+``multiprocessing.shared_memory`` float64 array of ``(x0, y0, x1, y1)``
+rows. A job only carries the shared memory name, the version and a chunk of
+endpoint tuples; owners travel as row numbers. Each worker rebuilds its
+``GridRouter`` when it sees a new version and returns plain corner lists.
+
+Nets are routed independently with the grid router; unlike ``BatchRouter``
+there is no congestion negotiation between them, and bus corridors (nets
+with ``lanes``) are not accepted. Its routes are meant as the first pass of a
+``BatchRouter`` (``route_all(nets, initial=...)``), which then re-routes the
+nets that overlap.
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.batch_router import Net
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import GridRouter, Point
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex
+
+# Worker-side router, rebuilt when the published obstacle set changes
+_worker = {'name': None, 'router': None}
+
+
+def _worker_router(name: str, count: int, cell_size: float, config: dict) -> GridRouter:
+    if _worker['name'] != name:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            rects = np.ndarray((count, 4), dtype=np.float64, buffer=shm.buf).tolist()
+        finally:
+            shm.close()
+        index = ObstacleIndex(cell_size=cell_size)
+        for row, rect in enumerate(rects):
+            index.insert(row, tuple(rect))
+        _worker['name'] = name
+        _worker['router'] = GridRouter(index, **config)
+    return _worker['router']
+
+
+def _route_chunk(name: str, count: int, cell_size: float, config: dict,
+                 jobs: Sequence[tuple]) -> List[Tuple[int, Optional[List[Point]]]]:
+    """Route ``(job id, start, end, start_dir, end_dir, owner rows)`` tuples"""
+    router = _worker_router(name, count, cell_size, config)
+    return [(job_id, router.route(start, end, start_dir, end_dir, owners))
+            for job_id, start, end, start_dir, end_dir, owners in jobs]
+
+
+class ProcessRouter:
+    """Grid routing of net batches on a process pool.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        workers: number of worker processes (default: CPU count)
+        chunks_per_worker: jobs are split into this many chunks per worker
+        grid_size, clearance, owner_clearance, bend_penalty, margin,
+        max_cells: passed to the workers' GridRouter
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, workers: Optional[int] = None,
+                 chunks_per_worker: int = 4, grid_size: float = 10.0, clearance: float = 30.0,
+                 owner_clearance: float = 10.0, bend_penalty: float = 4.0,
+                 margin: float = 120.0, max_cells: int = 250_000):
+        self.obstacle_index = obstacle_index
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.chunks_per_worker = max(1, int(chunks_per_worker))
+        self.config = {'grid_size': grid_size, 'clearance': clearance,
+                       'owner_clearance': owner_clearance, 'bend_penalty': bend_penalty,
+                       'margin': margin, 'max_cells': max_cells}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._shm_version: Optional[int] = None
+        self._rows: Dict[Hashable, int] = {}
+        self.stats = {'nets': 0, 'routed': 0, 'failed': 0, 'chunks': 0, 'workers': self.workers,
+                      'seconds': 0.0}
+
+    def _publish(self) -> Tuple[str, int]:
+        """Write the obstacle rects to shared memory if the index changed"""
+        index = self.obstacle_index
+        if self._shm is None or self._shm_version != index.version:
+            version = index.version
+            keys = index.keys()
+            rects = np.array([index.rect(key) for key in keys], dtype=np.float64).reshape(-1, 4)
+            shm = shared_memory.SharedMemory(create=True, size=max(rects.nbytes, 1))
+            np.ndarray(rects.shape, dtype=np.float64, buffer=shm.buf)[:] = rects
+            self._release_shm()
+            self._shm, self._shm_version = shm, version
+            self._rows = {key: row for row, key in enumerate(keys)}
+        return self._shm.name, len(self._rows)
+
+    def _release_shm(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the GUI process' Qt state
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=get_context("spawn"))
+        return self._executor
+
+    def route_all(self, nets: Sequence[Net]) -> Dict[Hashable, Optional[List[Point]]]:
+        """Route every net independently; returns {net key: corner points or None}"""
+        began = time.perf_counter()
+        self.stats = {'nets': len(nets), 'routed': 0, 'failed': 0, 'chunks': 0,
+                      'workers': self.workers, 'seconds': 0.0}
+        if not nets:
+            return {}
+        if any(net.lanes for net in nets):
+            raise ValueError("Bus corridors need the BatchRouter; ProcessRouter routes plain nets")
+
+        name, count = self._publish()
+        jobs = [(i, net.start, net.end, net.start_dir, net.end_dir,
+                 tuple(self._rows[o] for o in net.owners if o in self._rows))
+                for i, net in enumerate(nets)]
+        size = max(1, math.ceil(len(jobs) / (self.workers * self.chunks_per_worker)))
+        pool = self._pool()
+        futures = [pool.submit(_route_chunk, name, count, self.obstacle_index.cell_size,
+                               self.config, jobs[i:i + size])
+                   for i in range(0, len(jobs), size)]
+        self.stats['chunks'] = len(futures)
+
+        results: Dict[Hashable, Optional[List[Point]]] = {}
+        for future in futures:
+            for job_id, points in future.result():
+                results[nets[job_id].key] = points
+                self.stats['routed' if points is not None else 'failed'] += 1
+        self.stats['seconds'] = time.perf_counter() - began
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes and free the shared obstacle array"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._release_shm()
+        self._shm_version = None
@@ -0,0 +1,181 @@
+"""
+Route Cache Module
+
+Memoizes router output so repeated routing of an unchanged wire (wire
+creation, ``update_path``, intersection recalculation and the final pass of a
+scene load all route the same connection) costs one dictionary lookup.
+
+Entries are keyed on the routing engine, both approach points and both pin
+edges. Instead of a single obstacle-set version, which would drop every
+route whenever any component moves, each entry records the region its route
+depends on: the route's bounding box grown by a margin. The cache listens to
+the obstacle index and drops only the entries whose region overlaps the old
+or new rect of a changed obstacle, so the remaining entries are valid for the
+current obstacle set.
+
+The same region defines a route's signature (see ``route_signature``), which
+lets a saved route be reused when a scene is reopened without rerouting.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import ObstacleIndex, Rect, inflate_rect
+
+Point = Tuple[float, float]
+RouteKey = Tuple[str, Point, Point, Optional[str], Optional[str]]
+
+
+def route_key(engine: str, start: Point, end: Point, start_dir: Optional[str],
+              end_dir: Optional[str]) -> RouteKey:
+    """Cache key for a route between two approach points"""
+    return (engine, (round(start[0], 3), round(start[1], 3)),
+            (round(end[0], 3), round(end[1], 3)), start_dir, end_dir)
+
+
+def route_signature(engine: str, start: Point, end: Point, start_dir: Optional[str], end_dir: Optional[str],
+                    points: Sequence[Point], obstacle_index: ObstacleIndex, margin: float = 60.0) -> str:
+    """Hash of a route's endpoints and corners and of the obstacles near it.
+
+    A stored route is still valid while the signature computed for the
+    current scene matches the stored one: the engine, endpoints and corners
+    are unchanged and no obstacle within ``margin`` of the route has moved,
+    appeared or gone.
+    """
+    def rounded(values):
+        return tuple(round(float(v), 3) for v in values)
+
+    corners = [start] + list(points) + [end]
+    region = (min(p[0] for p in corners), min(p[1] for p in corners),
+              max(p[0] for p in corners), max(p[1] for p in corners))
+    obstacles = sorted(rounded(obstacle_index.rect(key))
+                       for key in obstacle_index.query_rect(region, margin))
+    payload = repr((engine, start_dir, end_dir, [rounded(p) for p in corners], obstacles))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class RouteRequest(NamedTuple):
+    """Plain routing inputs captured from a wire on the GUI thread"""
+    engine: str
+    start: Point
+    end: Point
+    start_dir: Optional[str]
+    end_dir: Optional[str]
+    owners: tuple
+
+
+def run_route_request(router, cache: Optional["RouteCache"], request: RouteRequest) -> Optional[List[Point]]:
+    """Route a request through the cache; safe to call from worker threads.
+
+    Worker threads pass a router over an obstacle index snapshot (see
+    ``ObstacleIndex.snapshot``), so no lock is held while routing. A route
+    computed against a version the scene has moved past is not cached.
+    """
+    key = route_key(request.engine, request.start, request.end, request.start_dir, request.end_dir)
+    points = cache.get(key) if cache is not None else None
+    if points is not None:
+        return points
+    version = router.obstacle_index.version
+    points = router.route(request.start, request.end, request.start_dir, request.end_dir, request.owners)
+    if points is not None and cache is not None:
+        cache.put(key, points, version)
+    return points
+
+
+def fast_route_request(router, cache: Optional["RouteCache"], request: RouteRequest) -> Optional[List[Point]]:
+    """Route a request from the cache or the router's straight/L fast path only.
+
+    Returns None when the request needs a full search, so callers working to
+    a frame budget can defer it. Call from the GUI thread.
+    """
+    key = route_key(request.engine, request.start, request.end, request.start_dir, request.end_dir)
+    points = cache.get(key) if cache is not None else None
+    if points is not None:
+        return points
+    fast_route = getattr(router, "fast_route", None)
+    if fast_route is None:
+        return None
+    return fast_route(request.start, request.end, request.start_dir, request.owners)
+
+
+class RouteCache:
+    """LRU cache of routed corner lists with spatial invalidation.
+
+    Args:
+        obstacle_index: ObstacleIndex whose changes invalidate entries
+        margin: distance around a route within which obstacle changes
+            invalidate it (at least the routing clearance)
+        max_entries: LRU capacity
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, margin: float = 60.0, max_entries: int = 4096):
+        self.obstacle_index = obstacle_index
+        self.margin = float(margin)
+        self.max_entries = int(max_entries)
+        self._routes: "OrderedDict[RouteKey, Tuple[Point, ...]]" = OrderedDict()
+        self._regions = ObstacleIndex(cell_size=obstacle_index.cell_size)
+        # Routes are looked up from wire calculation threads as well
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'invalidated': 0}
+        obstacle_index.add_listener(self._on_obstacle_changed)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def detach(self) -> None:
+        """Stop following the obstacle index"""
+        self.obstacle_index.remove_listener(self._on_obstacle_changed)
+
+    def get(self, key: RouteKey) -> Optional[List[Point]]:
+        with self._lock:
+            points = self._routes.get(key)
+            if points is None:
+                self.stats['misses'] += 1
+                return None
+            self._routes.move_to_end(key)
+            self.stats['hits'] += 1
+            return list(points)
+
+    def put(self, key: RouteKey, points: Sequence[Point], version: Optional[int] = None) -> bool:
+        """Store a route; skipped if the obstacle index moved past ``version``
+
+        ``version`` is the obstacle index version read before routing started,
+        so a route computed against a stale obstacle set is never stored.
+        """
+        if not points:
+            return False
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        region = inflate_rect((min(xs), min(ys), max(xs), max(ys)), self.margin)
+        with self._lock:
+            if version is not None and version != self.obstacle_index.version:
+                return False
+            self._routes[key] = tuple(points)
+            self._routes.move_to_end(key)
+            self._regions.insert(key, region)
+            while len(self._routes) > self.max_entries:
+                old_key, _ = self._routes.popitem(last=False)
+                self._regions.remove(old_key)
+        return True
+
+    def invalidate_region(self, rect: Rect) -> int:
+        """Drop entries whose route region overlaps ``rect``; returns the count"""
+        with self._lock:
+            keys = self._regions.query_rect(rect)
+            for key in keys:
+                self._routes.pop(key, None)
+                self._regions.remove(key)
+            self.stats['invalidated'] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._regions.clear()
+
+    def _on_obstacle_changed(self, key: Hashable, old: Optional[Rect], new: Optional[Rect]) -> None:
+        for rect in (old, new):
+            if rect is not None:
+                self.invalidate_region(rect)
@@ -0,0 +1,92 @@
+"""
+Steiner Module
+
+Multi-pin nets drawn as rectilinear Steiner trees.
+
+Connections are stored as two-pin rows, so a source pin driving k loads is
+routed as k wires leaving the same pin. The batch router lets the wires of
+one net share track at a discount (``BatchRouter.share_factor``), so their
+routes leave the source together and split where their loads diverge; the
+routes form a rectilinear Steiner tree whose Steiner points are the splits.
+
+``steiner_branches`` recovers that tree from the routes. Taking the routes in
+order, each adds only its part from where it leaves the routes before it,
+starting at a junction on the tree. Drawing and hit-testing the branches
+instead of the whole routes leaves every shared segment with one owner, and
+each junction is where a branch joins the tree.
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point
+
+Segment = Tuple[Point, Point]
+
+
+def _close(a: Point, b: Point, tolerance: float) -> bool:
+    return abs(a[0] - b[0]) <= tolerance and abs(a[1] - b[1]) <= tolerance
+
+
+def covered_prefix(a: Point, b: Point, tree: Sequence[Segment], tolerance: float = 1e-6) -> float:
+    """Largest t such that a->b lies on the tree segments from a up to parameter t.
+
+    Only colinear overlaps cover a segment; crossings and touching corners do
+    not. Returns 0.0 when a itself is not on the tree.
+    """
+    ux, uy = b[0] - a[0], b[1] - a[1]
+    length2 = ux * ux + uy * uy
+    if length2 == 0:
+        return 1.0
+    scale = length2 ** 0.5
+    slack = tolerance / scale
+    intervals = []
+    for (cx, cy), (dx, dy) in tree:
+        # Both ends of a colinear segment lie on the line through a and b
+        if (abs(ux * (cy - a[1]) - uy * (cx - a[0])) > tolerance * scale
+                or abs(ux * (dy - a[1]) - uy * (dx - a[0])) > tolerance * scale):
+            continue
+        tc = (ux * (cx - a[0]) + uy * (cy - a[1])) / length2
+        td = (ux * (dx - a[0]) + uy * (dy - a[1])) / length2
+        intervals.append((min(tc, td), max(tc, td)))
+    reach = 0.0
+    for low, high in sorted(intervals):
+        if low > reach + slack:
+            break
+        reach = max(reach, high)
+    return min(1.0, reach)
+
+
+def steiner_branches(routes: Sequence[Tuple[Hashable, Sequence[Point]]],
+                     tolerance: float = 1e-6) -> Dict[Hashable, Tuple[List[Point], Optional[Point]]]:
+    """Branch and junction of each route of one net, in the given order.
+
+    Every route starts at the net's source. The branch is the part of the
+    route from where it first leaves the routes before it; the junction is
+    that point, or None where the branch starts at the source. A route
+    lying entirely on the tree has an empty branch.
+    """
+    tree: List[Segment] = []
+    result: Dict[Hashable, Tuple[List[Point], Optional[Point]]] = {}
+    for key, points in routes:
+        points = [tuple(p) for p in points]
+        points = [p for n, p in enumerate(points) if n == 0 or not _close(p, points[n - 1], tolerance)]
+        branch: List[Point] = []
+        junction = None
+        for i, (a, b) in enumerate(zip(points, points[1:])):
+            t = covered_prefix(a, b, tree, tolerance) if tree else 0.0
+            if t >= 1.0:
+                continue
+            point = (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+            branch = [point] + points[i + 1:]
+            if i > 0 or t > 0:
+                junction = point
+            break
+        tree.extend(zip(branch, branch[1:]))
+        result[key] = (branch, junction)
+    return result
+
+
+def tree_length(branches: Dict[Hashable, Tuple[List[Point], Optional[Point]]]) -> float:
+    """Total length of the drawn branches of a net"""
+    return sum(abs(b[0] - a[0]) + abs(b[1] - a[1])
+               for branch, _ in branches.values() for a, b in zip(branch, branch[1:]))
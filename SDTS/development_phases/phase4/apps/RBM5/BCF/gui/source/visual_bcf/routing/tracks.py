@@ -0,0 +1,355 @@
+"""
+Tracks Module
+
+Global lane assignment for colinear wire segments, replacing per-wire jog
+decisions that queried the scene for every segment and depended on the
+order in which wires were routed.
+
+Every horizontal segment belongs to the channel of its y coordinate and
+every vertical segment to the channel of its x coordinate. Within a
+channel, segments whose intervals overlap must not share a lane. Sorting
+the intervals by start and giving each the lowest free lane colours the
+interval-overlap graph with the minimum number of lanes. Each cluster of
+overlapping segments then orders its lanes so that wires turning off the
+channel do not cut across each other (see ``turn_order``) and spreads them
+evenly around the channel, so parallel buses get stable, evenly spaced
+lanes regardless of routing order. Overlapping segments of wires on the same
+``net`` (wires driven by one source pin) share a lane, so a fan-out net is
+not jogged apart but keeps one trunk.
+
+Changing one wire reassigns only the channels its old and new segments
+lie in, and reports the other wires whose lanes moved.
+
+``offset_route`` shifts a whole route onto a parallel lane, which is how
+the wires of a routed bus are derived from its corridor.
+"""
+
+import heapq
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import Point, simplify_points
+
+Channel = Tuple[str, int]  # ('h', quantized y) or ('v', quantized x)
+SegmentKey = Tuple[Hashable, int]  # wire key, segment number
+Order = Tuple[float, float]
+
+
+def _turn_key(points: Sequence[Point], i: int) -> Tuple[float, List[Tuple[float, int]]]:
+    """Turn term of segment i and its (sign, neighbour segment) pairs"""
+    along, across = (0, 1) if points[i][1] == points[i + 1][1] else (1, 0)
+    low = min(points[i][along], points[i + 1][along])
+    key = 0.0
+    neighbours = []
+    for end, other, neighbour in ((i, i - 1, i - 1), (i + 1, i + 2, i + 1)):
+        if not 0 <= other < len(points):
+            continue
+        d = points[other][across] - points[end][across]
+        d = (d > 0) - (d < 0)
+        # The turn at the low end counts up, the one at the high end down
+        sign = d if points[end][along] == low else -d
+        key += sign * points[end][along]
+        neighbours.append((sign, neighbour))
+    return key, neighbours
+
+
+def turn_order(points: Sequence[Point], i: int) -> Order:
+    """Lane order key of segment i; smaller keys take lanes nearer to -x / -y.
+
+    A wire turning off the channel towards +y (or +x) at its low end belongs
+    nearer -y (or -x) the earlier it turns, and the reverse at its high end,
+    so lanes ordered by this key do not cross the turning wires. Wires
+    turning at the same corner are ordered by their neighbouring segments.
+    """
+    key, neighbours = _turn_key(points, i)
+    tie = 0.0
+    for sign, j in neighbours:
+        if 0 <= j < len(points) - 1:
+            tie += sign * _turn_key(points, j)[0]
+    return key, tie
+
+
+def apply_lane_offsets(points: Sequence[Point], offsets: Sequence[float],
+                       start_edge: Optional[str] = None, end_edge: Optional[str] = None) -> List[Point]:
+    """Shift each segment of an orthogonal path by its lane offset.
+
+    Horizontal segments move along y and vertical ones along x; corners take
+    the offsets of both adjacent segments. The first and last points stay put
+    and are joined to the shifted path by a short jog leaving along the pin
+    edge's axis.
+    """
+    n = len(points)
+    if n < 2:
+        return list(points)
+
+    def corner_offset(j: int) -> Tuple[float, float]:
+        dx = dy = 0.0
+        for i in (j - 1, j):
+            if 0 <= i < n - 1 and offsets[i]:
+                (x1, y1), (x2, y2) = points[i], points[i + 1]
+                if y1 == y2 and x1 != x2:
+                    dy = dy or offsets[i]
+                elif x1 == x2:
+                    dx = dx or offsets[i]
+        return dx, dy
+
+    def jog(point: Point, dx: float, dy: float, edge: Optional[str], leaving: bool) -> List[Point]:
+        x, y = point
+        if not dx and not dy:
+            return []
+        # Leave or enter along the pin edge's axis before the perpendicular shift
+        if (edge or 'left') in ('left', 'right'):
+            first = (x + dx, y) if dx else None
+        else:
+            first = (x, y + dy) if dy else None
+        shifted = (x + dx, y + dy)
+        steps = [p for p in (first, shifted) if p is not None]
+        return steps if leaving else list(reversed(steps))
+
+    start, end = points[0], points[-1]
+    result = [start]
+    result += jog(start, *corner_offset(0), start_edge, True)
+    for j in range(1, n - 1):
+        dx, dy = corner_offset(j)
+        result.append((points[j][0] + dx, points[j][1] + dy))
+    result += jog(end, *corner_offset(n - 1), end_edge, False)
+    result.append(end)
+
+    deduped = [result[0]]
+    for p in result[1:]:
+        if p != deduped[-1]:
+            deduped.append(p)
+    return deduped
+
+
+def lane_normal(direction: Tuple[float, float]) -> Tuple[float, float]:
+    """Lane normal of a travel direction: +x travel has its lanes along +y"""
+    return (-direction[1], direction[0])
+
+
+def _direction(a: Point, b: Point) -> Tuple[int, int]:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    return ((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))
+
+
+def offset_route(points: Sequence[Point], offset: float, keep_below: float = 0.0) -> Optional[List[Point]]:
+    """Orthogonal route shifted sideways by ``offset`` along each segment's lane normal.
+
+    Interior segments shorter than ``keep_below`` whose neighbours run the
+    same way are jogs and stay in place. Returns None if a segment would
+    vanish or reverse, i.e. the lane does not fit around a corner.
+    """
+    points = simplify_points(points)
+    if len(points) < 2:
+        return None
+    directions = [_direction(a, b) for a, b in zip(points, points[1:])]
+    shifts = []
+    for i, d in enumerate(directions):
+        length = abs(points[i + 1][0] - points[i][0]) + abs(points[i + 1][1] - points[i][1])
+        if 0 < i < len(directions) - 1 and directions[i - 1] == directions[i + 1] and length < keep_below:
+            shifts.append((0.0, 0.0))
+            continue
+        normal = lane_normal(d)
+        shifts.append((normal[0] * offset, normal[1] * offset))
+
+    shifted = []
+    for j, (x, y) in enumerate(points):
+        dx = dy = 0.0
+        for i in (j - 1, j):
+            if 0 <= i < len(shifts):
+                dx = dx or shifts[i][0]
+                dy = dy or shifts[i][1]
+        shifted.append((x + dx, y + dy))
+
+    for i, d in enumerate(directions):
+        if _direction(shifted[i], shifted[i + 1]) != d:
+            return None
+    return shifted
+
+
+class TrackAssigner:
+    """Lanes for wire segments sharing horizontal or vertical channels.
+
+    Wires are identified by any hashable key and registered with their
+    unshifted orthogonal corner points.
+
+    Args:
+        spacing: distance between adjacent lanes
+        tolerance: coordinates closer than this share a channel, and
+            intervals must overlap by more than this to need separate lanes
+    """
+
+    def __init__(self, spacing: float = 10.0, tolerance: float = 1.0):
+        self.spacing = float(spacing)
+        self.tolerance = float(tolerance)
+        # key -> (points, start edge, end edge, channel of each segment)
+        self._wires: Dict[Hashable, Tuple[List[Point], Optional[str], Optional[str], List[Optional[Channel]]]] = {}
+        # channel -> segment -> (low, high, lane order, net)
+        self._channels: Dict[Channel, Dict[SegmentKey, Tuple[float, float, Order, Hashable]]] = {}
+        self._offsets: Dict[SegmentKey, float] = {}
+        self.stats = {'updates': 0, 'channels_assigned': 0}
+
+    def __len__(self) -> int:
+        return len(self._wires)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._wires
+
+    def clear(self) -> None:
+        self._wires.clear()
+        self._channels.clear()
+        self._offsets.clear()
+
+    # Queries
+
+    def points(self, key: Hashable) -> Optional[List[Point]]:
+        """Registered (unshifted) points of a wire"""
+        entry = self._wires.get(key)
+        return list(entry[0]) if entry else None
+
+    def offsets(self, key: Hashable) -> List[float]:
+        """Lane offset of each segment of a wire"""
+        entry = self._wires.get(key)
+        if entry is None:
+            return []
+        return [self._offsets.get((key, i), 0.0) for i in range(len(entry[3]))]
+
+    def jogged_points(self, key: Hashable) -> Optional[List[Point]]:
+        """Points of a wire with its segments moved onto their lanes"""
+        entry = self._wires.get(key)
+        if entry is None:
+            return None
+        points, start_edge, end_edge, _ = entry
+        return apply_lane_offsets(points, self.offsets(key), start_edge, end_edge)
+
+    # Updates
+
+    def update_wire(self, key: Hashable, points: Sequence[Point], start_edge: Optional[str] = None,
+                    end_edge: Optional[str] = None, net: Hashable = None) -> Set[Hashable]:
+        """Register or replace one wire; returns the other wires whose lanes changed.
+
+        Wires with the same non-None ``net`` may share lanes.
+        """
+        touched = self._drop(key) | self._store(key, points, start_edge, end_edge, net)
+        self.stats['updates'] += 1
+        return self._reassign(touched) - {key}
+
+    def remove_wire(self, key: Hashable) -> Set[Hashable]:
+        """Unregister one wire; returns the other wires whose lanes changed"""
+        return self._reassign(self._drop(key)) - {key}
+
+    def rebuild(self, wires: Iterable[Tuple]) -> None:
+        """Replace all wires, given as update_wire arguments, and assign every channel once"""
+        self.clear()
+        for wire in wires:
+            self._store(*wire)
+        self._reassign(set(self._channels))
+
+    # Helpers
+
+    def _store(self, key: Hashable, points: Sequence[Point], start_edge: Optional[str] = None,
+               end_edge: Optional[str] = None, net: Hashable = None) -> Set[Channel]:
+        points = [(float(x), float(y)) for x, y in points]
+        channels: List[Optional[Channel]] = []
+        for i in range(len(points) - 1):
+            channel, low, high = self._channel_of(points[i], points[i + 1])
+            channels.append(channel)
+            if channel is not None:
+                self._channels.setdefault(channel, {})[(key, i)] = (low, high, turn_order(points, i), net)
+        self._wires[key] = (points, start_edge, end_edge, channels)
+        return {channel for channel in channels if channel is not None}
+
+    def _channel_of(self, a: Point, b: Point) -> Tuple[Optional[Channel], float, float]:
+        (x1, y1), (x2, y2) = a, b
+        if y1 == y2 and x1 != x2:
+            return ('h', round(y1 / self.tolerance)), min(x1, x2), max(x1, x2)
+        if x1 == x2 and y1 != y2:
+            return ('v', round(x1 / self.tolerance)), min(y1, y2), max(y1, y2)
+        return None, 0.0, 0.0
+
+    def _drop(self, key: Hashable) -> Set[Channel]:
+        entry = self._wires.pop(key, None)
+        if entry is None:
+            return set()
+        dropped = set()
+        for i, channel in enumerate(entry[3]):
+            self._offsets.pop((key, i), None)
+            if channel is None:
+                continue
+            segments = self._channels.get(channel)
+            if segments is not None:
+                segments.pop((key, i), None)
+                if not segments:
+                    del self._channels[channel]
+            dropped.add(channel)
+        return dropped
+
+    def _reassign(self, channels: Set[Channel]) -> Set[Hashable]:
+        """Recolour the given channels; returns the wires whose offsets changed"""
+        changed = set()
+        for channel in channels:
+            for skey, offset in self._assign_channel(self._channels.get(channel, {})).items():
+                if self._offsets.get(skey, 0.0) != offset:
+                    changed.add(skey[0])
+                if offset:
+                    self._offsets[skey] = offset
+                else:
+                    self._offsets.pop(skey, None)
+            self.stats['channels_assigned'] += 1
+        return changed
+
+    def _assign_channel(self, segments: Dict[SegmentKey, Tuple[float, float, Order, Hashable]]
+                        ) -> Dict[SegmentKey, float]:
+        """Interval-graph colouring of one channel, centred per overlap cluster"""
+        intervals = sorted((low, order, high, n, skey, net)
+                           for n, (skey, (low, high, order, net)) in enumerate(segments.items()))
+        offsets: Dict[SegmentKey, float] = {}
+        tol = self.tolerance
+        active: List[Tuple[float, int]] = []  # (high, lane)
+        holders: Dict[int, int] = {}  # lane -> active segments on it
+        lane_nets: Dict[int, Hashable] = {}  # lane -> net of its active segments
+        free: List[int] = []
+        cluster: List[Tuple[SegmentKey, int, Order]] = []
+        lanes_used = 0
+
+        def close_cluster():
+            if not cluster:
+                return
+            orders: Dict[int, List[Order]] = {}
+            for _, lane, order in cluster:
+                orders.setdefault(lane, []).append(order)
+
+            def mean_order(lane):
+                keys = orders[lane]
+                return sum(k for k, _ in keys) / len(keys), sum(t for _, t in keys) / len(keys), lane
+            ranked = sorted(orders, key=mean_order)
+            rank = {lane: r for r, lane in enumerate(ranked)}
+            center = (len(ranked) - 1) / 2.0
+            for skey, lane, _ in cluster:
+                offsets[skey] = (rank[lane] - center) * self.spacing
+            cluster.clear()
+
+        for low, order, high, _, skey, net in intervals:
+            while active and active[0][0] <= low + tol:
+                lane = heapq.heappop(active)[1]
+                holders[lane] -= 1
+                if not holders[lane]:
+                    lane_nets.pop(lane, None)
+                    heapq.heappush(free, lane)
+            if not active:
+                close_cluster()
+                free.clear()
+                lanes_used = 0
+            shared = [lane for lane, lane_net in lane_nets.items() if net is not None and lane_net == net]
+            if shared:
+                lane = min(shared)
+            elif free:
+                lane = heapq.heappop(free)
+            else:
+                lane = lanes_used
+                lanes_used += 1
+            holders[lane] = holders.get(lane, 0) + 1
+            lane_nets[lane] = net
+            heapq.heappush(active, (high, lane))
+            cluster.append((skey, lane, order))
+        close_cluster()
+        return offsets
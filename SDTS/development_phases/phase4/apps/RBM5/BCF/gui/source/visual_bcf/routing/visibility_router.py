@@ -0,0 +1,257 @@
+"""
+Visibility Router Module
+
+Orthogonal visibility-graph routing for large, sparse sheets.
+
+Graph nodes lie on the lines through the inflated obstacle edges and the two
+route endpoints; an edge joins two neighbouring nodes on a line when the
+segment between them does not enter an inflated obstacle. The graph is kept
+implicit: only the sorted edge coordinates are stored, and neighbours are
+generated while the search runs, so a route visits a number of nodes that
+depends on the obstacles around it and not on the canvas area.
+
+The router listens to the obstacle index. A component move updates the four
+coordinates of its rect and drops the cached edge visibility results in the
+old and new regions; nothing else is rebuilt.
+
+The edge cache is an LRU bounded by ``max_edges``, so edges along stale
+lines of moved obstacles age out instead of accumulating for the session.
+Routes fill the edge cache and obstacle updates prune it, from routing
+threads and the GUI thread respectively. Both run under the obstacle
+index's lock, so the cache and its spatial index change one thread at a
+time.
+"""
+
+import bisect
+import heapq
+import math
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.grid_router import EDGE_DIRECTIONS, Point, simplify_points
+from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import (
+    ObstacleIndex, Rect, inflate_rect, normalize_rect, segment_intersects_rect)
+
+# Search directions: +x, +y, -x, -y
+_DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+# Segments may run along an inflated edge but not inside it
+_EPS = 1e-6
+
+
+class VisibilityRouter:
+    """Orthogonal shortest-path-with-bends router over an implicit visibility graph.
+
+    Args:
+        obstacle_index: ObstacleIndex with component rects
+        clearance: inflation applied to obstacles
+        owner_clearance: smaller inflation for the components owning the
+            endpoints, so approach points just outside them stay reachable
+        bend_penalty: extra cost of a bend, in scene units
+        max_edges: LRU capacity of the edge visibility cache
+    """
+
+    def __init__(self, obstacle_index: ObstacleIndex, clearance: float = 30.0,
+                 owner_clearance: float = 10.0, bend_penalty: float = 40.0,
+                 max_edges: int = 65536):
+        self.obstacle_index = obstacle_index
+        self.clearance = float(clearance)
+        self.owner_clearance = float(owner_clearance)
+        self.bend_penalty = float(bend_penalty)
+        self.max_edges = int(max_edges)
+        self.stats = {'routed': 0, 'failed': 0, 'expanded': 0}
+
+        # Coordinate multisets and their sorted tuples, updated under the index lock
+        self._x_counts: Dict[float, int] = {}
+        self._y_counts: Dict[float, int] = {}
+        self._xs: Tuple[float, ...] = ()
+        self._ys: Tuple[float, ...] = ()
+
+        # Edge visibility cache: segment -> keys of the obstacles it enters,
+        # spatially indexed so obstacle changes drop only nearby entries.
+        # Filled by route() and pruned by _on_obstacle_changed, both under
+        # obstacle_index.lock
+        self._edges: "OrderedDict[Tuple[float, float, float, float], tuple]" = OrderedDict()
+        self._edge_index = ObstacleIndex(cell_size=obstacle_index.cell_size)
+
+        with obstacle_index.lock:
+            for key in obstacle_index.keys():
+                self._add_coords(obstacle_index.rect(key))
+            self._commit_coords()
+            obstacle_index.add_listener(self._on_obstacle_changed)
+
+    def for_index(self, obstacle_index: ObstacleIndex) -> "VisibilityRouter":
+        """Router with the same settings over another obstacle index, e.g. a snapshot"""
+        return VisibilityRouter(obstacle_index, self.clearance, self.owner_clearance,
+                                self.bend_penalty, self.max_edges)
+
+    def detach(self) -> None:
+        """Stop following the obstacle index"""
+        with self.obstacle_index.lock:
+            self.obstacle_index.remove_listener(self._on_obstacle_changed)
+
+    # Incremental graph maintenance
+
+    def _add_coords(self, rect: Optional[Rect], delta: int = 1) -> None:
+        if rect is None:
+            return
+        x0, y0, x1, y1 = inflate_rect(rect, self.clearance)
+        for counts, values in ((self._x_counts, (x0, x1)), (self._y_counts, (y0, y1))):
+            for value in values:
+                count = counts.get(value, 0) + delta
+                if count > 0:
+                    counts[value] = count
+                else:
+                    counts.pop(value, None)
+
+    def _commit_coords(self) -> None:
+        self._xs = tuple(sorted(self._x_counts))
+        self._ys = tuple(sorted(self._y_counts))
+
+    def _on_obstacle_changed(self, key: Hashable, old: Optional[Rect], new: Optional[Rect]) -> None:
+        # Called by the index with its lock held
+        self._add_coords(old, -1)
+        self._add_coords(new, 1)
+        self._commit_coords()
+        for rect in (old, new):
+            if rect is None:
+                continue
+            for edge in self._edge_index.query_rect(inflate_rect(rect, self.clearance)):
+                self._edges.pop(edge, None)
+                self._edge_index.remove(edge)
+
+    def _blockers(self, a: Point, b: Point) -> tuple:
+        """Keys of obstacles whose inflated interior the segment a-b enters (cached).
+
+        Called from ``route`` with the obstacle index lock held.
+        """
+        edge = (a[0], a[1], b[0], b[1]) if a <= b else (b[0], b[1], a[0], a[1])
+        cached = self._edges.get(edge)
+        if cached is not None:
+            self._edges.move_to_end(edge)
+            return cached
+        blockers = tuple(self.obstacle_index.query_segment(
+            edge[0], edge[1], edge[2], edge[3], inflate=self.clearance - _EPS))
+        self._edges[edge] = blockers
+        self._edge_index.insert(edge, normalize_rect(*edge))
+        while len(self._edges) > self.max_edges:
+            old_edge, _ = self._edges.popitem(last=False)
+            self._edge_index.remove(old_edge)
+        return blockers
+
+    def _segment_clear(self, a: Point, b: Point, owners) -> bool:
+        for key in self._blockers(a, b):
+            if key not in owners:
+                return False
+            rect = self.obstacle_index.rect(key)
+            if rect is not None and segment_intersects_rect(
+                    a[0], a[1], b[0], b[1], inflate_rect(rect, self.owner_clearance - _EPS)):
+                return False
+        return True
+
+    # Search
+
+    @staticmethod
+    def _next_coord(coords: Sequence[float], extra: Sequence[float], value: float, step: int) -> Optional[float]:
+        """Next coordinate after ``value`` in the direction of ``step`` (+1/-1)"""
+        best = None
+        for values in (coords, extra):
+            if step > 0:
+                i = bisect.bisect_right(values, value)
+                candidate = values[i] if i < len(values) else None
+                if candidate is not None and (best is None or candidate < best):
+                    best = candidate
+            else:
+                i = bisect.bisect_left(values, value) - 1
+                candidate = values[i] if i >= 0 else None
+                if candidate is not None and (best is None or candidate > best):
+                    best = candidate
+        return best
+
+    def route(self, start: Point, end: Point, start_dir: Optional[str] = None,
+              end_dir: Optional[str] = None, owners: Iterable[Hashable] = ()) -> Optional[List[Point]]:
+        """Route from ``start`` to ``end`` (approach points), returning corner points.
+
+        Same contract as ``GridRouter.route``; returns None if no route exists.
+        Safe to call from any thread: the search holds the obstacle index lock.
+        """
+        with self.obstacle_index.lock:
+            return self._route(start, end, start_dir, end_dir, owners)
+
+    def _route(self, start: Point, end: Point, start_dir: Optional[str],
+               end_dir: Optional[str], owners: Iterable[Hashable]) -> Optional[List[Point]]:
+        owners = set(owners)
+        start = (float(start[0]), float(start[1]))
+        end = (float(end[0]), float(end[1]))
+        if start == end:
+            return [start, end]
+
+        xs, ys = self._xs, self._ys
+        extra_x = tuple(sorted({start[0], end[0]}))
+        extra_y = tuple(sorted({start[1], end[1]}))
+        bend = self.bend_penalty
+        out_start = EDGE_DIRECTIONS.get(start_dir)
+        out_end = EDGE_DIRECTIONS.get(end_dir)
+        goal_dir = _DIRS.index((-out_end[0], -out_end[1])) if out_end else None
+
+        def heuristic(p: Point) -> float:
+            return abs(p[0] - end[0]) + abs(p[1] - end[1])
+
+        best: Dict[Tuple[Point, int], float] = {}
+        parent: Dict[Tuple[Point, int], Optional[Tuple[Point, int]]] = {}
+        heap = []
+        counter = 0
+        for d in ((_DIRS.index(out_start),) if out_start else range(4)):
+            state = (start, d)
+            best[state] = 0.0
+            parent[state] = None
+            heapq.heappush(heap, (heuristic(start), counter, 0.0, state))
+            counter += 1
+
+        while heap:
+            _, _, g, state = heapq.heappop(heap)
+            if g > best.get(state, math.inf):
+                continue
+            point, d = state
+            if point == end:
+                self.stats['routed'] += 1
+                return simplify_points(self._unwind(parent, state))
+            self.stats['expanded'] += 1
+            for nd, (dx, dy) in enumerate(_DIRS):
+                if nd == (d + 2) % 4:
+                    continue  # never reverse in place
+                if dx:
+                    nx = self._next_coord(xs, extra_x, point[0], dx)
+                    if nx is None:
+                        continue
+                    neighbour = (nx, point[1])
+                else:
+                    ny = self._next_coord(ys, extra_y, point[1], dy)
+                    if ny is None:
+                        continue
+                    neighbour = (point[0], ny)
+                if not self._segment_clear(point, neighbour, owners):
+                    continue
+                cost = g + abs(neighbour[0] - point[0]) + abs(neighbour[1] - point[1])
+                if nd != d:
+                    cost += bend
+                if neighbour == end and goal_dir is not None and nd != goal_dir:
+                    cost += bend
+                nstate = (neighbour, nd)
+                if cost < best.get(nstate, math.inf):
+                    best[nstate] = cost
+                    parent[nstate] = state
+                    heapq.heappush(heap, (cost + heuristic(neighbour), counter, cost, nstate))
+                    counter += 1
+
+        self.stats['failed'] += 1
+        return None
+
+    @staticmethod
+    def _unwind(parent, state) -> List[Point]:
+        points = []
+        while state is not None:
+            points.append(state[0])
+            state = parent[state]
+        points.reverse()
+        return points
@@ -3,16 +3,24 @@ Component Scene Module - Phase 2.5
 
 Custom scene that handles component placement and wire drawing.
 """
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional
 import logging
+import math
+import random
 
-from PySide6.QtCore import Signal, QPointF, Qt
-from PySide6.QtWidgets import QGraphicsScene
+from PySide6.QtCore import Signal, QPointF, QRectF, Qt, QTimer
+from PySide6.QtWidgets import QGraphicsPathItem, QGraphicsScene
 
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.pin import ComponentPin
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
-from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire, WirePath
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.crossing_overlay import CrossingOverlay
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.reroute_scheduler import RerouteScheduler
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import to_point, to_points, to_qpoint, to_qpoints
 from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.wire_thread_manager import SceneWireThreadManager
+from apps.RBM5.BCF.gui.source.visual_bcf.routing import (
+    BatchRouter, BundleRouter, CrossingIndex, GridRouter, Net, ObstacleIndex, ProcessRouter, Rect, RouteCache,
+    TrackAssigner, VisibilityRouter, inflate_rect, route_signature, segment_intersects_rect, steiner_branches)
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +39,56 @@ class ComponentScene(QGraphicsScene):
         self.mouse_position = QPointF(0, 0)
         self.controller = controller  # Controller reference for all operations
         self.preview_component = None  # Preview component that follows mouse
+
+        # Spatial index of component rects queried by wire routing
+        self.obstacle_index = ObstacleIndex()
+
+        # Routing engines available to WirePath, selected by routing_engine
+        self.routers = {
+            "grid": GridRouter(self.obstacle_index),
+            "visibility": VisibilityRouter(self.obstacle_index),
+        }
+        self.routing_engine = "grid"
+        # Whole-scene router used on load and for "re-route all"
+        self.batch_router = BatchRouter(self.obstacle_index)
+        # Batches of at least this many wires are routed on worker processes
+        # (see process_router), started on the first such batch
+        self._process_router = None
+        self.process_route_threshold = 1000
+        # Parallel buses are routed once as a corridor by the batch router
+        self.bundle_router = BundleRouter(self.obstacle_index)
+        # Routes of unchanged wires, invalidated around moved components
+        self.route_cache = RouteCache(self.obstacle_index)
+        # Crossings between wires: swept once per routing pass, updated per wire
+        self.crossing_index = CrossingIndex()
+        self._crossings_deferred = False
+        # Markers of all crossings, drawn by one item instead of per-wire bumps
+        self.crossing_overlay = CrossingOverlay()
+        super().addItem(self.crossing_overlay)
+        # Lanes of colinear heuristic wire segments, assigned across all wires
+        self.track_assigner = TrackAssigner(spacing=10)
+        self._track_updates = set()
+        self._track_wires = {}
+        self._track_timer = QTimer(self)
+        self._track_timer.setSingleShot(True)
+        self._track_timer.setInterval(0)
+        self._track_timer.timeout.connect(self.flush_track_updates)
+        # Wires driven by one source pin are drawn as a tree, rebuilt once per routing pass
+        self._trees_deferred = False
+
+        # Regions touched by component moves, rerouted at the next idle tick
+        # Slightly above the routing clearance so routes hugging a moved part are caught
+        self.dirty_margin = 40.0
+        self._dirty_rects: List[Rect] = []
+        self._dirty_components = {}
+        self._reroute_timer = QTimer(self)
+        self._reroute_timer.setSingleShot(True)
+        self._reroute_timer.setInterval(0)
+        self._reroute_timer.timeout.connect(self.flush_dirty_region)
+        self.reroute_stats = {'flushes': 0, 'rerouted': 0}
+        # Reroutes of those wires, nearest to the cursor first, within a per-frame budget
+        self.reroute_scheduler = RerouteScheduler(budget_ms=6.0, parent=self,
+                                                  on_preview=self.hide_wire_crossings)
         
         # Initialize wire thread manager for async calculations
         self.wire_thread_manager = SceneWireThreadManager(max_threads=10, parent=self)
@@ -94,18 +152,19 @@ class ComponentScene(QGraphicsScene):
         try:
             # Get component configuration using the actual component name
             component_config = self.controller.data_model.component_dcf(name)
+            pin_layout = self.controller.data_model.component_pin_layout(name)
             
             # Create component with configuration
-            preview = ComponentWithPins(name, component_type, component_config=component_config)
+            preview = ComponentWithPins(name, component_type, component_config=component_config, pin_layout=pin_layout)
             preview.setPos(position.x() - preview.rect().width() / 2,
                           position.y() - preview.rect().height() / 2)
             
             # Make it semi-transparent
             preview.setOpacity(0.5)
             
-            # Add to scene
-            self.addItem(preview)
+            # Add to scene (marked as preview first so it is not an obstacle)
             self.preview_component = preview
+            self.addItem(preview)
             
         except Exception as e:
             logger.warning("Could not create preview component: %s", e)
@@ -133,9 +192,10 @@ class ComponentScene(QGraphicsScene):
             
             # Get component configuration
             component_config = self.controller.data_model.component_dcf(name)
+            pin_layout = self.controller.data_model.component_pin_layout(name)
             
             # Create component with configuration
-            component = ComponentWithPins(name, component_type, component_config=component_config)
+            component = ComponentWithPins(name, component_type, component_config=component_config, pin_layout=pin_layout)
             component.setPos(position.x() - component.rect().width() / 2,
                              position.y() - component.rect().height() / 2)
             component.component_id = component_id
@@ -164,6 +224,267 @@ class ComponentScene(QGraphicsScene):
             self.controller.add_component(component, component_type, (position.x(), position.y()))
             logger.info("Component added to scene: %s (%s)", name, component_type)
 
+    # ---------------------- Obstacle index ----------------------
+
+    def addItem(self, item):
+        """Add an item and register components and wires in the spatial indexes"""
+        super().addItem(item)
+        if isinstance(item, ComponentWithPins):
+            self.update_obstacle(item)
+        elif isinstance(item, Wire):
+            self.update_wire_crossings(item)
+
+    def removeItem(self, item):
+        """Remove an item and drop it from the spatial indexes"""
+        if isinstance(item, ComponentWithPins):
+            self.obstacle_index.remove(item)
+        elif isinstance(item, Wire):
+            removed = self._overlay_crossings(item, self.crossing_index.crossings_of(item))
+            self.crossing_index.remove_wire(item)
+            self.crossing_overlay.update_crossings(removed, ())
+            self.reroute_scheduler.discard(item)
+            if item.start_pin and item.end_pin:
+                key = frozenset((item.start_pin, item.end_pin))
+                self._track_wires.pop(key, None)
+                self.schedule_track_updates(self.track_assigner.remove_wire(key))
+        super().removeItem(item)
+        if isinstance(item, Wire) and item.start_pin and item.end_pin:
+            # The rest of its net may have drawn only branches off it
+            self.rebuild_net_trees([item])
+
+    def clear(self):
+        """Remove all items and reset the spatial indexes"""
+        self.obstacle_index.clear()
+        self.crossing_index.clear()
+        self.track_assigner.clear()
+        self.reroute_scheduler.clear()
+        # Dirty regions of the old items must not be flushed into the next scene
+        self._dirty_rects, self._dirty_components = [], {}
+        self._reroute_timer.stop()
+        self._track_updates.clear()
+        self._track_wires.clear()
+        self._track_timer.stop()
+        style = self.crossing_overlay.style
+        super().clear()
+        self.crossing_overlay = CrossingOverlay(style)
+        super().addItem(self.crossing_overlay)
+
+    def update_obstacle(self, component: ComponentWithPins):
+        """Insert or move a component's scene rect in the obstacle index"""
+        if component is self.preview_component or component.scene() is not self:
+            return
+        old = self.obstacle_index.rect(component)
+        self.obstacle_index.insert(component, component.scene_rect())
+        if old is not None:
+            self.mark_dirty(old, self.obstacle_index.rect(component), component)
+
+    # ---------------------- Wire crossings ----------------------
+
+    def update_wire_crossings(self, wire: Wire):
+        """Re-index one wire's crossings after its path changed"""
+        if self._crossings_deferred or QGraphicsPathItem.scene(wire) is not self:
+            return
+        if wire.is_temporary or not wire.end_pin or not wire.wire_path:
+            return
+        removed = self._overlay_crossings(wire, self.crossing_index.crossings_of(wire))
+        added = self._overlay_crossings(
+            wire, self.crossing_index.update_wire(wire, to_points(wire.wire_path.drawn_points())))
+        # Only the tiles around this wire's old and new crossings are rebuilt
+        self.crossing_overlay.update_crossings(removed, added)
+
+    def hide_wire_crossings(self, wire: Wire):
+        """Drop a wire's crossings while it shows a preview; its next route re-indexes them"""
+        removed = self._overlay_crossings(wire, self.crossing_index.crossings_of(wire))
+        self.crossing_index.remove_wire(wire)
+        self.crossing_overlay.update_crossings(removed, ())
+
+    def rebuild_wire_crossings(self) -> int:
+        """Sweep all complete wires for crossings; returns the crossing count"""
+        wires = {item: to_points(item.wire_path.drawn_points()) for item in self.items()
+                 if isinstance(item, Wire) and not item.is_temporary and item.end_pin and item.wire_path}
+        count = self.crossing_index.rebuild(wires)
+        self.refresh_crossing_overlay()
+        return count
+
+    def refresh_crossing_overlay(self):
+        """Hand all current crossings to the overlay, which repaints changed tiles"""
+        self.crossing_overlay.set_crossings(self.crossing_index.all_crossings())
+
+    @staticmethod
+    def _overlay_crossings(wire: Wire, crossings) -> list:
+        """One wire's crossings as overlay entries, the horizontal wire hopping"""
+        return [(point, other, wire) if direction == 'vertical' else (point, wire, other)
+                for point, other, direction in crossings]
+
+    # ---------------------- Track assignment ----------------------
+
+    def schedule_track_updates(self, keys):
+        """Queue wires whose lanes moved for re-jogging at the next idle tick"""
+        if keys:
+            self._track_updates.update(keys)
+            self._track_timer.start()
+
+    def flush_track_updates(self) -> int:
+        """Move queued wires onto their current lanes without rerouting them"""
+        pending, self._track_updates = self._track_updates, set()
+        updated = 0
+        for key in pending:
+            wire = self._wire_for_track(key)
+            path = wire.wire_path if wire is not None else None
+            points = self.track_assigner.points(key)
+            if path is None or not points:
+                continue
+            # Skip wires rerouted since their lanes were registered
+            if (points[0] != to_point(path.start_approach_point)
+                    or points[-1] != to_point(path.end_approach_point)):
+                continue
+            path.segments = ([path.start_point] + to_qpoints(self.track_assigner.jogged_points(key))
+                             + [path.end_point])
+            wire._show_wire_path()
+            updated += 1
+        return updated
+
+    def _wire_for_track(self, key) -> Optional[Wire]:
+        wire = self._track_wires.get(key)
+        if wire is None or QGraphicsPathItem.scene(wire) is not self:
+            self._track_wires = {frozenset((item.start_pin, item.end_pin)): item for item in self.items()
+                                 if isinstance(item, Wire) and item.start_pin and item.end_pin}
+            wire = self._track_wires.get(key)
+        return wire
+
+    # ---------------------- Fan-out nets ----------------------
+
+    def wire_net(self, source: ComponentPin) -> List[Wire]:
+        """Complete wires in the scene driven by the ``source`` pin, in tree order.
+
+        The longest route comes first and is drawn whole; ties are broken by
+        the load's position so the tree does not depend on creation order.
+        """
+        component = getattr(source, 'parent_component', None)
+        wires = [wire for wire in getattr(component, 'connected_wires', ())
+                 if wire.start_pin is source and wire.end_pin and not wire.is_temporary and wire.wire_path
+                 and QGraphicsPathItem.scene(wire) is self]
+
+        def order(wire):
+            points = wire.wire_path.segments
+            length = sum(abs(b.x() - a.x()) + abs(b.y() - a.y()) for a, b in zip(points, points[1:]))
+            end = wire.end_pin.get_connection_point()
+            return -length, end.x(), end.y()
+        return sorted(wires, key=order)
+
+    def update_wire_net(self, wire: Wire) -> List[Wire]:
+        """Rebuild the tree of the net a rerouted wire belongs to.
+
+        A wire routed on its own ignores the track its net already uses, so a
+        routed member of a fan-out net reroutes the whole net through the
+        batch router. Returns the other wires of the net whose drawn branch
+        changed and must be redrawn along with ``wire``.
+        """
+        if self._trees_deferred or QGraphicsPathItem.scene(wire) is not self or not wire.start_pin:
+            return []
+        members = self.wire_net(wire.start_pin)
+        if len(members) > 1 and wire.wire_path.engine in self.routers:
+            self.route_net(members)  # redraws the members it rerouted
+            return []
+        return [member for member in self._apply_net_tree(members) if member is not wire]
+
+    def rebuild_net_trees(self, wires) -> int:
+        """Rebuild and redraw the trees of the nets of ``wires``; returns the redrawn wire count"""
+        sources = {wire.start_pin: None for wire in wires if wire.start_pin}
+        redrawn = 0
+        for source in sources:
+            for wire in self._apply_net_tree(self.wire_net(source)):
+                wire.draw_wire_path()
+                redrawn += 1
+        return redrawn
+
+    def _apply_net_tree(self, members: List[Wire]) -> List[Wire]:
+        """Give each member of one net its branch of the net's tree; returns the members that changed"""
+        routes = []
+        for wire in members:
+            points = to_points(wire.wire_path.segments)
+            if wire.wire_path.source_pin is not wire.wire_path.start_pin:
+                points.reverse()  # every route starts at the source
+            routes.append((wire, points))
+        branches = steiner_branches(routes, tolerance=0.5) if len(routes) > 1 else {}
+
+        changed = []
+        for n, (wire, _) in enumerate(routes):
+            branch, junction = branches.get(wire, (None, None))
+            if n == 0 or (junction is None and branch):
+                branch = None  # starts at the source, so the whole route is drawn
+            path = wire.wire_path
+            old = (None if path.branch is None else to_points(path.branch),
+                   None if path.junction is None else to_point(path.junction))
+            if old == (branch, junction):
+                continue
+            path.set_branch(None if branch is None else to_qpoints(branch),
+                            None if junction is None else to_qpoint(junction))
+            changed.append(wire)
+        return changed
+
+    # ---------------------- Dirty-region rerouting ----------------------
+
+    def mark_dirty(self, old: Rect, new: Optional[Rect] = None, component: Optional[ComponentWithPins] = None):
+        """Record the union of a component's old and new inflated rects and schedule a reroute"""
+        rects = [r for r in (old, new) if r is not None]
+        union = (min(r[0] for r in rects), min(r[1] for r in rects),
+                 max(r[2] for r in rects), max(r[3] for r in rects))
+        self._dirty_rects.append(inflate_rect(union, self.dirty_margin))
+        if component is not None:
+            self._dirty_components[component] = None
+        if not self._reroute_timer.isActive():
+            self._reroute_timer.start()
+
+    def flush_dirty_region(self) -> int:
+        """Queue the wires affected by moves since the last tick; returns their count.
+
+        Affected wires are those attached to a moved component and those whose
+        current route crosses a dirty rect. The reroute scheduler routes as many
+        as fit in one frame and previews the rest until later frames.
+        """
+        rects, components = self._dirty_rects, self._dirty_components
+        self._dirty_rects, self._dirty_components = [], {}
+        self._reroute_timer.stop()
+        if not rects:
+            return 0
+
+        wires = {}
+        for component in components:
+            try:
+                if component.scene() is not self:
+                    continue
+            except RuntimeError:
+                continue  # deleted since it moved
+            for wire in component.connected_wires:
+                wires[wire] = None
+        for rect in rects:
+            area = QRectF(rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1])
+            for item in self.items(area, Qt.ItemSelectionMode.IntersectsItemBoundingRect):
+                if isinstance(item, Wire) and item not in wires and self._route_crosses(item, rect):
+                    wires[item] = None
+                    # Wires of its net may run here undrawn, below its branch
+                    for member in self.wire_net(item.start_pin):
+                        if member not in wires and self._route_crosses(member, rect):
+                            wires[member] = None
+
+        self.reroute_scheduler.enqueue(wires, self.mouse_position)
+        self.reroute_scheduler.run_frame()
+        self.reroute_stats['flushes'] += 1
+        self.reroute_stats['rerouted'] += len(wires)
+        return len(wires)
+
+    @staticmethod
+    def _route_crosses(wire: Wire, rect: Rect) -> bool:
+        """True if the wire's current route has a segment inside ``rect``"""
+        segments = wire.wire_path.get_segments() if wire.wire_path else []
+        return any(segment_intersects_rect(a.x(), a.y(), b.x(), b.y(), rect) for a, b in segments)
+
+    def settle_reroutes(self):
+        """Flush pending dirty regions and route the whole queue once idle, e.g. after a drag"""
+        self.flush_dirty_region()
+        self.reroute_scheduler.finish_when_idle()
+
     def remove_component(self, component: ComponentWithPins):
         """Remove component from scene"""
         # self.removeItem(component)
@@ -259,8 +580,20 @@ class ComponentScene(QGraphicsScene):
             # Fallback - just remove from scene
             self.removeItem(wire)
     
+    @property
+    def process_router(self) -> ProcessRouter:
+        """Worker process router, created on first use"""
+        if self._process_router is None:
+            self._process_router = ProcessRouter(self.obstacle_index)
+        return self._process_router
+
     def cleanup(self):
-        """Clean up scene resources including thread manager"""
+        """Clean up scene resources including thread manager and routing workers"""
+        if getattr(self, '_process_router', None) is not None:
+            self._process_router.close()
+            self._process_router = None
+        if hasattr(self, 'reroute_scheduler'):
+            self.reroute_scheduler.clear()
         if hasattr(self, 'wire_thread_manager'):
             self.wire_thread_manager.cleanup()
             logger.info("Scene cleanup completed")
@@ -272,7 +605,7 @@ class ComponentScene(QGraphicsScene):
 
         This aids performance testing of wire routing with many pins/wires.
         """
-        if len(self.items()) > 0:
+        if any(item is not self.crossing_overlay for item in self.items()):
             return
         self.add_rfic_testbed()
 
@@ -314,30 +647,42 @@ class ComponentScene(QGraphicsScene):
             'pins': pins,
         }
 
-    def add_rfic_testbed(self, num_pairs: int = 8):
-        """Create two RFIC components with many PRX/DRX pins and connect them."""
-        try:
-            # Build components
-            cfg_a = self._build_rfic_config('RFIC_A', num_pairs=num_pairs)
-            cfg_b = self._build_rfic_config('RFIC_B', num_pairs=num_pairs)
-
-            rfic_a = ComponentWithPins('RFIC_A', 'rfic', component_config=cfg_a)
-            rfic_b = ComponentWithPins('RFIC_B', 'rfic', component_config=cfg_b)
-
-            rfic_a.setPos(100, 120)
-            rfic_b.setPos(500, 140)
+    def add_rfic_testbed(self, num_pairs: int = 8, num_rfics: int = 2, seed: Optional[int] = None):
+        """Create RFIC components with many PRX/DRX pins and connect them.
 
-            # Ensure they have component_id used by collision checks
-            rfic_a.component_id = 'RFIC_A'
-            rfic_b.component_id = 'RFIC_B'
+        RFICs are laid out on a grid and each is connected to the next one, so
+        the default two RFICs give the original testbed. A ``seed`` shuffles
+        the grid cells and jitters the placements reproducibly.
+        """
+        try:
+            num_rfics = max(num_rfics, 2)
+            cols = math.ceil(math.sqrt(num_rfics))
+            cells = [(i % cols, i // cols) for i in range(num_rfics)]
+            rng = random.Random(seed) if seed is not None else None
+            if rng is not None:
+                rng.shuffle(cells)
 
-            self.addItem(rfic_a)
-            self.addItem(rfic_b)
+            # Build components
+            rfics = []
+            for i, (col, row) in enumerate(cells):
+                name = f'RFIC_{chr(ord("A") + i)}' if i < 26 else f'RFIC_{i}'
+                cfg = self._build_rfic_config(name, num_pairs=num_pairs)
+                rfic = ComponentWithPins(name, 'rfic', component_config=cfg)
+                x = 100 + col * 400
+                y = 120 + (col % 2) * 20 + row * (rfic.rect().height() + 200)
+                if rng is not None:
+                    x += rng.uniform(-40, 40)
+                    y += rng.uniform(-40, 40)
+                rfic.setPos(x, y)
+                # Ensure they have component_id used by collision checks
+                rfic.component_id = name
+                self.addItem(rfic)
+                rfics.append(rfic)
 
             # Register with controller/model if available
             if self.controller and hasattr(self.controller, 'add_component'):
-                self.controller.add_component(rfic_a, 'rfic')
-                self.controller.add_component(rfic_b, 'rfic')
+                for rfic in rfics:
+                    self.controller.add_component(rfic, 'rfic')
 
             # Helper to find pin by id
             def pin(comp, pid):
@@ -346,31 +691,32 @@ class ComponentScene(QGraphicsScene):
                         return p
                 return None
 
-            # Create connections between A and B for PRX and DRX (both directions)
-            for i in range(1, num_pairs + 1):
-                # A.PRX_OUTi -> B.PRX_INi
-                sp = pin(rfic_a, f'PRX_OUT{i}')
-                ep = pin(rfic_b, f'PRX_IN{i}')
-                if sp and ep:
-                    self._add_wire_between(sp, ep)
-
-                # A.DRX_OUTi -> B.DRX_INi
-                sp = pin(rfic_a, f'DRX_OUT{i}')
-                ep = pin(rfic_b, f'DRX_IN{i}')
-                if sp and ep:
-                    self._add_wire_between(sp, ep)
+            # Create connections from each RFIC to the next for PRX and DRX
+            for rfic_a, rfic_b in zip(rfics, rfics[1:]):
+                for i in range(1, num_pairs + 1):
+                    # A.PRX_OUTi -> B.PRX_INi
+                    sp = pin(rfic_a, f'PRX_OUT{i}')
+                    ep = pin(rfic_b, f'PRX_IN{i}')
+                    if sp and ep:
+                        self._add_wire_between(sp, ep)
+
+                    # A.DRX_OUTi -> B.DRX_INi
+                    sp = pin(rfic_a, f'DRX_OUT{i}')
+                    ep = pin(rfic_b, f'DRX_IN{i}')
+                    if sp and ep:
+                        self._add_wire_between(sp, ep)
 
             # Add a few intra-component loops to stress self-avoidance
             for i in range(1, min(4, num_pairs) + 1):
-                sp = pin(rfic_a, f'PRX_IN{i}')
-                ep = pin(rfic_a, f'PRX_OUT{i}')
-                if sp and ep:
-                    self._add_wire_between(sp, ep)
+                for n, rfic in enumerate(rfics):
+                    prefix = 'PRX' if n % 2 == 0 else 'DRX'
+                    sp = pin(rfic, f'{prefix}_IN{i}')
+                    ep = pin(rfic, f'{prefix}_OUT{i}')
+                    if sp and ep:
+                        self._add_wire_between(sp, ep)
 
-                sp = pin(rfic_b, f'DRX_IN{i}')
-                ep = pin(rfic_b, f'DRX_OUT{i}')
-                if sp and ep:
-                    self._add_wire_between(sp, ep)
+            # Route the testbed wires together instead of one by one
+            self.route_all_wires()
 
         except Exception as e:
             logger.warning("Failed to add RFIC testbed: %s", e)
@@ -393,10 +739,180 @@ class ComponentScene(QGraphicsScene):
         except Exception as e:
             logger.debug("Wire creation failed: %s", e)
 
+    def route_all_wires(self, wires=None) -> dict:
+        """Route all complete wires together with negotiated congestion.
+
+        Batches of ``process_route_threshold`` wires or more get their first
+        pass from independent routes on worker processes; the batch router
+        then negotiates congestion from there. Parallel buses are routed
+        once by the batch router and their wires derived from that route. Wires that cannot be
+        routed fall back to individual routing. Returns the router statistics.
+        """
+        if wires is None:
+            wires = [item for item in self.items() if isinstance(item, Wire)]
+        paths, nets = self._route_inputs(wires)
+
+        router, routes = self.batch_router, None
+        if len(nets) >= self.process_route_threshold:
+            try:
+                # Workers route plain nets; bus corridors need the batch router's lanes
+                routes = self.bundle_router.route_all(nets, self.process_router, self.batch_router)
+                router = self.process_router
+            except Exception as e:
+                logger.error("Process routing failed, using batch router: %s", e)
+        if routes is None:
+            routes = self.bundle_router.route_all(nets, self.batch_router)
+        # Every wire gets a fresh route, so pending dirty regions are settled
+        self._dirty_rects, self._dirty_components = [], {}
+        self._reroute_timer.stop()
+        self.reroute_scheduler.clear()
+        # Net trees and crossings are rebuilt once after all routes are applied
+        self._crossings_deferred = self._trees_deferred = True
+        try:
+            for wire, path in paths.items():
+                points = routes.get(wire)
+                if points is None:
+                    wire.update_wire_position_final()
+                    continue
+                path.apply_route(to_qpoints(points))
+                wire.apply_wire_path(path)
+            self._trees_deferred = False
+            self.rebuild_net_trees(paths)
+        finally:
+            self._crossings_deferred = self._trees_deferred = False
+        self.rebuild_wire_crossings()
+
+        stats = dict(self.bundle_router.stats)
+        if stats['bundles']:
+            logger.info("Routed %d buses as corridors, deriving %d/%d of their wires",
+                        stats['bundles'], stats['derived'], stats['bundled'])
+        if router is not self.batch_router:
+            logger.info("Process routed %d/%d wires on %d workers in %.2fs, then %d passes (%d overused tracks)",
+                        stats['routed'], stats['nets'], stats['workers'], stats['seconds'],
+                        stats['iterations'], stats['overused'])
+        else:
+            logger.info("Batch routed %d/%d wires in %d passes (%d overused tracks)",
+                        stats['routed'], stats['nets'], stats['iterations'], stats['overused'])
+        return stats
+
+    def route_net(self, members: List[Wire]) -> List[Wire]:
+        """Route the wires of one fan-out net together with the batch router.
+
+        Routing the net as a unit keeps the share discount on its common
+        track, so the net stays one tree. Returns the members that got a
+        route; the others keep their current path.
+        """
+        paths, nets = self._route_inputs(members)
+        routes = self.batch_router.route_all(nets)
+        routed = []
+        deferred, self._trees_deferred = self._trees_deferred, True
+        try:
+            for wire, path in paths.items():
+                points = routes.get(wire)
+                if points is None:
+                    continue
+                path.apply_route(to_qpoints(points))
+                wire.apply_wire_path(path)
+                self.reroute_scheduler.discard(wire)
+                routed.append(wire)
+        finally:
+            self._trees_deferred = deferred
+        if not deferred:
+            self.rebuild_net_trees(routed)
+        return routed
+
+    def _route_inputs(self, wires):
+        """Fresh unrouted paths ({wire: WirePath}) and router nets for the complete ``wires``"""
+        paths = {}
+        nets = []
+        for wire in wires:
+            if not wire or not wire.start_pin or not wire.end_pin:
+                continue
+            path = WirePath(wire.start_pin.get_connection_point(), wire.end_pin.get_connection_point(),
+                            wire.start_pin, wire.end_pin, self, calculate_now=False)
+            paths[wire] = path
+            nets.append(Net(
+                wire,
+                to_point(path.start_approach_point),
+                to_point(path.end_approach_point),
+                getattr(path.start_pin, 'edge', None),
+                getattr(path.end_pin, 'edge', None),
+                tuple(pin.parent_component for pin in (path.start_pin, path.end_pin)
+                      if getattr(pin, 'parent_component', None) is not None)))
+        return paths, nets
+
+    # ---------------------- Persisted routes ----------------------
+
+    def route_signature(self, path: WirePath) -> str:
+        """Signature of a path's endpoints and corners and of the obstacles around it"""
+        return route_signature(
+            path.engine, to_point(path.start_point), to_point(path.end_point),
+            getattr(path.start_pin, 'edge', None), getattr(path.end_pin, 'edge', None),
+            to_points(path.segments[1:-1]), self.obstacle_index, self.route_cache.margin)
+
+    def stored_route(self, wire: Wire) -> Optional[dict]:
+        """The wire's current route in its persisted form, or None if it has none.
+
+        Routes on assigned lanes also keep their unshifted points under
+        'tracks' so a restored route can be registered with the track assigner.
+        """
+        path = wire.wire_path
+        if path is None or not wire.start_pin or not wire.end_pin or len(path.segments) < 2:
+            return None
+        points = to_points(path.segments[1:-1])
+        stored = {'points': [list(p) for p in points], 'hash': self.route_signature(path)}
+        key = path.track_key()
+        if key in self.track_assigner and self.track_assigner.jogged_points(key) == points:
+            stored['tracks'] = [list(p) for p in self.track_assigner.points(key)]
+        return stored
+
+    def restore_routes(self, routes: dict) -> list:
+        """Apply persisted routes ({wire: stored route or None}) that are still valid.
+
+        A route is reused only if its signature matches the current scene.
+        Returns the wires that still need routing.
+        """
+        stale = []
+        # Net trees and crossings are rebuilt once after all routes are applied
+        self._crossings_deferred = self._trees_deferred = True
+        try:
+            for wire, stored in routes.items():
+                path = self._restored_path(wire, stored)
+                if path is None:
+                    stale.append(wire)
+                else:
+                    wire.apply_wire_path(path)
+            self._trees_deferred = False
+            self.rebuild_net_trees(routes)
+        finally:
+            self._crossings_deferred = self._trees_deferred = False
+        self.rebuild_wire_crossings()
+        return stale
+
+    def _restored_path(self, wire: Wire, stored: Optional[dict]) -> Optional[WirePath]:
+        if not stored or not wire.start_pin or not wire.end_pin:
+            return None
+        path = WirePath(wire.start_pin.get_connection_point(), wire.end_pin.get_connection_point(),
+                        wire.start_pin, wire.end_pin, self, calculate_now=False)
+        try:
+            path.apply_route(to_qpoints([(float(x), float(y)) for x, y in stored['points']]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring malformed stored route: %s", e)
+            return None
+        if self.route_signature(path) != stored.get('hash'):
+            return None
+        if stored.get('tracks'):
+            # Take the wire's lanes back, as routing with jogs does
+            try:
+                path.apply_tracks(to_qpoints([(float(x), float(y)) for x, y in stored['tracks']]))
+            except (TypeError, ValueError) as e:
+                logger.warning("Ignoring malformed stored route: %s", e)
+                return None
+        return path
+
     def get_component_at_position(self, position: QPointF) -> ComponentWithPins:
-        """Get the component at the specified position"""
-        items = self.items(position)
-        for item in items:
-            if isinstance(item, ComponentWithPins):
-                return item
-        return None
+        """Get the topmost component at the specified position (obstacle index lookup)"""
+        hits = self.obstacle_index.query_point(position.x(), position.y())
+        if not hits:
+            return None
+        return max(hits, key=lambda item: item.zValue())
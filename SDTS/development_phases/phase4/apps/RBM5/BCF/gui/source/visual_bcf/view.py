@@ -146,6 +146,10 @@ class CustomGraphicsView(QGraphicsView):
 class MiniMapView(QGraphicsView):
     """A miniature view of the same scene that overlays a red rectangle to indicate
     the current viewport of the main view.
+
+    Items choose their level of detail from the scale they are painted at (see
+    ``artifacts.level_of_detail``), so at minimap scale chips are flat rects and
+    wires hairlines without pins, labels or crossing markers.
     """
 
     def __init__(self, scene, main_view: QGraphicsView, parent=None):
@@ -86,6 +86,11 @@ class VisualBCFManager(QMainWindow):
         self.status_updated.emit(
             "Visual BCF Manager initialized - Phase 3 (Controller-centric MVC)")
 
+    def cleanup(self):
+        """Save pending scene edits and release the visual BCF controller"""
+        if self.visual_bcf_controller:
+            self.visual_bcf_controller.cleanup()
+
     def refresh_tables_from_data_model(self):
         """Refresh all tables from the single source of truth data model"""
         print("🔄 refresh_tables_from_data_model called!")
@@ -123,6 +123,8 @@ class RBMMain(QWidget):
     def closeEvent(self, event):
         """Clean up when window is closed"""
         super().closeEvent(event)
+        # Let the GUI mirror pending edits into the RDB before it is written out
+        self.gui_controller.close()
         # Clean up resources
         self.rdb_manager.close()
 
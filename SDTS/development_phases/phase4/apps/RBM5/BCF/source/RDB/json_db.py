@@ -57,11 +57,13 @@ class JSONDatabase(QObject):
             print(f"Error saving database: {e}")
 
     def save(self) -> bool:
-        """Explicitly persist current in-memory DB to disk"""
+        """Explicitly persist current in-memory DB to disk; False if the write failed"""
         try:
-            self._save_db()
+            with open(self.db_file, "w") as f:
+                json.dump(self.data, f, indent=2)
             return True
-        except Exception:
+        except Exception as e:
+            print(f"Error saving database: {e}")
             return False
 
     def _get_path_parts(self, path: str|Path) -> List[str]:
@@ -205,8 +207,16 @@ class JSONDatabase(QObject):
                 }
             }
             self._save_db()
+            self._notify_replaced(self.data)
 
     def rollback(self) -> None:
         """Rollback changes"""
         # For JSON database, we just reload from file
+        previous = list(self.data)
         self._load_db()
+        self._notify_replaced(previous + list(self.data))
+
+    def _notify_replaced(self, keys) -> None:
+        """Report top-level paths whose whole subtree was replaced"""
+        for key in dict.fromkeys(keys):
+            self.data_changed.emit(key)
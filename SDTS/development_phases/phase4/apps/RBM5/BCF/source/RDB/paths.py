@@ -166,6 +166,7 @@ VISUAL_BCF_CONFIG = CONFIG / "visual_bcf"
 VISUAL_BCF_COMPONENTS = VISUAL_BCF_CONFIG / "components"
 VISUAL_BCF_CONNECTIONS = VISUAL_BCF_CONFIG / "connections"
 VISUAL_PROPERTIES = VISUAL_BCF_CONFIG / "visual_properties"
+CONNECTION_ROUTES = VISUAL_BCF_CONFIG / "connection_routes"
 
 # Device Configuration Paths (Updated)
 DEVICE_CONFIG = CONFIG / "device"
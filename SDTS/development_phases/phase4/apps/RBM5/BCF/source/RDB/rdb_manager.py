@@ -107,6 +107,10 @@ class RDBManager(QObject):
 
         return TableModel(self, path, columns)
 
+    def save(self) -> bool:
+        """Write the in-memory database to disk"""
+        return self.db.save()
+
     def close(self):
         """Close the database connection and clean up resources"""
         try:
@@ -10,13 +10,14 @@ import logging
 import traceback
 from typing import Dict, List, Any, Tuple, Optional
 
-from PySide6.QtCore import QObject, Signal, QTimer, Qt, QPoint, QEvent
+from PySide6.QtCore import QObject, Signal, QTimer, Qt, QPoint, QEvent, QRectF
 from PySide6.QtWidgets import QWidget, QGraphicsTextItem, QMessageBox
 
 from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+from apps.RBM5.BCF.source.models.visual_bcf.scene_stream import SceneImporter, SceneStreamWriter
 from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
 from apps.RBM5.BCF.gui.source.visual_bcf.view import CustomGraphicsView, MiniMapView
-from apps.RBM5.BCF.gui.source.visual_bcf.artifacts import ComponentWithPins, Wire, ComponentPin
+from apps.RBM5.BCF.gui.source.visual_bcf.artifacts import ComponentWithPins, Wire, ComponentPin, CrossingOverlay
 from apps.RBM5.BCF.gui.source.visual_bcf.floating_toolbar import FloatingToolbar
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,7 @@ class VisualBCFController(QObject):
     operation_completed = Signal(str, str)  # operation_type, message
     error_occurred = Signal(str)  # error_message
     data_synchronized = Signal() # Signal to notify that data model is synchronized
+    import_progress = Signal(int, int)  # records_done, records_total
 
     def __init__(self, parent_widget: QWidget, data_model: VisualBCFDataModel):
         super().__init__()
@@ -54,9 +56,17 @@ class VisualBCFController(QObject):
         # Maps to track graphics items
         self._component_graphics_items: Dict[str, ComponentWithPins] = {}
         self._connection_graphics_items: Dict[str, Wire] = {}
+        # Segment list of each connection's route when it was last persisted
+        self._persisted_segments: Dict[str, list] = {}
         # Guard to prevent selection feedback loops between scene and trees
         self._suppress_table_center = False
 
+        # Incremental scene import state (see import_scene)
+        self._scene_importer = None
+        self._scene_import_async = True
+        # Wires created by the import, routed together once it finishes
+        self._imported_wires = []
+
         # Component placement state
         self.placement_mode = False
         self.selected_component_type = "chip"
@@ -136,10 +146,13 @@ class VisualBCFController(QObject):
         self.floating_toolbar.clear_scene_requested.connect(
             self._on_clear_scene)
         self.floating_toolbar.zoom_fit_requested.connect(self._on_zoom_fit)
+        self.floating_toolbar.reroute_all_requested.connect(self._on_reroute_all)
 
         # Connect scene operation signals
         self.floating_toolbar.load_scene_requested.connect(
             self._on_load_scene)
+        self.floating_toolbar.save_scene_requested.connect(
+            self._on_save_scene)
 
         # Connect zoom signals to view
         if self.view:
@@ -245,10 +258,12 @@ class VisualBCFController(QObject):
             try:
                 component_name = component_data.get('Name') or component_data.get('name') or 'New Device'
                 component_config = self.data_model.component_dcf(component_name)
+                pin_layout = self.data_model.component_pin_layout(component_name)
                 comp = ComponentWithPins(
                     component_name,
                     self.selected_component_type,
                     component_config=component_config,
+                    pin_layout=pin_layout,
                 )
                 comp.setPos(0, 0)
                 self.scene.addItem(comp)
@@ -324,6 +339,31 @@ class VisualBCFController(QObject):
         except Exception as e:
             pass
 
+    def _on_save_scene(self):
+        """Handle save scene request from toolbar: mirror pending edits and write the RDB"""
+        if not self.save_scene():
+            return
+        if self.data_model.rdb_manager.save():
+            self.operation_completed.emit("save", "Scene saved")
+        else:
+            self.error_occurred.emit("Failed to save scene: the database could not be written")
+
+    def save_scene(self) -> bool:
+        """Mirror pending scene edits (component positions, wire routes) into the RDB.
+
+        Runs on explicit save and on close. Failures are logged and reported
+        through error_occurred.
+        """
+        try:
+            self.data_model.flush_positions()
+            # Rerouted wires are stored so a reopened scene can skip routing
+            self.persist_connection_routes()
+            return True
+        except Exception as e:
+            logger.error("Error saving scene to the RDB: %s", e)
+            self.error_occurred.emit(f"Failed to save scene: {str(e)}")
+            return False
+
     def _on_load_scene(self):
         """Handle load scene request from toolbar"""
         try:
@@ -341,10 +381,81 @@ class VisualBCFController(QObject):
         """Handle zoom fit request from toolbar"""
         try:
             if self.view:
-                self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+                # Cached bounding box of all placed components from the position store
+                bbox = self.data_model.positions.bounding_box()
+                if bbox is None:
+                    self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
+                    return
+                x0, y0, x1, y1 = bbox
+                margin = 50
+                self.view.fitInView(
+                    QRectF(x0 - margin, y0 - margin, x1 - x0 + 2 * margin, y1 - y0 + 2 * margin),
+                    Qt.KeepAspectRatio)
+                if hasattr(self.view, 'zoom_factor'):
+                    self.view.zoom_factor = self.view.transform().m11()
         except Exception as e:
             logger.error("Error zooming to fit: %s", e)
 
+    def _on_reroute_all(self):
+        """Handle re-route all request from toolbar"""
+        try:
+            stats = self.scene.route_all_wires()
+            self.operation_completed.emit(
+                "reroute_all", f"Re-routed {stats['routed']}/{stats['nets']} connections")
+        except Exception as e:
+            logger.error("Error re-routing connections: %s", e)
+            self.error_occurred.emit(f"Failed to re-route connections: {str(e)}")
+
+    # Layout operations on the current selection (vectorized in the position store)
+
+    def _selected_component_ids(self) -> List[str]:
+        ids = []
+        for item in self.scene.selectedItems():
+            if isinstance(item, ComponentWithPins):
+                component_id = getattr(item, 'component_id', None) or self._get_component_id(item)
+                if component_id:
+                    ids.append(component_id)
+        return ids
+
+    def _apply_store_positions(self, component_ids: List[str]):
+        """Move graphics items to the positions held in the position store"""
+        for component_id, (x, y) in self.data_model.positions.positions(component_ids).items():
+            component = self._component_graphics_items.get(component_id)
+            if component is not None:
+                component.setPos(x, y)
+
+    def move_selected_components(self, dx: float, dy: float) -> int:
+        """Move all selected components by (dx, dy) in one bulk update"""
+        moved = self.data_model.positions.move(self._selected_component_ids(), dx, dy)
+        self._apply_store_positions(moved)
+        return len(moved)
+
+    def align_selected_components(self, mode: str) -> int:
+        """Align selected components ('left', 'right', 'top', 'bottom', 'hcenter', 'vcenter')"""
+        try:
+            moved = self.data_model.positions.align(self._selected_component_ids(), mode)
+        except ValueError as e:
+            self.error_occurred.emit(str(e))
+            return 0
+        self._apply_store_positions(moved)
+        return len(moved)
+
+    def distribute_selected_components(self, axis: str = "horizontal") -> int:
+        """Distribute selected components evenly along 'horizontal' or 'vertical'"""
+        moved = self.data_model.positions.distribute(self._selected_component_ids(), axis)
+        self._apply_store_positions(moved)
+        return len(moved)
+
+    def snap_selected_to_grid(self, grid_size: float = None) -> int:
+        """Snap selected components (all if none selected) to the layout grid"""
+        if grid_size is None:
+            grid = self.data_model.rdb_manager.get_value("config.visual_bcf.layout.grid_settings") or {}
+            grid_size = grid.get("size", 20) if isinstance(grid, dict) else 20
+        ids = self._selected_component_ids() or None
+        moved = self.data_model.positions.snap_to_grid(grid_size, ids)
+        self._apply_store_positions(moved)
+        return len(moved)
+
     def _connect_signals(self):
         """Connect to model signals"""
         self.data_model.component_added.connect(self._on_model_component_added)
@@ -452,12 +563,14 @@ class VisualBCFController(QObject):
 
             # Get component configuration
             component_config = self.data_model.component_dcf(device_name)
+            pin_layout = self.data_model.component_pin_layout(device_name)
             
             # Create component graphics item
             component = ComponentWithPins(
                 device_name,
                 device_type,
-                component_config=component_config
+                component_config=component_config,
+                pin_layout=pin_layout
             )
 
             # Set position (default to center)
@@ -516,6 +629,7 @@ class VisualBCFController(QObject):
                 # Remove from scene
                 self.scene.removeItem(component)
                 del self._component_graphics_items[device_id]
+                self.data_model.positions.discard(device_id)
 
                 logger.info("Component %s (%s) removed from scene via table", device_id, device_name)
             else:
@@ -788,8 +902,11 @@ class VisualBCFController(QObject):
             logger.error("Error updating connection in scene via table: %s", e)
 
     def cleanup(self):
-        """Clean up resources and stop timers"""
+        """Save pending scene edits, then clean up resources and stop timers"""
+        self.save_scene()
         try:
+            # Stops wire jobs and routing worker processes
+            self.scene.cleanup()
             if hasattr(self, 'cleanup_timer'):
                 self.cleanup_timer.stop()
                 self.cleanup_timer.deleteLater()
@@ -807,8 +924,8 @@ class VisualBCFController(QObject):
             unexpected_items = []
             for item in all_scene_items:
                 # Skip certain item types that are expected during normal operation
-                if isinstance(item, (QGraphicsTextItem, ComponentPin)):
-                    # These are UI elements that are part of components, don't remove them
+                if isinstance(item, (QGraphicsTextItem, ComponentPin, CrossingOverlay)):
+                    # These are UI elements that are part of components or the scene, don't remove them
                     continue
 
                 # Check if this item is properly tracked
@@ -853,7 +970,9 @@ class VisualBCFController(QObject):
                 return
 
             new_position = (pos.x(), pos.y())
-            success = self.data_model.update_component_position(component_id, new_position)
+            rect = component.rect()
+            success = self.data_model.update_component_position(
+                component_id, new_position, size=(rect.width(), rect.height()))
             if success:
                 logger.debug(f"Successfully synced position for component {component_id}: {new_position}")
             else:
@@ -1056,12 +1175,12 @@ class VisualBCFController(QObject):
     def get_statistics(self) -> Dict[str, Any]:
         """Get current scene statistics"""
         try:
-            components = self.data_model.components
-            connections = self.data_model.connections
+            # Counters are maintained by the data model, no table scan here
+            model_stats = self.data_model.statistics
 
             return {
-                'component_count': len(components),
-                'connection_count': len(connections),
+                'component_count': model_stats.component_count,
+                'connection_count': model_stats.connection_count,
                 'graphics_components_count': len(
                     self._component_graphics_items),
                 'graphics_connections_count': len(
@@ -1118,142 +1237,200 @@ class VisualBCFController(QObject):
     def _load_components(self):
         """Load components from the data model"""
         for comp_data in self.data_model.components:
-            try:
-                # Get component ID from the loaded data - handle both "ID" and "id" fields
-                component_id = comp_data.get("ID") or comp_data.get("id")
-                component_name = comp_data.get("Name", comp_data.get("name", "Unknown"))
-                component_type = comp_data.get("Component Type", comp_data.get("component_type", "chip"))
+            self._create_component_graphics(comp_data)
 
-                if not component_id:
-                    logger.warning("Component missing ID: %s", component_name)
-                    continue
+    def _create_component_graphics(self, comp_data: Dict[str, Any]) -> Optional[ComponentWithPins]:
+        """Create, place and track the graphics item for one component row"""
+        try:
+            # Get component ID from the loaded data - handle both "ID" and "id" fields
+            component_id = comp_data.get("ID") or comp_data.get("id")
+            component_name = comp_data.get("Name", comp_data.get("name", "Unknown"))
+            component_type = comp_data.get("Component Type", comp_data.get("component_type", "chip"))
 
-                # Get component configuration for pin information
-                component_config = self.data_model.component_dcf(component_name)
-                
-                # Create the component graphics item with configuration
-                component = ComponentWithPins(
-                    component_name,
-                    component_type,
-                    component_config=component_config
-                )
+            if not component_id:
+                logger.warning("Component missing ID: %s", component_name)
+                return None
+
+            # Get component configuration for pin information
+            component_config = self.data_model.component_dcf(component_name)
+            pin_layout = self.data_model.component_pin_layout(component_name)
+            
+            # Create the component graphics item with configuration
+            component = ComponentWithPins(
+                component_name,
+                component_type,
+                component_config=component_config,
+                pin_layout=pin_layout
+            )
 
-                # Set position - handle both possible position formats
-                pos = self.data_model.visual_properties(component_id).get("position", {})
-                if isinstance(pos, dict):
-                    component.setPos(pos.get("x", 0), pos.get("y", 0))
-                else:
-                    component.setPos(0, 0)
+            # Set position from the model's position store
+            component.setPos(*self.data_model.component_position(component_id))
+            rect = component.rect()
+            self.data_model.positions.set_size(component_id, rect.width(), rect.height())
 
-                # Add to scene
-                self.scene.addItem(component)
+            # Add to scene
+            self.scene.addItem(component)
 
-                # Track the graphics item in the controller
-                self._component_graphics_items[component_id] = component
+            # Track the graphics item in the controller
+            self._component_graphics_items[component_id] = component
 
-                # Set component properties - DON'T re-add to data model to avoid infinite loop
-                component.component_id = component_id
-                component.properties = comp_data.get("Properties", comp_data.get("properties", {}))
+            # Set component properties - DON'T re-add to data model to avoid infinite loop
+            component.component_id = component_id
+            component.properties = comp_data.get("Properties", comp_data.get("properties", {}))
 
-                # Use track_loaded_component instead of add_component to avoid infinite loops
-                self.track_loaded_component(component, component_id)
+            # Use track_loaded_component instead of add_component to avoid infinite loops
+            self.track_loaded_component(component, component_id)
 
-                logger.info("Component %s (%s) added to scene", component_id, component_name)
+            logger.info("Component %s (%s) added to scene", component_id, component_name)
+            return component
 
-            except Exception as e:
-                logger.error("Error loading component %s: %s", comp_data.get('Name', comp_data.get('name', 'Unknown')), e)
+        except Exception as e:
+            logger.error("Error loading component %s: %s", comp_data.get('Name', comp_data.get('name', 'Unknown')), e)
+            return None
 
     def _load_connections(self):
-        """Load connections from the data model"""
+        """Load connections from the data model.
+
+        Routes persisted by persist_connection_routes are reused while their
+        signature still matches the scene; only the remaining wires are routed.
+        """
+        routes = {}
         for conn_data in self.data_model.connections:
-            try:
-                # Get connection ID from the loaded data
-                connection_id = conn_data.get("Connection ID")
+            wire = self._create_connection_graphics(conn_data, route=False)
+            if wire:
+                routes[wire] = self.data_model.connection_route(wire.connection_id)
+        stale = self.scene.restore_routes(routes)
+        stale_set = set(stale)
+        for wire in routes:
+            if wire not in stale_set:
+                self._persisted_segments[wire.connection_id] = wire.wire_path.segments
+        logger.info("Reused %d stored routes, routing %d wires", len(routes) - len(stale), len(stale))
+        if stale:
+            # Route the stale wires together so the layout does not depend on load order
+            self.scene.route_all_wires(stale)
+
+    def persist_connection_routes(self) -> int:
+        """Mirror changed wire routes into the RDB so a reopened scene can skip routing"""
+        routes, segments = {}, {}
+        for connection_id, wire in self._connection_graphics_items.items():
+            path = getattr(wire, 'wire_path', None) if wire else None
+            # Any reroute assigns a new segment list
+            if path is None or self._persisted_segments.get(connection_id) is path.segments:
+                continue
+            stored = self.scene.stored_route(wire)
+            if stored is not None:
+                routes[connection_id] = stored
+                segments[connection_id] = path.segments
+        if not routes:
+            return 0
+        count = self.data_model.set_connection_routes(routes)
+        # Only routes that reached the RDB count as persisted
+        self._persisted_segments.update(segments)
+        return count
+
+    def _create_connection_graphics(self, conn_data: Dict[str, Any], route: bool = True) -> Optional[Wire]:
+        """Create, route and track the wire for one IO connection row.
+
+        With ``route=False`` the wire is created without a path and the caller
+        routes it (see _load_connections).
+        """
+        # Get connection ID from the loaded data
+        connection_id = conn_data.get("Connection ID")
+        try:
+            if not connection_id:
+                logger.warning("Connection missing ID: %s", conn_data)
+                return None
 
-                if not connection_id:
-                    logger.warning("Connection missing ID: %s", conn_data)
-                    continue
+            # Get component IDs and pin IDs
+            from_component = conn_data.get("Source Device")
+            to_component = conn_data.get("Dest Device")
+            from_pin_name = conn_data.get("Source Pin")
+            to_pin_name = conn_data.get("Dest Pin")
 
-                # Get component IDs and pin IDs
-                from_component = conn_data.get("Source Device")
-                to_component = conn_data.get("Dest Device")
-                from_pin_name = conn_data.get("Source Pin")
-                to_pin_name = conn_data.get("Dest Pin")
+            if not all([from_component, to_component, from_pin_name, to_pin_name]):
+                logger.warning("Connection missing required data: %s", conn_data)
+                return None
 
-                if not all([from_component, to_component, from_pin_name, to_pin_name]):
-                    logger.warning("Connection missing required data: %s", conn_data)
-                    continue
+            from_component_id = self._get_component_id(from_component)
+            to_component_id = self._get_component_id(to_component)
+
+            # Find the component graphics items
+            from_comp = self._component_graphics_items.get(from_component_id)
+            to_comp = self._component_graphics_items.get(to_component_id)
 
-                from_component_id = self._get_component_id(from_component)
-                to_component_id = self._get_component_id(to_component)
+            if not from_comp or not to_comp:
+                logger.warning("Could not find component graphics for connection %s", connection_id)
+                return None
 
-                # Find the component graphics items
-                from_comp = self._component_graphics_items.get(from_component_id)
-                to_comp = self._component_graphics_items.get(to_component_id)
+            # Find the pins on the components
+            from_pin_obj = None
+            to_pin_obj = None
 
-                if not from_comp or not to_comp:
-                    logger.warning("Could not find component graphics for connection %s", connection_id)
-                    continue
+            # Match pins by name - check both pin_name and pin_id attributes
+            for pin in from_comp.pins:
+                pin_name = getattr(pin, 'pin_name', None) or getattr(pin, 'pin_id', None)
+                if pin_name == from_pin_name:
+                    from_pin_obj = pin
+                    break
 
-                # Find the pins on the components
-                from_pin_obj = None
-                to_pin_obj = None
-
-                # Match pins by name - check both pin_name and pin_id attributes
-                for pin in from_comp.pins:
-                    pin_name = getattr(pin, 'pin_name', None) or getattr(pin, 'pin_id', None)
-                    if pin_name == from_pin_name:
-                        from_pin_obj = pin
-                        break
-
-                for pin in to_comp.pins:
-                    pin_name = getattr(pin, 'pin_name', None) or getattr(pin, 'pin_id', None)
-                    if pin_name == to_pin_name:
-                        to_pin_obj = pin
-                        break
-
-                if not from_pin_obj or not to_pin_obj:
-                    logger.warning("Could not find pins for connection %s (from_pin: %s, to_pin: %s)",
-                                    connection_id, from_pin_name, to_pin_name)
-                    continue
+            for pin in to_comp.pins:
+                pin_name = getattr(pin, 'pin_name', None) or getattr(pin, 'pin_id', None)
+                if pin_name == to_pin_name:
+                    to_pin_obj = pin
+                    break
 
+            if not from_pin_obj or not to_pin_obj:
+                logger.warning("Could not find pins for connection %s (from_pin: %s, to_pin: %s)",
+                                connection_id, from_pin_name, to_pin_name)
+                return None
+
+            if route:
                 # Create the wire using the scene's wire creation logic
                 wire = Wire(from_pin_obj, end_pin=to_pin_obj, scene=self.scene)
-                if wire.complete_wire(to_pin_obj):
+                completed = wire.complete_wire(to_pin_obj)
+                if completed:
                     # Force wire to recalculate its path and update graphics
                     wire.update_path()
                     wire.force_intersection_recalculation()
+            else:
+                # Created without an end pin so no calculation starts
+                wire = Wire(from_pin_obj, scene=self.scene)
+                completed = to_pin_obj is not from_pin_obj
+                wire.end_pin = to_pin_obj
+                wire.is_temporary = False
+            if completed:
+                # Add wire to scene
+                self.scene.addItem(wire)
 
-                    # Add wire to scene
-                    self.scene.addItem(wire)
-
-                    # Force wire to update its geometry
-                    wire.update()
+                # Force wire to update its geometry
+                wire.update()
 
-                    # Register wire with both connected components
-                    from_comp.add_wire(wire)
-                    to_comp.add_wire(wire)
+                # Register wire with both connected components
+                from_comp.add_wire(wire)
+                to_comp.add_wire(wire)
 
-                    # Track the graphics item in the controller
-                    self._connection_graphics_items[connection_id] = wire
+                # Track the graphics item in the controller
+                self._connection_graphics_items[connection_id] = wire
 
-                    # Set wire properties
-                    wire.connection_id = connection_id
-                    wire.properties = conn_data.get("Properties", {})
+                # Set wire properties
+                wire.connection_id = connection_id
+                wire.properties = conn_data.get("Properties", {})
 
-                    # Force scene update for this wire and ensure it's visible
-                    self.scene.update(wire.sceneBoundingRect())
+                # Force scene update for this wire and ensure it's visible
+                self.scene.update(wire.sceneBoundingRect())
 
-                    # Additional visibility fixes
-                    wire.setVisible(True)
-                    wire.show()
+                # Additional visibility fixes
+                wire.setVisible(True)
+                wire.show()
 
-                    logger.info("Connection %s added to scene", connection_id)
-                else:
-                    logger.warning("Failed to complete wire for connection %s", connection_id)
+                logger.info("Connection %s added to scene", connection_id)
+                return wire
+            logger.warning("Failed to complete wire for connection %s", connection_id)
+            return None
 
-            except Exception as e:
-                logger.error("Error loading connection %s: %s", connection_id, e)
+        except Exception as e:
+            logger.error("Error loading connection %s: %s", connection_id, e)
+            return None
 
     def load_scene(self) -> bool:
         """Load scene from JSON file or database"""
@@ -1294,12 +1471,117 @@ class VisualBCFController(QObject):
             return False
 
     def export_scene(self, file_path: str) -> bool:
-        """Export current scene to external JSON file"""
-        pass
+        """Export current scene to an external JSON Lines file.
+
+        Components (with their visual properties) and connections are streamed
+        to disk one record at a time; progress is reported through
+        ``operation_completed("export_scene_progress", ...)``.
+        """
+        try:
+            def _report(done: int, total: int):
+                self.operation_completed.emit(
+                    "export_scene_progress", f"Exported {done}/{total} records")
+
+            written = SceneStreamWriter(file_path).write(self.data_model, progress=_report)
+            self.operation_completed.emit(
+                "export_scene", f"Scene exported: {written} records to {file_path}")
+            logger.info("Exported %s scene records to %s", written, file_path)
+            return True
+        except Exception as e:
+            error_msg = f"Failed to export scene: {str(e)}"
+            logger.error(error_msg)
+            self.error_occurred.emit(error_msg)
+            return False
+
+    def import_scene(self, file_path: str, batch_size: int = 500, synchronous: bool = False) -> bool:
+        """Import a scene file written by export_scene.
+
+        Records are read and applied to the RDB one batch at a time, and the
+        graphics of each batch are created on its own event loop tick so large
+        files do not freeze the UI. Progress is reported through
+        ``import_progress(done, total)`` and completion through
+        ``operation_completed("import_scene", ...)``.
+
+        Args:
+            file_path: Scene file to import
+            batch_size: Number of records applied per RDB batch / UI tick
+            synchronous: Process all batches before returning (scripts, tests)
+
+        Returns:
+            True if the import was started (or completed when synchronous)
+        """
+        try:
+            if self._scene_importer is not None:
+                self._scene_importer.close()
+            importer = SceneImporter(self.data_model, file_path, batch_size)
+            importer.start()
+            self._scene_importer = importer
+            self._scene_import_async = not synchronous
+            self._imported_wires = []
+        except Exception as e:
+            self._scene_importer = None
+            error_msg = f"Failed to import scene: {str(e)}"
+            logger.error(error_msg)
+            self.error_occurred.emit(error_msg)
+            return False
+
+        if synchronous:
+            while self._import_scene_step():
+                pass
+        else:
+            QTimer.singleShot(0, self._import_scene_step)
+        return True
+
+    def _import_scene_step(self) -> bool:
+        """Apply one import batch; returns True while more batches remain"""
+        importer = self._scene_importer
+        if importer is None:
+            return False
+        try:
+            components, connections = importer.apply_next_batch()
+            for comp_data in components:
+                component = self._component_graphics_items.get(comp_data.get("ID"))
+                if component is None:
+                    self._create_component_graphics(comp_data)
+                    continue
+                # Existing component: only follow the imported position
+                component.setPos(*self.data_model.component_position(comp_data.get("ID")))
+            for conn_data in connections:
+                if conn_data.get("Connection ID") not in self._connection_graphics_items:
+                    wire = self._create_connection_graphics(conn_data, route=False)
+                    if wire:
+                        self._imported_wires.append(wire)
+
+            self.import_progress.emit(importer.records_applied, importer.total_records)
+            if not importer.finished:
+                if self._scene_import_async:
+                    QTimer.singleShot(0, self._import_scene_step)
+                return True
+
+            importer.close()
+            self._scene_importer = None
+            self._route_imported_wires()
+            self.scene.update()
+            self.operation_completed.emit(
+                "import_scene", f"Scene imported: {importer.records_applied} records")
+            logger.info("Imported %s scene records", importer.records_applied)
+            return False
+        except Exception as e:
+            importer.close()
+            self._scene_importer = None
+            self._route_imported_wires()
+            error_msg = f"Failed to import scene: {str(e)}"
+            logger.error(error_msg)
+            self.error_occurred.emit(error_msg)
+            return False
 
-    def import_scene(self, file_path: str) -> bool:
-        """Import scene from external JSON file"""
-        pass
+    def _route_imported_wires(self):
+        """Route the wires created by an import in one batch, as load_scene does"""
+        wires, self._imported_wires = self._imported_wires, []
+        # Skip wires removed while the import was running
+        wires = [wire for wire in wires if self._connection_graphics_items.get(wire.connection_id) is wire]
+        if wires:
+            self.scene.route_all_wires(wires)
 
     def _clear_graphics_items(self):
         """Clear all graphics items from the scene and tracking dictionaries"""
@@ -1311,6 +1593,7 @@ class VisualBCFController(QObject):
             # Clear the tracking dictionaries
             self._component_graphics_items.clear()
             self._connection_graphics_items.clear()
+            self._persisted_segments.clear()
 
             # Scene is cleared by scene.clear(), no need to manage separate lists
             # Reset scene state
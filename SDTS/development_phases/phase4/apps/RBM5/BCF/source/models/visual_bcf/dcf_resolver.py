@@ -0,0 +1,162 @@
+"""
+DCF Resolver
+
+Memoized lookup of Device Configurations (DCF) for Visual BCF components.
+
+Resolution order matches VisualBCFDataModel.component_dcf: the component
+configurations in the RDB are consulted first, then the DCF_FOR_BCF table of
+the current revision. The DCF_FOR_BCF table is indexed by ``name`` and
+``device_name`` once per revision instead of being scanned on every lookup,
+and resolved entries are kept in a bounded LRU cache together with their
+parsed pin layout so identical device types share one parsed config.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import logging
+
+import apps.RBM5.BCF.source.RDB.paths as paths
+from apps.RBM5.BCF.source.RDB.paths import BCF_DCF_FOR_BCF, CURRENT_REVISION
+
+logger = logging.getLogger(__name__)
+
+
+class PinSpec(NamedTuple):
+    """Normalized pin description parsed from a component configuration"""
+    pin_id: str
+    pin_name: str
+    pin_type: str
+    side: str
+    position: float
+
+
+def parse_pin_layout(component_config: Optional[Dict[str, Any]]) -> Tuple[PinSpec, ...]:
+    """Parse the ``pins`` list of a component configuration into PinSpecs.
+
+    Pins without an ID are skipped, the same way ComponentWithPins skips them.
+    """
+    if not component_config:
+        return ()
+    layout = []
+    for pin_config in component_config.get('pins', []) or []:
+        pin_id = pin_config.get('pin_id', pin_config.get('id', ''))
+        if not pin_id:
+            continue
+        layout.append(PinSpec(
+            pin_id,
+            pin_config.get('pin_name', pin_config.get('name', pin_id)),
+            pin_config.get('type', 'digital'),
+            pin_config.get('side', 'right'),
+            pin_config.get('position', 0.5),
+        ))
+    return tuple(layout)
+
+
+class _ResolvedDCF(NamedTuple):
+    config: Dict[str, Any]
+    pin_layout: Tuple[PinSpec, ...]
+
+
+class DCFResolver:
+    """Memoized DCF lookup with a per-revision name index and LRU eviction.
+
+    The resolver follows the database's ``data_changed`` signal and drops
+    its cache only for writes that ``is_dcf_path`` matches (component
+    configs, the current revision and its DCF_FOR_BCF table), so unrelated
+    edits keep it warm. In-place edits of existing rows that are not written
+    back must be reported through ``invalidate()``.
+    """
+
+    def __init__(self, rdb_manager, max_entries: int = 256):
+        self.rdb_manager = rdb_manager
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, _ResolvedDCF]" = OrderedDict()
+        self._name_index: Dict[str, Dict[str, Any]] = {}
+        self._layouts: Dict[int, _ResolvedDCF] = {}
+        self.hits = 0
+        self.misses = 0
+        db = getattr(rdb_manager, 'db', None)
+        if db is not None and hasattr(db, 'data_changed'):
+            db.data_changed.connect(self._on_path_changed)
+
+    @property
+    def revision(self) -> str:
+        return self.rdb_manager.get_value(str(CURRENT_REVISION)) or "1.0.0"
+
+    def invalidate(self) -> None:
+        """Drop all memoized entries and the DCF_FOR_BCF name index"""
+        self._cache.clear()
+        self._name_index.clear()
+        self._layouts.clear()
+
+    def _on_path_changed(self, changed_path: str) -> None:
+        if self.is_dcf_path(changed_path):
+            self.invalidate()
+
+    def is_dcf_path(self, changed_path: str) -> bool:
+        """Return True if a change at ``changed_path`` can affect resolution"""
+        # The database treats '.' and '/' alike, so compare normalized paths
+        changed = str(changed_path).replace(".", "/")
+        watched = [str(p).replace(".", "/") for p in (paths.COMPONENT_CONFIGS,
+                                                      CURRENT_REVISION,
+                                                      BCF_DCF_FOR_BCF(self.revision))]
+        return any(changed == p or changed.startswith(p + "/") or p.startswith(changed + "/")
+                   for p in watched)
+
+    def _build_name_index(self) -> None:
+        table = self.rdb_manager.get_value(str(BCF_DCF_FOR_BCF(self.revision)))
+        index: Dict[str, Dict[str, Any]] = {}
+        if isinstance(table, list):
+            # First match wins, matching the original linear scan
+            for device_config in table:
+                if not isinstance(device_config, dict):
+                    continue
+                for key in ('name', 'device_name'):
+                    value = device_config.get(key)
+                    if value is not None and value not in index:
+                        index[value] = device_config
+        self._name_index = index
+        logger.debug("Built DCF name index for revision %s: %d entries", self.revision, len(index))
+
+    def _lookup(self, device_name: str) -> Optional[Dict[str, Any]]:
+        configs = self.rdb_manager.get_value(str(paths.COMPONENT_CONFIGS))
+        if isinstance(configs, dict) and device_name in configs:
+            return configs[device_name]
+        if not self._name_index:
+            self._build_name_index()
+        return self._name_index.get(device_name)
+
+    def _resolve_entry(self, device_name: str) -> Optional[_ResolvedDCF]:
+        entry = self._cache.get(device_name)
+        if entry is not None:
+            self._cache.move_to_end(device_name)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        config = self._lookup(device_name)
+        if config is None:
+            return None
+
+        # Devices that resolve to the same config object share one parsed layout
+        entry = self._layouts.get(id(config))
+        if entry is None or entry.config is not config:
+            entry = _ResolvedDCF(config, parse_pin_layout(config))
+            self._layouts[id(config)] = entry
+
+        self._cache[device_name] = entry
+        if len(self._cache) > self.max_entries:
+            _, evicted = self._cache.popitem(last=False)
+            if not any(e is evicted for e in self._cache.values()):
+                self._layouts.pop(id(evicted.config), None)
+        return entry
+
+    def resolve(self, device_name: str) -> Optional[Dict[str, Any]]:
+        """Return the DCF for ``device_name`` or None if it is unknown"""
+        entry = self._resolve_entry(device_name)
+        return entry.config if entry else None
+
+    def pin_layout(self, device_name: str) -> Tuple[PinSpec, ...]:
+        """Return the shared parsed pin layout for ``device_name``"""
+        entry = self._resolve_entry(device_name)
+        return entry.pin_layout if entry else ()
@@ -0,0 +1,165 @@
+"""
+Visual BCF Model Statistics
+
+Incrementally maintained row counters for the Visual BCF device and connection
+tables.
+
+The data model reports its own row operations (``row_added``/``row_removed``)
+so counters move by one per change. Changes made to the tables by anyone else
+arrive as database path changes and only recount the affected table, so
+``snapshot()`` never scans the tables and costs the same for any board size.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPONENT_TABLES = ("mipi", "gpio")
+CONNECTION_TABLE = "connection"
+
+
+def _normalize(path) -> str:
+    # The database treats '.' and '/' alike
+    return str(path).replace(".", "/")
+
+
+class ModelStatistics:
+    """Per-table row counts and per-type/per-module component counts.
+
+    Args:
+        table_paths: callable returning {table name: RDB table path} for the
+            current revision (``mipi``, ``gpio`` and ``connection``)
+        get_table: callable returning the row list stored at a table path
+    """
+
+    def __init__(self, table_paths: Callable[[], Dict[str, str]],
+                 get_table: Callable[[str], Any]):
+        self._table_paths = table_paths
+        self._get_table = get_table
+        self._paths: Dict[str, str] = {}
+        self._rows: Dict[str, int] = {}
+        self._modules: Dict[str, Counter] = {}
+        # Table writes already accounted for by row_added/row_removed
+        self._expected: Dict[str, tuple] = {}
+        self.rebuild()
+
+    # Full recount (construction, revision switch)
+
+    def rebuild(self) -> None:
+        self._paths = {name: _normalize(path) for name, path in self._table_paths().items()}
+        self._expected.clear()
+        for table in self._paths:
+            self._recount(table)
+
+    def _recount(self, table: str) -> None:
+        rows = self._get_table(self._paths[table])
+        rows = rows if isinstance(rows, list) else []
+        self._rows[table] = len(rows)
+        if table != CONNECTION_TABLE:
+            self._modules[table] = Counter(row.get("Module") or "Unknown"
+                                           for row in rows if isinstance(row, dict))
+        logger.debug("Recounted %s table: %d rows", table, len(rows))
+
+    # Row-level updates from the data model
+
+    def _expect(self, table: str) -> None:
+        rows = self._get_table(self._paths[table])
+        if isinstance(rows, list):
+            self._expected[table] = (id(rows), len(rows))
+
+    def row_added(self, table: str, row: Dict[str, Any], rows: Optional[list] = None) -> None:
+        """Count one appended row; ``rows`` is the table list about to be written"""
+        if table not in self._paths:
+            return
+        self._rows[table] = self._rows.get(table, 0) + 1
+        if table != CONNECTION_TABLE:
+            self._modules.setdefault(table, Counter())[row.get("Module") or "Unknown"] += 1
+        if rows is not None:
+            self._expected[table] = (id(rows), len(rows))
+        else:
+            self._expect(table)
+
+    def row_replaced(self, table: str, old_row: Dict[str, Any], new_row: Dict[str, Any],
+                     rows: Optional[list] = None) -> None:
+        """Account for a row replaced in place; ``rows`` is the table about to be written"""
+        if table not in self._paths:
+            return
+        if table != CONNECTION_TABLE:
+            self._uncount_module(table, old_row)
+            self._modules.setdefault(table, Counter())[new_row.get("Module") or "Unknown"] += 1
+        if rows is not None:
+            self._expected[table] = (id(rows), len(rows))
+
+    def row_removed(self, table: str, row: Dict[str, Any]) -> None:
+        """Uncount one row removed in place (no table write follows)"""
+        if table not in self._paths:
+            return
+        self._rows[table] = max(0, self._rows.get(table, 0) - 1)
+        if table != CONNECTION_TABLE:
+            self._uncount_module(table, row)
+
+    def _uncount_module(self, table: str, row: Dict[str, Any]) -> None:
+        modules = self._modules.setdefault(table, Counter())
+        module = row.get("Module") or "Unknown"
+        modules[module] -= 1
+        if modules[module] <= 0:
+            del modules[module]
+
+    # Database change notifications
+
+    def path_changed(self, changed_path) -> bool:
+        """Recount the tables affected by a database change; returns True if any"""
+        changed = _normalize(changed_path)
+        if self._paths_outdated():
+            self.rebuild()
+            return True
+        affected = False
+        for table, path in self._paths.items():
+            if changed == path or changed.startswith(path + "/") or path.startswith(changed + "/"):
+                affected = True
+                if changed == path and self._consume_expected(table):
+                    continue
+                self._recount(table)
+        return affected
+
+    def _paths_outdated(self) -> bool:
+        # Table paths depend on the current revision
+        current = {name: _normalize(path) for name, path in self._table_paths().items()}
+        return current != self._paths
+
+    def _consume_expected(self, table: str) -> bool:
+        expected = self._expected.pop(table, None)
+        if expected is None:
+            return False
+        rows = self._get_table(self._paths[table])
+        return isinstance(rows, list) and (id(rows), len(rows)) == expected
+
+    # Reads
+
+    def count(self, table: str) -> int:
+        return self._rows.get(table, 0)
+
+    @property
+    def component_count(self) -> int:
+        return sum(self._rows.get(table, 0) for table in COMPONENT_TABLES)
+
+    @property
+    def connection_count(self) -> int:
+        return self._rows.get(CONNECTION_TABLE, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the statistics dict; cost is independent of the table sizes"""
+        by_module: Counter = Counter()
+        for table in COMPONENT_TABLES:
+            by_module.update(self._modules.get(table, {}))
+        return {
+            'component_count': self.component_count,
+            'connection_count': self.connection_count,
+            'total_components': self.component_count,
+            'total_connections': self.connection_count,
+            'components_by_type': {table: self._rows.get(table, 0) for table in COMPONENT_TABLES
+                                   if self._rows.get(table, 0)},
+            'components_by_module': dict(by_module),
+        }
@@ -0,0 +1,266 @@
+"""
+Component Position Store
+
+Compact, array-backed storage of component positions for Visual BCF.
+
+Positions are held in NumPy arrays indexed by a per-component slot instead of
+nested ``{"position": {"x": .., "y": ..}}`` dicts. Layout operations (bounding
+box, fit-to-view, align, distribute, snap-to-grid, bulk move) are vectorized
+over the selected slots. Changed positions are tracked and mirrored back to the
+RDB visual properties by ``flush``.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BoundingBox = Tuple[float, float, float, float]  # x0, y0, x1, y1
+
+
+class ComponentPositionStore:
+    """Positions and sizes of components stored in parallel NumPy arrays"""
+
+    ALIGN_MODES = ("left", "right", "top", "bottom", "hcenter", "vcenter")
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(1, capacity)
+        self._xs = np.zeros(capacity, dtype=np.float64)
+        self._ys = np.zeros(capacity, dtype=np.float64)
+        self._ws = np.zeros(capacity, dtype=np.float64)
+        self._hs = np.zeros(capacity, dtype=np.float64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._free: List[int] = []
+        self._next = 0
+        self._dirty: set = set()
+        self._bbox: Optional[BoundingBox] = None
+        self._bbox_valid = False
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, component_id: str) -> bool:
+        return component_id in self._slots
+
+    @property
+    def has_changes(self) -> bool:
+        """True if positions changed since the last flush"""
+        return bool(self._dirty)
+
+    @property
+    def dirty_ids(self) -> set:
+        return set(self._dirty)
+
+    # Slot management
+
+    def _grow(self) -> None:
+        capacity = len(self._xs) * 2
+        for name in ("_xs", "_ys", "_ws", "_hs", "_active"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self._ids.extend([None] * (capacity - len(self._ids)))
+
+    def _slot(self, component_id: str) -> int:
+        slot = self._slots.get(component_id)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._next >= len(self._xs):
+                self._grow()
+            slot = self._next
+            self._next += 1
+        self._slots[component_id] = slot
+        self._ids[slot] = component_id
+        self._active[slot] = True
+        self._xs[slot] = self._ys[slot] = self._ws[slot] = self._hs[slot] = 0.0
+        return slot
+
+    def _indices(self, component_ids: Optional[Iterable[str]]) -> np.ndarray:
+        if component_ids is None:
+            return np.flatnonzero(self._active)
+        return np.fromiter((self._slots[c] for c in component_ids if c in self._slots), dtype=np.intp)
+
+    def _touch(self, indices) -> None:
+        self._bbox_valid = False
+        for i in np.atleast_1d(indices):
+            self._dirty.add(self._ids[int(i)])
+
+    # Single component access
+
+    def set_position(self, component_id: str, x: float, y: float, mark_dirty: bool = True) -> None:
+        slot = self._slot(component_id)
+        self._xs[slot] = x
+        self._ys[slot] = y
+        self._bbox_valid = False
+        if mark_dirty:
+            self._dirty.add(component_id)
+
+    def position(self, component_id: str) -> Optional[Tuple[float, float]]:
+        slot = self._slots.get(component_id)
+        if slot is None:
+            return None
+        return float(self._xs[slot]), float(self._ys[slot])
+
+    def set_size(self, component_id: str, width: float, height: float) -> None:
+        slot = self._slot(component_id)
+        if self._ws[slot] == width and self._hs[slot] == height:
+            return
+        self._ws[slot] = width
+        self._hs[slot] = height
+        self._bbox_valid = False
+
+    def discard(self, component_id: str) -> None:
+        """Forget a component (its next read falls back to the RDB)"""
+        slot = self._slots.pop(component_id, None)
+        if slot is None:
+            return
+        self._active[slot] = False
+        self._ids[slot] = None
+        self._free.append(slot)
+        self._dirty.discard(component_id)
+        self._bbox_valid = False
+
+    def clear(self) -> None:
+        for component_id in list(self._slots):
+            self.discard(component_id)
+
+    def positions(self, component_ids: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """Return {component_id: (x, y)} for the given components"""
+        return {c: (float(self._xs[s]), float(self._ys[s]))
+                for c in component_ids for s in (self._slots.get(c),) if s is not None}
+
+    # Vectorized layout operations
+
+    def bounding_box(self, component_ids: Optional[Iterable[str]] = None) -> Optional[BoundingBox]:
+        """Bounding box of the given components (all components if None).
+
+        Components without a size (not placed in a scene yet) are left out.
+        The whole-scene box is cached until a position or size changes.
+        """
+        if component_ids is None and self._bbox_valid:
+            return self._bbox
+        idx = self._indices(component_ids)
+        idx = idx[(self._ws[idx] > 0) | (self._hs[idx] > 0)]
+        if idx.size == 0:
+            bbox = None
+        else:
+            xs, ys = self._xs[idx], self._ys[idx]
+            bbox = (float(xs.min()), float(ys.min()),
+                    float((xs + self._ws[idx]).max()), float((ys + self._hs[idx]).max()))
+        if component_ids is None:
+            self._bbox, self._bbox_valid = bbox, True
+        return bbox
+
+    def fit_to_view(self, view_width: float, view_height: float, margin: float = 50.0,
+                    component_ids: Optional[Iterable[str]] = None) -> Optional[Tuple[float, float, float]]:
+        """Return (scale, center_x, center_y) fitting the components in a viewport"""
+        bbox = self.bounding_box(component_ids)
+        if bbox is None or view_width <= 0 or view_height <= 0:
+            return None
+        x0, y0, x1, y1 = bbox
+        width = max(x1 - x0 + 2 * margin, 1.0)
+        height = max(y1 - y0 + 2 * margin, 1.0)
+        scale = min(view_width / width, view_height / height)
+        return scale, (x0 + x1) / 2.0, (y0 + y1) / 2.0
+
+    def move(self, component_ids: Iterable[str], dx: float, dy: float) -> List[str]:
+        """Translate the given components; returns the moved IDs"""
+        idx = self._indices(component_ids)
+        if idx.size == 0 or (dx == 0 and dy == 0):
+            return []
+        self._xs[idx] += dx
+        self._ys[idx] += dy
+        self._touch(idx)
+        return [self._ids[i] for i in idx]
+
+    def align(self, component_ids: Iterable[str], mode: str) -> List[str]:
+        """Align components to the left/right/top/bottom edge or h/v center"""
+        if mode not in self.ALIGN_MODES:
+            raise ValueError(f"Unknown align mode: {mode}")
+        idx = self._indices(component_ids)
+        if idx.size < 2:
+            return []
+        xs, ys, ws, hs = self._xs[idx], self._ys[idx], self._ws[idx], self._hs[idx]
+        if mode == "left":
+            self._xs[idx] = xs.min()
+        elif mode == "right":
+            self._xs[idx] = (xs + ws).max() - ws
+        elif mode == "top":
+            self._ys[idx] = ys.min()
+        elif mode == "bottom":
+            self._ys[idx] = (ys + hs).max() - hs
+        elif mode == "hcenter":
+            center = (xs.min() + (xs + ws).max()) / 2.0
+            self._xs[idx] = center - ws / 2.0
+        else:
+            center = (ys.min() + (ys + hs).max()) / 2.0
+            self._ys[idx] = center - hs / 2.0
+        self._touch(idx)
+        return [self._ids[i] for i in idx]
+
+    def distribute(self, component_ids: Iterable[str], axis: str = "horizontal") -> List[str]:
+        """Space components evenly (equal gaps) between the outermost two"""
+        idx = self._indices(component_ids)
+        if idx.size < 3:
+            return []
+        pos, size = (self._xs, self._ws) if axis == "horizontal" else (self._ys, self._hs)
+        order = idx[np.argsort(pos[idx], kind="stable")]
+        start = pos[order[0]]
+        end = pos[order[-1]] + size[order[-1]]
+        gap = (end - start - size[order].sum()) / (order.size - 1)
+        offsets = np.concatenate(([0.0], np.cumsum(size[order][:-1] + gap)))
+        pos[order] = start + offsets
+        self._touch(order)
+        return [self._ids[i] for i in order]
+
+    def snap_to_grid(self, grid_size: float, component_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """Round positions to the nearest grid point; returns the changed IDs"""
+        if grid_size <= 0:
+            return []
+        idx = self._indices(component_ids)
+        if idx.size == 0:
+            return []
+        xs = np.round(self._xs[idx] / grid_size) * grid_size
+        ys = np.round(self._ys[idx] / grid_size) * grid_size
+        changed = idx[(xs != self._xs[idx]) | (ys != self._ys[idx])]
+        self._xs[idx] = xs
+        self._ys[idx] = ys
+        if changed.size:
+            self._touch(changed)
+        return [self._ids[i] for i in changed]
+
+    # RDB mirroring
+
+    def load(self, visual_properties: Dict[str, dict]) -> None:
+        """Bulk-load positions from RDB visual properties (not marked dirty)"""
+        for component_id, props in (visual_properties or {}).items():
+            pos = props.get("position") if isinstance(props, dict) else None
+            if isinstance(pos, dict):
+                self.set_position(component_id, pos.get("x", 0), pos.get("y", 0), mark_dirty=False)
+
+    def flush(self, visual_properties: Dict[str, dict],
+              component_ids: Optional[Iterable[str]] = None) -> int:
+        """Write dirty positions into ``visual_properties``; returns the count"""
+        ids = self._dirty if component_ids is None else self._dirty.intersection(component_ids)
+        count = 0
+        for component_id in list(ids):
+            slot = self._slots.get(component_id)
+            if slot is not None:
+                props = visual_properties.setdefault(component_id, {})
+                pos = props.get("position")
+                if isinstance(pos, dict):
+                    pos["x"] = float(self._xs[slot])
+                    pos["y"] = float(self._ys[slot])
+                else:
+                    props["position"] = {"x": float(self._xs[slot]), "y": float(self._ys[slot])}
+                count += 1
+            self._dirty.discard(component_id)
+        return count
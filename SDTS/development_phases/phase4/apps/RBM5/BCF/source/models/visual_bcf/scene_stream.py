@@ -0,0 +1,256 @@
+"""
+Visual BCF Scene Stream
+
+Streaming serialization of a Visual BCF scene to JSON Lines.
+
+A scene file is a sequence of one JSON object per line:
+
+    {"type": "header", "format": "visual_bcf_scene", "version": 1, ...}
+    {"type": "component", "table": "mipi", "row": {...}, "visual": {...}}
+    {"type": "connection", "row": {...}}
+    {"type": "end", "records": <number of component/connection records>}
+
+Records are written one at a time straight from the RDB tables, so the full
+scene dict is never built in memory, and read back in batches so an import
+never holds more than one batch of parsed records.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import apps.RBM5.BCF.source.RDB.paths as paths
+
+logger = logging.getLogger(__name__)
+
+SCENE_FORMAT = "visual_bcf_scene"
+SCENE_FORMAT_VERSION = 1
+
+
+class SceneStreamWriter:
+    """Write a Visual BCF scene to a JSON Lines file record by record.
+
+    The file is written to a temporary sibling and moved into place when the
+    export completes, so a failed export never leaves a truncated scene behind.
+    """
+
+    def __init__(self, file_path: str, progress_interval: int = 1000):
+        self.file_path = file_path
+        self.progress_interval = max(1, progress_interval)
+        self.records_written = 0
+
+    def _write(self, f, record: Dict[str, Any]) -> None:
+        f.write(json.dumps(record, separators=(",", ":")))
+        f.write("\n")
+
+    def write(self, data_model,
+              progress: Optional[Callable[[int, int], None]] = None) -> int:
+        """Stream all components and connections of ``data_model`` to disk.
+
+        Args:
+            data_model: VisualBCFDataModel providing the device/IO tables
+            progress: optional callback(records_written, total_records)
+
+        Returns:
+            Number of component and connection records written
+        """
+        component_count, connection_count = data_model.scene_record_counts()
+        total = component_count + connection_count
+        tmp_path = f"{self.file_path}.tmp"
+        self.records_written = 0
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                self._write(f, {
+                    "type": "header",
+                    "format": SCENE_FORMAT,
+                    "version": SCENE_FORMAT_VERSION,
+                    "revision": data_model.revision,
+                    "counts": {"components": component_count, "connections": connection_count},
+                })
+                for table, row, visual in data_model.iter_component_records():
+                    self._write(f, {"type": "component", "table": table, "row": row, "visual": visual})
+                    self._advance(progress, total)
+                for row in data_model.iter_connection_records():
+                    self._write(f, {"type": "connection", "row": row})
+                    self._advance(progress, total)
+                self._write(f, {"type": "end", "records": self.records_written})
+            os.replace(tmp_path, self.file_path)
+        except Exception:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        if progress:
+            progress(self.records_written, total)
+        return self.records_written
+
+    def _advance(self, progress, total: int) -> None:
+        self.records_written += 1
+        if progress and self.records_written % self.progress_interval == 0:
+            progress(self.records_written, total)
+
+
+class SceneStreamReader:
+    """Read a Visual BCF scene file written by SceneStreamWriter line by line"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.header: Dict[str, Any] = {}
+        self._file = None
+
+    def open(self) -> Dict[str, Any]:
+        """Open the file and return its validated header record"""
+        self._file = open(self.file_path, "r", encoding="utf-8")
+        header = json.loads(self._file.readline() or "{}")
+        if header.get("type") != "header" or header.get("format") != SCENE_FORMAT:
+            self.close()
+            raise ValueError(f"Not a Visual BCF scene file: {self.file_path}")
+        if header.get("version", 0) > SCENE_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported scene file version: {header.get('version')}")
+        self.header = header
+        return header
+
+    @property
+    def total_records(self) -> int:
+        counts = self.header.get("counts", {})
+        return int(counts.get("components", 0)) + int(counts.get("connections", 0))
+
+    def read_batch(self, batch_size: int) -> List[Dict[str, Any]]:
+        """Return up to ``batch_size`` component/connection records (empty at EOF)"""
+        batch = []
+        if self._file is None:
+            return batch
+        while len(batch) < batch_size:
+            line = self._file.readline()
+            if not line:
+                self.close()
+                break
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            record_type = record.get("type")
+            if record_type == "end":
+                self.close()
+                break
+            if record_type in ("component", "connection"):
+                batch.append(record)
+        return batch
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SceneImporter:
+    """Apply scene records to the RDB in batches.
+
+    Rows are upserted by ID: a record whose ``ID`` (devices) or
+    ``Connection ID`` (connections) already exists replaces that row, other
+    records are appended. Each batch ends with one ``set_table`` per touched
+    table, so listeners see one change per table per batch.
+    """
+
+    def __init__(self, data_model, file_path: str, batch_size: int = 500):
+        self.data_model = data_model
+        self.reader = SceneStreamReader(file_path)
+        self.batch_size = max(1, batch_size)
+        self.records_applied = 0
+        self._tables: Dict[str, Any] = {}
+        self._row_index: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def total_records(self) -> int:
+        return self.reader.total_records
+
+    @property
+    def finished(self) -> bool:
+        return self.reader.closed
+
+    def start(self) -> Dict[str, Any]:
+        header = self.reader.open()
+        rdb = self.data_model.rdb_manager
+        revision = self.data_model.revision
+        self._tables = {
+            "mipi": (str(paths.BCF_DEV_MIPI(revision)), "ID"),
+            "gpio": (str(paths.BCF_DEV_GPIO(revision)), "ID"),
+            "connection": (str(paths.BCF_DB_IO_CONNECT), "Connection ID"),
+        }
+        for name, (table_path, key) in self._tables.items():
+            rows = rdb.get_table(table_path)
+            self._row_index[name] = {row.get(key): i for i, row in enumerate(rows)
+                                     if isinstance(row, dict) and row.get(key)}
+        return header
+
+    def _upsert(self, table: str, row: Dict[str, Any], touched: Dict[str, List]) -> None:
+        table_path, key = self._tables[table]
+        if table not in touched:
+            touched[table] = self.data_model.rdb_manager.get_table(table_path)
+        rows = touched[table]
+        index = self._row_index[table]
+        row_id = row.get(key)
+        statistics = self.data_model.statistics
+        if row_id in index:
+            statistics.row_replaced(table, rows[index[row_id]], row, rows)
+            rows[index[row_id]] = row
+        else:
+            if row_id:
+                index[row_id] = len(rows)
+            rows.append(row)
+            statistics.row_added(table, row, rows)
+
+    def apply_next_batch(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Read and apply the next batch.
+
+        Returns:
+            (components, connections) applied in this batch; components are in
+            the converted format used by VisualBCFDataModel.components
+        """
+        batch = self.reader.read_batch(self.batch_size)
+        if not batch:
+            return [], []
+        rdb = self.data_model.rdb_manager
+        visual_properties = rdb[paths.VISUAL_PROPERTIES]
+        if not isinstance(visual_properties, dict):
+            visual_properties = {}
+        visual_changed = False
+        touched: Dict[str, List] = {}
+        components, connections = [], []
+        for record in batch:
+            row = record.get("row")
+            if not isinstance(row, dict):
+                continue
+            if record["type"] == "component":
+                table = record.get("table", "mipi")
+                if table not in ("mipi", "gpio"):
+                    table = "mipi"
+                self._upsert(table, row, touched)
+                visual = record.get("visual")
+                if visual and row.get("ID"):
+                    visual_properties[row["ID"]] = visual
+                    # Drop any cached position so it is re-read from the import
+                    self.data_model.positions.discard(row["ID"])
+                    visual_changed = True
+                components.append(self.data_model.convert_device_row(row, table))
+            else:
+                self._upsert("connection", row, touched)
+                connections.append(row)
+        for table, rows in touched.items():
+            rdb.set_table(self._tables[table][0], rows)
+        if visual_changed:
+            # Re-set the dict so it is attached even if the path did not exist yet
+            rdb[str(paths.VISUAL_PROPERTIES)] = visual_properties
+        self.records_applied += len(batch)
+        return components, connections
+
+    def close(self) -> None:
+        self.reader.close()
@@ -7,13 +7,16 @@ and properties data from the underlying JSON database tables used by Legacy BCF.
 """
 
 import traceback
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import uuid
 import logging
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QMetaMethod
 
 import apps.RBM5.BCF.source.RDB.paths as paths
 from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+from apps.RBM5.BCF.source.models.visual_bcf.dcf_resolver import DCFResolver
+from apps.RBM5.BCF.source.models.visual_bcf.position_store import ComponentPositionStore
+from apps.RBM5.BCF.source.models.visual_bcf.model_statistics import ModelStatistics
 from apps.RBM5.BCF.source.RDB.paths import (
     DCF_DEVICES,
     BCF_DEV_MIPI,
@@ -59,7 +62,58 @@ class VisualBCFDataModel(QObject):
         return self.rdb_manager[paths.BCF_DB_ANT(self.revision)]
     
     def visual_properties(self, component_id: str):
+        # Mirror a pending position change before handing out the RDB dict
+        self.flush_positions([component_id])
         return self.rdb_manager[paths.VISUAL_PROPERTIES].get(component_id, {"position": {"x": 0, "y": 0}})
+
+    def component_position(self, component_id: str) -> Tuple[float, float]:
+        """Get a component position from the position store (RDB on first access)"""
+        pos = self.positions.position(component_id)
+        if pos is not None:
+            return pos
+        stored = (self.rdb_manager[paths.VISUAL_PROPERTIES] or {}).get(component_id, {}).get("position")
+        if not isinstance(stored, dict):
+            return 0.0, 0.0
+        x, y = stored.get("x", 0), stored.get("y", 0)
+        self.positions.set_position(component_id, x, y, mark_dirty=False)
+        return float(x), float(y)
+
+    def flush_positions(self, component_ids=None) -> int:
+        """Mirror changed positions from the position store into the RDB.
+
+        Called on explicit save and on close. Errors propagate so a failed
+        flush is never mistaken for a saved scene.
+        """
+        if not self.positions.has_changes:
+            return 0
+        visual_properties = self.rdb_manager[paths.VISUAL_PROPERTIES]
+        count = self.positions.flush(visual_properties, component_ids)
+        # A missing path yields a detached dict; attach it on first write
+        if count and self.rdb_manager[paths.VISUAL_PROPERTIES] is not visual_properties:
+            if not self.rdb_manager.set_value(str(paths.VISUAL_PROPERTIES), visual_properties):
+                raise RuntimeError("Could not store component positions in the RDB")
+        return count
+
+    def connection_route(self, connection_id: str) -> Optional[Dict[str, Any]]:
+        """Persisted routed geometry of a connection (see ComponentScene.stored_route)"""
+        routes = self.rdb_manager[paths.CONNECTION_ROUTES]
+        return routes.get(connection_id) if isinstance(routes, dict) else None
+
+    def set_connection_routes(self, routes: Dict[str, Dict[str, Any]]) -> int:
+        """Store the routed geometry of connections by Connection ID; returns the count stored.
+
+        Errors propagate, as for flush_positions.
+        """
+        stored = self.rdb_manager[paths.CONNECTION_ROUTES]
+        attached = isinstance(stored, dict)
+        if not attached:
+            stored = {}
+        stored.update(routes)
+        # A missing path yields a detached dict; attach it on first write
+        if not attached or self.rdb_manager[paths.CONNECTION_ROUTES] is not stored:
+            if not self.rdb_manager.set_value(str(paths.CONNECTION_ROUTES), stored):
+                raise RuntimeError("Could not store connection routes in the RDB")
+        return len(routes)
     
     def __init__(self, rdb_manager: RDBManager):
         super().__init__()
@@ -78,8 +132,23 @@ class VisualBCFDataModel(QObject):
         # Component configurations (JSON file)
         self.component_configs = self.rdb_manager[paths.COMPONENT_CONFIGS] or {}
 
+        # Array-backed component positions, mirrored to VISUAL_PROPERTIES on save
+        self.positions = ComponentPositionStore()
+        self.positions.load(self.rdb_manager[paths.VISUAL_PROPERTIES] or {})
+
+        # Memoized DCF lookup (name index per revision + LRU of parsed configs)
+        self.dcf_resolver = DCFResolver(self.rdb_manager)
+
+        # Row counters maintained from row operations and table change events
+        self.statistics = ModelStatistics(self._statistics_table_paths, self.rdb_manager.get_table)
+
         # Connect to database changes
         self.rdb_manager.data_changed.connect(self._on_data_changed)
+        # RDBManager does not forward database signals yet, so listen to the
+        # database directly to keep the table statistics current
+        db = getattr(self.rdb_manager, 'db', None)
+        if db is not None and hasattr(db, 'data_changed'):
+            db.data_changed.connect(self._on_db_path_changed)
 
         # Initialize database structure if needed
         self.init_tab()
@@ -117,6 +186,9 @@ class VisualBCFDataModel(QObject):
         """
         Get Device Configuration (DCF) for a specific device name
         
+        Lookups are memoized by the DCF resolver; component configurations take
+        precedence over the DCF_FOR_BCF table of the current revision.
+
         Args:
             device_name: Name of the device to get configuration for
             
@@ -125,26 +197,28 @@ class VisualBCFDataModel(QObject):
             Returns None if device not found
         """
         try:
-            # First try to get from component configurations
-            if device_name in self.component_configs:
-                return self.component_configs[device_name]
-            
-            # If not found in component configs, try to get from DCF_FOR_BCF table
-            self._update_device_table_paths()
-            dcf_data = self.rdb_manager.get_value(self.dcf_for_bcf_path) or []
-            
-            # Search for device in DCF_FOR_BCF table
-            for device_config in dcf_data:
-                if device_config.get('name') == device_name or device_config.get('device_name') == device_name:
-                    return device_config
-            
-            logger.warning(f"Device configuration not found for: {device_name}")
-            return None
-            
+            device_config = self.dcf_resolver.resolve(device_name)
+            if device_config is None:
+                logger.warning(f"Device configuration not found for: {device_name}")
+            return device_config
+
         except Exception as e:
             logger.error(f"Error getting device configuration for {device_name}: %s", e)
             return None
 
+    def component_pin_layout(self, device_name: str) -> tuple:
+        """Get the parsed pin layout (shared per device type) for a device name"""
+        try:
+            return self.dcf_resolver.pin_layout(device_name)
+        except Exception as e:
+            logger.error(f"Error getting pin layout for {device_name}: %s", e)
+            return ()
+
+    def invalidate_dcf_cache(self):
+        """Drop memoized DCF lookups (call after editing DCF rows in place)"""
+        self.component_configs = self.rdb_manager[paths.COMPONENT_CONFIGS] or {}
+        self.dcf_resolver.invalidate()
+
     def _update_device_table_paths(self):
         """Update device table paths with current revision"""
         try:
@@ -162,6 +236,21 @@ class VisualBCFDataModel(QObject):
             # Data changed in RDB, emit signal for other parts to refresh
             self.data_synchronized.emit()
 
+    def _on_db_path_changed(self, changed_path: str):
+        """Recount tables changed elsewhere (the DCF resolver follows the database itself)"""
+        try:
+            self.statistics.path_changed(changed_path)
+        except Exception as e:
+            logger.error("Error updating model statistics: %s", e)
+
+    def _statistics_table_paths(self) -> Dict[str, str]:
+        revision = self.rdb_manager.get_value(str(CURRENT_REVISION)) or "1.0.0"
+        return {
+            "mipi": str(BCF_DEV_MIPI(revision)),
+            "gpio": str(BCF_DEV_GPIO(revision)),
+            "connection": str(BCF_DB_IO_CONNECT),
+        }
+
     # Component Management Methods
 
     def add_component(self,
@@ -209,6 +298,8 @@ class VisualBCFDataModel(QObject):
             # Add to the appropriate table
             table_data = self.rdb_manager.get_table(table_path)
             table_data.append(component_data)
+            self.statistics.row_added("mipi" if component_type.lower() == 'mipi' else "gpio",
+                                      component_data, table_data)
             self.rdb_manager.set_table(table_path, table_data)
 
             # Update visual properties
@@ -219,6 +310,7 @@ class VisualBCFDataModel(QObject):
                 'x': position[0], 
                 'y': position[1]
             }
+            self.positions.set_position(component_id, position[0], position[1], mark_dirty=False)
 
             # Emit signal
             self.component_added.emit(component_id)
@@ -242,6 +334,7 @@ class VisualBCFDataModel(QObject):
                     component_name = component.get('Name', 'Unknown')
                     components_table = self.rdb_manager[paths.BCF_DEV_MIPI(self.revision)]
                     components_table.remove(component)
+                    self.statistics.row_removed("mipi", component)
                     component_found = True
                     break
             for component in self.rdb_manager[paths.BCF_DEV_GPIO(self.revision)]:
@@ -249,6 +342,7 @@ class VisualBCFDataModel(QObject):
                     component_name = component.get('Name', 'Unknown')
                     components_table = self.rdb_manager[paths.BCF_DEV_GPIO(self.revision)]
                     components_table.remove(component)
+                    self.statistics.row_removed("gpio", component)
                     component_found = True
                     break
 
@@ -263,6 +357,7 @@ class VisualBCFDataModel(QObject):
             #                      conn.get('Dest Device') != component_name]
             # self.rdb_manager[paths.BCF_DB_IO_CONNECT] = connections_table
             # Emit signal
+            self.positions.discard(component_id)
             if emit_signal:
                 self.component_removed.emit(component_id)
 
@@ -273,16 +368,17 @@ class VisualBCFDataModel(QObject):
             logger.error("Error removing component: %s", e)
             return False
 
-    def update_component_position(self, component_id: str, position: Tuple[float, float]) -> bool:
-        """Update component position directly in RDB"""
+    def update_component_position(self, component_id: str, position: Tuple[float, float],
+                                  size: Optional[Tuple[float, float]] = None) -> bool:
+        """Update component position (and size) in the position store (mirrored to RDB on flush)"""
         try:
-            if component_id not in self.rdb_manager[paths.VISUAL_PROPERTIES]:
-                self.rdb_manager[paths.VISUAL_PROPERTIES][component_id] = {"position": {"x": 0, "y": 0}}
-
-            self.rdb_manager[paths.VISUAL_PROPERTIES][component_id]['position'] = {'x': position[0], 'y': position[1]}
+            self.positions.set_position(component_id, position[0], position[1])
+            if size is not None:
+                self.positions.set_size(component_id, size[0], size[1])
 
-            # Emit update signal
-            self.component_updated.emit(component_id, self.rdb_manager[paths.VISUAL_PROPERTIES][component_id])
+            # Emit update signal (only build the payload if someone listens)
+            if self.isSignalConnected(QMetaMethod.fromSignal(self.component_updated)):
+                self.component_updated.emit(component_id, self.visual_properties(component_id))
             # logger.info("Updated component position: %s", component_id)
             return True
         except Exception as e:
@@ -528,6 +624,10 @@ class VisualBCFDataModel(QObject):
             for i, connection in enumerate(connections_table):
                 if connection.get('Connection ID') == connection_id:
                     connections_table.pop(i)
+                    routes = self.rdb_manager[paths.CONNECTION_ROUTES]
+                    if isinstance(routes, dict):
+                        routes.pop(connection_id, None)
+                    self.statistics.row_removed("connection", connection)
                     # Emit signal
                     if emit_signal:
                         self.connection_removed.emit(connection_id)
@@ -714,21 +814,9 @@ class VisualBCFDataModel(QObject):
             logger.error("Error clearing data: %s", e)
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about the current data directly from RDB"""
+        """Get statistics about the current data from the maintained counters"""
         try:
-            components_table = self.rdb_manager.get_table(self.components_table_path) or []
-            connections_table = self.rdb_manager.get_table(self.connections_table_path) or []
-
-            return {
-                'component_count': len(components_table),
-                'connection_count': len(connections_table),
-                'total_components': len(components_table),
-                'total_connections': len(connections_table),
-                'components_by_type': {
-                    comp_type: len([c for c in components_table if c.get('component_type') == comp_type])
-                    for comp_type in set(c.get('component_type') for c in components_table if c.get('component_type'))
-                }
-            }
+            return self.statistics.snapshot()
         except Exception as e:
             logger.error("Error getting statistics: %s", e)
             return {
@@ -745,9 +833,9 @@ class VisualBCFDataModel(QObject):
             # Get Visual BCF table statistics
             visual_bcf_stats = self.get_statistics()
 
-            # Get table format data counts
-            available_devices_count = len(self.get_available_devices_for_table())
-            io_connections_count = len(self.get_io_connections_for_table())
+            # Table views are row-for-row conversions of the counted tables
+            available_devices_count = visual_bcf_stats['component_count']
+            io_connections_count = visual_bcf_stats['connection_count']
 
             # Combine all statistics
             all_stats = {
@@ -791,6 +879,42 @@ class VisualBCFDataModel(QObject):
                 }
             }
 
+    # Scene streaming helpers
+
+    def scene_record_counts(self) -> Tuple[int, int]:
+        """Return (component rows, connection rows) without copying the tables"""
+        mipi_devices = self.rdb_manager[paths.BCF_DEV_MIPI(self.revision)] or []
+        gpio_devices = self.rdb_manager[paths.BCF_DEV_GPIO(self.revision)] or []
+        io_connections = self.rdb_manager[paths.BCF_DB_IO_CONNECT] or []
+        return len(mipi_devices) + len(gpio_devices), len(io_connections)
+
+    def iter_component_records(self) -> Iterator[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Yield (table, raw device row, visual properties) for every device row"""
+        self.flush_positions()
+        visual_properties = self.rdb_manager[paths.VISUAL_PROPERTIES] or {}
+        for table, table_path in (("mipi", paths.BCF_DEV_MIPI(self.revision)),
+                                  ("gpio", paths.BCF_DEV_GPIO(self.revision))):
+            for row in self.rdb_manager[table_path] or []:
+                if isinstance(row, dict):
+                    yield table, row, visual_properties.get(row.get("ID"))
+
+    def iter_connection_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield raw IO connection rows"""
+        for row in self.rdb_manager[paths.BCF_DB_IO_CONNECT] or []:
+            if isinstance(row, dict):
+                yield row
+
+    @staticmethod
+    def convert_device_row(device: Dict[str, Any], component_type: str) -> Dict[str, Any]:
+        """Convert a MIPI/GPIO device row to the Visual BCF component format"""
+        return {
+            "ID": device.get("ID"),
+            "Name": device.get("Name"),
+            "Component Type": component_type,
+            "Module": device.get("Module"),
+            "Properties": device.get("Properties", {})
+        }
+
     @property
     def components(self) -> List[Dict[str, Any]]:
         """Get all components from device tables (MIPI + GPIO devices only)"""
@@ -805,29 +929,9 @@ class VisualBCFDataModel(QObject):
             logger.debug(f"Found {len(mipi_devices)} MIPI devices: {[d.get('Name') for d in mipi_devices]}")
             logger.debug(f"Found {len(gpio_devices)} GPIO devices: {[d.get('Name') for d in gpio_devices]}")
             
-            # Convert MIPI devices to component format
-            converted_mipi_devices = []
-            for device in mipi_devices:
-                converted_device = {
-                    "ID": device.get("ID"),
-                    "Name": device.get("Name"),
-                    "Component Type": "mipi",
-                    "Module": device.get("Module"),
-                    "Properties": device.get("Properties", {})
-                }
-                converted_mipi_devices.append(converted_device)
-            
-            # Convert GPIO devices to component format
-            converted_gpio_devices = []
-            for device in gpio_devices:
-                converted_device = {
-                    "ID": device.get("ID"),
-                    "Name": device.get("Name"),
-                    "Component Type": "gpio",
-                    "Module": device.get("Module"),
-                    "Properties": device.get("Properties", {})
-                }
-                converted_gpio_devices.append(converted_device)
+            # Convert device rows to component format
+            converted_mipi_devices = [self.convert_device_row(device, "mipi") for device in mipi_devices]
+            converted_gpio_devices = [self.convert_device_row(device, "gpio") for device in gpio_devices]
             
             all_components = converted_mipi_devices + converted_gpio_devices
             logger.debug(f"Returning {len(all_components)} total components: {[c.get('Name') for c in all_components]}")
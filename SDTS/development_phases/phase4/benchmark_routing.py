@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Routing and Scene-Load Benchmark Suite
+
+Runs headless (offscreen Qt platform) on parametric RFIC testbeds built by
+ComponentScene.add_rfic_testbed (N RFICs x M PRX/DRX pin pairs, optionally
+with seeded random placements) and measures:
+- per-wire route latency (p50/p99) of the scene's routing engine
+- full-scene route time (ComponentScene.route_all_wires)
+- load_scene wall time through VisualBCFController, first open and reopen
+  with the persisted routes
+- drag-reroute time per frame and to settle after release
+- peak memory (resident set size of the process)
+
+Results are written to JSON and can be compared against a stored baseline;
+every metric is lower-is-better, and one that exceeds its baseline by more
+than the tolerance is reported as a regression (exit status 1).
+
+Usage:
+    python benchmark_routing.py --rfics 4 --pairs 8 --output results.json
+    python benchmark_routing.py --baseline routing_benchmark_baseline.json
+    python benchmark_routing.py --baseline routing_benchmark_baseline.json --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_BASELINE = project_root / "routing_benchmark_baseline.json"
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0..100) of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def _application():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def make_scene(num_rfics: int, num_pairs: int, seed: Optional[int] = None, engine: Optional[str] = None):
+    """Build a ComponentScene holding one parametric RFIC testbed"""
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+
+    class BenchmarkScene(ComponentScene):
+        # The default testbed is replaced by the parametric one
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = BenchmarkScene()
+    if engine:
+        scene.routing_engine = engine
+    scene.add_rfic_testbed(num_pairs=num_pairs, num_rfics=num_rfics, seed=seed)
+    return scene
+
+
+def _wires(scene) -> list:
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+    return [item for item in scene.items() if isinstance(item, Wire) and item.start_pin and item.end_pin]
+
+
+def _components(scene) -> list:
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    return [item for item in scene.items() if isinstance(item, ComponentWithPins)]
+
+
+def bench_route_wires(scene) -> List[float]:
+    """Uncached route time of every wire in ms"""
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing.route_cache import run_route_request
+
+    timings = []
+    for wire in _wires(scene):
+        start, end = wire.start_pin.get_connection_point(), wire.end_pin.get_connection_point()
+        request = WirePath(start, end, wire.start_pin, wire.end_pin, scene, calculate_now=False).routing_request()
+        started = time.perf_counter()
+        if request is None:
+            # Heuristic engine: the detour logic runs in the constructor
+            WirePath(start, end, wire.start_pin, wire.end_pin, scene)
+        else:
+            run_route_request(scene.routers[request.engine], None, request)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return timings
+
+
+def bench_route_scene(scene) -> float:
+    """Time to route every wire of the scene together in ms"""
+    started = time.perf_counter()
+    scene.route_all_wires()
+    return (time.perf_counter() - started) * 1000.0
+
+
+def bench_drag(scene, steps: int = 20, step: float = 10.0) -> Tuple[List[float], float]:
+    """Drag the most connected component; returns per-frame ms and settle ms"""
+    from PySide6.QtCore import QPointF
+
+    chip = max(_components(scene), key=lambda c: len(c.connected_wires))
+    frames = []
+    for n in range(1, steps + 1):
+        chip.setPos(chip.pos() + QPointF(0, step))
+        scene.mouse_position = chip.sceneBoundingRect().center()
+        started = time.perf_counter()
+        scene.flush_dirty_region()
+        frames.append((time.perf_counter() - started) * 1000.0)
+    started = time.perf_counter()
+    scene.flush_dirty_region()
+    scene.reroute_scheduler.finish()
+    return frames, (time.perf_counter() - started) * 1000.0
+
+
+def scene_database(scene) -> Dict:
+    """RDB contents describing the components and wires of a scene"""
+    components = _components(scene)
+    ids = {component: f"M{n}" for n, component in enumerate(components)}
+    connections = []
+    for n, wire in enumerate(_wires(scene)):
+        start, end = wire.start_pin, wire.end_pin
+        connections.append({
+            "Connection ID": f"C{n}",
+            "Source Device": start.parent_component.name, "Source Pin": start.pin_id,
+            "Dest Device": end.parent_component.name, "Dest Pin": end.pin_id,
+        })
+    return {
+        "model": {"current_revision": "1.0.0"},
+        "config": {
+            "component_configs": {c.name: c.component_config for c in components},
+            "visual_bcf": {"visual_properties": {
+                ids[c]: {"position": {"x": c.pos().x(), "y": c.pos().y()}} for c in components}},
+            "bcf": {
+                "1": {"0": {"0": {
+                    "bcf_dev_mipi": [{"ID": ids[c], "Name": c.name, "Module": "RFIC"} for c in components],
+                    "bcf_dev_gpio": [],
+                }}},
+                "bcf_db_io_connect": connections,
+            },
+        },
+    }
+
+
+def bench_load_scene(scene) -> Tuple[float, float, int]:
+    """Wall time of VisualBCFController.load_scene in ms, without and with persisted routes.
+
+    Also returns the number of wires loaded.
+    """
+    from PySide6.QtWidgets import QWidget
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+    from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+    from apps.RBM5.BCF.source.controllers.visual_bcf.visual_bcf_controller import VisualBCFController
+
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(scene_database(scene), f)
+    controller = None
+    try:
+        widget = QWidget()
+        controller = VisualBCFController(widget, VisualBCFDataModel(RDBManager(db_file)))
+        # Drop the default testbed so only the loaded scene is measured
+        controller.scene.clear()
+        started = time.perf_counter()
+        if not controller.load_scene():
+            raise RuntimeError("load_scene failed")
+        elapsed = (time.perf_counter() - started) * 1000.0
+        controller.persist_connection_routes()
+        started = time.perf_counter()
+        if not controller.load_scene():
+            raise RuntimeError("load_scene failed")
+        reopen = (time.perf_counter() - started) * 1000.0
+        return elapsed, reopen, sum(1 for wire in controller._connection_graphics_items.values() if wire)
+    finally:
+        if controller is not None:
+            controller.scene.cleanup()
+        os.remove(db_file)
+
+
+def run_benchmarks(num_rfics: int = 4, num_pairs: int = 8, seed: Optional[int] = 0,
+                   engine: Optional[str] = None, drag_steps: int = 20) -> Dict:
+    """Run every benchmark on one parametric scene and return the results"""
+    app = _application()
+    from PySide6 import __version__ as pyside_version
+
+    started = time.perf_counter()
+    scene = make_scene(num_rfics, num_pairs, seed, engine)
+    build_ms = (time.perf_counter() - started) * 1000.0
+    try:
+        wires = _wires(scene)
+        route_wire = bench_route_wires(scene)
+        route_scene = bench_route_scene(scene)
+        frames, settle = bench_drag(scene, drag_steps)
+        load_ms, reopen_ms, loaded = bench_load_scene(scene)
+        app.processEvents()
+        return {
+            "config": {
+                "rfics": num_rfics, "pairs": num_pairs, "seed": seed, "engine": scene.routing_engine,
+                "drag_steps": drag_steps, "components": len(_components(scene)), "wires": len(wires),
+            },
+            "metrics": {
+                "build_scene_ms": build_ms,
+                "route_wire_ms": {"p50": percentile(route_wire, 50), "p99": percentile(route_wire, 99)},
+                "route_scene_ms": route_scene,
+                "load_scene_ms": load_ms,
+                "reopen_scene_ms": reopen_ms,
+                "drag_frame_ms": {"p50": percentile(frames, 50), "p99": percentile(frames, 99)},
+                "drag_settle_ms": settle,
+                "peak_rss_mb": peak_memory_mb(),
+            },
+            "loaded_wires": loaded,
+            "environment": {
+                "python": platform.python_version(), "pyside6": pyside_version,
+                "platform": platform.platform(), "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+            },
+        }
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def flatten(metrics: Dict, prefix: str = "") -> Dict[str, float]:
+    """Nested metric dicts as {'route_wire_ms.p50': value, ...}"""
+    flat = {}
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{name}."))
+        elif value is not None:
+            flat[f"{prefix}{name}"] = float(value)
+    return flat
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.25,
+            min_delta: float = 1.0) -> List[Tuple[str, float, float]]:
+    """Metrics slower than the baseline; returns (metric, baseline, current) tuples.
+
+    A metric regresses when it exceeds the baseline by more than ``tolerance``
+    (a fraction) and by more than ``min_delta`` (ms or MB), so timer noise on
+    very fast metrics is not reported.
+    """
+    current, reference = flatten(results["metrics"]), flatten(baseline["metrics"])
+    regressions = []
+    for name, value in sorted(current.items()):
+        base = reference.get(name)
+        if base is None:
+            continue
+        if value > base * (1.0 + tolerance) and value - base > min_delta:
+            regressions.append((name, base, value))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless routing and scene-load benchmarks")
+    parser.add_argument("--rfics", type=int, default=4, help="number of RFICs")
+    parser.add_argument("--pairs", type=int, default=8, help="PRX/DRX pin pairs per RFIC")
+    parser.add_argument("--seed", type=int, default=0, help="placement seed (-1 for the plain grid)")
+    parser.add_argument("--engine", default=None, help="routing engine (default: the scene's)")
+    parser.add_argument("--drag-steps", type=int, default=20, help="drag frames to measure")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown fraction")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.rfics, args.pairs, None if args.seed < 0 else args.seed,
+                             args.engine, args.drag_steps)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline) if args.baseline else DEFAULT_BASELINE
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+    if not args.baseline:
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != results["config"]:
+        print(f"\nBaseline configuration differs, not compared: {baseline.get('config')}")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for name, base, value in regressions:
+        print(f"❌ {name}: {value:.2f} (baseline {base:.2f})")
+    if not regressions:
+        print("\n✅ No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
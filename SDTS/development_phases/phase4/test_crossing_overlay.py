@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test the scene overlay that draws all wire crossing markers.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def render(scene, rect):
+    """Paint a scene rect 1:1 through a view, as on screen"""
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QFrame, QGraphicsView
+    view = QGraphicsView(scene)
+    view.setFrameShape(QFrame.Shape.NoFrame)
+    view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setSceneRect(rect)
+    view.resize(int(rect.width()), int(rect.height()))
+    return view.grab().toImage()
+
+
+def test_tiles_cached_and_culled():
+    """Only changed tiles are rebuilt and only exposed tiles are painted"""
+    print("=== Testing crossing overlay tiles ===")
+    from PySide6.QtCore import QRectF
+    from PySide6.QtWidgets import QApplication, QGraphicsScene
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts import CrossingOverlay
+
+    scene = QGraphicsScene()
+    overlay = CrossingOverlay(tile_size=100)
+    scene.addItem(overlay)
+    crossings = [((50.0, 50.0), None, None), ((150.0, 50.0), None, None), ((1050.0, 1050.0), None, None)]
+    overlay.set_crossings(crossings)
+    assert len(overlay) == 3
+    assert overlay.boundingRect().contains(1050, 1050)
+
+    image = render(scene, QRectF(0, 0, 200, 100))
+    assert overlay.stats['tiles_built'] == 2 and overlay.stats['tiles_painted'] == 2
+    # The hop's arc rises above the crossing
+    assert image.pixelColor(50, 45).black() > 200
+
+    # Moving one crossing rebuilds only its tile
+    overlay.update_crossings([((150.0, 50.0), None, None)], [((160.0, 50.0), None, None)])
+    assert len(overlay) == 3
+    render(scene, QRectF(0, 0, 200, 100))
+    assert overlay.stats['tiles_built'] == 3
+    overlay.set_crossings([((50.0, 50.0), None, None), ((160.0, 50.0), None, None),
+                           ((1050.0, 1050.0), None, None)])
+    render(scene, QRectF(0, 0, 200, 100))
+    assert overlay.stats['tiles_built'] == 3
+
+    overlay.set_style('dot')
+    image = render(scene, QRectF(0, 0, 200, 100))
+    assert image.pixelColor(50, 50).black() > 200
+    assert image.pixelColor(50, 45).black() == 0
+
+    overlay.set_crossings([])
+    assert overlay.boundingRect().isEmpty()
+    print("✓ Overlay caches per tile and culls to the exposed rect")
+    return True
+
+
+def test_markers_use_wire_pens_and_background():
+    """Hops are masked with the scene background and stroked with their wires' pens"""
+    print("\n=== Testing crossing overlay colours ===")
+    from PySide6.QtCore import QPointF, QRectF
+    from PySide6.QtGui import QColor, QPainterPath, QPen
+    from PySide6.QtWidgets import QApplication, QGraphicsPathItem, QGraphicsScene
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts import CrossingOverlay
+
+    scene = QGraphicsScene()
+    background = QColor(30, 40, 60)
+    scene.setBackgroundBrush(background)
+
+    def line(a, b, color):
+        path = QPainterPath(QPointF(*a))
+        path.lineTo(QPointF(*b))
+        item = QGraphicsPathItem(path)
+        item.setPen(QPen(color, 2))
+        scene.addItem(item)
+        return item
+
+    red, green = QColor(255, 0, 0), QColor(0, 255, 0)
+    over = line((0, 50), (100, 50), red)
+    under = line((50, 0), (50, 100), green)
+    overlay = CrossingOverlay()
+    scene.addItem(overlay)
+    overlay.update_crossings((), [((50.0, 50.0), over, under)])
+
+    image = render(scene, QRectF(0, 0, 100, 100))
+    assert image.pixelColor(47, 50) == background  # over wire masked
+    assert image.pixelColor(50, 53) == green  # under wire redrawn through the gap
+    assert image.pixelColor(50, 45) == red  # hop in the over wire's pen
+    assert image.pixelColor(20, 50) == red
+
+    overlay.update_crossings([((50.0, 50.0), under, over)], ())
+    assert len(overlay) == 0 and overlay.boundingRect().isEmpty()
+    print("✓ Markers follow wire pens and the scene background")
+    return True
+
+
+def test_scene_overlay_follows_crossings():
+    """ComponentScene feeds its crossing index to one overlay item"""
+    print("\n=== Testing scene crossing overlay ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = {}
+        for name, x, y in (("W", 0, 300), ("E", 800, 300), ("N", 400, 0), ("S", 400, 700)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips[name] = chip
+
+        def connect(a, a_edge, b, b_edge):
+            # Built without an end pin so no async calculation starts
+            wire = Wire(next(p for p in chips[a].pins if p.edge == a_edge), scene=scene)
+            wire.end_pin = next(p for p in chips[b].pins if p.edge == b_edge)
+            wire.is_temporary = False
+            scene.addItem(wire)
+            return wire
+
+        connect("W", "right", "E", "left")
+        down = connect("N", "bottom", "S", "top")
+        scene.route_all_wires()
+        assert len(scene.crossing_overlay) == len(scene.crossing_index) == 1
+
+        # A single wire update hands only its own crossings to the overlay
+        overlay = scene.crossing_overlay
+        overlay.set_crossings = None  # a full refresh would fail here
+        scene.update_wire_crossings(down)
+        del overlay.set_crossings
+        assert len(overlay) == 1
+
+        scene.removeItem(down)
+        assert len(scene.crossing_overlay) == 0
+
+        scene.clear()
+        assert scene.items() == [scene.crossing_overlay]
+        print("✓ Overlay tracks scene crossings and survives clear()")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_tiles_cached_and_culled, test_markers_use_wire_pens_and_background,
+             test_scene_overlay_follows_crossings]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test the memoized DCF resolver used by VisualBCFDataModel.component_dcf.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _make_rdb(dcf_rows, configs=None):
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+
+    data = {
+        "model": {"current_revision": "1.0.0"},
+        "config": {
+            "component_configs": configs or {},
+            "bcf": {"1": {"0": {"0": {"dcf_for_bcf": dcf_rows}}}},
+        },
+    }
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    return RDBManager(db_file), db_file
+
+
+def test_resolver_uses_name_index():
+    """Lookups by name or device_name hit the index and the LRU cache"""
+    print("=== Testing DCF name index ===")
+    from apps.RBM5.BCF.source.models.visual_bcf.dcf_resolver import DCFResolver
+
+    rows = [{"name": f"DEV_{i}", "pins": [{"id": "P1", "side": "left"}]} for i in range(50)]
+    rows.append({"device_name": "ALIAS", "pins": []})
+    rdb, db_file = _make_rdb(rows)
+    try:
+        resolver = DCFResolver(rdb)
+        first = resolver.resolve("DEV_42")
+        assert first == rows[42]
+        assert resolver.resolve("ALIAS") == rows[50]
+        assert resolver.resolve("MISSING") is None
+        assert resolver.resolve("DEV_42") is first
+        assert resolver.hits == 1
+        layout = resolver.pin_layout("DEV_42")
+        assert layout[0].pin_id == "P1" and layout[0].side == "left"
+        print("✓ Name index and cache work")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def test_component_configs_take_precedence_and_share_layout():
+    """Component configs win over DCF rows and identical types share one layout"""
+    print("\n=== Testing config precedence and shared layouts ===")
+    from apps.RBM5.BCF.source.models.visual_bcf.dcf_resolver import DCFResolver
+
+    configs = {"RFIC": {"pins": [{"id": "A"}, {"id": "B", "side": "top"}]}}
+    rdb, db_file = _make_rdb([{"name": "RFIC", "pins": []}], configs)
+    try:
+        resolver = DCFResolver(rdb)
+        config = resolver.resolve("RFIC")
+        assert config["pins"][0]["id"] == "A"
+        assert resolver.pin_layout("RFIC") is resolver.pin_layout("RFIC")
+        assert [p.pin_id for p in resolver.pin_layout("RFIC")] == ["A", "B"]
+        print("✓ Component configs take precedence")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def test_lru_eviction_and_invalidation():
+    """Cache is bounded and follows table replacement"""
+    print("\n=== Testing LRU eviction and invalidation ===")
+    from apps.RBM5.BCF.source.models.visual_bcf.dcf_resolver import DCFResolver
+
+    rows = [{"name": f"DEV_{i}"} for i in range(10)]
+    rdb, db_file = _make_rdb(rows)
+    try:
+        resolver = DCFResolver(rdb, max_entries=4)
+        for i in range(10):
+            resolver.resolve(f"DEV_{i}")
+        assert len(resolver._cache) == 4
+        assert list(resolver._cache) == ["DEV_6", "DEV_7", "DEV_8", "DEV_9"]
+
+        # Replacing the table is picked up without an explicit invalidate
+        rdb.set_value("config/bcf/1.0.0/dcf_for_bcf", [{"name": "NEW"}])
+        assert resolver.resolve("DEV_9") is None
+        assert resolver.resolve("NEW") == {"name": "NEW"}
+
+        # Rows written back in place are picked up too, and hits read nothing
+        rdb.set_row("config/bcf/1.0.0/dcf_for_bcf", 0, {"name": "NEWER"})
+        assert resolver.resolve("NEW") is None
+        assert resolver.resolve("NEWER") == {"name": "NEWER"}
+        reads = []
+        get_value = rdb.get_value
+        rdb.get_value = lambda path: (reads.append(path), get_value(path))[1]
+        assert resolver.resolve("NEWER") == {"name": "NEWER"} and reads == []
+        del rdb.get_value
+
+        # Unrelated writes keep the cache warm; replacing the whole tree drops it
+        rdb.set_value("config/visual_bcf/connection_routes", {"C1": {"points": []}})
+        assert "NEWER" in resolver._cache and resolver._name_index
+        rdb.db.rollback()
+        assert not resolver._cache and not resolver._name_index
+        assert resolver.resolve("DEV_9") == {"name": "DEV_9"}
+        assert resolver.is_dcf_path("config.bcf.1.0.0.dcf_for_bcf")
+        assert resolver.is_dcf_path("config/component_configs/RFIC")
+        assert not resolver.is_dcf_path("config/visual_bcf/visual_properties")
+        print("✓ Eviction and invalidation work")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def main():
+    tests = [
+        test_resolver_uses_name_index,
+        test_component_configs_take_precedence_and_share_layout,
+        test_lru_eviction_and_invalidation,
+    ]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test dirty-region rerouting of wires after component moves.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_move_reroutes_only_affected_wires():
+    """A move reroutes attached wires and wires crossing the moved region only"""
+    print("=== Testing dirty-region rerouting ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = {}
+        for name, x, y in (("A", 0, 0), ("B", 300, 0), ("C", 600, 0),
+                           ("D", 0, 2000), ("E", 600, 2000), ("F", 300, 1000)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips[name] = chip
+
+        def connect(a, b):
+            start = next(p for p in chips[a].pins if p.edge == "right")
+            end = next(p for p in chips[b].pins if p.edge == "left")
+            # Built without an end pin so no async calculation starts
+            wire = Wire(start, scene=scene)
+            wire.end_pin = end
+            wire.is_temporary = False
+            scene.addItem(wire)
+            chips[a].add_wire(wire)
+            chips[b].add_wire(wire)
+            return wire
+
+        around_b = connect("A", "C")   # detours around B
+        far = connect("D", "E")
+        attached = connect("F", "E")
+        scene.route_all_wires()
+
+        rerouted = []
+        for wire in (around_b, far, attached):
+            # Dragging frames try each affected wire on a fast route first
+            original = wire.update_wire_position_fast
+            wire.update_wire_position_fast = (
+                lambda w=wire, f=original: (rerouted.append(w), f())[1])
+
+        # Moving B only touches the wire routed around it
+        chips["B"].setPos(300, 20)
+        assert scene._reroute_timer.isActive()
+        deadline = time.monotonic() + 2
+        while scene._reroute_timer.isActive() and time.monotonic() < deadline:
+            app.processEvents()
+        assert rerouted == [around_b]
+        assert scene.reroute_stats['flushes'] == 1
+
+        # Several moves within one tick are rerouted once, attached wires included
+        rerouted.clear()
+        for step in range(1, 6):
+            chips["F"].setPos(300 + step * 10, 1000)
+        assert scene.flush_dirty_region() == 1 and rerouted == [attached]
+        assert scene.flush_dirty_region() == 0
+
+        # Clearing the scene drops regions still waiting for the next tick
+        chips["D"].setPos(600, 20)
+        scene.clear()
+        assert not scene._reroute_timer.isActive() and not scene._dirty_rects
+        assert scene.flush_dirty_region() == 0
+        print("✓ Only affected wires are rerouted")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_move_reroutes_only_affected_wires]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
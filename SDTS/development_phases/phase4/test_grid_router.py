@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the grid A* routing engine and its selection from WirePath.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _assert_orthogonal(points):
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        assert x1 == x2 or y1 == y2, f"diagonal segment {(x1, y1)} -> {(x2, y2)}"
+
+
+def test_fast_path_and_detour():
+    """Clear routes take the straight/L fast path; blocked routes detour with few bends"""
+    print("=== Testing grid router ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import GridRouter, ObstacleIndex, count_bends
+
+    index = ObstacleIndex()
+    router = GridRouter(index, grid_size=10, clearance=30)
+
+    assert router.route((0, 0), (400, 0)) == [(0, 0), (400, 0)]
+    assert router.route((0, 0), (400, 200), start_dir="right") == [(0, 0), (400, 0), (400, 200)]
+    assert router.stats['fast_path'] == 2
+
+    # A wall between the endpoints forces a search
+    index.insert("wall", (180, -150, 220, 150))
+    points = router.route((0, 0), (400, 0), start_dir="right", end_dir="left")
+    assert points[0] == (0, 0) and points[-1] == (400, 0)
+    assert router.stats['searched'] == 1
+    _assert_orthogonal(points)
+    assert router.polyline_clear(points)
+    assert count_bends(points) <= 4
+
+    # Endpoint off the grid still gets an exact, orthogonal end
+    points = router.route((0, 0), (405, 3), start_dir="right", end_dir="left")
+    assert points[-1] == (405, 3)
+    _assert_orthogonal(points)
+
+    # Fully enclosed target cannot be reached
+    index.clear()
+    index.insert("box", (900, -400, 1000, 400))
+    for key, rect in (("t", (600, -400, 1000, -300)), ("b", (600, 300, 1000, 400)),
+                      ("l", (600, -400, 650, 400))):
+        index.insert(key, rect)
+    assert router.route((0, 0), (800, 0)) is None
+    print("✓ Grid router finds clear orthogonal routes")
+    return True
+
+
+def test_wire_path_uses_engine():
+    """WirePath routes through the scene's grid router and keeps clear of components"""
+    print("\n=== Testing WirePath engine selection ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = {}
+        for name, x in (("A", 0), ("B", 300), ("C", 600)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, 0)
+            scene.addItem(chip)
+            chips[name] = chip
+        start = next(p for p in chips["A"].pins if p.edge == "right")
+        end = next(p for p in chips["C"].pins if p.edge == "left")
+
+        router = scene.routers["grid"]
+        path = WirePath(start.get_connection_point(), end.get_connection_point(),
+                        start, end, scene=scene)
+        assert path.engine == "grid" and router.stats['searched'] == 1
+        points = [(p.x(), p.y()) for p in path.segments]
+        _assert_orthogonal(points)
+        # The middle component is avoided with clearance
+        assert router.polyline_clear(points[1:-1], owners=[chips["A"], chips["C"]])
+
+        heuristic = WirePath(start.get_connection_point(), end.get_connection_point(),
+                             start, end, scene=scene, engine="heuristic")
+        assert heuristic.engine == "heuristic" and router.stats['searched'] == 1
+        print("✓ WirePath uses the selected routing engine")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_fast_path_and_detour, test_wire_path_uses_engine]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
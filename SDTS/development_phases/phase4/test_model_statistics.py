@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the incrementally maintained Visual BCF model statistics.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _make_model():
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+    from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+
+    mipi = [{"ID": f"M{i}", "Name": f"DEV_{i}", "Module": "FEM" if i % 2 else "LNA"} for i in range(4)]
+    gpio = [{"ID": "G0", "Name": "SWITCH"}]
+    io_rows = [{"Connection ID": "C0", "Source Device": "DEV_0", "Dest Device": "DEV_1"}]
+    data = {
+        "model": {"current_revision": "1.0.0"},
+        "config": {
+            "component_configs": {},
+            "visual_bcf": {"visual_properties": {}},
+            "bcf": {
+                "1": {"0": {"0": {"bcf_dev_mipi": mipi, "bcf_dev_gpio": gpio}}},
+                "bcf_db_io_connect": io_rows,
+            },
+        },
+    }
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    return VisualBCFDataModel(RDBManager(db_file)), db_file
+
+
+def _count_recounts(statistics):
+    calls = []
+    recount = statistics._recount
+
+    def counting(table):
+        calls.append(table)
+        recount(table)
+    statistics._recount = counting
+    return calls
+
+
+def test_initial_counts():
+    """Counters are built once from the tables"""
+    print("=== Testing initial statistics ===")
+    model, db_file = _make_model()
+    try:
+        stats = model.get_statistics()
+        assert stats['component_count'] == 5
+        assert stats['connection_count'] == 1
+        assert stats['components_by_type'] == {"mipi": 4, "gpio": 1}
+        assert stats['components_by_module'] == {"LNA": 2, "FEM": 2, "Unknown": 1}
+        table_stats = model.get_table_statistics()
+        assert table_stats['available_devices_count'] == 5
+        assert table_stats['table_status']['visual_bcf_connections'] == 'Active'
+        print("✓ Initial statistics are correct")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def test_row_operations_do_not_rescan():
+    """Own row operations update counters without recounting tables"""
+    print("\n=== Testing incremental row updates ===")
+    model, db_file = _make_model()
+    try:
+        recounts = _count_recounts(model.statistics)
+        model.add_component("PA_1", "mipi", (0, 0), {"Module": "PA"})
+        model.add_component("SW_1", "gpio", (0, 0))
+        assert model.remove_component("M0")
+        assert model.remove_connection("C0")
+        assert recounts == []
+
+        stats = model.get_statistics()
+        assert stats['components_by_type'] == {"mipi": 4, "gpio": 2}
+        assert stats['components_by_module'] == {"LNA": 1, "FEM": 2, "PA": 1, "Unknown": 2}
+        assert stats['connection_count'] == 0
+        print("✓ Row operations are counted incrementally")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def test_external_changes_recount_one_table():
+    """Writes from elsewhere recount only the affected table"""
+    print("\n=== Testing external table changes ===")
+    from apps.RBM5.BCF.source.RDB import paths
+
+    model, db_file = _make_model()
+    try:
+        recounts = _count_recounts(model.statistics)
+        model.rdb_manager.set_table(str(paths.BCF_DEV_GPIO("1.0.0")), [])
+        assert recounts == ["gpio"]
+        assert model.get_statistics()['components_by_type'] == {"mipi": 4}
+
+        # An in-place edit of an existing row is picked up from its table write
+        mipi = model.rdb_manager.get_table(str(paths.BCF_DEV_MIPI("1.0.0")))
+        model.rdb_manager.set_row(str(paths.BCF_DEV_MIPI("1.0.0")), 0, dict(mipi[0], Module="PA"))
+        assert model.get_statistics()['components_by_module'] == {"LNA": 1, "FEM": 2, "PA": 1}
+
+        # Switching revision rebuilds against the new tables
+        model.rdb_manager.set_value(str(paths.CURRENT_REVISION), "2.0.0")
+        assert model.get_statistics()['component_count'] == 0
+        print("✓ External changes recount only affected tables")
+        return True
+    finally:
+        os.unlink(db_file)
+
+
+def main():
+    tests = [
+        test_initial_counts,
+        test_row_operations_do_not_rescan,
+        test_external_changes_recount_one_table,
+    ]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
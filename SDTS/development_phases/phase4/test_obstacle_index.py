@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the obstacle index used by wire routing for component collision queries.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_index_queries():
+    """Rect, point and segment queries only return overlapping obstacles"""
+    print("=== Testing obstacle index queries ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex
+
+    index = ObstacleIndex(cell_size=100)
+    changes = []
+    index.add_listener(lambda key, old, new: changes.append((key, old, new)))
+    index.insert("A", (0, 0, 50, 50))
+    index.insert("B", (300, 0, 350, 50))
+    index.insert("C", (1000, 1000, 1100, 1060))
+
+    assert sorted(index.query_rect((-10, -10, 400, 60))) == ["A", "B"]
+    assert index.query_point(25, 25) == ["A"]
+    assert index.query_point(60, 25) == []
+    assert index.query_point(60, 25, inflate=20) == ["A"]
+
+    # Horizontal segment through A and B, diagonal that misses both
+    assert sorted(index.query_segment(-20, 25, 400, 25)) == ["A", "B"]
+    assert index.query_segment(60, -100, 290, 200) == []
+    assert index.segment_blocked(-20, 25, 400, 25, ignore=["A", "B"]) is False
+
+    index.insert("A", (500, 500, 550, 550))
+    assert index.query_point(25, 25) == []
+    assert index.query_point(510, 510) == ["A"]
+    assert index.remove("C") and not index.remove("C")
+    assert len(index) == 2 and index.version == 5
+    assert changes[-1] == ("C", (1000, 1000, 1100, 1060), None)
+    print("✓ Obstacle index queries work")
+    return True
+
+
+def test_scene_keeps_index_current():
+    """ComponentScene registers, moves and removes components in its index"""
+    print("\n=== Testing scene obstacle index maintenance ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QLineF, QPointF
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        assert len(scene.obstacle_index) == 0
+
+        chip = ComponentWithPins("U1", "chip")
+        chip.component_id = "U1"
+        chip.setPos(2000, 2000)
+        scene.addItem(chip)
+        assert scene.obstacle_index.query_point(2020, 2020) == [chip]
+        assert scene.get_component_at_position(QPointF(2020, 2020)) is chip
+
+        chip.setPos(2400, 2000)
+        assert scene.obstacle_index.query_point(2020, 2020) == []
+        assert scene.get_component_at_position(QPointF(2420, 2020)) is chip
+
+        path = WirePath(QPointF(0, 0), QPointF(10, 10), scene=scene, calculate_now=False)
+        assert path._line_intersects_any_component(QLineF(2300, 2030, 2600, 2030))
+        assert not path._line_intersects_any_component(QLineF(1800, 2030, 2100, 2030))
+        assert path._find_intersecting_components(QLineF(2300, 2030, 2600, 2030)) == [chip]
+
+        scene.removeItem(chip)
+        assert len(scene.obstacle_index) == 0
+        print("✓ Scene keeps the obstacle index current")
+        return True
+    finally:
+        scene.cleanup()
+
+
+def main():
+    tests = [test_index_queries, test_scene_keeps_index_current]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the Qt-free geometry kernel behind WirePath's heuristic routing.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_geometry_primitives():
+    """Approach points and segment/rect intersection on plain tuples"""
+    print("=== Testing geometry primitives ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import (
+        approach_point, segment_intersection, segment_rect_crossing)
+
+    assert approach_point((10, 10), "left") == (-10, 10)
+    assert approach_point((10, 10), "bottom") == (10, 30)
+    assert approach_point((10, 10), None) == (10, 10)
+
+    assert segment_intersection((0, 5), (10, 5), (5, 0), (5, 10)) == (5, 5)
+    assert segment_intersection((0, 5), (4, 5), (5, 0), (5, 10)) is None
+    assert segment_intersection((0, 0), (10, 0), (0, 1), (10, 1)) is None  # parallel
+
+    assert segment_rect_crossing((0, 5), (20, 5), (10, 0, 30, 10)) == ((10, 5), "left")
+    assert segment_rect_crossing((15, -5), (15, 20), (10, 0, 30, 10)) == ((15, 0), "top")
+    assert segment_rect_crossing((12, 2), (14, 2), (10, 0, 30, 10)) == (None, None)
+    print("✓ Geometry primitives work on tuples")
+    return True
+
+
+def test_router_runs_headless():
+    """OrthogonalRouter detours around components without importing Qt"""
+    print("\n=== Testing headless orthogonal router ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, OrthogonalRouter
+
+    index = ObstacleIndex()
+    router = OrthogonalRouter(index, clearance=30)
+    assert router.route((0, 0), (400, 200)) == [(0, 0), (400, 0), (400, 200)]
+
+    # A component on the first leg is passed on its nearer side
+    index.insert("U1", (150, -20, 250, 60))
+    points = router.route((0, 0), (400, 200))
+    assert points[0] == (0, 0) and points[-1] == (400, 200)
+    assert points[1:5] == [(120, 0), (120, -50), (280, -50), (280, 0)]
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        assert x1 == x2 or y1 == y2
+
+    assert router.obstacles_crossed((0, 0), (400, 0)) == ["U1"]
+    assert not router.segment_blocked((0, 300), (400, 300))
+
+    # The routing package imports no Qt module at all
+    check = ("import sys; import apps.RBM5.BCF.gui.source.visual_bcf.routing; "
+             "sys.exit('PySide6' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", check], cwd=str(project_root)).returncode == 0
+    print("✓ Heuristic routing needs no QApplication")
+    return True
+
+
+def main():
+    tests = [test_geometry_primitives, test_router_runs_headless]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the array-backed component position store used by Visual BCF.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _make_store():
+    from apps.RBM5.BCF.source.models.visual_bcf.position_store import ComponentPositionStore
+
+    store = ComponentPositionStore(capacity=2)
+    for i, (x, y) in enumerate([(0, 0), (100, 50), (37, 210)]):
+        store.set_position(f"C{i}", x, y, mark_dirty=False)
+        store.set_size(f"C{i}", 40, 20)
+    return store
+
+
+def test_bounding_box_and_fit():
+    """Bounding box covers position plus size and is cached for the scene"""
+    print("=== Testing bounding box and fit-to-view ===")
+    store = _make_store()
+    assert len(store) == 3
+    assert store.bounding_box() == (0.0, 0.0, 140.0, 230.0)
+    assert store.bounding_box() is store.bounding_box()
+    assert store.bounding_box(["C0", "C1"]) == (0.0, 0.0, 140.0, 70.0)
+
+    scale, cx, cy = store.fit_to_view(330, 330, margin=50)
+    assert scale == 1.0 and (cx, cy) == (70.0, 115.0)
+
+    store.set_position("C2", -60, 0)
+    assert store.bounding_box()[0] == -60.0
+    # Components without a size yet do not stretch the box
+    store.set_position("C9", 5000, 5000, mark_dirty=False)
+    assert store.bounding_box()[2:] == (140.0, 70.0)
+    store.set_size("C9", 40, 20)
+    assert store.bounding_box()[2:] == (5040.0, 5020.0)
+    store.discard("C9")
+    assert store.has_changes and store.dirty_ids == {"C2"}
+    print("✓ Bounding box and fit work")
+    return True
+
+
+def test_align_distribute_snap_move():
+    """Layout operations update only the selected slots"""
+    print("\n=== Testing align, distribute, snap and move ===")
+    store = _make_store()
+
+    assert sorted(store.align(["C0", "C1", "C2"], "right")) == ["C0", "C1", "C2"]
+    assert {x for x, _ in store.positions(["C0", "C1", "C2"]).values()} == {100.0}
+
+    store.set_position("C1", 300, 50)
+    moved = store.distribute(["C0", "C1", "C2"], "horizontal")
+    assert moved == ["C0", "C2", "C1"]
+    assert store.position("C2") == (200.0, 210.0)
+
+    store.set_position("C0", 11, 29)
+    assert store.snap_to_grid(20, ["C0", "C2"]) == ["C0", "C2"]
+    assert store.position("C0") == (20.0, 20.0)
+    assert store.snap_to_grid(20, ["C0", "C2"]) == []
+
+    assert store.move(["C0", "missing"], 5, -5) == ["C0"]
+    assert store.position("C0") == (25.0, 15.0)
+
+    try:
+        store.align(["C0", "C1"], "diagonal")
+        assert False, "unknown align mode accepted"
+    except ValueError:
+        pass
+    print("✓ Layout operations work")
+    return True
+
+
+def test_flush_and_slot_reuse():
+    """Only dirty positions are written back and freed slots are reused"""
+    print("\n=== Testing flush and slot reuse ===")
+    store = _make_store()
+    visual = {"C0": {"position": {"x": 0, "y": 0}, "color": "red"}}
+    store.load(visual)
+    assert not store.has_changes
+
+    store.move(["C0", "C1"], 10, 0)
+    assert store.flush(visual, ["C1"]) == 1
+    assert visual["C1"] == {"position": {"x": 110.0, "y": 50.0}}
+    assert store.dirty_ids == {"C0"}
+    assert store.flush(visual) == 1
+    assert visual["C0"] == {"position": {"x": 10.0, "y": 0.0}, "color": "red"}
+    assert not store.has_changes
+
+    slot = store._slots["C1"]
+    store.discard("C1")
+    assert "C1" not in store and store.position("C1") is None
+    store.set_position("C3", 1, 2)
+    assert store._slots["C3"] == slot
+    print("✓ Flush and slot reuse work")
+    return True
+
+
+def test_model_flushes_on_save_only():
+    """Moves stay in the store until an explicit flush; flush errors surface"""
+    print("\n=== Testing model position flush ===")
+    import json
+    import os
+    import tempfile
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+    from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"config": {"visual_bcf": {"visual_properties": {
+            "U1": {"position": {"x": 0, "y": 0}}}}}}, f)
+    try:
+        model = VisualBCFDataModel(RDBManager(db_file))
+        stored = model.rdb_manager.get_value("config.visual_bcf.visual_properties")
+        assert model.update_component_position("U1", (40.0, 60.0), size=(120.0, 80.0))
+        assert stored["U1"]["position"] == {"x": 0, "y": 0}
+        assert model.positions.bounding_box() == (40.0, 60.0, 160.0, 140.0)
+
+        assert model.flush_positions() == 1
+        assert stored["U1"]["position"] == {"x": 40.0, "y": 60.0}
+        assert model.rdb_manager.save()
+
+        # A write the RDB rejects is reported, not dropped
+        model.rdb_manager.get_value("config.visual_bcf").pop("visual_properties")
+        model.rdb_manager.set_value = lambda path, value: False
+        model.update_component_position("U1", (1.0, 2.0))
+        try:
+            model.flush_positions()
+            assert False, "failed flush was swallowed"
+        except RuntimeError:
+            pass
+        print("✓ Positions reach the RDB on flush and failures raise")
+        return True
+    finally:
+        os.remove(db_file)
+
+
+def main():
+    tests = [
+        test_bounding_box_and_fit,
+        test_align_distribute_snap_move,
+        test_flush_and_slot_reuse,
+        test_model_flushes_on_save_only,
+    ]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test process-pool routing of large wire batches.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_matches_serial_routing():
+    """Worker processes return the grid router's routes and follow obstacle changes"""
+    print("=== Testing process router ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import GridRouter, Net, ObstacleIndex, ProcessRouter
+
+    index = ObstacleIndex()
+    for i in range(4):
+        index.insert(("U", i), (i * 300, 0, i * 300 + 100, 200))
+    nets = [Net(k, (k % 3 * 300 + 120, 20 + k * 10), (k % 3 * 300 + 580, 180 - k * 10),
+                "right", "left", (("U", k % 3), ("U", k % 3 + 2 if k % 3 < 2 else 3)))
+            for k in range(12)]
+
+    router = ProcessRouter(index, workers=2)
+    try:
+        serial = GridRouter(index)
+        expected = {net.key: serial.route(net.start, net.end, net.start_dir, net.end_dir, net.owners)
+                    for net in nets}
+        assert router.route_all(nets) == expected
+        assert router.stats['routed'] == 12 and router.stats['chunks'] > 1
+        published = router._shm.name
+
+        # A moved component republishes the obstacle array once
+        index.insert(("U", 1), (300, 0, 400, 400))
+        expected = {net.key: serial.route(net.start, net.end, net.start_dir, net.end_dir, net.owners)
+                    for net in nets}
+        assert router.route_all(nets) == expected
+        assert router._shm.name != published
+        shm_name = router._shm.name
+        router.route_all(nets)
+        assert router._shm.name == shm_name
+        print("✓ Process routes match serial grid routes")
+        return True
+    finally:
+        router.close()
+
+
+def test_scene_uses_process_pool_above_threshold():
+    """ComponentScene hands large batches to the process router"""
+    print("\n=== Testing scene process routing ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = []
+        for name, x in (("A", 0), ("B", 600)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, 0)
+            scene.addItem(chip)
+            chips.append(chip)
+        wires = []
+        ends = [p for p in chips[1].pins if p.edge == "left"]
+        for start, end in zip((p for p in chips[0].pins if p.edge == "right"), ends):
+            # Built without an end pin so no async calculation starts
+            wire = Wire(start, scene=scene)
+            wire.end_pin = end
+            wire.is_temporary = False
+            scene.addItem(wire)
+            wires.append(wire)
+
+        # Worker processes start with the first large batch only
+        assert scene._process_router is None
+        scene.process_router.workers = 2
+        sent = []
+        route_all = scene.process_router.route_all
+        scene.process_router.route_all = lambda nets: (sent.extend(nets), route_all(nets))[1]
+        scene.process_route_threshold = len(wires)
+        stats = scene.route_all_wires()
+        assert stats['workers'] == 2 and stats['routed'] == len(wires)
+        assert all(not wire.path().isEmpty() for wire in wires)
+        # The wires form a bus; its corridor stays on the batch router
+        assert stats['bundles'] and not any(net.lanes for net in sent)
+        # The batch router negotiates congestion from the workers' routes
+        assert stats['iterations'] >= 1 and stats['overused'] == 0
+
+        scene.process_route_threshold = len(wires) + 1
+        assert 'workers' not in scene.route_all_wires()
+        print("✓ Scene routes large batches on worker processes")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+        assert scene._process_router is None
+
+
+def main():
+    tests = [test_matches_serial_routing, test_scene_uses_process_pool_above_threshold]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test the frame-budgeted reroute scheduler used while dragging components.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+class FakePin:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+    def get_connection_point(self):
+        from PySide6.QtCore import QPointF
+        return QPointF(self.x, self.y)
+
+
+class FakeWire:
+    """Records reroutes and displayed paths instead of routing"""
+
+    def __init__(self, name, x, log, needs_search=False):
+        self.name = name
+        self.start_pin = FakePin(x, 0)
+        self.end_pin = FakePin(x + 50, 200)
+        self.path = None
+        self.log = log
+        self.needs_search = needs_search
+
+    def setPath(self, path):
+        self.path = path
+
+    def update_wire_position_fast(self):
+        if self.needs_search:
+            return False
+        self.update_wire_position_dragging()
+        return True
+
+    def update_wire_position_dragging(self):
+        self.log.append(self.name)
+        self.path = "routed"
+
+
+def wait_until(app, condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+    return condition()
+
+
+def test_nearest_first_within_budget():
+    """Each frame routes the wires nearest the cursor and previews the rest"""
+    print("=== Testing reroute scheduler frames ===")
+    from PySide6.QtCore import QPointF
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts import RerouteScheduler
+
+    log = []
+    wires = [FakeWire(name, x, log) for name, x in (("far", 900), ("near", 100), ("mid", 500))]
+    # A zero budget tries exactly one wire per frame
+    shown = []
+    scheduler = RerouteScheduler(budget_ms=0, frame_ms=1, settle_ms=5, on_preview=shown.append)
+    scheduler.enqueue(wires, QPointF(0, 0))
+    assert len(scheduler) == 3
+
+    assert scheduler.run_frame() == 1 and log == ["near"]
+    for wire in wires[0], wires[2]:
+        # Still queued: a straight pin-to-pin preview
+        assert wire in scheduler and wire.path.elementCount() == 2
+    assert scheduler.stats['previewed'] == 2 and shown == [wires[0], wires[2]]
+
+    # Moving the cursor re-prioritises wires queued again
+    scheduler.enqueue([wires[0]], QPointF(1000, 0))
+    assert len(scheduler) == 2
+    assert wait_until(app, lambda: len(scheduler) == 0)
+    assert log == ["near", "far", "mid"]
+    assert scheduler.stats['frames'] == 3 and scheduler.stats['rerouted'] == 3
+
+    # finish() drains the queue at once; discarded wires are skipped
+    log.clear()
+    scheduler.enqueue(wires)
+    scheduler.discard(wires[1])
+    assert scheduler.finish() == 2 and sorted(log) == ["far", "mid"]
+    assert len(scheduler) == 0
+
+    # A wire that needs a full search keeps its preview until the queue settles
+    log.clear()
+    slow = FakeWire("slow", 0, log, needs_search=True)
+    scheduler.budget_ms = 50
+    scheduler.enqueue([slow, wires[0]], QPointF(0, 0))
+    assert scheduler.run_frame() == 1 and log == ["far"]
+    assert slow in scheduler and slow.path.elementCount() == 2
+    assert scheduler.stats['deferred'] == 1
+    assert wait_until(app, lambda: len(scheduler) == 0)
+    assert log == ["far", "slow"] and slow.path == "routed"
+    print("✓ Frames respect the budget, nearest wires first")
+    return True
+
+
+def test_scene_settles_after_drag():
+    """Dragging a component reroutes within the frame budget, the rest when idle"""
+    print("\n=== Testing scene reroute scheduling ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = []
+        for name, x, y in (("A", 0, 0), ("B", 600, 0)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips.append(chip)
+        wires = []
+        for start, end in zip((p for p in chips[0].pins if p.edge == "right"),
+                              (p for p in chips[1].pins if p.edge == "left")):
+            # Built without an end pin so no async calculation starts
+            wire = Wire(start, scene=scene)
+            wire.end_pin = end
+            wire.is_temporary = False
+            scene.addItem(wire)
+            for chip in chips:
+                chip.add_wire(wire)
+            wires.append(wire)
+        assert len(wires) > 1
+        scene.route_all_wires()
+
+        scheduler = scene.reroute_scheduler
+        scheduler.budget_ms = 0
+        chips[1].setPos(600, 300)
+        assert scene.flush_dirty_region() == len(wires)
+        assert len(scheduler) == len(wires) - 1
+        previews = [w for w in wires if w in scheduler]
+        assert all(w.path().elementCount() == 2 for w in previews)
+        # Previews have no crossings until they are rerouted
+        assert not any(w in scene.crossing_index for w in previews)
+
+        scene.settle_reroutes()
+        assert wait_until(app, lambda: len(scheduler) == 0)
+        assert scheduler.stats['finished'] == len(wires) - 1
+        assert all(w.path().elementCount() > 2 for w in previews)
+        assert all(w in scene.crossing_index for w in previews)
+
+        scene.removeItem(wires[0])
+        scene.clear()
+        assert len(scheduler) == 0
+        print("✓ Previews give way to routes once the drag settles")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_nearest_first_within_budget, test_scene_settles_after_drag]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the route cache shared by WirePath routing engines.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_cache_invalidation():
+    """Obstacle changes drop only routes in their region"""
+    print("=== Testing route cache ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, RouteCache, route_key
+
+    index = ObstacleIndex()
+    cache = RouteCache(index, margin=50, max_entries=3)
+    near = route_key("grid", (0, 0), (400, 0), "right", "left")
+    far = route_key("grid", (0, 5000), (400, 5000), "right", "left")
+    assert cache.put(near, [(0, 0), (400, 0)])
+    assert cache.put(far, [(0, 5000), (400, 5000)])
+    assert cache.get(near) == [(0, 0), (400, 0)]
+    assert cache.get(route_key("grid", (0, 0), (400, 0), "right", "top")) is None
+
+    # A component placed next to the first route only invalidates that one
+    index.insert("U1", (100, 30, 200, 100))
+    assert cache.get(near) is None and cache.get(far) is not None
+
+    # Routes computed against an older obstacle set are not stored
+    version = index.version
+    index.insert("U1", (100, 300, 200, 400))
+    assert not cache.put(near, [(0, 0), (400, 0)], version)
+    assert cache.put(near, [(0, 0), (400, 0)], index.version)
+
+    # LRU eviction keeps the spatial index in step
+    for i in range(3):
+        cache.put(route_key("grid", (0, i * 100 + 10000), (10, 0), None, None), [(0, i * 100 + 10000)])
+    assert len(cache) == 3 and len(cache._regions) == 3
+    assert cache.stats['hits'] == 2
+    cache.detach()
+    print("✓ Route cache invalidates by region")
+    return True
+
+
+def test_wire_path_reuses_routes():
+    """Repeated WirePath construction with identical inputs skips the router"""
+    print("\n=== Testing cached WirePath routing ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = {}
+        for name, x, y in (("A", 0, 0), ("B", 300, 0), ("C", 600, 0), ("D", 3000, 3000)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips[name] = chip
+        start = next(p for p in chips["A"].pins if p.edge == "right")
+        end = next(p for p in chips["C"].pins if p.edge == "left")
+        router = scene.routers["grid"]
+
+        def route():
+            path = WirePath(start.get_connection_point(), end.get_connection_point(),
+                            start, end, scene=scene)
+            return [(p.x(), p.y()) for p in path.segments]
+
+        first = route()
+        searched = router.stats['searched']
+        assert route() == first and router.stats['searched'] == searched
+        assert scene.route_cache.stats['hits'] == 1
+
+        # A far component move keeps the route, moving the blocker re-routes
+        chips["D"].setPos(3500, 3000)
+        assert route() == first and router.stats['searched'] == searched
+        chips["B"].setPos(300, 2000)
+        straight = route()
+        assert straight != first and len(straight) == 4
+        print("✓ WirePath reuses cached routes")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_cache_invalidation, test_wire_path_reuses_routes]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
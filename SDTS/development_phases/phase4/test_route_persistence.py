@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test persisted wire routes that let a reopened scene skip routing.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_route_signature():
+    """The signature follows the route and the obstacles near it only"""
+    print("=== Testing route signatures ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, route_signature
+
+    index = ObstacleIndex()
+    index.insert("near", (100, 40, 160, 80))
+    index.insert("far", (1000, 1000, 1100, 1100))
+
+    def signature(points=((200, 0),)):
+        return route_signature("grid", (0, 0), (200, 200), "right", "left", list(points), index)
+
+    original = signature()
+    assert signature() == original
+    assert signature([(200.0, 0.0)]) == original
+    assert signature([(180, 0), (180, 200)]) != original
+
+    index.insert("far", (1200, 1000, 1300, 1100))
+    assert signature() == original
+    index.insert("near", (100, 50, 160, 90))
+    assert signature() != original
+    index.remove("near")
+    assert signature() != original
+    print("✓ Only endpoint, corner and nearby obstacle changes invalidate a route")
+    return True
+
+
+def _scene_file():
+    """RDB file with three chips connected left to right"""
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+
+    config = ComponentScene._build_rfic_config(None, "RFIC", num_pairs=2)
+    devices, positions = [], {}
+    for n, (x, y) in enumerate(((0, 0), (400, 60), (800, 0))):
+        devices.append({"ID": f"M{n}", "Name": f"RFIC_{n}", "Module": "RFIC"})
+        positions[f"M{n}"] = {"position": {"x": x, "y": y}}
+    connections = [{"Connection ID": f"C{n}{pin}", "Source Device": f"RFIC_{n}", "Source Pin": f"{pin}_OUT1",
+                    "Dest Device": f"RFIC_{n + 1}", "Dest Pin": f"{pin}_IN1"}
+                   for n in range(2) for pin in ("PRX", "DRX")]
+    data = {
+        "model": {"current_revision": "1.0.0"},
+        "config": {
+            "component_configs": {device["Name"]: config for device in devices},
+            "visual_bcf": {"visual_properties": positions},
+            "bcf": {"1": {"0": {"0": {"bcf_dev_mipi": devices, "bcf_dev_gpio": []}}},
+                    "bcf_db_io_connect": connections},
+        },
+    }
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    return db_file
+
+
+def _open(db_file):
+    """Load the scene through a controller, recording which wires get routed"""
+    from PySide6.QtWidgets import QWidget
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+    from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+    from apps.RBM5.BCF.source.controllers.visual_bcf.visual_bcf_controller import VisualBCFController
+
+    controller = VisualBCFController(QWidget(), VisualBCFDataModel(RDBManager(db_file)))
+    routed = []
+    route_all_wires = controller.scene.route_all_wires
+    controller.scene.route_all_wires = lambda wires=None: (routed.extend(wires or []), route_all_wires(wires))[1]
+    assert controller.load_scene()
+    return controller, routed
+
+
+def _corners(controller):
+    return {cid: [(p.x(), p.y()) for p in wire.wire_path.segments]
+            for cid, wire in controller._connection_graphics_items.items()}
+
+
+def test_reopen_reuses_stored_routes():
+    """A saved scene reopens without routing; moved parts reroute nearby wires only"""
+    print("\n=== Testing persisted routes ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    db_file = _scene_file()
+    controllers = []
+    try:
+        # First open routes everything; saving stores the routes
+        controller, routed = _open(db_file)
+        controllers.append(controller)
+        assert len(routed) == 4
+        assert controller.persist_connection_routes() == 4
+        assert controller.persist_connection_routes() == 0  # unchanged since
+        corners = _corners(controller)
+        controller.data_model.rdb_manager.db.save()
+
+        # Reopening reuses every route
+        controller, routed = _open(db_file)
+        controllers.append(controller)
+        assert routed == []
+        assert _corners(controller) == corners
+
+        # Moving the last chip invalidates the wires attached to it only
+        model = controller.data_model
+        model.rdb_manager.get_value("config.visual_bcf.visual_properties")["M2"]["position"]["y"] = 200
+        model.rdb_manager.db.save()
+        controller, routed = _open(db_file)
+        controllers.append(controller)
+        assert sorted(wire.connection_id for wire in routed) == ["C1DRX", "C1PRX"]
+
+        # A tampered route no longer matches its signature
+        wire = controller._connection_graphics_items["C0PRX"]
+        stored = controller.data_model.connection_route("C0PRX")
+        assert controller.scene.restore_routes({wire: stored}) == []
+        stored["points"][0][1] += 5
+        assert controller.scene.restore_routes({wire: stored}) == [wire]
+        print("✓ Stored routes are reused while their signature matches")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        for controller in controllers:
+            controller.scene.cleanup()
+        os.remove(db_file)
+
+
+def test_restored_routes_take_their_lanes():
+    """Routes are stored on save only and restored routes rejoin the track assigner"""
+    print("\n=== Testing restored lanes ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    db_file = _scene_file()
+    controller = None
+    try:
+        controller, _ = _open(db_file)
+        scene = controller.scene
+        scene.routing_engine = "heuristic"
+        wires = list(controller._connection_graphics_items.values())
+        for wire in wires:
+            wire.wire_path = None
+            wire.update_wire_position_final()
+        app.processEvents()
+        corners = _corners(controller)
+
+        # Debounced view-state saves leave the routes alone
+        controller.save_view_state()
+        assert controller.data_model.connection_route("C0PRX") is None
+        assert controller.save_scene()
+        stored = {wire: controller.data_model.connection_route(wire.connection_id) for wire in wires}
+        assert all(route and route.get("tracks") for route in stored.values())
+
+        scene.track_assigner.clear()
+        assert scene.restore_routes(stored) == []
+        assert len(scene.track_assigner) == len(wires)
+        scene.flush_track_updates()
+        assert _corners(controller) == corners
+        print("✓ Restored routes are registered with their lanes")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        if controller is not None:
+            controller.scene.cleanup()
+        os.remove(db_file)
+
+
+def test_import_routes_wires_in_one_batch():
+    """Imported connections are created unrouted and batch routed when the import ends"""
+    print("\n=== Testing imported wire routing ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    db_file = _scene_file()
+    with open(db_file) as f:
+        data = json.load(f)
+    fd, scene_file = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    # The import target has the component configs but no devices or connections yet
+    data["config"]["bcf"]["1"]["0"]["0"]["bcf_dev_mipi"] = []
+    data["config"]["bcf"]["bcf_db_io_connect"] = []
+    data["config"]["visual_bcf"]["visual_properties"] = {}
+    fd, empty_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    controllers = []
+    try:
+        controller, _ = _open(db_file)
+        controllers.append(controller)
+        assert controller.export_scene(scene_file)
+
+        controller, routed = _open(empty_file)
+        controllers.append(controller)
+        calls, started = [], []
+        route_all_wires = controller.scene.route_all_wires
+        controller.scene.route_all_wires = lambda wires=None: (calls.append(list(wires)), route_all_wires(wires))[1]
+        controller.scene.wire_thread_manager.calculate_wire_async = lambda *args, **kwargs: started.append(args)
+        assert controller.import_scene(scene_file, batch_size=2, synchronous=True)
+        wires = list(controller._connection_graphics_items.values())
+        assert len(wires) == 4 and started == []
+        assert len(calls) == 1 and set(calls[0]) == set(wires)
+        assert all(len(wire.wire_path.segments) > 2 for wire in wires)
+        print("✓ Imported wires are routed once, together")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        for controller in controllers:
+            controller.scene.cleanup()
+        for path in (db_file, empty_file, scene_file):
+            os.remove(path)
+
+
+def main():
+    tests = [test_route_signature, test_reopen_reuses_stored_routes, test_restored_routes_take_their_lanes,
+             test_import_routes_wires_in_one_batch]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
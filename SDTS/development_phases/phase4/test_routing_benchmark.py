@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the parametric RFIC testbed and the routing benchmark suite.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_parametric_testbed():
+    """The testbed scales to N RFICs, chained, with reproducible seeded placements"""
+    print("=== Testing parametric RFIC testbed ===")
+    import benchmark_routing
+
+    app = benchmark_routing._application()
+    placements = []
+    for seed in (7, 7, None):
+        scene = benchmark_routing.make_scene(5, 2, seed)
+        try:
+            rfics = sorted(benchmark_routing._components(scene), key=lambda c: c.name)
+            assert [c.name for c in rfics] == ["RFIC_A", "RFIC_B", "RFIC_C", "RFIC_D", "RFIC_E"]
+            # 4 links x 2 pairs x PRX/DRX, plus 2 loops per RFIC
+            assert len(benchmark_routing._wires(scene)) == 4 * 2 * 2 + 5 * 2
+            for n, a in enumerate(rfics):
+                for b in rfics[n + 1:]:
+                    assert not a.sceneBoundingRect().intersects(b.sceneBoundingRect())
+            placements.append([(c.pos().x(), c.pos().y()) for c in rfics])
+        finally:
+            app.processEvents()  # let deferred wire updates run before teardown
+            scene.cleanup()
+    assert placements[0] == placements[1] != placements[2]
+    print("✓ RFICs are chained and placed reproducibly without overlaps")
+    return True
+
+
+def test_benchmark_results_and_baseline():
+    """A small run reports every metric and regressions against a baseline"""
+    print("\n=== Testing benchmark results ===")
+    import benchmark_routing
+
+    assert benchmark_routing.percentile([4, 1, 3, 2], 50) == 2.5
+    assert benchmark_routing.percentile([1, 2, 3], 100) == 3
+
+    results = benchmark_routing.run_benchmarks(num_rfics=2, num_pairs=2, seed=1, drag_steps=2)
+    assert results["config"]["wires"] == results["loaded_wires"] == 8
+    metrics = benchmark_routing.flatten(results["metrics"])
+    for name in ("route_wire_ms.p50", "route_wire_ms.p99", "route_scene_ms", "load_scene_ms", "reopen_scene_ms",
+                 "drag_frame_ms.p50", "drag_frame_ms.p99", "drag_settle_ms"):
+        assert metrics[name] >= 0, name
+    assert metrics["route_wire_ms.p99"] >= metrics["route_wire_ms.p50"]
+
+    # Slower than the tolerance and the noise floor regresses; faster never does
+    slower = json.loads(json.dumps(results))
+    slower["metrics"]["route_scene_ms"] = results["metrics"]["route_scene_ms"] * 2 + 10
+    slower["metrics"]["load_scene_ms"] = results["metrics"]["load_scene_ms"] * 0.5
+    regressions = benchmark_routing.compare(slower, results, tolerance=0.25)
+    assert [name for name, _, _ in regressions] == ["route_scene_ms"]
+    assert [name for name, _, _ in benchmark_routing.compare(results, slower)] == ["load_scene_ms"]
+
+    fd, baseline = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        with open(baseline, "w") as f:
+            json.dump(slower, f)
+        # A different configuration is reported but not compared
+        assert benchmark_routing.main(["--rfics", "2", "--pairs", "1", "--drag-steps", "1",
+                                       "--baseline", baseline]) == 0
+    finally:
+        os.remove(baseline)
+    print("✓ Metrics are complete and regressions are detected")
+    return True
+
+
+def main():
+    tests = [test_parametric_testbed, test_benchmark_results_and_baseline]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
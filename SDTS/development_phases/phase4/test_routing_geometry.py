@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the routing geometry components cache between moves and resizes.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_component_geometry_cache():
+    """Rects and approach points are reused until the component's geometry changes"""
+    print("=== Testing component geometry cache ===")
+    from PySide6.QtGui import QPen, QTransform
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import to_point, to_rect
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing.obstacle_index import inflate_rect
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing.orthogonal import approach_point
+
+    chip = ComponentWithPins("U1", "chip")
+    pin = chip.pins[0]
+    rect = chip.scene_rect()
+    assert rect == to_rect(chip.mapRectToScene(chip.boundingRect()))
+    assert chip.scene_rect() is rect
+    assert chip.inflated_rect(20) == inflate_rect(rect, 20)
+    assert chip.inflated_rect(20) is chip.inflated_rect(20)
+    connection, approach = chip.pin_approach(pin)
+    assert connection == to_point(pin.get_connection_point())
+    assert approach == approach_point(connection, pin.edge)
+    assert chip.pin_approach(pin) is chip.pin_approach(pin)
+
+    version = chip.geometry_version
+    chip.setPos(100, 50)
+    assert chip.geometry_version > version
+    assert chip.scene_rect() == (rect[0] + 100, rect[1] + 50, rect[2] + 100, rect[3] + 50)
+    assert chip.pin_approach(pin)[0] == to_point(pin.get_connection_point())
+
+    version = chip.geometry_version
+    chip.setRect(0, 0, 300, 200)
+    assert chip.geometry_version > version
+    assert chip.scene_rect() == to_rect(chip.mapRectToScene(chip.boundingRect()))
+
+    # Pen width and transforms change the scene rect and pins as well
+    for change in (lambda: chip.setPen(QPen(chip.pen().color(), 8)),
+                   lambda: chip.setTransform(QTransform().scale(2, 1)),
+                   lambda: chip.setRotation(90),
+                   lambda: chip.setScale(0.5)):
+        chip.scene_rect(), chip.pin_approach(pin)
+        version = chip.geometry_version
+        change()
+        assert chip.geometry_version > version
+        assert chip.scene_rect() == to_rect(chip.mapRectToScene(chip.boundingRect()))
+        assert chip.pin_approach(pin)[0] == to_point(pin.get_connection_point())
+    print("✓ Geometry is rebuilt only after a move, resize, pen or transform change")
+    return True
+
+
+def test_scene_uses_cached_geometry():
+    """The obstacle index and wire approach points follow the cache after a move"""
+    print("\n=== Testing scene geometry ===")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire, WirePath
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import to_point
+
+    class EmptyScene(ComponentScene):
+        # Skip the default testbed; the test adds a smaller one
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        scene.add_rfic_testbed(num_pairs=2, num_rfics=2)
+        chip = next(item for item in scene.items() if isinstance(item, ComponentWithPins))
+        chip.setPos(chip.pos().x() + 40, chip.pos().y() + 30)
+        assert scene.obstacle_index.rect(chip) == chip.scene_rect()
+
+        wire = next(item for item in scene.items() if isinstance(item, Wire))
+        wire_path = WirePath(wire.start_pin.get_connection_point(), wire.end_pin.get_connection_point(),
+                             wire.start_pin, wire.end_pin, scene, calculate_now=False)
+        for pin, approach in ((wire_path.start_pin, wire_path.start_approach_point),
+                              (wire_path.end_pin, wire_path.end_approach_point)):
+            assert to_point(approach) == pin.parent_component.pin_approach(pin)[1]
+        print("✓ Obstacle index and approach points come from the component cache")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_component_geometry_cache, test_scene_uses_cached_geometry]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test streaming scene export/import (JSON Lines) for Visual BCF.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _make_model(num_devices=5, num_connections=3):
+    from apps.RBM5.BCF.source.RDB.rdb_manager import RDBManager
+    from apps.RBM5.BCF.source.models.visual_bcf.visual_bcf_data_model import VisualBCFDataModel
+
+    mipi = [{"ID": f"M{i}", "Name": f"DEV_{i}", "Module": "FEM"} for i in range(num_devices)]
+    gpio = [{"ID": "G0", "Name": "SWITCH", "Module": "GPIO"}]
+    io_rows = [{"Connection ID": f"C{i}", "Source Device": "DEV_0", "Source Pin": "OUT",
+                "Dest Device": f"DEV_{i + 1}", "Dest Pin": "IN"} for i in range(num_connections)]
+    data = {
+        "model": {"current_revision": "1.0.0"},
+        "config": {
+            "component_configs": {},
+            "visual_bcf": {"visual_properties": {"M0": {"position": {"x": 10, "y": 20}}}},
+            "bcf": {
+                "1": {"0": {"0": {"bcf_dev_mipi": mipi, "bcf_dev_gpio": gpio}}},
+                "bcf_db_io_connect": io_rows,
+            },
+        },
+    }
+    fd, db_file = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    return VisualBCFDataModel(RDBManager(db_file)), db_file
+
+
+def test_export_writes_json_lines():
+    """Every device and connection row becomes one JSON line"""
+    print("=== Testing streaming scene export ===")
+    from apps.RBM5.BCF.source.models.visual_bcf.scene_stream import SceneStreamWriter
+
+    model, db_file = _make_model()
+    out_fd, out_file = tempfile.mkstemp(suffix=".jsonl")
+    os.close(out_fd)
+    try:
+        progress = []
+        written = SceneStreamWriter(out_file, progress_interval=2).write(
+            model, progress=lambda done, total: progress.append((done, total)))
+        with open(out_file) as f:
+            records = [json.loads(line) for line in f]
+
+        assert written == 9
+        assert records[0]["type"] == "header"
+        assert records[0]["counts"] == {"components": 6, "connections": 3}
+        assert records[-1] == {"type": "end", "records": 9}
+        components = [r for r in records if r["type"] == "component"]
+        assert [r["table"] for r in components].count("gpio") == 1
+        assert components[0]["visual"] == {"position": {"x": 10, "y": 20}}
+        assert len([r for r in records if r["type"] == "connection"]) == 3
+        assert progress[-1] == (9, 9)
+        assert not os.path.exists(out_file + ".tmp")
+        print("✓ Export streamed all records")
+        return True
+    finally:
+        os.unlink(db_file)
+        os.unlink(out_file)
+
+
+def test_import_applies_batches():
+    """Import upserts rows batch by batch with one table write per batch"""
+    print("\n=== Testing batched scene import ===")
+    from apps.RBM5.BCF.source.RDB import paths
+    from apps.RBM5.BCF.source.models.visual_bcf.scene_stream import SceneImporter, SceneStreamWriter
+
+    source, source_db = _make_model(num_devices=5, num_connections=3)
+    target, target_db = _make_model(num_devices=2, num_connections=0)
+    out_fd, out_file = tempfile.mkstemp(suffix=".jsonl")
+    os.close(out_fd)
+    try:
+        SceneStreamWriter(out_file).write(source)
+        changes = []
+        target.rdb_manager.db.data_changed.connect(changes.append)
+
+        importer = SceneImporter(target, out_file, batch_size=4)
+        assert importer.start()["counts"]["components"] == 6
+        batches = []
+        while not importer.finished:
+            components, connections = importer.apply_next_batch()
+            if components or connections:
+                batches.append((len(components), len(connections)))
+        assert batches == [(4, 0), (2, 2), (0, 1)]
+        assert importer.records_applied == 9
+
+        mipi = target.rdb_manager[paths.BCF_DEV_MIPI("1.0.0")]
+        assert [row["ID"] for row in mipi] == ["M0", "M1", "M2", "M3", "M4"]
+        assert len(target.rdb_manager[paths.BCF_DB_IO_CONNECT]) == 3
+        assert target.visual_properties("M0")["position"] == {"x": 10, "y": 20}
+        # One write per touched table per batch, plus visual properties
+        assert len(changes) <= 3 * 2 + 1
+        print("✓ Import applied all records in batches")
+        return True
+    finally:
+        for path in (source_db, target_db, out_file):
+            os.unlink(path)
+
+
+def main():
+    tests = [test_export_writes_json_lines, test_import_applies_batches]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test fan-out nets routed and drawn as Steiner trees with junction dots.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_steiner_branches():
+    """Each route adds only its part beyond the routes before it"""
+    print("=== Testing Steiner branches ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import steiner_branches, tree_length
+
+    routes = [
+        ("trunk", [(0, 0), (100, 0), (100, 100)]),
+        ("split", [(0, 0), (50, 0), (50, -80)]),
+        ("onto", [(0, 0), (100, 0), (100, 50)]),  # lies on the trunk
+        ("further", [(0, 0), (100, 0), (100, 100), (200, 100)]),
+        ("cross", [(0, 0), (0, 50), (150, 50)]),  # leaves at the source, crosses the trunk later
+    ]
+    branches = steiner_branches(routes)
+    assert branches["trunk"] == ([(0, 0), (100, 0), (100, 100)], None)
+    assert branches["split"] == ([(50, 0), (50, -80)], (50, 0))
+    assert branches["onto"] == ([], None)
+    assert branches["further"] == ([(100, 100), (200, 100)], (100, 100))
+    assert branches["cross"] == ([(0, 0), (0, 50), (150, 50)], None)
+    assert tree_length(branches) == 200 + 80 + 100 + 200
+    print("✓ Branches start where routes leave the tree")
+    return True
+
+
+def test_same_net_shares_lanes():
+    """Overlapping segments of one net stay on one lane; other nets are jogged apart"""
+    print("\n=== Testing same-net lanes ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import TrackAssigner
+
+    assigner = TrackAssigner(spacing=10)
+    assigner.update_wire("a", [(0, 0), (200, 0)], net="clk")
+    assigner.update_wire("b", [(0, 0), (120, 0), (120, 80)], net="clk")
+    assert assigner.offsets("a")[0] == assigner.offsets("b")[0]
+    assigner.update_wire("c", [(50, 0), (150, 0)], net="data")
+    assert assigner.offsets("c")[0] != assigner.offsets("a")[0]
+    print("✓ A net keeps one lane per channel")
+    return True
+
+
+def test_fan_out_routes_as_tree():
+    """Wires of one source share track, so their tree is shorter than their routes"""
+    print("\n=== Testing fan-out routing ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import (
+        BatchRouter, Net, ObstacleIndex, steiner_branches, tree_length)
+
+    sinks = [(290, 140), (860, 330), (260, -140), (840, 220)]
+    index = ObstacleIndex()
+    index.insert("S", (-100, 60, 0, 140))
+    for k, (x, y) in enumerate(sinks):
+        index.insert(k, (x, y - 40, x + 100, y + 40))
+    nets = [Net(k, (20, 100), (x - 20, y), "right", "left", ("S", k)) for k, (x, y) in enumerate(sinks)]
+
+    lengths = {}
+    for share in (1.0, 0.5):
+        router = BatchRouter(index, share_factor=share)
+        routes = router.route_all(nets)
+        assert router.stats['routed'] == len(nets) and router.stats['overused'] == 0
+        branches = steiner_branches([(net.key, routes[net.key]) for net in nets])
+        routed = sum(abs(b[0] - a[0]) + abs(b[1] - a[1])
+                     for points in routes.values() for a, b in zip(points, points[1:]))
+        lengths[share] = tree_length(branches)
+        assert lengths[share] < routed
+        assert sum(1 for _, junction in branches.values() if junction is not None) == len(nets) - 1
+    assert lengths[0.5] < lengths[1.0]
+    print(f"✓ Fan-out tree length {lengths[0.5]:.0f} (without sharing discount {lengths[1.0]:.0f})")
+    return True
+
+
+def test_scene_draws_clock_tree():
+    """A clock driving every RFIC's REFCLK is drawn as one tree with junction dots"""
+    print("\n=== Testing scene clock tree ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.qt_geometry import to_points
+
+    class EmptyScene(ComponentScene):
+        # Skip the default testbed; the test adds a smaller one
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    def length(points):
+        return sum(abs(b[0] - a[0]) + abs(b[1] - a[1]) for a, b in zip(points, points[1:]))
+
+    scene = EmptyScene()
+    try:
+        scene.add_rfic_testbed(num_pairs=1, num_rfics=4)
+        rfics = [item for item in scene.items() if isinstance(item, ComponentWithPins)]
+        clock = ComponentWithPins('CLKGEN', 'clock', component_config={
+            'visual_properties': {'color': '#10AC84'},
+            'pins': [{'pin_id': 'CLK_OUT', 'pin_name': 'CLK_OUT', 'side': 'right', 'position': 0.5,
+                      'type': 'clock'}]})
+        clock.setPos(-300, 60)
+        scene.addItem(clock)
+        source = clock.pins[0]
+        for rfic in rfics:
+            scene._add_wire_between(source, next(p for p in rfic.pins if p.pin_id == 'REFCLK'))
+        scene.route_all_wires()
+
+        net = scene.wire_net(source)
+        assert len(net) == len(rfics)
+        full = [to_points(wire.wire_path.segments) for wire in net]
+        drawn = [to_points(wire.wire_path.drawn_points()) for wire in net]
+        assert net[0].wire_path.branch is None and net[0].wire_path.junction is None
+        assert all(wire.wire_path.junction is not None for wire in net[1:])
+        assert sum(len(p) for p in drawn) < sum(len(p) for p in full)
+        assert sum(map(length, drawn)) < sum(map(length, full))
+        # Junction dots are part of the drawn wire
+        for wire in net[1:]:
+            assert wire.boundingRect().contains(wire.wire_path.junction)
+
+        # Moving the source reroutes the net as a unit, so it stays a tree
+        clock.setPos(-300, 110)
+        assert scene.flush_dirty_region() == len(rfics)
+        scene.reroute_scheduler.finish()
+        moved = [to_points(wire.wire_path.drawn_points()) for wire in scene.wire_net(source)]
+        assert sum(map(length, moved)) < 1.1 * sum(map(length, drawn))
+
+        # Removing the trunk redraws the rest of the net
+        trunk = scene.wire_net(source)[0]
+        for pin in (trunk.start_pin, trunk.end_pin):
+            pin.parent_component.remove_wire(trunk)
+        scene.removeItem(trunk)
+        rest = scene.wire_net(source)
+        assert len(rest) == len(rfics) - 1 and rest[0].wire_path.branch is None
+        print(f"✓ Clock tree drawn with {sum(map(length, drawn)):.0f} of {sum(map(length, full)):.0f} units")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_steiner_branches, test_same_net_shares_lanes, test_fan_out_routes_as_tree,
+             test_scene_draws_clock_tree]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test global lane assignment for colinear wire segments.
+"""
+
+import itertools
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def bus(turn):
+    """Four wires sharing a channel, then turning off it by `turn` (+1 down, -1 up)"""
+    return {k: [(0, 100), (300, 100), (300, 100 + turn * (100 + 50 * k)), (500, 100 + turn * (100 + 50 * k))]
+            for k in range(4)}
+
+
+def test_bus_lanes_stable_and_uncrossed():
+    """Bus wires get evenly spaced lanes in any routing order, without crossings"""
+    print("=== Testing bus lane assignment ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import CrossingIndex, TrackAssigner
+
+    for turn in (1, -1):
+        wires = bus(turn)
+        results = set()
+        for order in itertools.permutations(range(4)):
+            assigner = TrackAssigner(spacing=10)
+            for k in order:
+                assigner.update_wire(k, wires[k], "right", "left")
+            results.add(tuple(tuple(assigner.offsets(k)) for k in range(4)))
+        assert len(results) == 1
+        offsets = results.pop()
+        assert sorted(o[0] for o in offsets) == [-15.0, -5.0, 5.0, 15.0]
+        assert sorted(o[1] for o in offsets) == [-15.0, -5.0, 5.0, 15.0]
+
+        jogged = {k: assigner.jogged_points(k) for k in range(4)}
+        assert CrossingIndex().rebuild(jogged) == 0
+        for points in jogged.values():
+            assert points[0] == (0, 100) and points[-1][0] == 500
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                assert x1 == x2 or y1 == y2
+    print("✓ Lanes are order-independent, evenly spaced and uncrossed")
+    return True
+
+
+def test_interval_colouring_and_updates():
+    """Lanes follow interval overlap and single-wire changes report moved wires"""
+    print("\n=== Testing interval colouring ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import TrackAssigner
+
+    assigner = TrackAssigner(spacing=10)
+    # a overlaps b, b overlaps c, a and c are apart: two lanes suffice
+    assigner.update_wire("a", [(0, 0), (100, 0)])
+    assigner.update_wire("b", [(80, 0), (220, 0)])
+    assigner.update_wire("c", [(200, 0), (300, 0)])
+    lanes = {k: assigner.offsets(k)[0] for k in "abc"}
+    assert len(set(lanes.values())) == 2 and lanes["a"] == lanes["c"] != lanes["b"]
+
+    # A distant segment in the same channel keeps the centre line
+    assert assigner.update_wire("d", [(500, 0), (600, 0)]) == set()
+    assert assigner.offsets("d") == [0.0]
+
+    # Moving b off the channel frees a and c
+    assert assigner.update_wire("b", [(80, 50), (220, 50)]) == {"a", "c"}
+    assert assigner.offsets("a") == assigner.offsets("c") == [0.0]
+    assigner.update_wire("b", [(80, 0), (220, 0)])
+    assert assigner.remove_wire("b") == {"a", "c"}
+    assert "b" not in assigner and len(assigner) == 3
+    print("✓ Minimal lanes per overlap cluster, updated incrementally")
+    return True
+
+
+def test_scene_rejogs_neighbours():
+    """ComponentScene re-jogs wires whose lanes another wire's change moved"""
+    print("\n=== Testing scene track updates ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    scene.routing_engine = "heuristic"
+    try:
+        chips = []
+        for name, x, y in (("A", 0, 0), ("B", 600, 300)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips.append(chip)
+        wires = []
+        for start, end in zip((p for p in chips[0].pins if p.edge == "right"),
+                              (p for p in chips[1].pins if p.edge == "left")):
+            # Built without an end pin so no async calculation starts
+            wire = Wire(start, scene=scene)
+            wire.end_pin = end
+            wire.is_temporary = False
+            scene.addItem(wire)
+            wires.append(wire)
+        for wire in wires:
+            wire.update_wire_position_final()
+        app.processEvents()
+
+        keys = [wire.wire_path.track_key() for wire in wires]
+        assert all(key in scene.track_assigner for key in keys)
+        for wire, key in zip(wires, keys):
+            # Every wire shows its current lanes, including ones moved by later wires
+            path = wire.wire_path
+            expected = scene.track_assigner.jogged_points(key)
+            assert [(p.x(), p.y()) for p in path.segments[1:-1]] == expected
+
+        shifted = [w for w, k in zip(wires, keys) if any(scene.track_assigner.offsets(k))]
+        assert shifted, "bus wires should share a channel"
+        for wire in wires:
+            if wire is not shifted[0]:
+                scene.removeItem(wire)
+        assert scene.flush_track_updates() == 1
+        assert not any(scene.track_assigner.offsets(shifted[0].wire_path.track_key()))
+        print("✓ Scene keeps neighbouring wires on their lanes")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_bus_lanes_stable_and_uncrossed, test_interval_colouring_and_updates,
+             test_scene_rejogs_neighbours]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test the orthogonal visibility-graph routing engine.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def _assert_orthogonal(points):
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        assert x1 == x2 or y1 == y2, f"diagonal segment {(x1, y1)} -> {(x2, y2)}"
+
+
+def test_routes_and_incremental_updates():
+    """Routes avoid inflated obstacles and follow component moves"""
+    print("=== Testing visibility router ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import (
+        GridRouter, ObstacleIndex, VisibilityRouter, count_bends)
+
+    index = ObstacleIndex()
+    router = VisibilityRouter(index, clearance=30)
+    checker = GridRouter(index, clearance=29.9)
+
+    assert router.route((0, 0), (400, 200), start_dir="right") == [(0, 0), (400, 0), (400, 200)]
+
+    index.insert("wall", (180, -150, 220, 150))
+    points = router.route((0, 0), (400, 0), start_dir="right", end_dir="left")
+    assert points[0] == (0, 0) and points[-1] == (400, 0)
+    _assert_orthogonal(points)
+    assert checker.polyline_clear(points)
+    assert count_bends(points) <= 4
+    # The detour hugs the inflated wall
+    assert points[1] == (150.0, 0.0) and points[2] == (150.0, 180.0)
+
+    # Moving the wall away drops its cached edges and coordinates
+    index.insert("wall", (1180, 500, 1220, 800))
+    assert 150.0 not in router._xs and 1150.0 in router._xs
+    assert router.route((0, 0), (400, 0), start_dir="right", end_dir="left") == [(0, 0), (400, 0)]
+
+    index.remove("wall")
+    assert router._xs == () and router._ys == ()
+    router.detach()
+
+    # The edge cache stays within its LRU bound, together with its spatial index
+    bounded = VisibilityRouter(index, clearance=30, max_edges=8)
+    for n in range(6):
+        index.insert(n, (n * 200, 100, n * 200 + 40, 300))
+    for n in range(5):
+        assert bounded.route((n * 200 + 100, 0), (n * 200 + 100, 400), start_dir="down") is not None
+        assert len(bounded._edges) <= 8 and len(bounded._edge_index) == len(bounded._edges)
+    bounded.detach()
+    print("✓ Visibility router follows obstacle changes")
+    return True
+
+
+def test_cost_independent_of_canvas_area():
+    """Search effort depends on obstacles, not on route length"""
+    print("\n=== Testing visibility router scaling ===")
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, VisibilityRouter
+
+    index = ObstacleIndex()
+    for i in range(5):
+        index.insert(f"U{i}", (1000 + i * 300, -100, 1100 + i * 300, 100))
+    router = VisibilityRouter(index)
+
+    expanded = []
+    for span in (3000, 300000):
+        router.stats['expanded'] = 0
+        points = router.route((0, 0), (span, 0), start_dir="right", end_dir="left")
+        assert points is not None and points[-1] == (span, 0)
+        expanded.append(router.stats['expanded'])
+    assert expanded[0] == expanded[1], expanded
+    print("✓ Route effort does not grow with the canvas")
+    return True
+
+
+def test_cache_consistent_under_concurrent_moves():
+    """Routing threads and component moves leave the edge cache matching the index"""
+    print("\n=== Testing visibility router threading ===")
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, VisibilityRouter
+
+    rng = random.Random(7)
+    index = ObstacleIndex()
+    for i in range(12):
+        index.insert(f"U{i}", (i * 250, (i % 3) * 250, i * 250 + 100, (i % 3) * 250 + 100))
+    router = VisibilityRouter(index)
+
+    def route_many():
+        for _ in range(40):
+            router.route((-100, rng.randrange(-50, 600)), (3200, rng.randrange(-50, 600)),
+                         start_dir="right", end_dir="left")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(route_many) for _ in range(3)]
+        for step in range(200):
+            i = step % 12
+            x, y = rng.randrange(0, 3000), rng.randrange(0, 600)
+            index.insert(f"U{i}", (x, y, x + 100, y + 100))
+        for future in futures:
+            future.result()
+
+    for edge, blockers in router._edges.items():
+        fresh = index.query_segment(*edge, inflate=router.clearance - 1e-6)
+        assert set(blockers) == set(fresh), edge
+        assert router._edge_index.rect(edge) is not None
+    assert len(router._edge_index) == len(router._edges)
+    router.detach()
+    print("✓ Edge cache matches the index after concurrent routing")
+    return True
+
+
+def test_wire_path_visibility_engine():
+    """WirePath can select the visibility engine"""
+    print("\n=== Testing WirePath visibility engine ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    try:
+        chips = {}
+        for name, x in (("A", 0), ("B", 300), ("C", 600)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, 0)
+            scene.addItem(chip)
+            chips[name] = chip
+        start = next(p for p in chips["A"].pins if p.edge == "right")
+        end = next(p for p in chips["C"].pins if p.edge == "left")
+
+        router = scene.routers["visibility"]
+        path = WirePath(start.get_connection_point(), end.get_connection_point(),
+                        start, end, scene=scene, engine="visibility")
+        assert router.stats['routed'] == 1
+        points = [(p.x(), p.y()) for p in path.segments]
+        _assert_orthogonal(points)
+        b_rect = scene.obstacle_index.rect(chips["B"])
+        # Passes over the middle component along its inflated corner
+        assert (b_rect[0] - 30, b_rect[1] - 30) in points
+        assert min(y for _, y in points) == b_rect[1] - 30
+        print("✓ WirePath routes with the visibility engine")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [
+        test_routes_and_incremental_updates,
+        test_cache_consistent_under_concurrent_moves,
+        test_cost_independent_of_canvas_area,
+        test_wire_path_visibility_engine,
+    ]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
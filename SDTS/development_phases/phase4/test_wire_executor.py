@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test the pooled wire-routing executor of the scene.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def test_pool_drops_stale_results():
+    """Superseded jobs are dropped and results arrive on the GUI thread"""
+    print("=== Testing pooled wire executor ===")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QThread
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    manager = scene.wire_thread_manager
+    try:
+        chips = {}
+        for name, x, y in (("A", 0, 0), ("B", 300, 0), ("C", 600, 0)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, y)
+            scene.addItem(chip)
+            chips[name] = chip
+        start = next(p for p in chips["A"].pins if p.edge == "right")
+        end = next(p for p in chips["C"].pins if p.edge == "left")
+
+        results = []
+
+        def callback(wire_id, wire_path):
+            results.append((wire_id, wire_path, QThread.currentThread() is app.thread()))
+
+        # Three requests for one wire: only the latest result is applied
+        for _ in range(3):
+            manager.calculate_wire_async("w1", start, end, scene, callback)
+        manager.calculate_wire_async("w2", end, start, scene, callback)
+        # Results are queued to the GUI thread once the workers are done
+        assert manager.wait_for_done(5.0)
+        app.processEvents()
+
+        assert sorted(r[0] for r in results) == ["w1", "w2"]
+        assert all(r[1] is not None and r[2] for r in results)
+        segments = [(p.x(), p.y()) for p in results[0][1].segments]
+        for (x1, y1), (x2, y2) in zip(segments, segments[1:]):
+            assert x1 == x2 or y1 == y2
+
+        stats = manager.get_statistics()
+        assert stats['total_calculations'] == 4 and stats['completed_calculations'] == 2
+        assert stats['stale_results'] == 2
+        assert stats['queue_depth'] == 0 and stats['pending_calculations'] == 0
+        assert stats['max_latency_ms'] >= stats['avg_latency_ms'] > 0
+        print("✓ Stale results are dropped, latest results applied on the GUI thread")
+
+        # Stopping discards in-flight results without waiting on workers
+        manager.calculate_wire_async("w3", start, end, scene, callback)
+        manager.stop_all_calculations()
+        manager.wait_for_done(1.0)
+        app.processEvents()
+        assert all(r[0] != "w3" for r in results)
+        print("✓ Stopped calculations never reach their callback")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def test_pool_routes_on_obstacle_snapshot():
+    """Jobs route without the obstacle lock; results the scene moved across are routed again"""
+    print("\n=== Testing pooled routing on obstacle snapshots ===")
+    import threading
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.scene import ComponentScene
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.routing import segment_intersects_rect
+
+    class EmptyScene(ComponentScene):
+        # Skip the RFIC testbed and its async wire calculations
+        def _populate_rfic_test_if_empty(self):
+            pass
+
+    scene = EmptyScene()
+    manager = scene.wire_thread_manager
+    try:
+        chips = {}
+        for name, x in (("A", 0), ("C", 600)):
+            chip = ComponentWithPins(name, "chip")
+            chip.setPos(x, 0)
+            scene.addItem(chip)
+            chips[name] = chip
+        start = next(p for p in chips["A"].pins if p.edge == "right")
+        end = next(p for p in chips["C"].pins if p.edge == "left")
+        results = []
+
+        def callback(wire_id, wire_path):
+            results.append(wire_path)
+
+        # A long obstacle update on another thread does not hold up the workers
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with scene.obstacle_index.lock:
+                locked.set()
+                release.wait(5.0)
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            locked.wait(1.0)
+            manager.calculate_wire_async("w1", start, end, scene, callback)
+            assert manager.wait_for_done(2.0)
+        finally:
+            release.set()
+            holder.join()
+        app.processEvents()
+        assert len(results) == 1 and results[0] is not None
+        print("✓ Jobs route while the obstacle index is locked")
+
+        # An obstacle placed across the route before it arrives sends it back
+        results.clear()
+        manager.calculate_wire_async("w2", start, end, scene, callback)
+        assert manager.wait_for_done(5.0)
+        y = start.get_connection_point().y()
+        blocker = (280.0, y - 20.0, 320.0, y + 20.0)
+        scene.obstacle_index.insert("blocker", blocker)
+        app.processEvents()
+        assert manager.get_statistics()['resubmitted_calculations'] == 1 and not results
+        assert manager.wait_for_done(5.0)
+        app.processEvents()
+        assert len(results) == 1
+        points = [(p.x(), p.y()) for p in results[0].segments]
+        assert not any(segment_intersects_rect(*a, *b, blocker) for a, b in zip(points, points[1:]))
+
+        # A move elsewhere keeps a route that is still clear
+        results.clear()
+        manager.calculate_wire_async("w3", start, end, scene, callback)
+        assert manager.wait_for_done(5.0)
+        scene.obstacle_index.insert("far", (0.0, 2000.0, 40.0, 2040.0))
+        app.processEvents()
+        assert len(results) == 1 and manager.get_statistics()['resubmitted_calculations'] == 1
+        print("✓ Results the scene moved across are routed again")
+        return True
+    finally:
+        app.processEvents()  # let deferred wire updates run before teardown
+        scene.cleanup()
+
+
+def main():
+    tests = [test_pool_drops_stale_results, test_pool_routes_on_obstacle_snapshot]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the cached painter path, shape and bounds of wires.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def test_wire_path_cached_per_segments():
+    """WirePath builds its painter path and segment pairs once per segment list"""
+    print("=== Testing WirePath caches ===")
+    from PySide6.QtCore import QPointF
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import WirePath
+
+    path = WirePath(QPointF(0, 0), QPointF(100, 50), calculate_now=False)
+    path.apply_route([QPointF(50, 0), QPointF(50, 50)])
+    builds = []
+    build = path._build_path
+    path._build_path = lambda: builds.append(1) or build()
+
+    first = path.get_path()
+    assert path.get_path() == first and len(builds) == 1
+    assert first.elementCount() == 4
+    pairs = path.get_segments()
+    assert pairs is path.get_segments() and len(pairs) == 3
+
+    # Assigning new segments invalidates both caches
+    path.apply_route([QPointF(100, 0)])
+    assert path.get_path().elementCount() == 3 and len(builds) == 2
+    assert len(path.get_segments()) == 2
+    print("✓ Path and segment pairs are rebuilt only when segments change")
+    return True
+
+
+def test_wire_shape_and_bounds_cached():
+    """Wire reuses its stroked shape and keeps the scene index current on setPath"""
+    print("\n=== Testing Wire geometry cache ===")
+    from PySide6.QtCore import QPointF, QRectF
+    from PySide6.QtWidgets import QApplication, QGraphicsScene
+    app = QApplication.instance() or QApplication([])
+
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.chip import ComponentWithPins
+    from apps.RBM5.BCF.gui.source.visual_bcf.artifacts.connection import Wire, WirePath
+
+    scene = QGraphicsScene()
+    chip = ComponentWithPins("A", "chip")
+    scene.addItem(chip)
+    wire = Wire(chip.pins[0])  # temporary wire, no routing started
+    scene.addItem(wire)
+    assert wire.boundingRect() == QRectF()
+
+    path = WirePath(QPointF(0, 500), QPointF(300, 500), calculate_now=False)
+    path.apply_route([])
+    wire.wire_path = path
+    wire.setPath(path.get_path())
+    shape = wire.shape()
+    assert wire.shape() is shape
+    assert wire.boundingRect() == QRectF(0, 500, 300, 0)
+    assert wire in scene.items(QRectF(140, 490, 20, 20))
+
+    # A new path moves the wire in the scene index, repaints its old area and drops the old shape
+    changed = []
+    scene.changed.connect(changed.extend)
+    prepared = []
+    prepare = wire.prepareGeometryChange
+    wire.prepareGeometryChange = lambda: (prepared.append(QRectF(wire.boundingRect())), prepare())
+    path.apply_route([QPointF(0, 800), QPointF(300, 800)])
+    wire.setPath(path.get_path())
+    app.processEvents()
+    # Qt is told about the change while the wire still reports its old bounds
+    assert prepared == [QRectF(0, 500, 300, 0)]
+    assert any(rect.intersects(QRectF(140, 490, 20, 20)) for rect in changed)
+    assert wire.shape() is not shape
+    assert wire not in scene.items(QRectF(140, 490, 20, 20))
+    assert wire in scene.items(QRectF(140, 790, 20, 20))
+    print("✓ Shape, bounds and scene index follow setPath only")
+    return True
+
+
+def main():
+    tests = [test_wire_path_cached_per_segments, test_wire_shape_and_bounds_cached]
+    results = [t() for t in tests]
+    print(f"\n{sum(bool(r) for r in results)}/{len(results)} tests passed")
+    return all(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
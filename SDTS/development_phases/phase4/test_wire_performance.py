@@ -29,24 +29,20 @@ def test_wire_performance():
         import_time = time.time() - start_time
         print(f"✅ Import completed in {import_time:.4f} seconds")
 
-        # Test 2: Wire creation performance
-        print("\n🔄 Testing wire creation performance...")
-        start_time = time.time()
-
-        # Create mock points for testing
-        class MockQPointF:
-            def __init__(self, x, y):
-                self.x = x
-                self.y = y
+        # Test 2: Path creation performance (Qt-free routing kernel, no QApplication)
+        print("\n🔄 Testing path creation performance...")
+        from apps.RBM5.BCF.gui.source.visual_bcf.routing import ObstacleIndex, OrthogonalRouter
 
-        start_point = MockQPointF(0, 0)
-        end_point = MockQPointF(100, 100)
+        index = ObstacleIndex()
+        index.insert("U1", (40, -20, 60, 20))
+        router = OrthogonalRouter(index)
+        start_time = time.time()
 
-        # Create wire path
-        wire_path = WirePath(start_point, end_point)
+        points = router.route((0, 0), (100, 100))
         creation_time = time.time() - start_time
-        print(f"✅ WirePath creation completed in {creation_time:.4f} seconds")
-        print(f"   Segments created: {len(wire_path.segments)}")
+        print(f"✅ Path creation completed in {creation_time:.4f} seconds")
+        print(f"   Corner points created: {len(points)}")
+        assert points[0] == (0, 0) and points[-1] == (100, 100)
 
         # Test 3: Path calculation performance
         print("\n🔄 Testing path calculation performance...")
@@ -54,9 +50,7 @@ def test_wire_performance():
 
         # Simulate multiple path calculations
         for i in range(100):
-            test_start = MockQPointF(i, i)
-            test_end = MockQPointF(i + 50, i + 50)
-            test_path = WirePath(test_start, test_end)
+            router.route((i, i), (i + 50, i + 50))
 
         calc_time = time.time() - start_time
         print(f"✅ 100 path calculations completed in {calc_time:.4f} seconds")
@@ -84,9 +78,11 @@ def test_wire_performance():
         # Check if position caching is implemented
         if hasattr(Wire, 'update_path'):
             # Create a mock wire to test position caching
+            from PySide6.QtCore import QPointF
+
             class MockPin:
                 def get_connection_point(self):
-                    return MockQPointF(0, 0)
+                    return QPointF(0, 0)
 
             class MockScene:
                 def __init__(self):